@@ -288,6 +288,18 @@ FREUDD_GAMIFICATION_XP_PER_LEVEL = int(os.environ.get("FREUDD_GAMIFICATION_XP_PE
 FREUDD_CREDENTIALS_MASTER_KEY = os.environ.get("FREUDD_CREDENTIALS_MASTER_KEY", "")
 FREUDD_CREDENTIALS_KEY_VERSION = int(os.environ.get("FREUDD_CREDENTIALS_KEY_VERSION", "1"))
 FREUDD_EXT_SYNC_TIMEOUT_SECONDS = int(os.environ.get("FREUDD_EXT_SYNC_TIMEOUT_SECONDS", "20"))
+FREUDD_EXT_SYNC_WORKERS = int(os.environ.get("FREUDD_EXT_SYNC_WORKERS", "8"))
+FREUDD_EXT_SYNC_MAX_ATTEMPTS = int(os.environ.get("FREUDD_EXT_SYNC_MAX_ATTEMPTS", "4"))
+FREUDD_EXT_SYNC_BACKOFF_SECONDS = float(os.environ.get("FREUDD_EXT_SYNC_BACKOFF_SECONDS", "1.0"))
+FREUDD_EXT_SYNC_RATE_PER_SECOND = {
+    "habitica": float(os.environ.get("FREUDD_EXT_SYNC_HABITICA_RATE_PER_SECOND", "2.0")),
+}
+FREUDD_ANKI_EXPORT_CACHE_DIR = Path(
+    os.environ.get(
+        "FREUDD_ANKI_EXPORT_CACHE_DIR",
+        Path.home() / ".cache" / "psyk-podcast" / "anki-exports",
+    )
+)
 FREUDD_PROGRESS_QUIZ_HISTORY_ENABLED = _as_bool_env(
     "FREUDD_PROGRESS_QUIZ_HISTORY_ENABLED",
     default="1",
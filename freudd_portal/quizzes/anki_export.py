@@ -0,0 +1,522 @@
+"""Build Anki ``.apkg`` packages from portal flashcard decks and per-user review state."""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, time, timezone as dt_timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX fallback
+    fcntl = None
+
+from django.conf import settings
+from django.utils import timezone
+
+from .flashcard_services import FlashcardDeck, _reviews_for_deck
+from .models import FlashcardReview
+
+ANKI_EXPORT_FORMAT_VERSION = "anki2-schema11-v1"
+ANKI_SCHEMA_VERSION = 11
+EXPORT_OWNERS_FILENAME = "owners.json"
+EXPORT_LOCK_FILENAME = ".lock"
+ANKI_FIELD_SEPARATOR = "\x1f"
+DEFAULT_EASE_FACTOR = 2500
+MIN_EASE_FACTOR = 1300
+MAX_EASE_FACTOR = 3500
+# Anki encodes remaining learning steps as ``today * 1000 + total``; one step left.
+LEARNING_STEPS_LEFT = 1001
+_ID_MASK = (1 << 52) - 1
+_GUID_ALPHABET = (
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    "!#$%&()*+,-./:;<=>?@[]^_`{|}~"
+)
+_CARD_TYPE_NEW, _CARD_TYPE_LEARNING, _CARD_TYPE_REVIEW, _CARD_TYPE_RELEARNING = 0, 1, 2, 3
+_QUEUE_NEW, _QUEUE_LEARNING, _QUEUE_REVIEW = 0, 1, 2
+
+_SCHEMA_SQL = """
+CREATE TABLE col (
+    id integer primary key, crt integer not null, mod integer not null, scm integer not null,
+    ver integer not null, dty integer not null, usn integer not null, ls integer not null,
+    conf text not null, models text not null, decks text not null, dconf text not null, tags text not null
+);
+CREATE TABLE notes (
+    id integer primary key, guid text not null, mid integer not null, mod integer not null,
+    usn integer not null, tags text not null, flds text not null, sfld integer not null,
+    csum integer not null, flags integer not null, data text not null
+);
+CREATE TABLE cards (
+    id integer primary key, nid integer not null, did integer not null, ord integer not null,
+    mod integer not null, usn integer not null, type integer not null, queue integer not null,
+    due integer not null, ivl integer not null, factor integer not null, reps integer not null,
+    lapses integer not null, left integer not null, odue integer not null, odid integer not null,
+    flags integer not null, data text not null
+);
+CREATE TABLE revlog (
+    id integer primary key, cid integer not null, usn integer not null, ease integer not null,
+    ivl integer not null, lastIvl integer not null, factor integer not null, time integer not null,
+    type integer not null
+);
+CREATE TABLE graves (usn integer not null, oid integer not null, type integer not null);
+CREATE INDEX ix_notes_usn ON notes (usn);
+CREATE INDEX ix_cards_usn ON cards (usn);
+CREATE INDEX ix_revlog_usn ON revlog (usn);
+CREATE INDEX ix_cards_nid ON cards (nid);
+CREATE INDEX ix_cards_sched ON cards (did, queue, due);
+CREATE INDEX ix_revlog_cid ON revlog (cid);
+CREATE INDEX ix_notes_csum ON notes (csum);
+"""
+
+_CARD_CSS = ".card { font-family: arial; font-size: 20px; text-align: left; color: black; background-color: white; }"
+
+
+@dataclass(frozen=True)
+class AnkiExport:
+    path: Path
+    filename: str
+    cache_hit: bool
+    card_count: int
+    reviewed_count: int
+
+
+def _stable_int(*parts: str) -> int:
+    digest = hashlib.sha256("|".join(parts).encode("utf-8")).digest()
+    # Anki ids are millisecond timestamps; keep derived ids positive and inside JS-safe range.
+    return (int.from_bytes(digest[:8], "big") & _ID_MASK) or 1
+
+
+def note_guid(*, subject_slug: str, deck_slug: str, card_id: str) -> str:
+    """Stable base91 note GUID so re-imports update notes instead of duplicating them."""
+
+    value = int.from_bytes(
+        hashlib.sha256(f"freudd|{subject_slug}|{deck_slug}|{card_id}".encode("utf-8")).digest()[:8],
+        "big",
+    )
+    chars: list[str] = []
+    while value:
+        value, remainder = divmod(value, len(_GUID_ALPHABET))
+        chars.append(_GUID_ALPHABET[remainder])
+    return "".join(reversed(chars)) or _GUID_ALPHABET[0]
+
+
+def _field_checksum(sort_field: str) -> int:
+    return int(hashlib.sha1(sort_field.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _anki_tag(value: object) -> str:
+    return "_".join(str(value or "").split())
+
+
+def _ease_factor(difficulty: float) -> int:
+    if not difficulty:
+        return DEFAULT_EASE_FACTOR
+    span = MAX_EASE_FACTOR - MIN_EASE_FACTOR
+    return int(round(MIN_EASE_FACTOR + (10.0 - float(difficulty)) / 9.0 * span))
+
+
+def _interval_days(review: FlashcardReview) -> int:
+    if review.last_reviewed_at is not None and review.next_review_at is not None:
+        seconds = (review.next_review_at - review.last_reviewed_at).total_seconds()
+        return max(1, int(round(seconds / 86400)))
+    return max(1, int(round(review.stability_days or 0)))
+
+
+def card_scheduling(review: FlashcardReview | None, *, position: int, collection_created: int, now) -> dict[str, int]:
+    """Map a portal review row onto the Anki ``cards`` scheduling columns.
+
+    ``again`` rows become (re)learning cards due at an epoch timestamp; other
+    ratings become review cards due on a day number relative to ``col.crt``.
+    """
+
+    if review is None:
+        return {
+            "type": _CARD_TYPE_NEW,
+            "queue": _QUEUE_NEW,
+            "due": position,
+            "ivl": 0,
+            "factor": 0,
+            "reps": 0,
+            "lapses": 0,
+            "left": 0,
+        }
+    next_review_at = review.next_review_at or now
+    common = {
+        "factor": _ease_factor(review.difficulty),
+        "reps": int(review.review_count),
+        "lapses": int(review.lapses),
+    }
+    if review.rating == FlashcardReview.Rating.AGAIN:
+        return {
+            **common,
+            "type": _CARD_TYPE_RELEARNING if review.lapses else _CARD_TYPE_LEARNING,
+            "queue": _QUEUE_LEARNING,
+            "due": int(next_review_at.timestamp()),
+            "ivl": _interval_days(review) if review.lapses else 0,
+            "left": LEARNING_STEPS_LEFT,
+        }
+    due_day = math.floor((next_review_at.timestamp() - collection_created) / 86400)
+    return {
+        **common,
+        "type": _CARD_TYPE_REVIEW,
+        "queue": _QUEUE_REVIEW,
+        "due": max(0, due_day),
+        "ivl": _interval_days(review),
+        "left": 0,
+    }
+
+
+def deck_content_hash(deck: FlashcardDeck) -> str:
+    digest = hashlib.sha256(f"{ANKI_EXPORT_FORMAT_VERSION}|{deck.subject_slug}|{deck.deck_slug}|{deck.title}".encode("utf-8"))
+    for card in deck.cards:
+        digest.update(f"|{card['card_id']}:{card['content_sha256']}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def review_state_hash(reviews: dict[str, FlashcardReview]) -> str:
+    digest = hashlib.sha256()
+    for card_id in sorted(reviews):
+        review = reviews[card_id]
+        digest.update(
+            "|".join(
+                (
+                    card_id,
+                    str(review.rating),
+                    str(review.review_count),
+                    review.next_review_at.isoformat() if review.next_review_at else "",
+                    review.last_reviewed_at.isoformat() if review.last_reviewed_at else "",
+                    f"{review.stability_days:.4f}",
+                    f"{review.difficulty:.4f}",
+                    str(review.lapses),
+                )
+            ).encode("utf-8")
+        )
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _model_payload(*, model_id: int, deck_id: int, mod: int) -> dict[str, Any]:
+    fields = [
+        {"name": name, "ord": index, "sticky": False, "rtl": False, "font": "Arial", "size": 20, "media": []}
+        for index, name in enumerate(("Front", "Back", "Background"))
+    ]
+    return {
+        "id": model_id,
+        "name": "Freudd Basic",
+        "type": 0,
+        "mod": mod,
+        "usn": -1,
+        "sortf": 0,
+        "did": deck_id,
+        "tmpls": [
+            {
+                "name": "Card 1",
+                "ord": 0,
+                "qfmt": "{{Front}}",
+                "afmt": "{{FrontSide}}<hr id=answer>{{Back}}{{#Background}}<hr>{{Background}}{{/Background}}",
+                "bqfmt": "",
+                "bafmt": "",
+                "did": None,
+                "bfont": "",
+                "bsize": 0,
+            }
+        ],
+        "flds": fields,
+        "css": _CARD_CSS,
+        "latexPre": "\\documentclass[12pt]{article}\n\\begin{document}\n",
+        "latexPost": "\\end{document}",
+        "latexsvg": False,
+        "req": [[0, "any", [0]]],
+        "tags": [],
+        "vers": [],
+    }
+
+
+def _deck_payload(*, deck_id: int, name: str, description: str, mod: int) -> dict[str, Any]:
+    return {
+        "id": deck_id,
+        "name": name,
+        "desc": description,
+        "mod": mod,
+        "usn": -1,
+        "lrnToday": [0, 0],
+        "revToday": [0, 0],
+        "newToday": [0, 0],
+        "timeToday": [0, 0],
+        "collapsed": False,
+        "browserCollapsed": False,
+        "dyn": 0,
+        "conf": 1,
+        "extendNew": 0,
+        "extendRev": 0,
+    }
+
+
+def _deck_config_payload(*, mod: int) -> dict[str, Any]:
+    return {
+        "id": 1,
+        "name": "Default",
+        "mod": mod,
+        "usn": -1,
+        "maxTaken": 60,
+        "autoplay": True,
+        "timer": 0,
+        "replayq": True,
+        "dyn": False,
+        "new": {
+            "delays": [1.0, 10.0],
+            "ints": [1, 4, 0],
+            "initialFactor": DEFAULT_EASE_FACTOR,
+            "order": 1,
+            "perDay": 20,
+            "bury": False,
+        },
+        "lapse": {"delays": [10.0], "mult": 0.0, "minInt": 1, "leechFails": 8, "leechAction": 1},
+        "rev": {"perDay": 200, "ease4": 1.3, "ivlFct": 1.0, "maxIvl": 36500, "bury": False, "hardFactor": 1.2},
+    }
+
+
+def write_collection(
+    database_path: Path,
+    *,
+    deck: FlashcardDeck,
+    reviews: dict[str, FlashcardReview],
+    now=None,
+) -> int:
+    """Write a schema 11 ``collection.anki2`` and return the number of reviewed cards."""
+
+    now = now or timezone.now()
+    day_start = datetime.combine(now.astimezone(dt_timezone.utc).date(), time.min, tzinfo=dt_timezone.utc)
+    collection_created = int(day_start.timestamp())
+    mod_seconds = int(now.timestamp())
+    mod_millis = mod_seconds * 1000
+    model_id = _stable_int("model", "freudd-basic")
+    deck_id = _stable_int("deck", deck.subject_slug, deck.deck_slug)
+    deck_name = f"Freudd::{deck.title}"
+
+    decks = {
+        "1": _deck_payload(deck_id=1, name="Default", description="", mod=mod_seconds),
+        str(deck_id): _deck_payload(deck_id=deck_id, name=deck_name, description=deck.description, mod=mod_seconds),
+    }
+    conf = {
+        "nextPos": len(deck.cards) + 1,
+        "estTimes": True,
+        "activeDecks": [deck_id],
+        "sortType": "noteFld",
+        "timeLim": 0,
+        "sortBackwards": False,
+        "addToCur": True,
+        "curDeck": deck_id,
+        "newSpread": 0,
+        "dueCounts": True,
+        "curModel": model_id,
+        "collapseTime": 1200,
+    }
+
+    note_rows: list[tuple[Any, ...]] = []
+    card_rows: list[tuple[Any, ...]] = []
+    reviewed_count = 0
+    for position, card in enumerate(deck.cards, start=1):
+        card_id = str(card["card_id"])
+        front = html.escape(str(card.get("front_text") or ""))
+        fields = (front, str(card.get("back_html") or ""), str(card.get("background_html") or ""))
+        tags = [_anki_tag(tag) for tag in card.get("tags") or []]
+        if card.get("category_slug"):
+            tags.append(_anki_tag(card["category_slug"]))
+        note_id = _stable_int("note", deck.subject_slug, deck.deck_slug, card_id)
+        sort_field = str(card.get("front_text") or "")
+        note_rows.append(
+            (
+                note_id,
+                note_guid(subject_slug=deck.subject_slug, deck_slug=deck.deck_slug, card_id=card_id),
+                model_id,
+                mod_seconds,
+                -1,
+                f" {' '.join(tag for tag in tags if tag)} " if any(tags) else "",
+                ANKI_FIELD_SEPARATOR.join(fields),
+                sort_field,
+                _field_checksum(sort_field),
+                0,
+                "",
+            )
+        )
+        review = reviews.get(card_id)
+        if review is not None:
+            reviewed_count += 1
+        schedule = card_scheduling(review, position=position, collection_created=collection_created, now=now)
+        card_rows.append(
+            (
+                _stable_int("card", deck.subject_slug, deck.deck_slug, card_id),
+                note_id,
+                deck_id,
+                0,
+                mod_seconds,
+                -1,
+                schedule["type"],
+                schedule["queue"],
+                schedule["due"],
+                schedule["ivl"],
+                schedule["factor"],
+                schedule["reps"],
+                schedule["lapses"],
+                schedule["left"],
+                0,
+                0,
+                0,
+                "",
+            )
+        )
+
+    connection = sqlite3.connect(database_path)
+    try:
+        connection.executescript(_SCHEMA_SQL)
+        connection.execute(
+            "INSERT INTO col VALUES (1, ?, ?, ?, ?, 0, 0, 0, ?, ?, ?, ?, '{}')",
+            (
+                collection_created,
+                mod_millis,
+                mod_millis,
+                ANKI_SCHEMA_VERSION,
+                json.dumps(conf),
+                json.dumps({str(model_id): _model_payload(model_id=model_id, deck_id=deck_id, mod=mod_seconds)}),
+                json.dumps(decks),
+                json.dumps({"1": _deck_config_payload(mod=mod_seconds)}),
+            ),
+        )
+        connection.executemany("INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", note_rows)
+        connection.executemany(
+            "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            card_rows,
+        )
+        connection.commit()
+    finally:
+        connection.close()
+    return reviewed_count
+
+
+def write_apkg(
+    destination: Path,
+    *,
+    deck: FlashcardDeck,
+    reviews: dict[str, FlashcardReview],
+    now=None,
+) -> int:
+    """Write ``collection.anki2`` plus an empty ``media`` map into ``destination``."""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database_path = Path(temp_dir) / "collection.anki2"
+        reviewed_count = write_collection(database_path, deck=deck, reviews=reviews, now=now)
+        with zipfile.ZipFile(destination, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.write(database_path, "collection.anki2")
+            archive.writestr("media", "{}")
+    return reviewed_count
+
+
+def anki_export_cache_root() -> Path:
+    return Path(getattr(settings, "FREUDD_ANKI_EXPORT_CACHE_DIR")).expanduser()
+
+
+def _write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False, suffix=".tmp", encoding="utf-8") as handle:
+        json.dump(payload, handle, sort_keys=True)
+        tmp_name = handle.name
+    try:
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _prune_deck_exports(directory: Path, *, owner: str, cache_key: str) -> None:
+    """Point ``owner`` at ``cache_key`` and delete packages no user points at any more.
+
+    Packages are shared by users with identical review state, so a user's previous
+    package is only removed once no other user's latest export still uses it.
+    Packages built from older deck content are removed unconditionally.
+    """
+
+    owners_path = directory / EXPORT_OWNERS_FILENAME
+    try:
+        owners = json.loads(owners_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        owners = {}
+    owners = owners if isinstance(owners, dict) else {}
+    content_prefix = cache_key.split("-", 1)[0]
+    current = {
+        user_key: key
+        for user_key, key in owners.items()
+        if isinstance(key, str) and key.split("-", 1)[0] == content_prefix
+    }
+    current[owner] = cache_key
+    if current == owners:
+        return
+    _write_json_atomic(owners_path, current)
+    keep = set(current.values())
+    for package in directory.glob("*.apkg"):
+        if package.stem not in keep:
+            package.unlink(missing_ok=True)
+
+
+@contextmanager
+def _locked_deck_directory(directory: Path) -> Iterator[None]:
+    """Serialize cache lookups, builds and pruning for one deck directory across processes."""
+
+    directory.mkdir(parents=True, exist_ok=True)
+    with (directory / EXPORT_LOCK_FILENAME).open("a") as lock_handle:
+        if fcntl is not None:
+            fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+def open_deck_export_for_user(*, deck: FlashcardDeck, user=None, now=None) -> tuple[AnkiExport, BinaryIO]:
+    """Return a cached ``.apkg`` for ``deck`` with ``user``'s review state and an open handle to it.
+
+    The cache key is the deck content hash plus the review-state hash, so users
+    with identical state (e.g. no reviews yet) share one package. Each deck
+    directory keeps only the packages that are some user's latest export. The
+    package is opened under the deck lock before pruning, so the handle stays
+    readable even if a concurrent export removes the file afterwards.
+    """
+
+    reviews = _reviews_for_deck(user=user, subject_slug=deck.subject_slug, deck_slug=deck.deck_slug)
+    cache_key = f"{deck_content_hash(deck)[:16]}-{review_state_hash(reviews)[:16]}"
+    path = anki_export_cache_root() / deck.subject_slug / deck.deck_slug / f"{cache_key}.apkg"
+    filename = f"{deck.subject_slug}-{deck.deck_slug}.apkg"
+    reviewed_count = sum(1 for card in deck.cards if str(card["card_id"]) in reviews)
+    owner = str(user.pk) if user is not None else "anonymous"
+    with _locked_deck_directory(path.parent):
+        cache_hit = path.is_file()
+        if not cache_hit:
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False, suffix=".tmp") as handle:
+                tmp_name = handle.name
+            try:
+                write_apkg(Path(tmp_name), deck=deck, reviews=reviews, now=now)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        package = path.open("rb")
+        try:
+            _prune_deck_exports(path.parent, owner=owner, cache_key=cache_key)
+        except BaseException:
+            package.close()
+            raise
+    return AnkiExport(path, filename, cache_hit, deck.card_count, reviewed_count), package
+
+
+def export_deck_for_user(*, deck: FlashcardDeck, user=None, now=None) -> AnkiExport:
+    """Build or reuse ``user``'s ``.apkg`` for ``deck`` without keeping it open."""
+
+    export, package = open_deck_export_for_user(deck=deck, user=user, now=now)
+    package.close()
+    return export
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Any
 
 from django.conf import settings
+from django.db.models import Case, Count, F, IntegerField, Value, When
 from django.utils import timezone
 
 from .models import FlashcardReview, FlashcardUserAnswer
@@ -35,12 +36,43 @@ RATING_DUE_OFFSETS = {
     FlashcardReview.Rating.GOOD: timedelta(days=3),
     FlashcardReview.Rating.EASY: timedelta(days=7),
 }
+RELEARN_OFFSET = RATING_DUE_OFFSETS[FlashcardReview.Rating.AGAIN]
+INITIAL_DIFFICULTY = {
+    FlashcardReview.Rating.AGAIN: 7.0,
+    FlashcardReview.Rating.HARD: 6.0,
+    FlashcardReview.Rating.GOOD: 5.0,
+    FlashcardReview.Rating.EASY: 3.5,
+}
+DIFFICULTY_DELTA = {
+    FlashcardReview.Rating.AGAIN: 1.5,
+    FlashcardReview.Rating.HARD: 0.75,
+    FlashcardReview.Rating.GOOD: 0.0,
+    FlashcardReview.Rating.EASY: -0.75,
+}
+MIN_DIFFICULTY = 1.0
+MAX_DIFFICULTY = 10.0
+LAPSE_STABILITY_FACTOR = 0.3
+HARD_INTERVAL_FACTOR = 1.2
+EASY_BONUS = 1.3
+MAX_STABILITY_DAYS = 365.0
+DEFAULT_DUE_QUEUE_LIMIT = 20
+MAX_DUE_QUEUE_LIMIT = 100
 RATING_SORT_ORDER = {
     FlashcardReview.Rating.AGAIN: 0,
     FlashcardReview.Rating.HARD: 1,
     FlashcardReview.Rating.GOOD: 2,
     FlashcardReview.Rating.EASY: 3,
 }
+# Reviewed cards are listed weakest rating first, then least recently reviewed.
+REVIEW_LIST_ORDERING = (
+    Case(
+        *(When(rating=rating, then=Value(rank)) for rating, rank in RATING_SORT_ORDER.items()),
+        default=Value(9),
+        output_field=IntegerField(),
+    ),
+    F("last_reviewed_at").asc(nulls_first=True),
+    "card_id",
+)
 MAX_FLASHCARD_USER_ANSWER_CHARS = 10_000
 
 
@@ -56,6 +88,14 @@ class FlashcardValidationError(FlashcardServiceError):
     """Raised when a flashcard registry or deck artifact is malformed."""
 
 
+@dataclass(frozen=True)
+class FlashcardSchedule:
+    stability_days: float
+    difficulty: float
+    lapses: int
+    next_review_at: Any
+
+
 @dataclass(frozen=True)
 class FlashcardDeckEntry:
     subject_slug: str
@@ -327,14 +367,20 @@ def load_flashcard_deck(subject_slug: str, deck_slug: str) -> FlashcardDeck:
     return deck
 
 
-def _reviews_for_deck(*, user, subject_slug: str, deck_slug: str) -> dict[str, FlashcardReview]:
+def _reviews_for_deck(
+    *,
+    user,
+    subject_slug: str,
+    deck_slug: str,
+    ordering: tuple[Any, ...] = (),
+) -> dict[str, FlashcardReview]:
     if user is None or not getattr(user, "is_authenticated", False):
         return {}
     rows = FlashcardReview.objects.filter(
         user=user,
         subject_slug=subject_slug,
         deck_slug=deck_slug,
-    )
+    ).order_by(*ordering)
     return {row.card_id: row for row in rows}
 
 
@@ -366,16 +412,16 @@ def normalize_flashcard_user_answer_text(value: object) -> str:
 
 
 def review_summary_for_deck(*, user, subject_slug: str, deck_slug: str, card_count: int) -> dict[str, object]:
-    reviews = _reviews_for_deck(user=user, subject_slug=subject_slug, deck_slug=deck_slug)
     ratings = {rating: 0 for rating in FLASHCARD_RATINGS}
+    reviewed_count = 0
     due_count = 0
-    now = timezone.now()
-    for review in reviews.values():
-        if review.rating in ratings:
-            ratings[review.rating] += 1
-        if review.next_review_at is not None and review.next_review_at <= now:
-            due_count += 1
-    reviewed_count = len(reviews)
+    if user is not None and getattr(user, "is_authenticated", False):
+        rows = FlashcardReview.objects.filter(user=user, subject_slug=subject_slug, deck_slug=deck_slug)
+        for row in rows.values("rating").annotate(count=Count("id")).order_by():
+            reviewed_count += int(row["count"])
+            if row["rating"] in ratings:
+                ratings[row["rating"]] += int(row["count"])
+        due_count = rows.filter(next_review_at__lte=timezone.now()).count()
     total = max(0, int(card_count))
     return {
         "reviewed_count": reviewed_count,
@@ -424,6 +470,9 @@ def _card_review_payload(review: FlashcardReview | None) -> dict[str, object] |
         "review_count": int(review.review_count or 0),
         "last_reviewed_at": review.last_reviewed_at.isoformat() if review.last_reviewed_at else None,
         "next_review_at": review.next_review_at.isoformat() if review.next_review_at else None,
+        "stability_days": round(float(review.stability_days or 0.0), 3),
+        "difficulty": round(float(review.difficulty or 0.0), 3),
+        "lapses": int(review.lapses or 0),
     }
 
 
@@ -439,37 +488,48 @@ def _card_answer_payload(answer: FlashcardUserAnswer | None) -> dict[str, object
     }
 
 
-def deck_cards_payload(*, deck: FlashcardDeck, user=None) -> list[dict[str, object]]:
-    reviews = _reviews_for_deck(user=user, subject_slug=deck.subject_slug, deck_slug=deck.deck_slug)
-    answers = _answers_for_deck(user=user, subject_slug=deck.subject_slug, deck_slug=deck.deck_slug)
+def _card_payload(
+    card: dict[str, object],
+    *,
+    review: FlashcardReview | None,
+    answer: FlashcardUserAnswer | None,
+) -> dict[str, object]:
+    return {
+        "card_id": str(card.get("card_id") or ""),
+        "front_text": str(card.get("front_text") or ""),
+        "back_html": str(card.get("back_html") or ""),
+        "background_html": str(card.get("background_html") or ""),
+        "background_text": str(card.get("background_text") or ""),
+        "tags": card.get("tags") if isinstance(card.get("tags"), list) else [],
+        "category_slug": str(card.get("category_slug") or DEFAULT_CATEGORY["slug"]),
+        "category_title": str(card.get("category_title") or DEFAULT_CATEGORY["title"]),
+        "review": _card_review_payload(review),
+        **_card_answer_payload(answer),
+    }
 
-    def sort_key(card: dict[str, object]) -> tuple[int, int, str, str]:
-        card_id = str(card.get("card_id") or "")
-        review = reviews.get(card_id)
-        if review is None:
-            return (0, 0, "", card_id)
-        reviewed_at = review.last_reviewed_at.isoformat() if review.last_reviewed_at else ""
-        return (1, RATING_SORT_ORDER.get(review.rating, 9), reviewed_at, card_id)
 
-    cards = sorted(deck.cards, key=sort_key) if reviews else list(deck.cards)
-    payload: list[dict[str, object]] = []
-    for card in cards:
-        card_id = str(card.get("card_id") or "")
-        payload.append(
-            {
-                "card_id": card_id,
-                "front_text": str(card.get("front_text") or ""),
-                "back_html": str(card.get("back_html") or ""),
-                "background_html": str(card.get("background_html") or ""),
-                "background_text": str(card.get("background_text") or ""),
-                "tags": card.get("tags") if isinstance(card.get("tags"), list) else [],
-                "category_slug": str(card.get("category_slug") or DEFAULT_CATEGORY["slug"]),
-                "category_title": str(card.get("category_title") or DEFAULT_CATEGORY["title"]),
-                "review": _card_review_payload(reviews.get(card_id)),
-                **_card_answer_payload(answers.get(card_id)),
-            }
+def deck_cards_payload(*, deck: FlashcardDeck, user=None) -> list[dict[str, object]]:
+    reviews = _reviews_for_deck(
+        user=user,
+        subject_slug=deck.subject_slug,
+        deck_slug=deck.deck_slug,
+        ordering=REVIEW_LIST_ORDERING,
+    )
+    answers = _answers_for_deck(user=user, subject_slug=deck.subject_slug, deck_slug=deck.deck_slug)
+    cards = list(deck.cards)
+    if reviews:
+        cards_by_id = {str(card.get("card_id") or ""): card for card in deck.cards}
+        # Unseen cards keep deck order; reviewed cards follow in the query's order.
+        cards = [card for card in deck.cards if str(card.get("card_id") or "") not in reviews]
+        cards.extend(cards_by_id[card_id] for card_id in reviews if card_id in cards_by_id)
+    return [
+        _card_payload(
+            card,
+            review=reviews.get(str(card.get("card_id") or "")),
+            answer=answers.get(str(card.get("card_id") or "")),
         )
-    return payload
+        for card in cards
+    ]
 
 
 def flashcard_deck_api_payload(*, deck: FlashcardDeck, user=None) -> dict[str, object]:
@@ -492,11 +552,119 @@ def flashcard_deck_api_payload(*, deck: FlashcardDeck, user=None) -> dict[str, o
     }
 
 
-def next_review_at_for_rating(rating: str):
-    offset = RATING_DUE_OFFSETS.get(rating)
-    if offset is None:
-        return None
-    return timezone.now() + offset
+def _clamp_difficulty(value: float) -> float:
+    return min(MAX_DIFFICULTY, max(MIN_DIFFICULTY, value))
+
+
+def schedule_flashcard_review(
+    *,
+    rating: str,
+    stability_days: float,
+    difficulty: float,
+    lapses: int,
+    now=None,
+) -> FlashcardSchedule:
+    """Return the next memory state for a card after one rating.
+
+    SM-2 style: difficulty (1-10) sets the interval multiplier, successful
+    recalls grow stability, and `again` on a learned card counts a lapse and
+    shrinks stability before a short relearning step.
+    """
+
+    if rating not in FLASHCARD_RATINGS:
+        raise FlashcardValidationError("Invalid flashcard rating.")
+    now = now or timezone.now()
+    stability = max(0.0, float(stability_days or 0.0))
+    lapses = max(0, int(lapses or 0))
+
+    if stability <= 0.0:
+        next_difficulty = float(difficulty) if difficulty else INITIAL_DIFFICULTY[rating]
+        if rating == FlashcardReview.Rating.AGAIN:
+            return FlashcardSchedule(0.0, _clamp_difficulty(next_difficulty), lapses, now + RELEARN_OFFSET)
+        next_stability = RATING_DUE_OFFSETS[rating].total_seconds() / 86400
+        return FlashcardSchedule(
+            next_stability,
+            _clamp_difficulty(next_difficulty),
+            lapses,
+            now + timedelta(days=next_stability),
+        )
+
+    next_difficulty = _clamp_difficulty(float(difficulty or INITIAL_DIFFICULTY[rating]) + DIFFICULTY_DELTA[rating])
+    if rating == FlashcardReview.Rating.AGAIN:
+        next_stability = max(RELEARN_OFFSET.total_seconds() / 86400, stability * LAPSE_STABILITY_FACTOR)
+        return FlashcardSchedule(next_stability, next_difficulty, lapses + 1, now + RELEARN_OFFSET)
+
+    ease = 1.0 + (MAX_DIFFICULTY + 1.0 - next_difficulty) * 0.25
+    if rating == FlashcardReview.Rating.HARD:
+        next_stability = max(1.0, stability * HARD_INTERVAL_FACTOR)
+    elif rating == FlashcardReview.Rating.GOOD:
+        next_stability = max(stability + 1.0, stability * ease)
+    else:
+        next_stability = max(stability + 2.0, stability * ease * EASY_BONUS)
+    next_stability = min(MAX_STABILITY_DAYS, next_stability)
+    return FlashcardSchedule(next_stability, next_difficulty, lapses, now + timedelta(days=next_stability))
+
+
+def due_flashcard_queue(
+    *,
+    user,
+    subject_slug: str,
+    deck_slug: str,
+    limit: int = DEFAULT_DUE_QUEUE_LIMIT,
+    include_new: bool = True,
+    now=None,
+) -> dict[str, object]:
+    """Return the next due cards for one deck, oldest due first, topped up with unseen cards."""
+
+    deck = load_flashcard_deck(subject_slug, deck_slug)
+    limit = min(MAX_DUE_QUEUE_LIMIT, max(1, int(limit)))
+    now = now or timezone.now()
+    cards_by_id = {str(card.get("card_id") or ""): card for card in deck.cards}
+    due_reviews = list(
+        FlashcardReview.objects.filter(
+            user=user,
+            subject_slug=deck.subject_slug,
+            deck_slug=deck.deck_slug,
+            next_review_at__lte=now,
+        ).order_by("next_review_at")[:limit]
+    )
+    selected: list[tuple[dict[str, object], FlashcardReview | None]] = [
+        (cards_by_id[review.card_id], review) for review in due_reviews if review.card_id in cards_by_id
+    ]
+    if include_new and len(selected) < limit:
+        reviewed_ids = set(
+            FlashcardReview.objects.filter(
+                user=user,
+                subject_slug=deck.subject_slug,
+                deck_slug=deck.deck_slug,
+            ).values_list("card_id", flat=True)
+        )
+        for card_id, card in cards_by_id.items():
+            if len(selected) >= limit:
+                break
+            if card_id not in reviewed_ids:
+                selected.append((card, None))
+    answers = {
+        row.card_id: row
+        for row in FlashcardUserAnswer.objects.filter(
+            user=user,
+            subject_slug=deck.subject_slug,
+            deck_slug=deck.deck_slug,
+            card_id__in=[str(card.get("card_id") or "") for card, _review in selected],
+        )
+    }
+    return {
+        "subject_slug": deck.subject_slug,
+        "deck_slug": deck.deck_slug,
+        "generated_at": now.isoformat(),
+        "limit": limit,
+        "due_count": sum(1 for _card, review in selected if review is not None),
+        "new_count": sum(1 for _card, review in selected if review is None),
+        "cards": [
+            _card_payload(card, review=review, answer=answers.get(str(card.get("card_id") or "")))
+            for card, review in selected
+        ],
+    }
 
 
 def upsert_flashcard_review(*, user, subject_slug: str, deck_slug: str, card_id: str, rating: str) -> FlashcardReview:
@@ -515,16 +683,29 @@ def upsert_flashcard_review(*, user, subject_slug: str, deck_slug: str, card_id:
             "review_count": 0,
         },
     )
+    schedule = schedule_flashcard_review(
+        rating=rating,
+        stability_days=0.0 if created else review.stability_days,
+        difficulty=0.0 if created else review.difficulty,
+        lapses=0 if created else review.lapses,
+        now=now,
+    )
     review.rating = rating
     review.review_count = int(review.review_count or 0) + 1
     review.last_reviewed_at = now
-    review.next_review_at = next_review_at_for_rating(rating)
+    review.next_review_at = schedule.next_review_at
+    review.stability_days = schedule.stability_days
+    review.difficulty = schedule.difficulty
+    review.lapses = schedule.lapses
     review.save(
         update_fields=[
             "rating",
             "review_count",
             "last_reviewed_at",
             "next_review_at",
+            "stability_days",
+            "difficulty",
+            "lapses",
             "updated_at",
         ]
         if not created
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import json
 import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
@@ -36,6 +39,9 @@ UNKNOWN_UNIT_KEY = "W00"
 UNKNOWN_UNIT_LABEL = "Ukendt"
 UNIT_RE = r"^(W\d{1,2})L\d+"
 HABITICA_API_BASE = "https://habitica.com/api/v3"
+# Habitica scoring is not idempotent: a 5xx or a timeout may already have scored
+# the task, so only rate limiting (and connection errors, see below) is retried.
+EXTENSION_SYNC_RETRYABLE_STATUS_CODES = {429}
 
 
 @dataclass(frozen=True)
@@ -860,6 +866,60 @@ def _habitica_sync_timeout_seconds() -> int:
     return max(1, int(getattr(settings, "FREUDD_EXT_SYNC_TIMEOUT_SECONDS", 20)))
 
 
+def _extension_sync_workers() -> int:
+    return max(1, int(getattr(settings, "FREUDD_EXT_SYNC_WORKERS", 8)))
+
+
+def _extension_sync_max_attempts() -> int:
+    return max(1, int(getattr(settings, "FREUDD_EXT_SYNC_MAX_ATTEMPTS", 4)))
+
+
+def _extension_sync_backoff_seconds() -> float:
+    return max(0.0, float(getattr(settings, "FREUDD_EXT_SYNC_BACKOFF_SECONDS", 1.0)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every worker calling one provider."""
+
+    def __init__(self, *, rate_per_second: float, capacity: int, clock=time.monotonic, sleep=time.sleep) -> None:
+        self.rate_per_second = max(0.001, float(rate_per_second))
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate_per_second
+            self._sleep(wait_seconds)
+
+
+def _provider_token_bucket(extension: str) -> TokenBucket:
+    rates = dict(getattr(settings, "FREUDD_EXT_SYNC_RATE_PER_SECOND", {}) or {})
+    rate = float(rates.get(extension, 2.0))
+    return TokenBucket(rate_per_second=rate, capacity=max(1, math.ceil(rate)))
+
+
+def _retry_after_seconds(response: Any, attempt: int) -> float:
+    raw = ""
+    headers = getattr(response, "headers", None) or {}
+    if hasattr(headers, "get"):
+        raw = str(headers.get("Retry-After") or "").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return _extension_sync_backoff_seconds() * (2 ** (attempt - 1))
+
+
 def _daily_outcome_for_stat(*, daily_stat: DailyGamificationStat) -> dict[str, Any]:
     goal_target = max(1, int(daily_stat.goal_target or _daily_goal_target()))
     answered_delta = max(0, int(daily_stat.answered_delta or 0))
@@ -879,7 +939,41 @@ def _daily_outcome_for_stat(*, daily_stat: DailyGamificationStat) -> dict[str, A
     }
 
 
-def _habitica_score_task(*, credential_payload: dict[str, str], direction: str, score_events: int) -> int:
+def _habitica_post_with_retry(
+    *,
+    endpoint: str,
+    headers: dict[str, str],
+    timeout_seconds: int,
+    rate_limiter: TokenBucket | None,
+    sleep=time.sleep,
+):
+    max_attempts = _extension_sync_max_attempts()
+    for attempt in range(1, max_attempts + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            response = requests.post(endpoint, headers=headers, timeout=timeout_seconds)
+        except requests.RequestException as exc:
+            # Only a failed connect is known not to have reached Habitica.
+            retryable = isinstance(exc, requests.ConnectionError) and not isinstance(exc, requests.Timeout)
+            if not retryable or attempt == max_attempts:
+                raise ExtensionSyncError(f"Habitica request failed: {exc}") from exc
+            sleep(_extension_sync_backoff_seconds() * (2 ** (attempt - 1)))
+            continue
+        if response.status_code in EXTENSION_SYNC_RETRYABLE_STATUS_CODES and attempt < max_attempts:
+            sleep(_retry_after_seconds(response, attempt))
+            continue
+        return response
+    raise ExtensionSyncError("Habitica request failed: retries exhausted.")
+
+
+def _habitica_score_task(
+    *,
+    credential_payload: dict[str, str],
+    direction: str,
+    score_events: int,
+    rate_limiter: TokenBucket | None = None,
+) -> int:
     headers = {
         "x-api-user": credential_payload["habitica_user_id"],
         "x-api-key": credential_payload["habitica_api_token"],
@@ -894,10 +988,12 @@ def _habitica_score_task(*, credential_payload: dict[str, str], direction: str,
     timeout_seconds = _habitica_sync_timeout_seconds()
     endpoint = f"{HABITICA_API_BASE}/tasks/{task_id}/score/{normalized_direction}"
     for _ in range(max(1, score_events)):
-        try:
-            response = requests.post(endpoint, headers=headers, timeout=timeout_seconds)
-        except requests.RequestException as exc:
-            raise ExtensionSyncError(f"Habitica request failed: {exc}") from exc
+        response = _habitica_post_with_retry(
+            endpoint=endpoint,
+            headers=headers,
+            timeout_seconds=timeout_seconds,
+            rate_limiter=rate_limiter,
+        )
 
         try:
             payload = response.json()
@@ -917,12 +1013,23 @@ def _habitica_score_task(*, credential_payload: dict[str, str], direction: str,
     return applied_events
 
 
-def _sync_habitica_access(
+@dataclass
+class _PendingExtensionSync:
+    access: UserExtensionAccess
+    status: str
+    details: dict[str, Any]
+    error: str = ""
+    credential_payload: dict[str, str] | None = None
+
+
+def _prepare_habitica_access(
     *,
     access: UserExtensionAccess,
     sync_date: date,
     dry_run: bool,
-) -> tuple[str, dict[str, Any], str]:
+) -> _PendingExtensionSync:
+    """Do the DB work for one Habitica row; a returned credential payload means a provider call is due."""
+
     goal_target = _daily_goal_target()
     daily_stat, _ = DailyGamificationStat.objects.get_or_create(
         user=access.user,
@@ -946,23 +1053,25 @@ def _sync_habitica_access(
             extension=access.extension,
         )
     except ExtensionCredentialError as exc:
-        return ExtensionSyncLedger.Status.ERROR, details, str(exc)
+        return _PendingExtensionSync(access, ExtensionSyncLedger.Status.ERROR, details, str(exc))
 
     if dry_run:
         details["applied_events"] = outcome["score_events"]
-        return ExtensionSyncLedger.Status.OK, details, ""
+        return _PendingExtensionSync(access, ExtensionSyncLedger.Status.OK, details)
+    return _PendingExtensionSync(access, ExtensionSyncLedger.Status.OK, details, credential_payload=credential_payload)
 
+
+def _run_habitica_call(pending: _PendingExtensionSync, rate_limiter: TokenBucket) -> None:
     try:
-        applied_events = _habitica_score_task(
-            credential_payload=credential_payload,
-            direction=str(outcome["score_direction"]),
-            score_events=int(outcome["score_events"]),
+        pending.details["applied_events"] = _habitica_score_task(
+            credential_payload=pending.credential_payload or {},
+            direction=str(pending.details["score_direction"]),
+            score_events=int(pending.details["score_events"]),
+            rate_limiter=rate_limiter,
         )
     except ExtensionSyncError as exc:
-        return ExtensionSyncLedger.Status.ERROR, details, str(exc)
-
-    details["applied_events"] = applied_events
-    return ExtensionSyncLedger.Status.OK, details, ""
+        pending.status = ExtensionSyncLedger.Status.ERROR
+        pending.error = str(exc)
 
 
 def sync_extensions_batch(
@@ -972,6 +1081,14 @@ def sync_extensions_batch(
     sync_date: date | None = None,
     dry_run: bool = False,
 ) -> dict[str, Any]:
+    """Sync enabled extension rows for one day.
+
+    DB reads happen up front on the calling thread (one ledger query for the
+    whole day), provider calls fan out through a bounded pool behind a
+    per-provider token bucket, and each row's ledger entry is written on the
+    calling thread as soon as its provider call completes.
+    """
+
     extension_key = (extension or "").strip().lower()
     if extension_key not in {"habitica", "all"}:
         raise ValueError("extension must be 'habitica' or 'all'")
@@ -988,6 +1105,12 @@ def sync_extensions_batch(
     if username:
         accesses = accesses.filter(user__username=username.strip())
     accesses = accesses.order_by("user__username", "extension")
+    existing_ledger_keys = set(
+        ExtensionSyncLedger.objects.filter(
+            sync_date=sync_day,
+            extension__in=enabled_extensions,
+        ).values_list("user_id", "extension")
+    )
 
     summary: dict[str, Any] = {
         "sync_date": sync_day.isoformat(),
@@ -1000,76 +1123,93 @@ def sync_extensions_batch(
         "results": [],
     }
 
+    rows: list[_PendingExtensionSync | dict[str, Any]] = []
     for access in accesses.iterator():
-        row_key = {
-            "user": access.user.username,
-            "extension": access.extension,
-            "sync_date": sync_day.isoformat(),
-        }
-        existing_ledger = ExtensionSyncLedger.objects.filter(
-            user=access.user,
-            extension=access.extension,
-            sync_date=sync_day,
-        ).first()
-        if existing_ledger is not None:
-            summary["processed"] += 1
-            summary["skipped"] += 1
-            summary["results"].append(
+        if (access.user_id, access.extension) in existing_ledger_keys:
+            rows.append(
                 {
-                    **row_key,
+                    "user": access.user.username,
+                    "extension": access.extension,
+                    "sync_date": sync_day.isoformat(),
                     "status": ExtensionSyncLedger.Status.SKIPPED,
                     "details": {"reason": "ledger_exists"},
                 }
             )
-            continue
-
-        if access.extension == UserExtensionAccess.Extension.ANKI:
-            status = ExtensionSyncLedger.Status.SKIPPED
-            details = {"reason": "anki_server_sync_deferred"}
-            error_message = ""
-        else:
-            status, details, error_message = _sync_habitica_access(
-                access=access,
-                sync_date=sync_day,
-                dry_run=dry_run,
+        elif access.extension == UserExtensionAccess.Extension.ANKI:
+            rows.append(
+                _PendingExtensionSync(
+                    access,
+                    ExtensionSyncLedger.Status.SKIPPED,
+                    {"reason": "anki_server_sync_deferred"},
+                )
             )
-
+        else:
+            rows.append(_prepare_habitica_access(access=access, sync_date=sync_day, dry_run=dry_run))
+
+    if not dry_run:
+        for row in rows:
+            if isinstance(row, _PendingExtensionSync) and row.credential_payload is None:
+                _persist_sync_row(row, sync_date=sync_day)
+    provider_calls = [
+        row for row in rows if isinstance(row, _PendingExtensionSync) and row.credential_payload is not None
+    ]
+    if provider_calls:
+        rate_limiter = _provider_token_bucket(UserExtensionAccess.Extension.HABITICA)
+        with ThreadPoolExecutor(max_workers=min(_extension_sync_workers(), len(provider_calls))) as pool:
+            futures = {pool.submit(_run_habitica_call, row, rate_limiter): row for row in provider_calls}
+            # Persist each row as soon as its call lands, so a crash mid-batch keeps
+            # the ledger rows that stop already-scored users from being scored twice.
+            for future in as_completed(futures):
+                future.result()
+                _persist_sync_row(futures[future], sync_date=sync_day)
+
+    for row in rows:
         summary["processed"] += 1
-        if status == ExtensionSyncLedger.Status.OK:
+        if isinstance(row, dict):
+            summary["skipped"] += 1
+            summary["results"].append(row)
+            continue
+        if row.status == ExtensionSyncLedger.Status.OK:
             summary["ok"] += 1
-        elif status == ExtensionSyncLedger.Status.ERROR:
+        elif row.status == ExtensionSyncLedger.Status.ERROR:
             summary["error"] += 1
         else:
             summary["skipped"] += 1
-
-        if not dry_run:
-            if status in {ExtensionSyncLedger.Status.OK, ExtensionSyncLedger.Status.ERROR}:
-                record_extension_sync(
-                    user=access.user,
-                    extension=access.extension,
-                    status=status,
-                    payload=details,
-                    error=error_message,
-                )
-            ExtensionSyncLedger.objects.create(
-                user=access.user,
-                extension=access.extension,
-                sync_date=sync_day,
-                status=status,
-                details_json={**details, "error": error_message} if error_message else details,
-            )
-
         summary["results"].append(
             {
-                **row_key,
-                "status": status,
-                "error": error_message,
-                "details": details,
+                "user": row.access.user.username,
+                "extension": row.access.extension,
+                "sync_date": sync_day.isoformat(),
+                "status": row.status,
+                "error": row.error,
+                "details": row.details,
             }
         )
     return summary
 
 
+def _persist_sync_row(row: _PendingExtensionSync, *, sync_date: date) -> None:
+    with transaction.atomic():
+        if row.status in {ExtensionSyncLedger.Status.OK, ExtensionSyncLedger.Status.ERROR}:
+            record_extension_sync(
+                user=row.access.user,
+                extension=row.access.extension,
+                status=row.status,
+                payload=row.details,
+                error=row.error,
+            )
+        # A concurrent run may have claimed the row since the prefetch; the unique constraint keeps the first.
+        ExtensionSyncLedger.objects.get_or_create(
+            user=row.access.user,
+            extension=row.access.extension,
+            sync_date=sync_date,
+            defaults={
+                "status": row.status,
+                "details_json": {**row.details, "error": row.error} if row.error else row.details,
+            },
+        )
+
+
 def recompute_many(*, usernames: list[str] | None = None) -> int:
     user_model = get_user_model()
     queryset = user_model.objects.all()
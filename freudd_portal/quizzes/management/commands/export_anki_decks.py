@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzes.anki_export import open_deck_export_for_user
+from quizzes.flashcard_services import FlashcardServiceError, list_flashcard_deck_entries, load_flashcard_deck
+from quizzes.models import UserExtensionAccess
+
+
+class Command(BaseCommand):
+    help = "Export flashcard decks as Anki .apkg packages for users with the Anki extension enabled."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--subject", required=True, help="Subject slug whose decks should be exported.")
+        parser.add_argument("--deck", help="Only export one deck slug (default: all enabled decks).")
+        parser.add_argument("--user", help="Only export for one username.")
+        parser.add_argument(
+            "--output-dir",
+            help="Copy packages to <output-dir>/<username>/<subject>-<deck>.apkg (default: cache only).",
+        )
+
+    def handle(self, *args, **options):
+        subject_slug = str(options["subject"]).strip().lower()
+        deck_slug = str(options.get("deck") or "").strip().lower()
+        username = str(options.get("user") or "").strip()
+        output_dir = Path(options["output_dir"]).expanduser() if options.get("output_dir") else None
+
+        try:
+            entries = list_flashcard_deck_entries(subject_slug)
+            if deck_slug:
+                entries = tuple(entry for entry in entries if entry.deck_slug == deck_slug)
+                if not entries:
+                    raise CommandError(f"Unknown flashcard deck: {subject_slug}/{deck_slug}")
+            decks = [load_flashcard_deck(entry.subject_slug, entry.deck_slug) for entry in entries]
+        except FlashcardServiceError as exc:
+            raise CommandError(str(exc)) from exc
+
+        accesses = UserExtensionAccess.objects.filter(
+            enabled=True,
+            extension=UserExtensionAccess.Extension.ANKI,
+        ).select_related("user")
+        if username:
+            accesses = accesses.filter(user__username=username)
+
+        summary = {"exported": 0, "cache_hits": 0, "exports": []}
+        for access in accesses.order_by("user__username"):
+            for deck in decks:
+                export, package = open_deck_export_for_user(deck=deck, user=access.user)
+                path = export.path
+                with package:
+                    if output_dir is not None:
+                        path = output_dir / access.user.username / export.filename
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        with path.open("wb") as handle:
+                            shutil.copyfileobj(package, handle)
+                summary["exported"] += 1
+                summary["cache_hits"] += int(export.cache_hit)
+                summary["exports"].append(
+                    {
+                        "user": access.user.username,
+                        "deck": f"{deck.subject_slug}/{deck.deck_slug}",
+                        "cards": export.card_count,
+                        "reviewed": export.reviewed_count,
+                        "cache_hit": export.cache_hit,
+                        "path": str(path),
+                    }
+                )
+        self.stdout.write(json.dumps(summary, ensure_ascii=False))
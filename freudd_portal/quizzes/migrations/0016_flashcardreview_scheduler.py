@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0015_usernotificationpreference_announcement_emails_enabled_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flashcardreview',
+            name='difficulty',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='flashcardreview',
+            name='lapses',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='flashcardreview',
+            name='stability_days',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='flashcardreview',
+            index=models.Index(fields=['user', 'subject_slug', 'deck_slug', 'next_review_at'], name='flash_rev_deck_due_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+# Frozen copies of the scheduler constants at the time of this migration.
+_RATING_INTERVAL_DAYS = {"again": 10 / 1440, "hard": 1.0, "good": 3.0, "easy": 7.0}
+_RATING_DIFFICULTY = {"again": 7.0, "hard": 6.0, "good": 5.0, "easy": 3.5}
+_BATCH_SIZE = 1000
+
+
+def _seed_schedule(apps, schema_editor):
+    """Carry pre-scheduler rows over instead of restarting them as first reviews.
+
+    Rows rated before 0016 have no stability or difficulty, only the fixed SM-2
+    interval implied by their last rating and the ease that rating stood for.
+    Stability is seeded from the stored interval (falling back to the rating's
+    offset) and difficulty from the rating.
+    """
+
+    flashcard_review = apps.get_model("quizzes", "FlashcardReview")
+    rows = flashcard_review.objects.filter(review_count__gt=0, stability_days=0.0, difficulty=0.0)
+    batch = []
+    for row in rows.iterator(chunk_size=_BATCH_SIZE):
+        interval_days = _RATING_INTERVAL_DAYS.get(row.rating, 0.0)
+        if row.last_reviewed_at is not None and row.next_review_at is not None:
+            interval_days = max(0.0, (row.next_review_at - row.last_reviewed_at).total_seconds() / 86400)
+        row.stability_days = round(interval_days, 4)
+        row.difficulty = _RATING_DIFFICULTY.get(row.rating, 0.0)
+        batch.append(row)
+        if len(batch) >= _BATCH_SIZE:
+            flashcard_review.objects.bulk_update(batch, ["stability_days", "difficulty"])
+            batch = []
+    if batch:
+        flashcard_review.objects.bulk_update(batch, ["stability_days", "difficulty"])
+
+
+def _noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0016_flashcardreview_scheduler'),
+    ]
+
+    operations = [
+        migrations.RunPython(_seed_schedule, _noop_reverse),
+    ]
@@ -68,6 +68,9 @@ class FlashcardReview(models.Model):
     review_count = models.PositiveIntegerField(default=0)
     last_reviewed_at = models.DateTimeField(blank=True, null=True)
     next_review_at = models.DateTimeField(blank=True, null=True)
+    stability_days = models.FloatField(default=0.0)
+    difficulty = models.FloatField(default=0.0)
+    lapses = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -81,6 +84,10 @@ class FlashcardReview(models.Model):
         indexes = [
             models.Index(fields=["user", "subject_slug", "deck_slug"], name="flash_rev_user_deck_idx"),
             models.Index(fields=["user", "next_review_at"], name="flash_rev_user_due_idx"),
+            models.Index(
+                fields=["user", "subject_slug", "deck_slug", "next_review_at"],
+                name="flash_rev_deck_due_idx",
+            ),
             models.Index(fields=["subject_slug", "deck_slug", "card_id"], name="flash_rev_card_idx"),
         ]
 
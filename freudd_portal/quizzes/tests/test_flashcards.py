@@ -1,25 +1,40 @@
 from __future__ import annotations
 
+import importlib
 import importlib.util
 import json
+import os
 import shutil
+import sqlite3
 import sys
 import tempfile
+import time
+import zipfile
+from datetime import timedelta
+from io import BytesIO, StringIO
 from pathlib import Path
 from unittest import skipUnless
 from unittest.mock import patch
 
+from django.apps import apps as django_apps
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
 from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
+from quizzes.anki_export import export_deck_for_user, note_guid, open_deck_export_for_user
 from quizzes.flashcard_services import (
     FlashcardValidationError,
     clear_flashcard_service_caches,
+    deck_cards_payload,
+    due_flashcard_queue,
     list_flashcard_deck_entries,
     load_flashcard_deck,
+    schedule_flashcard_review,
 )
-from quizzes.models import FlashcardReview, FlashcardUserAnswer, QuizProgress
+from quizzes.models import FlashcardReview, FlashcardUserAnswer, QuizProgress, UserExtensionAccess
 from quizzes.subject_services import clear_subject_service_caches
 
 
@@ -95,6 +110,68 @@ class AnkiFlashcardImporterTests(SimpleTestCase):
             self.assertEqual(first.read_text(encoding="utf-8"), second.read_text(encoding="utf-8"))
 
 
+class FlashcardSchedulerTests(SimpleTestCase):
+    def _replay(self, ratings: list[str]):
+        now = timezone.now()
+        state = schedule_flashcard_review(rating=ratings[0], stability_days=0.0, difficulty=0.0, lapses=0, now=now)
+        history = [state]
+        for rating in ratings[1:]:
+            state = schedule_flashcard_review(
+                rating=rating,
+                stability_days=state.stability_days,
+                difficulty=state.difficulty,
+                lapses=state.lapses,
+                now=now,
+            )
+            history.append(state)
+        return now, history
+
+    def test_first_review_keeps_legacy_offsets(self) -> None:
+        now = timezone.now()
+        expected = {
+            "again": timedelta(minutes=10),
+            "hard": timedelta(days=1),
+            "good": timedelta(days=3),
+            "easy": timedelta(days=7),
+        }
+        for rating, offset in expected.items():
+            schedule = schedule_flashcard_review(rating=rating, stability_days=0.0, difficulty=0.0, lapses=0, now=now)
+            self.assertEqual(schedule.next_review_at, now + offset)
+            self.assertEqual(schedule.lapses, 0)
+
+    def test_successful_reviews_grow_interval(self) -> None:
+        now, history = self._replay(["good", "good", "good", "good"])
+        intervals = [state.next_review_at - now for state in history]
+        self.assertEqual(intervals, sorted(intervals))
+        self.assertGreater(intervals[-1], timedelta(days=30))
+        _now, easy_history = self._replay(["good", "easy"])
+        self.assertGreater(easy_history[-1].stability_days, history[1].stability_days)
+        _now, hard_history = self._replay(["good", "hard"])
+        self.assertLess(hard_history[-1].stability_days, history[1].stability_days)
+        self.assertGreater(hard_history[-1].difficulty, history[1].difficulty)
+
+    def test_lapse_counts_and_shrinks_stability(self) -> None:
+        now, history = self._replay(["good", "good", "good", "again"])
+        lapsed = history[-1]
+        self.assertEqual(lapsed.lapses, 1)
+        self.assertEqual(lapsed.next_review_at, now + timedelta(minutes=10))
+        self.assertLess(lapsed.stability_days, history[-2].stability_days)
+        self.assertGreater(lapsed.difficulty, history[-2].difficulty)
+
+        _now, relearned = self._replay(["good", "good", "good", "again", "good"])
+        self.assertLess(relearned[-1].stability_days, history[-2].stability_days)
+        self.assertEqual(relearned[-1].lapses, 1)
+
+    def test_again_on_new_card_is_not_a_lapse(self) -> None:
+        _now, history = self._replay(["again", "again", "good"])
+        self.assertEqual(history[-1].lapses, 0)
+        self.assertAlmostEqual(history[-1].stability_days, 3.0)
+
+    def test_rejects_unknown_rating(self) -> None:
+        with self.assertRaises(FlashcardValidationError):
+            schedule_flashcard_review(rating="perfect", stability_days=0.0, difficulty=0.0, lapses=0)
+
+
 class FlashcardPortalTests(TestCase):
     def setUp(self) -> None:
         self.temp_dir = tempfile.TemporaryDirectory(dir=REPO_ROOT)
@@ -131,6 +208,7 @@ class FlashcardPortalTests(TestCase):
             FREUDD_READING_DOWNLOAD_EXCLUSIONS_PATH=self.subject_root / "reading_download_exclusions.json",
             FREUDD_SUBJECT_SLIDES_CATALOG_PATH=self.subject_root / "slides_catalog.json",
             FREUDD_SUBJECT_SLIDES_FILES_ROOT=root / "slides",
+            FREUDD_ANKI_EXPORT_CACHE_DIR=root / "anki-exports",
         )
         self.override.enable()
         self.addCleanup(self.override.disable)
@@ -403,6 +481,326 @@ class FlashcardPortalTests(TestCase):
         self.assertEqual(answer.answer_text, "My recall")
         self.assertEqual(QuizProgress.objects.count(), 0)
 
+    def test_review_post_persists_scheduler_state(self) -> None:
+        user = self._user()
+        self.client.force_login(user)
+        url = reverse("flashcard-review", kwargs={"subject_slug": "bioneuro", "deck_slug": "test-deck"})
+
+        for rating in ("good", "good"):
+            response = self.client.post(
+                url,
+                data=json.dumps({"card_id": "anki-1", "rating": rating}),
+                content_type="application/json",
+            )
+            self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertGreater(body["stability_days"], 3.0)
+        self.assertEqual(body["lapses"], 0)
+
+        lapse = self.client.post(
+            url,
+            data=json.dumps({"card_id": "anki-1", "rating": "again"}),
+            content_type="application/json",
+        )
+        self.assertEqual(lapse.json()["lapses"], 1)
+        review = FlashcardReview.objects.get(user=user, card_id="anki-1")
+        self.assertEqual(review.lapses, 1)
+        self.assertLess(review.stability_days, body["stability_days"])
+
+    def test_due_queue_returns_due_cards_then_new_cards(self) -> None:
+        user = self._user()
+        now = timezone.now()
+        FlashcardReview.objects.create(
+            user=user,
+            subject_slug="bioneuro",
+            deck_slug="test-deck",
+            card_id="anki-2",
+            rating="again",
+            review_count=1,
+            next_review_at=now - timedelta(minutes=5),
+        )
+        url = reverse("flashcard-due", kwargs={"subject_slug": "bioneuro", "deck_slug": "test-deck"})
+
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(user)
+
+        payload = self.client.get(url).json()
+        self.assertEqual([card["card_id"] for card in payload["cards"]], ["anki-2", "anki-1"])
+        self.assertEqual(payload["due_count"], 1)
+        self.assertEqual(payload["new_count"], 1)
+        self.assertEqual(payload["cards"][0]["review"]["rating"], "again")
+        self.assertIsNone(payload["cards"][1]["review"])
+
+        due_only = self.client.get(url, {"include_new": "0", "limit": "5"}).json()
+        self.assertEqual([card["card_id"] for card in due_only["cards"]], ["anki-2"])
+        self.assertEqual(self.client.get(url, {"limit": "many"}).status_code, 400)
+
+        FlashcardReview.objects.filter(card_id="anki-2").update(next_review_at=now + timedelta(days=1))
+        later = due_flashcard_queue(user=user, subject_slug="bioneuro", deck_slug="test-deck", include_new=False)
+        self.assertEqual(later["cards"], [])
+
+    def _read_apkg(self, path: Path) -> tuple[dict, list, dict]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with zipfile.ZipFile(path) as archive:
+                self.assertEqual(json.loads(archive.read("media")), {})
+                archive.extract("collection.anki2", temp_dir)
+            db = sqlite3.connect(Path(temp_dir) / "collection.anki2")
+            db.row_factory = sqlite3.Row
+            try:
+                col = dict(db.execute("SELECT crt, ver, decks FROM col").fetchone())
+                notes = [dict(row) for row in db.execute("SELECT id, guid, flds, tags FROM notes ORDER BY sfld")]
+                cards = {
+                    row["sfld"]: dict(row)
+                    for row in db.execute(
+                        "SELECT notes.sfld, cards.* FROM cards JOIN notes ON notes.id = cards.nid"
+                    )
+                }
+            finally:
+                db.close()
+        return col, notes, cards
+
+    def test_anki_export_maps_review_state_into_collection(self) -> None:
+        user = self._user()
+        now = timezone.now()
+        FlashcardReview.objects.create(
+            user=user,
+            subject_slug="bioneuro",
+            deck_slug="test-deck",
+            card_id="anki-1",
+            rating="good",
+            review_count=3,
+            last_reviewed_at=now - timedelta(days=1),
+            next_review_at=now + timedelta(days=9),
+            stability_days=10.0,
+            difficulty=5.0,
+            lapses=1,
+        )
+        deck = load_flashcard_deck("bioneuro", "test-deck")
+
+        export = export_deck_for_user(deck=deck, user=user)
+        col, notes, cards = self._read_apkg(export.path)
+
+        self.assertFalse(export.cache_hit)
+        self.assertEqual(export.filename, "bioneuro-test-deck.apkg")
+        self.assertEqual(col["ver"], 11)
+        self.assertIn("Freudd::Test Deck", col["decks"])
+        self.assertEqual(len(notes), 2)
+        self.assertEqual(
+            notes[0]["guid"],
+            note_guid(subject_slug="bioneuro", deck_slug="test-deck", card_id="anki-1"),
+        )
+        self.assertEqual(notes[0]["flds"].split("\x1f"), ["Front 1", "<div>Back 1</div>", "<div>Background 1</div>"])
+        self.assertEqual(notes[1]["tags"], " w01 neuroner-og-synapser ")
+
+        reviewed = cards["Front 1"]
+        self.assertEqual((reviewed["type"], reviewed["queue"]), (2, 2))
+        expected_due = int(((now + timedelta(days=9)).timestamp() - col["crt"]) // 86400)
+        self.assertEqual(reviewed["due"], expected_due)
+        self.assertEqual(reviewed["ivl"], 10)
+        self.assertEqual((reviewed["reps"], reviewed["lapses"]), (3, 1))
+        self.assertTrue(1300 <= reviewed["factor"] <= 3500)
+        new = cards["Front 2"]
+        self.assertEqual((new["type"], new["queue"], new["due"], new["reps"]), (0, 0, 2, 0))
+
+        self.assertTrue(export_deck_for_user(deck=deck, user=user).cache_hit)
+        FlashcardReview.objects.filter(card_id="anki-1").update(
+            rating="again",
+            next_review_at=now + timedelta(minutes=10),
+        )
+        relearn = export_deck_for_user(deck=deck, user=user)
+        self.assertFalse(relearn.cache_hit)
+        _col, relearn_notes, relearn_cards = self._read_apkg(relearn.path)
+        self.assertEqual([note["guid"] for note in relearn_notes], [note["guid"] for note in notes])
+        self.assertEqual((relearn_cards["Front 1"]["type"], relearn_cards["Front 1"]["queue"]), (3, 1))
+        self.assertEqual(relearn_cards["Front 1"]["due"], int((now + timedelta(minutes=10)).timestamp()))
+
+    def test_anki_export_replaces_a_users_previous_package_unless_shared(self) -> None:
+        alice = self._user()
+        bob = User.objects.create_user(username="bob", password="Secret123!!")
+        deck = load_flashcard_deck("bioneuro", "test-deck")
+        shared = export_deck_for_user(deck=deck, user=alice)
+        self.assertTrue(export_deck_for_user(deck=deck, user=bob).cache_hit)
+
+        now = timezone.now()
+        review = FlashcardReview.objects.create(
+            user=alice,
+            subject_slug="bioneuro",
+            deck_slug="test-deck",
+            card_id="anki-1",
+            rating="good",
+            review_count=1,
+            next_review_at=now + timedelta(days=1),
+        )
+        first = export_deck_for_user(deck=deck, user=alice)
+        review.review_count = 2
+        review.next_review_at = now + timedelta(days=4)
+        review.save()
+        second = export_deck_for_user(deck=deck, user=alice)
+
+        self.assertEqual(
+            sorted(path.name for path in second.path.parent.glob("*.apkg")),
+            sorted([shared.path.name, second.path.name]),
+        )
+        self.assertFalse(first.path.exists())
+
+    def test_anki_export_handle_survives_a_concurrent_prune(self) -> None:
+        alice = self._user()
+        deck = load_flashcard_deck("bioneuro", "test-deck")
+        first, package = open_deck_export_for_user(deck=deck, user=alice)
+        self.addCleanup(package.close)
+
+        FlashcardReview.objects.create(
+            user=alice,
+            subject_slug="bioneuro",
+            deck_slug="test-deck",
+            card_id="anki-1",
+            rating="good",
+            review_count=1,
+            next_review_at=timezone.now() + timedelta(days=1),
+        )
+        export_deck_for_user(deck=deck, user=alice)
+
+        self.assertFalse(first.path.exists())
+        with zipfile.ZipFile(package) as archive:
+            self.assertEqual(sorted(archive.namelist()), ["collection.anki2", "media"])
+
+    def test_anki_export_endpoint_and_batch_command_require_anki_extension(self) -> None:
+        user = self._user()
+        url = reverse("flashcard-anki-export", kwargs={"subject_slug": "bioneuro", "deck_slug": "test-deck"})
+
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(url).json()["error"], "extension_disabled")
+
+        UserExtensionAccess.objects.create(user=user, extension="anki", enabled=True)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="bioneuro-test-deck.apkg"', response["Content-Disposition"])
+        with zipfile.ZipFile(BytesIO(b"".join(response.streaming_content))) as archive:
+            self.assertIn("collection.anki2", archive.namelist())
+        missing = reverse("flashcard-anki-export", kwargs={"subject_slug": "bioneuro", "deck_slug": "missing"})
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            stdout = StringIO()
+            call_command("export_anki_decks", "--subject", "bioneuro", "--output-dir", output_dir, stdout=stdout)
+            summary = json.loads(stdout.getvalue())
+            self.assertEqual(summary["exported"], 1)
+            self.assertEqual(summary["cache_hits"], 1)
+            self.assertTrue((Path(output_dir) / "alice" / "bioneuro-test-deck.apkg").is_file())
+
+    def test_deck_cards_payload_lists_unseen_cards_then_weakest_reviews(self) -> None:
+        user = self._user()
+        deck = load_flashcard_deck("bioneuro", "test-deck")
+        now = timezone.now()
+        FlashcardReview.objects.create(
+            user=user,
+            subject_slug="bioneuro",
+            deck_slug="test-deck",
+            card_id="anki-1",
+            rating="good",
+            review_count=1,
+            last_reviewed_at=now,
+        )
+        self.assertEqual([card["card_id"] for card in deck_cards_payload(deck=deck, user=user)], ["anki-2", "anki-1"])
+
+        FlashcardReview.objects.create(
+            user=user,
+            subject_slug="bioneuro",
+            deck_slug="test-deck",
+            card_id="anki-2",
+            rating="again",
+            review_count=1,
+            last_reviewed_at=now,
+        )
+        self.assertEqual([card["card_id"] for card in deck_cards_payload(deck=deck, user=user)], ["anki-2", "anki-1"])
+        FlashcardReview.objects.filter(card_id="anki-2").update(rating="easy")
+        self.assertEqual([card["card_id"] for card in deck_cards_payload(deck=deck, user=user)], ["anki-1", "anki-2"])
+
+    def test_scheduler_migration_seeds_legacy_rows_from_interval_and_rating(self) -> None:
+        migration = importlib.import_module("quizzes.migrations.0017_seed_flashcard_review_schedule")
+        user = self._user()
+        now = timezone.now()
+        rows = {
+            card_id: FlashcardReview.objects.create(
+                user=user,
+                subject_slug="bioneuro",
+                deck_slug="test-deck",
+                card_id=card_id,
+                rating=rating,
+                review_count=1,
+                last_reviewed_at=now - timedelta(days=1) if card_id == "legacy" else None,
+                next_review_at=now + timedelta(days=2) if card_id == "legacy" else None,
+                difficulty=difficulty,
+            )
+            for card_id, rating, difficulty in (
+                ("legacy", "good", 0.0),
+                ("legacy-no-dates", "easy", 0.0),
+                ("scheduled", "again", 7.0),
+            )
+        }
+
+        migration._seed_schedule(django_apps, None)
+
+        seeded = {
+            row.card_id: (row.stability_days, row.difficulty)
+            for row in FlashcardReview.objects.filter(pk__in=[row.pk for row in rows.values()])
+        }
+        self.assertEqual(
+            seeded,
+            {"legacy": (3.0, 5.0), "legacy-no-dates": (7.0, 3.5), "scheduled": (0.0, 7.0)},
+        )
+
+    def test_due_queue_query_uses_deck_due_index(self) -> None:
+        if connection.vendor != "sqlite":
+            self.skipTest("query plan assertion is SQLite specific")
+        user = self._user()
+        queryset = FlashcardReview.objects.filter(
+            user=user,
+            subject_slug="bioneuro",
+            deck_slug="test-deck",
+            next_review_at__lte=timezone.now(),
+        ).order_by("next_review_at")[:20]
+        plan = queryset.explain()
+        self.assertIn("flash_rev_deck_due_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    @skipUnless(os.environ.get("FREUDD_FLASHCARD_BENCHMARK"), "set FREUDD_FLASHCARD_BENCHMARK=1 to run")
+    def test_due_queue_benchmark_with_100k_reviews(self) -> None:
+        user = self._user()
+        other = User.objects.create_user(username="bob", password="Secret123!!")
+        now = timezone.now()
+        rows = [
+            FlashcardReview(
+                user=user if index % 2 == 0 else other,
+                subject_slug="bioneuro",
+                deck_slug="test-deck" if index % 4 < 2 else "other-deck",
+                card_id=f"bench-{index}",
+                rating="good",
+                review_count=1,
+                next_review_at=now + timedelta(minutes=index % 2000 - 1000),
+                stability_days=3.0,
+                difficulty=5.0,
+            )
+            for index in range(100_000)
+        ]
+        FlashcardReview.objects.bulk_create(rows, batch_size=5_000)
+        FlashcardReview.objects.create(
+            user=user,
+            subject_slug="bioneuro",
+            deck_slug="test-deck",
+            card_id="anki-1",
+            rating="again",
+            review_count=1,
+            next_review_at=now - timedelta(days=30),
+        )
+
+        started = time.perf_counter()
+        payload = due_flashcard_queue(user=user, subject_slug="bioneuro", deck_slug="test-deck", limit=20)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(payload["cards"][0]["card_id"], "anki-1")
+        self.assertLess(elapsed, 1.0)
+
     def test_subject_detail_shows_flashcard_entry_point(self) -> None:
         self.client.force_login(self._user())
 
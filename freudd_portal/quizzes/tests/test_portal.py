@@ -5,12 +5,15 @@ import html
 import io
 import json
 import tempfile
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone as dt_timezone
 from pathlib import Path
 from unittest.mock import patch
 from urllib.parse import parse_qs, urlencode, urlparse
 
+import requests
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core import mail
@@ -21,9 +24,10 @@ from django.test import Client, TestCase, override_settings
 from django.urls import clear_url_caches, reverse, set_urlconf
 from django.utils import timezone
 
+from quizzes import gamification_services
 from quizzes import services as quiz_services
 from quizzes.content_services import clear_content_service_caches
-from quizzes.gamification_services import get_subject_learning_path_snapshot
+from quizzes.gamification_services import TokenBucket, get_subject_learning_path_snapshot, sync_extensions_batch
 from quizzes.leaderboard_services import active_half_year_semester
 from quizzes.models import (
     DailyGamificationStat,
@@ -4823,6 +4827,185 @@ class QuizPortalTests(TestCase):
             ExtensionSyncLedger.objects.filter(user=user, extension="habitica").exists()
         )
 
+    @override_settings(
+        FREUDD_EXT_SYNC_WORKERS=4,
+        FREUDD_EXT_SYNC_BACKOFF_SECONDS=0,
+        FREUDD_EXT_SYNC_RATE_PER_SECOND={"habitica": 1000.0},
+    )
+    @patch("quizzes.gamification_services.requests.post")
+    def test_sync_extensions_runs_provider_calls_concurrently_and_retries_429(self, mock_post) -> None:
+        class _Response:
+            def __init__(self, status_code: int) -> None:
+                self.status_code = status_code
+                self.headers = {"Retry-After": "0"} if status_code == 429 else {}
+
+            def json(self) -> dict[str, object]:
+                return {"success": self.status_code < 400, "message": "rate limited"}
+
+        lock = threading.Lock()
+        seen_users: set[str] = set()
+        in_flight = {"now": 0, "peak": 0}
+
+        def _post(endpoint, headers, timeout):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+                first_call = headers["x-api-user"] not in seen_users
+                seen_users.add(headers["x-api-user"])
+            time.sleep(0.05)
+            with lock:
+                in_flight["now"] -= 1
+            return _Response(429 if first_call else 200)
+
+        mock_post.side_effect = _post
+        usernames = [f"student-{index}" for index in range(6)]
+        for username in usernames:
+            user = self._create_user(username=username)
+            call_command(
+                "extension_access",
+                "--user",
+                username,
+                "--extension",
+                "habitica",
+                "--enable",
+                stdout=io.StringIO(),
+            )
+            call_command(
+                "extension_credentials",
+                "--user",
+                username,
+                "--extension",
+                "habitica",
+                "--set",
+                "--habitica-user-id",
+                f"habitica-{username}",
+                "--habitica-api-token",
+                "secret-token",
+                "--habitica-task-id",
+                "task-123",
+                stdout=io.StringIO(),
+            )
+        ExtensionSyncLedger.objects.create(
+            user=user,
+            extension="habitica",
+            sync_date=timezone.localdate(),
+            status=ExtensionSyncLedger.Status.OK,
+        )
+
+        summary = sync_extensions_batch(extension="habitica")
+
+        self.assertEqual(
+            {key: summary[key] for key in ("processed", "ok", "error", "skipped")},
+            {"processed": 6, "ok": 5, "error": 0, "skipped": 1},
+        )
+        self.assertEqual([row["user"] for row in summary["results"]], sorted(usernames))
+        self.assertEqual(set(summary["results"][0]), {"user", "extension", "sync_date", "status", "error", "details"})
+        self.assertEqual(summary["results"][-1]["details"], {"reason": "ledger_exists"})
+        self.assertEqual(mock_post.call_count, 10)
+        self.assertGreater(in_flight["peak"], 1)
+        self.assertEqual(ExtensionSyncLedger.objects.filter(status=ExtensionSyncLedger.Status.OK).count(), 6)
+        self.assertEqual(
+            UserExtensionAccess.objects.filter(last_sync_status=UserExtensionAccess.SyncStatus.OK).count(),
+            5,
+        )
+
+    def _enable_habitica(self, username: str) -> User:
+        user = self._create_user(username=username)
+        call_command("extension_access", "--user", username, "--extension", "habitica", "--enable", stdout=io.StringIO())
+        call_command(
+            "extension_credentials",
+            "--user",
+            username,
+            "--extension",
+            "habitica",
+            "--set",
+            "--habitica-user-id",
+            f"habitica-{username}",
+            "--habitica-api-token",
+            "secret-token",
+            "--habitica-task-id",
+            "task-123",
+            stdout=io.StringIO(),
+        )
+        return user
+
+    @override_settings(FREUDD_EXT_SYNC_BACKOFF_SECONDS=0)
+    @patch("quizzes.gamification_services.requests.post")
+    def test_sync_extensions_retries_only_connect_failures_and_rate_limits(self, mock_post) -> None:
+        class _Response:
+            def __init__(self, status_code: int) -> None:
+                self.status_code = status_code
+                self.headers = {"Retry-After": "0"}
+
+            def json(self) -> dict[str, object]:
+                return {"success": self.status_code < 400}
+
+        self._enable_habitica("student")
+        cases = [
+            ("connection_refused", [requests.ConnectionError("refused"), _Response(200)], 2, "ok"),
+            ("rate_limited", [_Response(429), _Response(200)], 2, "ok"),
+            ("read_timeout", [requests.ReadTimeout("slow"), _Response(200)], 1, "error"),
+            ("connect_timeout", [requests.ConnectTimeout("slow"), _Response(200)], 1, "error"),
+            ("server_error", [_Response(503), _Response(200)], 1, "error"),
+        ]
+        for offset, (name, responses, expected_calls, expected_status) in enumerate(cases):
+            with self.subTest(name):
+                mock_post.reset_mock()
+                mock_post.side_effect = responses
+                summary = sync_extensions_batch(
+                    extension="habitica",
+                    sync_date=timezone.localdate() - timedelta(days=offset + 1),
+                )
+                self.assertEqual(mock_post.call_count, expected_calls)
+                self.assertEqual(summary["results"][0]["status"], expected_status)
+
+    @override_settings(FREUDD_EXT_SYNC_WORKERS=1)
+    @patch("quizzes.gamification_services.requests.post")
+    def test_sync_extensions_writes_each_ledger_row_as_its_call_completes(self, mock_post) -> None:
+        class _Response:
+            status_code = 200
+
+            @staticmethod
+            def json() -> dict[str, object]:
+                return {"success": True}
+
+        first = self._enable_habitica("student-a")
+        second = self._enable_habitica("student-b")
+        recorded = threading.Event()
+        real_record = gamification_services._persist_sync_row
+
+        def _record(row, *, sync_date):
+            real_record(row, sync_date=sync_date)
+            recorded.set()
+
+        def _post(endpoint, headers, timeout):
+            if headers["x-api-user"] == "habitica-student-a":
+                return _Response()
+            recorded.wait(timeout=5)
+            raise RuntimeError("worker crashed")
+
+        mock_post.side_effect = _post
+        with patch.object(gamification_services, "_persist_sync_row", side_effect=_record):
+            with self.assertRaises(RuntimeError):
+                sync_extensions_batch(extension="habitica")
+
+        self.assertTrue(ExtensionSyncLedger.objects.filter(user=first, extension="habitica").exists())
+        self.assertFalse(ExtensionSyncLedger.objects.filter(user=second, extension="habitica").exists())
+
+    def test_extension_token_bucket_waits_once_burst_is_spent(self) -> None:
+        clock = {"now": 0.0}
+        sleeps: list[float] = []
+
+        def _sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            clock["now"] += seconds
+
+        bucket = TokenBucket(rate_per_second=2.0, capacity=2, clock=lambda: clock["now"], sleep=_sleep)
+        for _ in range(3):
+            bucket.acquire()
+
+        self.assertEqual(sleeps, [0.5])
+
     def test_rebuild_content_manifest_command_writes_manifest(self) -> None:
         output = io.StringIO()
         call_command(
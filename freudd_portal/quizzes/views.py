@@ -46,14 +46,17 @@ from .activity_notifications import (
     notify_reading_sent_to_chatgpt,
     notify_subject_enrolled,
 )
+from .anki_export import open_deck_export_for_user
 from .announcement_emails import unsubscribe_announcement_token
 from .auth_origins import google_auth_available
 from .content_services import load_subject_content_manifest
 from .forms import SignupForm
 from .flashcard_services import (
+    DEFAULT_DUE_QUEUE_LIMIT,
     FlashcardDeckNotFound,
     FlashcardValidationError,
     deck_summary_payload,
+    due_flashcard_queue,
     flashcard_deck_api_payload,
     get_flashcard_deck_entry,
     list_flashcard_deck_summaries,
@@ -76,6 +79,7 @@ from .models import (
     QuizProgress,
     SubjectEnrollment,
     UserLeaderboardProfile,
+    UserExtensionAccess,
     UserPodcastMark,
     UserReadingMark,
     UserSubjectLastLecture,
@@ -2380,6 +2384,69 @@ def flashcard_content_view(request: HttpRequest, subject_slug: str, deck_slug: s
     return JsonResponse(flashcard_deck_api_payload(deck=deck, user=user))
 
 
+@require_GET
+def flashcard_due_view(request: HttpRequest, subject_slug: str, deck_slug: str) -> HttpResponse:
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "authentication_required"}, status=403)
+    try:
+        limit = int(request.GET.get("limit") or DEFAULT_DUE_QUEUE_LIMIT)
+    except ValueError:
+        return HttpResponseBadRequest("Ugyldig limit.")
+    include_new = _as_bool(request.GET.get("include_new"), default=True)
+
+    catalog = load_subject_catalog()
+    subject = _subject_or_404(catalog, subject_slug)
+    try:
+        payload = due_flashcard_queue(
+            user=request.user,
+            subject_slug=subject.slug,
+            deck_slug=deck_slug,
+            limit=limit,
+            include_new=include_new,
+        )
+    except FlashcardDeckNotFound as exc:
+        raise Http404("Kortsaet ikke fundet") from exc
+    except FlashcardValidationError:
+        logger.exception(
+            "Failed to load flashcard due queue",
+            extra={"subject_slug": subject.slug, "deck_slug": deck_slug},
+        )
+        return JsonResponse({"error": "deck_unavailable"}, status=500)
+    return JsonResponse(payload)
+
+
+@require_GET
+def flashcard_anki_export_view(request: HttpRequest, subject_slug: str, deck_slug: str) -> HttpResponse:
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "authentication_required"}, status=403)
+    if not UserExtensionAccess.objects.filter(
+        user=request.user,
+        extension=UserExtensionAccess.Extension.ANKI,
+        enabled=True,
+    ).exists():
+        return JsonResponse({"error": "extension_disabled"}, status=403)
+
+    catalog = load_subject_catalog()
+    subject = _subject_or_404(catalog, subject_slug)
+    try:
+        deck = load_flashcard_deck(subject.slug, deck_slug)
+        export, package = open_deck_export_for_user(deck=deck, user=request.user)
+    except FlashcardDeckNotFound as exc:
+        raise Http404("Kortsaet ikke fundet") from exc
+    except (FlashcardValidationError, OSError):
+        logger.exception(
+            "Failed to export flashcard deck to Anki",
+            extra={"subject_slug": subject.slug, "deck_slug": deck_slug},
+        )
+        return JsonResponse({"error": "deck_unavailable"}, status=500)
+    return FileResponse(
+        package,
+        content_type="application/apkg",
+        as_attachment=True,
+        filename=export.filename,
+    )
+
+
 @require_POST
 def flashcard_answer_view(request: HttpRequest, subject_slug: str, deck_slug: str) -> HttpResponse:
     if not request.user.is_authenticated:
@@ -2474,6 +2541,9 @@ def flashcard_review_view(request: HttpRequest, subject_slug: str, deck_slug: st
         "review_count": review.review_count,
         "last_reviewed_at": review.last_reviewed_at.isoformat() if review.last_reviewed_at else None,
         "next_review_at": review.next_review_at.isoformat() if review.next_review_at else None,
+        "stability_days": round(float(review.stability_days or 0.0), 3),
+        "difficulty": round(float(review.difficulty or 0.0), 3),
+        "lapses": review.lapses,
         "review_summary": summary,
     }
     if answer_present:
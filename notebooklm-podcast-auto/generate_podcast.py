@@ -43,7 +43,18 @@ from notebooklm_queue.notebook_reclaim_safety import (  # noqa: E402
     notebook_sort_key,
     reclaim_blocker_for_notebook,
 )
+from notebooklm_queue.profile_leases import (  # noqa: E402
+    ProfileAllocator,
+    ProfileLease,
+    lease_wait_seconds_from_env,
+    live_leases,
+    read_profile_state,
+)
 from notebooklm_queue.profile_state import profile_auth_is_stale  # noqa: E402
+from notebooklm_queue.request_log_index import (  # noqa: E402
+    load_request_log_index,
+    record_request_log,
+)
 
 RATE_LIMIT_TOKENS = (
     "rate limit",
@@ -74,6 +85,9 @@ AUTH_TOKENS = (
 )
 RATE_LIMIT_COOLDOWN_SECONDS = _int_env(PROFILE_RATE_LIMIT_COOLDOWN_ENV_VAR, 3600)
 AUTH_COOLDOWN_SECONDS = 3600
+SOURCE_UPLOAD_CONCURRENCY = max(_int_env("NOTEBOOKLM_SOURCE_UPLOAD_CONCURRENCY", 4), 1)
+SOURCE_READY_INITIAL_POLL_SECONDS = 1.0
+SOURCE_READY_MAX_POLL_SECONDS = 15.0
 PROFILE_ERROR_COOLDOWN_SECONDS = 3600
 NOTEBOOK_CAPACITY_TOKENS = (
     "maximum number of notebooks",
@@ -407,28 +421,12 @@ def _profile_state_path() -> Path:
 
 
 def _load_profile_state(path: Path) -> dict:
-    if not path.exists():
-        return {"profiles": {}}
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+    payload, warnings = read_profile_state(path)
+    if warnings:
         print(f"Warning: invalid profile state file {path}; ignoring.")
-        return {"profiles": {}}
-    if not isinstance(payload, dict):
-        return {"profiles": {}}
-    profiles = payload.get("profiles")
-    if not isinstance(profiles, dict):
-        payload["profiles"] = {}
     return payload
 
 
-def _save_profile_state(path: Path, state: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
-    tmp.replace(path)
-
-
 def _profile_state_entry(state: dict, profile: str) -> dict:
     profiles = state.setdefault("profiles", {})
     entry = profiles.get(profile)
@@ -440,10 +438,13 @@ def _profile_state_entry(state: dict, profile: str) -> dict:
 
 def _profile_last_used(state: dict, profile: str) -> float:
     entry = _profile_state_entry(state, profile)
-    try:
-        return float(entry.get("last_used", 0))
-    except (TypeError, ValueError):
-        return 0.0
+    values: list[float] = []
+    for key in ("last_used", "last_leased"):
+        try:
+            values.append(float(entry.get(key, 0)))
+        except (TypeError, ValueError):
+            values.append(0.0)
+    return max(values)
 
 
 def _profile_auth_is_stale(state: dict, profile: str, storage_path: str) -> bool:
@@ -456,26 +457,35 @@ def _profile_auth_is_stale(state: dict, profile: str, storage_path: str) -> bool
 
 
 def _record_profile_result(
-    state: dict,
+    allocator: ProfileAllocator,
     profile: str,
     *,
     success: bool,
     error_type: str | None,
     cooldown_seconds: int | None,
 ) -> None:
-    entry = _profile_state_entry(state, profile)
-    now = time.time()
-    entry["last_used"] = now
-    if success:
-        entry["success_count"] = int(entry.get("success_count", 0)) + 1
-        entry["last_error"] = None
-        entry["cooldown_until"] = 0
-    else:
-        entry["failure_count"] = int(entry.get("failure_count", 0)) + 1
-        entry["last_error"] = error_type
-        if cooldown_seconds:
-            until = now + cooldown_seconds
-            entry["cooldown_until"] = max(float(entry.get("cooldown_until", 0)), until)
+    allocator.record_result(
+        profile,
+        success=success,
+        error_type=error_type,
+        cooldown_seconds=cooldown_seconds,
+    )
+
+
+def _acquire_profile_lease(
+    allocator: ProfileAllocator,
+    profile: str,
+    *,
+    wait: bool,
+) -> ProfileLease | None:
+    if not wait:
+        return allocator.acquire([profile])
+    wait_seconds = lease_wait_seconds_from_env()
+    lease = allocator.acquire([profile])
+    if lease is None and wait_seconds > 0:
+        print(f"Profile {profile} is leased by another generator; waiting up to {wait_seconds}s.")
+        lease = allocator.acquire_blocking([profile], wait_seconds=wait_seconds)
+    return lease
 
 
 def _classify_error(exc: Exception) -> str:
@@ -488,6 +498,16 @@ def _classify_error(exc: Exception) -> str:
     return "other"
 
 
+def _cooldown_for_error_type(error_type: str) -> int | None:
+    if error_type == "rate_limit":
+        return RATE_LIMIT_COOLDOWN_SECONDS
+    if error_type == "auth":
+        return AUTH_COOLDOWN_SECONDS
+    if error_type == "profile_error":
+        return PROFILE_ERROR_COOLDOWN_SECONDS
+    return None
+
+
 def _error_details(exc: Exception) -> dict[str, object]:
     details: dict[str, object] = {}
     if isinstance(exc, NotebookLimitError):
@@ -685,7 +705,8 @@ def _build_auth_candidates(args: argparse.Namespace) -> list[tuple[str | None, d
         if preferred and preferred in profiles and preferred not in ordered:
             ordered.append(preferred)
         remaining = [name for name in profiles if name not in ordered]
-        remaining.sort(key=lambda name: (_profile_last_used(profile_state, name), name))
+        leased = set(live_leases(profile_state, now_ts=now))
+        remaining.sort(key=lambda name: (name in leased, _profile_last_used(profile_state, name), name))
         ordered.extend(remaining)
         names = ordered
     else:
@@ -820,9 +841,44 @@ def _write_request_log(
         json.dumps(payload, indent=2) + "\n",
         encoding="utf-8",
     )
+    record_request_log(request_log, payload)
     return request_log
 
 
+def _write_request_error_log(
+    output_path: Path,
+    *,
+    notebook_id: str,
+    notebook_title: str,
+    args: argparse.Namespace,
+    sources: list[dict],
+    auth_meta: dict,
+    rotation_attempts: list[dict],
+    exc: Exception,
+) -> Path:
+    error_log = output_path.with_suffix(output_path.suffix + ".request.error.json")
+    payload = _build_request_payload(
+        created_at=datetime.now(timezone.utc).isoformat(),
+        notebook_id=notebook_id,
+        notebook_title=notebook_title,
+        artifact_id=None,
+        output_path=output_path,
+        args=args,
+        sources=sources,
+        auth_meta=auth_meta,
+    )
+    if rotation_attempts:
+        payload["rotation_attempts"] = rotation_attempts
+    payload["error_type"] = _classify_error(exc)
+    payload["error"] = str(exc)
+    payload.update(_error_details(exc))
+    error_log.write_text(
+        json.dumps(payload, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    return error_log
+
+
 def _print_profiles(args: argparse.Namespace) -> None:
     profiles_path = _resolve_profiles_path(args)
     profiles = _load_profiles(profiles_path)
@@ -935,11 +991,14 @@ async def _delete_oldest_owned_notebook(client: NotebookLMClient):
     if not owned:
         return None
 
+    request_log_roots = (Path.cwd(),)
+    request_log_index = load_request_log_index(request_log_roots)
     for candidate in sorted(owned, key=notebook_sort_key):
         reclaim_blocker = await reclaim_blocker_for_notebook(
             client=client,
             notebook_id=candidate.id,
-            request_log_roots=(Path.cwd(),),
+            request_log_roots=request_log_roots,
+            request_log_index=request_log_index,
         )
         if reclaim_blocker:
             print(
@@ -991,89 +1050,171 @@ async def _source_index(
     return index
 
 
-async def _ensure_sources_ready(
+def _source_label(source: dict) -> str:
+    kind = source.get("kind")
+    if kind == "text":
+        return str(source.get("title") or "")
+    if kind == "file":
+        return str(Path(source.get("value", "")).expanduser())
+    return str(source.get("value") or "")
+
+
+async def _submit_source(client: NotebookLMClient, notebook_id: str, source: dict, *, timeout: float) -> None:
+    kind = source["kind"]
+    if kind == "url":
+        await client.sources.add_url(notebook_id, source["value"], wait=False, wait_timeout=timeout)
+    elif kind == "file":
+        file_path = Path(source["value"]).expanduser().resolve()
+        await client.sources.add_file(notebook_id, file_path, wait=False, wait_timeout=timeout)
+    elif kind == "text":
+        await client.sources.add_text(
+            notebook_id, source["title"], source["content"], wait=False, wait_timeout=timeout
+        )
+    else:
+        raise ValueError(f"Unknown source kind: {kind}")
+
+
+async def _submit_sources(
+    client: NotebookLMClient,
+    notebook_id: str,
+    items: list[tuple[str, dict]],
+    *,
+    timeout: float,
+    concurrency: int,
+) -> dict[str, Exception]:
+    """Submit uploads concurrently without waiting for processing; return failures by label."""
+
+    semaphore = asyncio.Semaphore(max(int(concurrency), 1))
+
+    async def submit(label: str, source: dict) -> None:
+        async with semaphore:
+            print(f"{label} Adding {source['kind']}: {_source_label(source)}")
+            await _submit_source(client, notebook_id, source, timeout=timeout)
+
+    results = await asyncio.gather(
+        *(submit(label, source) for label, source in items),
+        return_exceptions=True,
+    )
+    failures: dict[str, Exception] = {}
+    for (label, source), result in zip(items, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception) or _should_rotate_profile(result):
+                raise result
+            print(f"{label} Upload failed for {_source_label(source)}: {result}")
+            failures[_source_label(source)] = result
+    return failures
+
+
+async def _wait_for_sources_ready(
     client: NotebookLMClient,
     notebook_id: str,
     sources: list[dict],
     *,
     timeout: float,
-    poll_interval: float = 5.0,
+    failed_labels: set[str] | None = None,
+    initial_interval: float = 1.0,
+    max_interval: float = SOURCE_READY_MAX_POLL_SECONDS,
+    missing_grace_polls: int = 3,
+    concurrency: int = 1,
 ) -> None:
-    expected_keys = {key for source in sources if (key := _source_key(source)) is not None}
-    if not expected_keys:
+    """Poll the source index once per round until every expected source is ready.
+
+    Failed uploads and sources NotebookLM marks as errored are re-added right away;
+    sources that stay missing while others are listed are re-added after a few
+    polls. Each source is re-added at most once.
+    """
+
+    expected = {key: source for source in sources if (key := _source_key(source)) is not None}
+    if not expected:
         return
 
+    failed_labels = set(failed_labels or ())
+    readded: set[tuple[str, str]] = set()
+    missing_polls: dict[tuple[str, str], int] = {}
     start = monotonic()
+    delay = max(float(initial_interval), 0.0)
     saw_any_source = False
     while True:
         index = await _source_index(client, notebook_id)
         if index:
             saw_any_source = True
-        missing = expected_keys - set(index.keys())
+        missing = set(expected) - set(index)
+        errored = {key for key in expected if key in index and getattr(index[key], "is_error", False)}
         not_ready = [
-            src for key, src in index.items() if key in expected_keys and not src.is_ready
+            index[key] for key in expected if key in index and key not in errored and not index[key].is_ready
         ]
-        if not missing and not not_ready:
+        if not missing and not errored and not not_ready:
             return
 
+        for key in missing:
+            missing_polls[key] = missing_polls.get(key, 0) + 1
+        retry_keys = sorted(
+            key
+            for key in missing | errored
+            if key not in readded
+            and (
+                key in errored
+                or _source_label(expected[key]) in failed_labels
+                or (saw_any_source and missing_polls.get(key, 0) >= missing_grace_polls)
+            )
+        )
+        if retry_keys and monotonic() - start < timeout:
+            for key in retry_keys:
+                if key in errored:
+                    await client.sources.delete(notebook_id, index[key].id)
+                readded.add(key)
+            print("Re-adding sources: " + ", ".join(key[1] for key in retry_keys))
+            retry_failures = await _submit_sources(
+                client,
+                notebook_id,
+                [("[retry]", expected[key]) for key in retry_keys],
+                timeout=timeout,
+                concurrency=concurrency,
+            )
+            if retry_failures:
+                raise next(iter(retry_failures.values()))
+            continue
+
         elapsed = monotonic() - start
         if elapsed >= timeout:
             break
-
         if missing:
-            missing_labels = ", ".join(sorted(key[1] for key in missing))
-            print(f"Waiting for missing sources: {missing_labels}")
+            print(f"Waiting for missing sources: {', '.join(sorted(key[1] for key in missing))}")
         if not_ready:
-            pending_labels = ", ".join(
-                sorted(
-                    src.title or src.url or src.id
-                    for src in not_ready
-                )
-            )
+            pending_labels = ", ".join(sorted(src.title or src.url or src.id for src in not_ready))
             print(f"Waiting for sources to be ready: {pending_labels}")
+        await asyncio.sleep(min(delay, max(timeout - elapsed, 0.0)))
+        delay = min(max(delay, 0.01) * 2, max_interval)
 
-        await asyncio.sleep(poll_interval)
-
-    if missing and saw_any_source:
-        print("Re-adding missing sources before generation.")
-        for source in sources:
-            key = _source_key(source)
-            if not key or key not in missing:
-                continue
-            kind = source["kind"]
-            if kind == "url":
-                url = source["value"]
-                print(f"Re-adding URL: {url}")
-                await client.sources.add_url(notebook_id, url, wait=True, wait_timeout=timeout)
-            elif kind == "file":
-                file_path = Path(source["value"]).expanduser().resolve()
-                print(f"Re-adding file: {file_path}")
-                await client.sources.add_file(notebook_id, file_path, wait=True, wait_timeout=timeout)
-            elif kind == "text":
-                title = source["title"]
-                content = source["content"]
-                print(f"Re-adding text: {title}")
-                await client.sources.add_text(
-                    notebook_id, title, content, wait=True, wait_timeout=timeout
-                )
-
-    index = await _source_index(client, notebook_id)
-    missing = expected_keys - set(index.keys())
-    not_ready = [
-        src for key, src in index.items() if key in expected_keys and not src.is_ready
-    ]
-    if missing or not_ready:
-        missing_labels = ", ".join(sorted(key[1] for key in missing)) if missing else "none"
-        if missing and not saw_any_source:
-            raise RuntimeError(
-                "Source listing returned empty while waiting for uploads. "
-                "Unable to verify readiness; retry later."
-            )
+    missing_labels = ", ".join(sorted(key[1] for key in missing)) if missing else "none"
+    if missing and not saw_any_source:
         raise RuntimeError(
-            "Sources not ready after waiting. "
-            f"Missing: {missing_labels}. "
-            f"Not ready: {len(not_ready)}"
+            "Source listing returned empty while waiting for uploads. "
+            "Unable to verify readiness; retry later."
         )
+    raise RuntimeError(
+        "Sources not ready after waiting. "
+        f"Missing: {missing_labels}. "
+        f"Not ready: {len(not_ready) + len(errored)}"
+    )
+
+
+async def _ensure_sources_ready(
+    client: NotebookLMClient,
+    notebook_id: str,
+    sources: list[dict],
+    *,
+    timeout: float,
+    poll_interval: float = 5.0,
+) -> None:
+    await _wait_for_sources_ready(
+        client,
+        notebook_id,
+        sources,
+        timeout=timeout,
+        initial_interval=poll_interval,
+        max_interval=max(poll_interval, SOURCE_READY_MAX_POLL_SECONDS),
+    )
 
 
 async def _add_sources(
@@ -1083,41 +1224,44 @@ async def _add_sources(
     timeout: float,
     *,
     skip_existing: bool,
+    concurrency: int = SOURCE_UPLOAD_CONCURRENCY,
 ):
     if not sources:
         raise ValueError("No sources provided")
 
     existing_keys = await _existing_source_keys(client, notebook_id) if skip_existing else set()
 
+    pending: list[tuple[str, dict]] = []
     for idx, source in enumerate(sources, start=1):
-        if skip_existing:
-            key = _source_key(source)
-            if key and key in existing_keys:
-                print(f"[{idx}/{len(sources)}] Skipping existing source: {key[1]}")
-                continue
+        label = f"[{idx}/{len(sources)}]"
+        key = _source_key(source)
+        if skip_existing and key and key in existing_keys:
+            print(f"{label} Skipping existing source: {key[1]}")
+            continue
+        if source.get("kind") not in {"url", "file", "text"}:
+            raise ValueError(f"Unknown source kind: {source.get('kind')}")
+        if key:
+            existing_keys.add(key)
+        pending.append((label, source))
+    if not pending:
+        return
 
-        kind = source["kind"]
-        if kind == "url":
-            url = source["value"]
-            print(f"[{idx}/{len(sources)}] Adding URL: {url}")
-            await client.sources.add_url(notebook_id, url, wait=True, wait_timeout=timeout)
-            if skip_existing:
-                existing_keys.add(("url", url.strip()))
-        elif kind == "file":
-            file_path = Path(source["value"]).expanduser().resolve()
-            print(f"[{idx}/{len(sources)}] Adding file: {file_path}")
-            await client.sources.add_file(notebook_id, file_path, wait=True, wait_timeout=timeout)
-            if skip_existing:
-                existing_keys.add(("title", file_path.name.lower()))
-        elif kind == "text":
-            title = source["title"]
-            content = source["content"]
-            print(f"[{idx}/{len(sources)}] Adding text: {title}")
-            await client.sources.add_text(notebook_id, title, content, wait=True, wait_timeout=timeout)
-            if skip_existing:
-                existing_keys.add(("title", title.strip().lower()))
-        else:
-            raise ValueError(f"Unknown source kind: {kind}")
+    failures = await _submit_sources(
+        client,
+        notebook_id,
+        pending,
+        timeout=timeout,
+        concurrency=concurrency,
+    )
+    await _wait_for_sources_ready(
+        client,
+        notebook_id,
+        [source for _label, source in pending],
+        timeout=timeout,
+        failed_labels=set(failures),
+        initial_interval=SOURCE_READY_INITIAL_POLL_SECONDS,
+        concurrency=concurrency,
+    )
 
 
 async def _generate_audio_with_retry(
@@ -1309,15 +1453,99 @@ async def _generate_report_with_retry(
     raise last_exc or RuntimeError("generate_report failed")
 
 
+async def _request_artifact(client: NotebookLMClient, notebook_id: str, args: argparse.Namespace):
+    if args.artifact_type == "audio":
+        return await _generate_audio_with_retry(
+            client,
+            notebook_id,
+            instructions=args.instructions,
+            audio_format=_audio_format(args.audio_format),
+            audio_length=_audio_length(args.audio_length),
+            language=args.language,
+            retries=args.artifact_retries,
+            backoff=args.artifact_retry_backoff,
+        )
+    if args.artifact_type == "infographic":
+        return await _generate_infographic_with_retry(
+            client,
+            notebook_id,
+            instructions=args.instructions,
+            language=args.language,
+            orientation=_infographic_orientation(args.infographic_orientation),
+            detail_level=_infographic_detail(args.infographic_detail),
+            retries=args.artifact_retries,
+            backoff=args.artifact_retry_backoff,
+        )
+    if args.artifact_type == "quiz":
+        return await _generate_quiz_with_retry(
+            client,
+            notebook_id,
+            instructions=args.instructions,
+            language=args.language,
+            quantity=_quiz_quantity(args.quiz_quantity),
+            difficulty=_quiz_difficulty(args.quiz_difficulty),
+            retries=args.artifact_retries,
+            backoff=args.artifact_retry_backoff,
+        )
+    if args.artifact_type == "report":
+        return await _generate_report_with_retry(
+            client,
+            notebook_id,
+            instructions=args.instructions,
+            report_format=_report_format(args.report_format),
+            language=args.language,
+            retries=args.artifact_retries,
+            backoff=args.artifact_retry_backoff,
+        )
+    raise RuntimeError(f"Unsupported artifact type: {args.artifact_type}")
+
+
+async def _download_artifact(
+    client: NotebookLMClient,
+    notebook_id: str,
+    args: argparse.Namespace,
+    output_path: Path,
+    artifact_id: str,
+) -> None:
+    if args.artifact_type == "audio":
+        await client.artifacts.download_audio(notebook_id, str(output_path), artifact_id=artifact_id)
+    elif args.artifact_type == "infographic":
+        await client.artifacts.download_infographic(notebook_id, str(output_path), artifact_id=artifact_id)
+    elif args.artifact_type == "quiz":
+        await client.artifacts.download_quiz(
+            notebook_id,
+            str(output_path),
+            artifact_id=artifact_id,
+            output_format=args.quiz_format,
+        )
+    elif args.artifact_type == "report":
+        await client.artifacts.download_report(notebook_id, str(output_path), artifact_id=artifact_id)
+    else:
+        raise RuntimeError(f"Unsupported artifact type: {args.artifact_type}")
+
+
 async def _generate_podcast(args: argparse.Namespace) -> int:
+    allocator = ProfileAllocator(_profile_state_path())
+    held_leases: list[ProfileLease] = []
+    try:
+        return await _generate_podcast_with_leases(args, allocator=allocator, held_leases=held_leases)
+    finally:
+        for lease in held_leases:
+            allocator.release(lease)
+
+
+async def _generate_podcast_with_leases(
+    args: argparse.Namespace,
+    *,
+    allocator: ProfileAllocator,
+    held_leases: list[ProfileLease],
+) -> int:
     base_output_path = Path(args.output).expanduser()
     sources = _load_sources(args.source, args.sources_file)
     if not sources:
         raise ValueError("Provide at least one source via --source or --sources-file")
 
     candidates = _build_auth_candidates(args)
-    state_path = _profile_state_path()
-    profile_state = _load_profile_state(state_path)
     rotation_attempts: list[dict] = []
     last_exc: Exception | None = None
     last_output_path: Path | None = None
@@ -1332,6 +1560,18 @@ async def _generate_podcast(args: argparse.Namespace) -> int:
             print(f"Skipping existing output: {output_path}")
             return 0
 
+        for held_lease in held_leases:
+            allocator.release(held_lease)
+        held_leases.clear()
+        profile_name = auth_meta.get("profile")
+        if profile_name:
+            lease = _acquire_profile_lease(allocator, profile_name, wait=idx == len(candidates))
+            if lease is None:
+                last_exc = RuntimeError(f"Profile '{profile_name}' is leased by another generator or cooling down.")
+                print(f"Skipping profile {profile_name}: leased by another generator or cooling down.")
+                continue
+            held_leases.append(lease)
+
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         label = _auth_label_from_meta(auth_meta)
@@ -1360,6 +1600,7 @@ async def _generate_podcast(args: argparse.Namespace) -> int:
                     sources,
                     args.source_timeout,
                     skip_existing=args.reuse_notebook,
+                    concurrency=getattr(args, "source_upload_concurrency", SOURCE_UPLOAD_CONCURRENCY),
                 )
                 if args.ensure_sources_ready:
                     await _ensure_sources_ready(
@@ -1370,67 +1611,15 @@ async def _generate_podcast(args: argparse.Namespace) -> int:
                     )
 
                 print(f"Generating {args.artifact_type}...")
-                if args.artifact_type == "audio":
-                    status = await _generate_audio_with_retry(
-                        client,
-                        nb.id,
-                        instructions=args.instructions,
-                        audio_format=_audio_format(args.audio_format),
-                        audio_length=_audio_length(args.audio_length),
-                        language=args.language,
-                        retries=args.artifact_retries,
-                        backoff=args.artifact_retry_backoff,
-                    )
-                elif args.artifact_type == "infographic":
-                    status = await _generate_infographic_with_retry(
-                        client,
-                        nb.id,
-                        instructions=args.instructions,
-                        language=args.language,
-                        orientation=_infographic_orientation(args.infographic_orientation),
-                        detail_level=_infographic_detail(args.infographic_detail),
-                        retries=args.artifact_retries,
-                        backoff=args.artifact_retry_backoff,
-                    )
-                elif args.artifact_type == "quiz":
-                    status = await _generate_quiz_with_retry(
-                        client,
-                        nb.id,
-                        instructions=args.instructions,
-                        language=args.language,
-                        quantity=_quiz_quantity(args.quiz_quantity),
-                        difficulty=_quiz_difficulty(args.quiz_difficulty),
-                        retries=args.artifact_retries,
-                        backoff=args.artifact_retry_backoff,
-                    )
-                elif args.artifact_type == "report":
-                    status = await _generate_report_with_retry(
-                        client,
-                        nb.id,
-                        instructions=args.instructions,
-                        report_format=_report_format(args.report_format),
-                        language=args.language,
-                        retries=args.artifact_retries,
-                        backoff=args.artifact_retry_backoff,
-                    )
-                else:
-                    raise RuntimeError(f"Unsupported artifact type: {args.artifact_type}")
+                status = await _request_artifact(client, nb.id, args)
         except Exception as exc:
             last_exc = exc
             last_used_profile = auth_meta.get("profile")
             error_type = _classify_error(exc)
-            cooldown = (
-                RATE_LIMIT_COOLDOWN_SECONDS
-                if error_type == "rate_limit"
-                else AUTH_COOLDOWN_SECONDS
-                if error_type == "auth"
-                else PROFILE_ERROR_COOLDOWN_SECONDS
-                if error_type == "profile_error"
-                else None
-            )
+            cooldown = _cooldown_for_error_type(error_type)
             if last_used_profile:
                 _record_profile_result(
-                    profile_state,
+                    allocator,
                     last_used_profile,
                     success=False,
                     error_type=error_type,
@@ -1459,29 +1648,18 @@ async def _generate_podcast(args: argparse.Namespace) -> int:
                 )
                 continue
 
-            error_log = output_path.with_suffix(output_path.suffix + ".request.error.json")
-            payload = _build_request_payload(
-                created_at=datetime.now(timezone.utc).isoformat(),
+            error_log = _write_request_error_log(
+                output_path,
                 notebook_id=nb.id if "nb" in locals() else "",
                 notebook_title=nb.title if "nb" in locals() else "",
-                artifact_id=None,
-                output_path=output_path,
                 args=args,
                 sources=sources,
                 auth_meta=auth_meta,
-            )
-            if rotation_attempts:
-                payload["rotation_attempts"] = rotation_attempts
-            payload["error_type"] = error_type
-            payload["error"] = str(exc)
-            payload.update(_error_details(exc))
-            error_log.write_text(
-                json.dumps(payload, indent=2) + "\n",
-                encoding="utf-8",
+                rotation_attempts=rotation_attempts,
+                exc=exc,
             )
             print(f"Generation failed: {exc}")
             print(f"Wrote error log: {error_log}")
-            _save_profile_state(state_path, profile_state)
             return 2
 
         request_log_created_at = datetime.now(timezone.utc).isoformat()
@@ -1516,13 +1694,12 @@ async def _generate_podcast(args: argparse.Namespace) -> int:
 
             if auth_meta.get("profile"):
                 _record_profile_result(
-                    profile_state,
+                    allocator,
                     auth_meta["profile"],
                     success=True,
                     error_type=None,
                     cooldown_seconds=None,
                 )
-            _save_profile_state(state_path, profile_state)
             return 0
 
         # The generation request is created inside a client context above.
@@ -1537,40 +1714,13 @@ async def _generate_podcast(args: argparse.Namespace) -> int:
 
             if not final.is_complete:
                 print(f"Generation failed: status={final.status} error={final.error}")
-                _save_profile_state(state_path, profile_state)
                 return 2
 
-            if args.artifact_type == "audio":
-                await wait_client.artifacts.download_audio(
-                    nb.id,
-                    str(output_path),
-                    artifact_id=final.task_id,
-                )
-            elif args.artifact_type == "infographic":
-                await wait_client.artifacts.download_infographic(
-                    nb.id,
-                    str(output_path),
-                    artifact_id=final.task_id,
-                )
-            elif args.artifact_type == "quiz":
-                await wait_client.artifacts.download_quiz(
-                    nb.id,
-                    str(output_path),
-                    artifact_id=final.task_id,
-                    output_format=args.quiz_format,
-                )
-            elif args.artifact_type == "report":
-                await wait_client.artifacts.download_report(
-                    nb.id,
-                    str(output_path),
-                    artifact_id=final.task_id,
-                )
-            else:
-                raise RuntimeError(f"Unsupported artifact type: {args.artifact_type}")
+            await _download_artifact(wait_client, nb.id, args, output_path, final.task_id)
 
         if auth_meta.get("profile"):
             _record_profile_result(
-                profile_state,
+                allocator,
                 auth_meta["profile"],
                 success=True,
                 error_type=None,
@@ -1589,35 +1739,21 @@ async def _generate_podcast(args: argparse.Namespace) -> int:
         )
 
         print(f"Artifact saved to: {output_path}")
-        _save_profile_state(state_path, profile_state)
         return 0
 
     if last_exc and last_output_path and last_auth_meta:
-        error_log = last_output_path.with_suffix(
-            last_output_path.suffix + ".request.error.json"
-        )
-        payload = _build_request_payload(
-            created_at=datetime.now(timezone.utc).isoformat(),
+        error_log = _write_request_error_log(
+            last_output_path,
             notebook_id="",
             notebook_title="",
-            artifact_id=None,
-            output_path=last_output_path,
             args=args,
             sources=sources,
             auth_meta=last_auth_meta,
-        )
-        if rotation_attempts:
-            payload["rotation_attempts"] = rotation_attempts
-        payload["error_type"] = _classify_error(last_exc)
-        payload["error"] = str(last_exc)
-        payload.update(_error_details(last_exc))
-        error_log.write_text(
-            json.dumps(payload, indent=2) + "\n",
-            encoding="utf-8",
+            rotation_attempts=rotation_attempts,
+            exc=last_exc,
         )
         print(f"Generation failed: {last_exc}")
         print(f"Wrote error log: {error_log}")
-        _save_profile_state(state_path, profile_state)
         return 2
 
     return 2
@@ -1635,21 +1771,343 @@ def _output_path_for_quiz_difficulty(output_path: Path, difficulty: str) -> Path
     return output_path.with_name(f"{stem} [difficulty={difficulty}]{output_path.suffix}")
 
 
+BATCH_JOB_KEYS = frozenset(
+    {
+        "artifact_type",
+        "output",
+        "instructions",
+        "language",
+        "audio_format",
+        "audio_length",
+        "infographic_orientation",
+        "infographic_detail",
+        "quiz_quantity",
+        "quiz_difficulty",
+        "quiz_format",
+        "report_format",
+    }
+)
+
+
+def _batch_job_args(args: argparse.Namespace, overrides: dict) -> argparse.Namespace:
+    job = argparse.Namespace(**vars(args))
+    for key, value in overrides.items():
+        setattr(job, key, value)
+    return job
+
+
+def _quiz_difficulty_jobs(args: argparse.Namespace) -> list[argparse.Namespace]:
+    base_output = Path(args.output).expanduser()
+    return [
+        _batch_job_args(
+            args,
+            {
+                "quiz_difficulty": difficulty,
+                "output": str(_output_path_for_quiz_difficulty(base_output, difficulty)),
+            },
+        )
+        for difficulty in QUIZ_DIFFICULTIES
+    ]
+
+
+def _load_batch_jobs(args: argparse.Namespace) -> list[argparse.Namespace]:
+    path = Path(args.batch_file).expanduser()
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Unable to read batch file {path}: {exc}") from exc
+    if isinstance(payload, dict):
+        payload = payload.get("jobs")
+    if not isinstance(payload, list) or not payload:
+        raise ValueError(f"Batch file {path} must contain a non-empty list of jobs")
+
+    jobs: list[argparse.Namespace] = []
+    for index, entry in enumerate(payload, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Batch job #{index} must be an object")
+        unknown = sorted(set(entry) - BATCH_JOB_KEYS)
+        if unknown:
+            raise ValueError(f"Batch job #{index} has unsupported keys: {', '.join(unknown)}")
+        if not str(entry.get("output") or "").strip():
+            raise ValueError(f"Batch job #{index} is missing 'output'")
+        job = _batch_job_args(args, entry)
+        if job.artifact_type not in {"audio", "infographic", "quiz", "report"}:
+            raise ValueError(f"Batch job #{index} has unsupported artifact_type: {job.artifact_type}")
+        if job.artifact_type == "quiz" and job.quiz_difficulty == "all":
+            jobs.extend(_quiz_difficulty_jobs(job))
+        else:
+            jobs.append(job)
+
+    outputs = [str(Path(job.output).expanduser()) for job in jobs]
+    duplicates = sorted({output for output in outputs if outputs.count(output) > 1})
+    if duplicates:
+        raise ValueError(f"Batch file {path} repeats outputs: {', '.join(duplicates)}")
+    return jobs
+
+
+async def _generate_batch(args: argparse.Namespace, jobs: list[argparse.Namespace]) -> int:
+    allocator = ProfileAllocator(_profile_state_path())
+    held_leases: list[ProfileLease] = []
+    try:
+        return await _generate_batch_with_leases(args, jobs, allocator=allocator, held_leases=held_leases)
+    finally:
+        for lease in held_leases:
+            allocator.release(lease)
+
+
+async def _wait_and_download_artifact(
+    client: NotebookLMClient,
+    nb,
+    job: argparse.Namespace,
+    artifact_id: str,
+) -> bool:
+    output_path = Path(job.output).expanduser()
+    final = await client.artifacts.wait_for_completion(
+        nb.id,
+        artifact_id,
+        timeout=job.generation_timeout,
+        initial_interval=job.initial_interval,
+    )
+    if not final.is_complete:
+        print(f"Generation failed for {output_path}: status={final.status} error={final.error}")
+        return False
+    await _download_artifact(client, nb.id, job, output_path, final.task_id)
+    print(f"Artifact saved to: {output_path}")
+    return True
+
+
+async def _generate_batch_with_leases(
+    args: argparse.Namespace,
+    jobs: list[argparse.Namespace],
+    *,
+    allocator: ProfileAllocator,
+    held_leases: list[ProfileLease],
+) -> int:
+    """Generate every job from one notebook session: one auth, one notebook, one source ingest.
+
+    Artifact requests and wait/download run concurrently. Jobs that fail with a
+    rotatable error move to the next profile; everything else is final.
+    """
+
+    sources = _load_sources(args.source, args.sources_file)
+    if not sources:
+        raise ValueError("Provide at least one source via --source or --sources-file")
+
+    pending: list[argparse.Namespace] = []
+    for job in jobs:
+        output_path = Path(job.output).expanduser()
+        if job.skip_existing and output_path.exists() and output_path.stat().st_size > 0:
+            print(f"Skipping existing output: {output_path}")
+            continue
+        pending.append(job)
+    if not pending:
+        return 0
+
+    candidates = _build_auth_candidates(args)
+    rotation_attempts: list[dict] = []
+    exit_code = 0
+    last_exc: Exception | None = None
+    last_auth_meta: dict | None = None
+
+    for idx, (storage_path, auth_meta) in enumerate(candidates, start=1):
+        last_auth_meta = auth_meta
+        for held_lease in held_leases:
+            allocator.release(held_lease)
+        held_leases.clear()
+        profile_name = auth_meta.get("profile")
+        if profile_name:
+            lease = _acquire_profile_lease(allocator, profile_name, wait=idx == len(candidates))
+            if lease is None:
+                last_exc = RuntimeError(f"Profile '{profile_name}' is leased by another generator or cooling down.")
+                print(f"Skipping profile {profile_name}: leased by another generator or cooling down.")
+                continue
+            held_leases.append(lease)
+
+        label = _auth_label_from_meta(auth_meta)
+        if len(candidates) > 1:
+            prefix = f"[{idx}/{len(candidates)}]"
+            if label:
+                print(f"{prefix} Using profile: {label}")
+            else:
+                print(f"{prefix} Using auth source: {auth_meta.get('source')}")
+
+        nb = None
+        results: list[object] = []
+        try:
+            async with await NotebookLMClient.from_storage(storage_path) as client:
+                notebook_title = args.notebook_title
+                if (
+                    args.append_profile_to_notebook_title
+                    and len(candidates) > 1
+                    and label
+                    and f"[{label}]" not in notebook_title
+                ):
+                    notebook_title = f"{notebook_title} [{label}]"
+
+                nb = await _resolve_notebook(client, notebook_title, args.reuse_notebook)
+                await _add_sources(
+                    client,
+                    nb.id,
+                    sources,
+                    args.source_timeout,
+                    skip_existing=args.reuse_notebook,
+                    concurrency=getattr(args, "source_upload_concurrency", SOURCE_UPLOAD_CONCURRENCY),
+                )
+                if args.ensure_sources_ready:
+                    await _ensure_sources_ready(
+                        client,
+                        nb.id,
+                        sources,
+                        timeout=args.source_timeout,
+                    )
+
+                print(f"Generating {len(pending)} artifacts in notebook {nb.id}...")
+                results = await asyncio.gather(
+                    *(_request_artifact(client, nb.id, job) for job in pending),
+                    return_exceptions=True,
+                )
+        except Exception as exc:
+            results = [exc] * len(pending)
+
+        requested: list[tuple[argparse.Namespace, str]] = []
+        rotatable: list[tuple[argparse.Namespace, Exception]] = []
+        failed: list[tuple[argparse.Namespace, Exception]] = []
+        for job, result in zip(pending, results):
+            if isinstance(result, Exception):
+                if args.rotate_on_rate_limit and _should_rotate_profile(result):
+                    rotatable.append((job, result))
+                else:
+                    failed.append((job, result))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                requested.append((job, result.task_id))
+
+        if idx == len(candidates):
+            failed.extend(rotatable)
+            rotatable = []
+
+        profile_exc = rotatable[0][1] if rotatable else failed[0][1] if failed and not requested else None
+        if profile_name and profile_exc is not None:
+            error_type = _classify_error(profile_exc)
+            _record_profile_result(
+                allocator,
+                profile_name,
+                success=False,
+                error_type=error_type,
+                cooldown_seconds=_cooldown_for_error_type(error_type),
+            )
+
+        request_log_created_at = datetime.now(timezone.utc).isoformat()
+        for job, artifact_id in requested:
+            output_path = Path(job.output).expanduser()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_request_log(
+                output_path,
+                created_at=request_log_created_at,
+                notebook_id=nb.id,
+                notebook_title=nb.title,
+                artifact_id=artifact_id,
+                args=job,
+                sources=sources,
+                auth_meta=auth_meta,
+                rotation_attempts=rotation_attempts,
+            )
+        for job, exc in failed:
+            output_path = Path(job.output).expanduser()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            error_log = _write_request_error_log(
+                output_path,
+                notebook_id=nb.id if nb is not None else "",
+                notebook_title=nb.title if nb is not None else "",
+                args=job,
+                sources=sources,
+                auth_meta=auth_meta,
+                rotation_attempts=rotation_attempts,
+                exc=exc,
+            )
+            print(f"Generation failed for {output_path}: {exc}")
+            print(f"Wrote error log: {error_log}")
+            exit_code = 2
+
+        if requested and not args.wait:
+            for job, artifact_id in requested:
+                print(
+                    "Generation started (non-blocking). "
+                    f"notebook_id={nb.id} artifact_id={artifact_id} output={job.output}"
+                )
+        elif requested:
+            # Same as the single-artifact path: the request client is closed, so re-open for waiting.
+            async with await NotebookLMClient.from_storage(storage_path) as wait_client:
+                completed = await asyncio.gather(
+                    *(_wait_and_download_artifact(wait_client, nb, job, artifact_id) for job, artifact_id in requested),
+                    return_exceptions=True,
+                )
+            for (job, _artifact_id), outcome in zip(requested, completed):
+                if isinstance(outcome, Exception):
+                    print(f"Download failed for {job.output}: {outcome}")
+                    exit_code = 2
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+                elif not outcome:
+                    exit_code = 2
+
+        if profile_name and requested and profile_exc is None:
+            _record_profile_result(
+                allocator,
+                profile_name,
+                success=True,
+                error_type=None,
+                cooldown_seconds=None,
+            )
+
+        if not rotatable:
+            return exit_code
+
+        exc = rotatable[0][1]
+        last_exc = exc
+        rotation_attempts.append(
+            {
+                "profile": auth_meta.get("profile"),
+                "storage_path": auth_meta.get("storage_path"),
+                "source": auth_meta.get("source"),
+                "error": str(exc),
+                "error_type": _classify_error(exc),
+            }
+        )
+        print(
+            f"{len(rotatable)} of {len(pending)} artifacts failed with a rotatable error on "
+            f"{label or auth_meta.get('source')}; trying next profile."
+        )
+        pending = [job for job, _exc in rotatable]
+
+    if last_exc is not None and last_auth_meta is not None:
+        for job in pending:
+            output_path = Path(job.output).expanduser()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            error_log = _write_request_error_log(
+                output_path,
+                notebook_id="",
+                notebook_title="",
+                args=job,
+                sources=sources,
+                auth_meta=last_auth_meta,
+                rotation_attempts=rotation_attempts,
+                exc=last_exc,
+            )
+            print(f"Generation failed for {output_path}: {last_exc}")
+            print(f"Wrote error log: {error_log}")
+    return 2
+
+
 def _run_all_quiz_difficulties(args: argparse.Namespace) -> int:
     if args.artifact_type != "quiz":
         raise ValueError("--quiz-difficulty all is only valid with --artifact-type quiz")
 
-    base_output = Path(args.output).expanduser()
-    final_exit_code = 0
-    for difficulty in QUIZ_DIFFICULTIES:
-        run_args = argparse.Namespace(**vars(args))
-        run_args.quiz_difficulty = difficulty
-        run_args.output = str(_output_path_for_quiz_difficulty(base_output, difficulty))
-        print(f"Generating quiz difficulty '{difficulty}' -> {run_args.output}")
-        code = asyncio.run(_generate_podcast(run_args))
-        if code != 0:
-            final_exit_code = code
-    return final_exit_code
+    jobs = _quiz_difficulty_jobs(args)
+    for job in jobs:
+        print(f"Generating quiz difficulty '{job.quiz_difficulty}' -> {job.output}")
+    return asyncio.run(_generate_batch(args, jobs))
 
 
 def main() -> int:
@@ -1739,6 +2197,13 @@ def main() -> int:
         default="output/podcast.mp3",
         help="Output path for the artifact file.",
     )
+    parser.add_argument(
+        "--batch-file",
+        help=(
+            "JSON list of per-output overrides (artifact_type, output, instructions, ...). "
+            "All outputs share one client session, notebook, and source upload."
+        ),
+    )
     parser.add_argument(
         "--skip-existing",
         action="store_true",
@@ -1804,7 +2269,13 @@ def main() -> int:
         "--source-timeout",
         type=float,
         default=300,
-        help="Seconds to wait for each source to finish processing.",
+        help="Seconds to wait for all sources to finish processing.",
+    )
+    parser.add_argument(
+        "--source-upload-concurrency",
+        type=int,
+        default=SOURCE_UPLOAD_CONCURRENCY,
+        help="Maximum concurrent source uploads (default: NOTEBOOKLM_SOURCE_UPLOAD_CONCURRENCY or 4).",
     )
     parser.add_argument(
         "--no-ensure-sources-ready",
@@ -1849,6 +2320,8 @@ def main() -> int:
         if args.list_profiles:
             _print_profiles(args)
             return 0
+        if args.batch_file:
+            return asyncio.run(_generate_batch(args, _load_batch_jobs(args)))
         if args.quiz_difficulty == "all":
             return _run_all_quiz_difficulties(args)
         return asyncio.run(_generate_podcast(args))
@@ -2,6 +2,9 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import contextlib
+import importlib.util
 import json
 import os
 import re
@@ -9,11 +12,19 @@ import subprocess
 import sys
 import time
 from pathlib import Path
+from typing import NamedTuple
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from notebooklm_queue.output_inventory import (  # noqa: E402
+    OutputInventory,
+    artifact_type_for_name,
+    load_output_inventory,
+    parse_week_dir_label,
+    parse_week_selector,
+)
 from notebooklm_queue.profile_state import profile_auth_is_stale  # noqa: E402
 
 DEFAULT_OUTPUT_ROOT = "notebooklm-podcast-auto/personlighedspsykologi/output"
@@ -21,6 +32,10 @@ OUTPUT_ROOT_ENV_VAR = "PERSONLIGHEDSPSYKOLOGI_OUTPUT_ROOT"
 PROFILES_FILE_ENV_VAR = "NOTEBOOKLM_PROFILES_FILE"
 PROFILE_PRIORITY_ENV_VAR = "NOTEBOOKLM_PROFILE_PRIORITY"
 PROFILE_STATE_FILE_ENV_VAR = "NOTEBOOKLM_PROFILE_STATE_FILE"
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = 4
+PART_SUFFIX = ".part"
+PART_VALIDATOR_SUFFIX = ".part-validator"
+MEDIA_RESUME_ATTEMPTS = 5
 
 
 def default_output_root() -> str:
@@ -123,38 +138,15 @@ def is_disallowed_brief_quiz_request_log(output_path: str | None, artifact_type:
     return name.startswith("[short]") or name.startswith("[brief]")
 
 
-WEEK_SELECTOR_PATTERN = re.compile(r"^(?:W)?0*(\d{1,2})(?:L0*(\d{1,2}))?$", re.IGNORECASE)
-WEEK_DIR_PATTERN = re.compile(r"^W0*(\d{1,2})(?:L0*(\d{1,2}))?\b", re.IGNORECASE)
-
-
-def parse_week_selector(value: str) -> tuple[int, int | None] | None:
-    match = WEEK_SELECTOR_PATTERN.fullmatch(value.strip())
-    if not match:
-        return None
-    week_num = int(match.group(1))
-    lesson_num = int(match.group(2)) if match.group(2) else None
-    return week_num, lesson_num
-
-
-def parse_week_dir_label(value: str) -> tuple[int, int | None] | None:
-    match = WEEK_DIR_PATTERN.match(value.strip())
-    if not match:
-        return None
-    week_num = int(match.group(1))
-    lesson_num = int(match.group(2)) if match.group(2) else None
-    return week_num, lesson_num
-
-
-def find_week_dirs(root: Path, week: str) -> list[Path]:
+def find_week_dirs(root: Path, week: str, *, inventory: OutputInventory | None = None) -> list[Path]:
     if not root.exists():
         return []
+    inventory = inventory or load_output_inventory(root)
     selector = parse_week_selector(week)
     if selector:
         requested_week, requested_lesson = selector
         matches: list[Path] = []
-        for entry in root.iterdir():
-            if not entry.is_dir():
-                continue
+        for entry in inventory.subdirs(root):
             label = parse_week_dir_label(entry.name)
             if not label:
                 continue
@@ -169,16 +161,14 @@ def find_week_dirs(root: Path, week: str) -> list[Path]:
     week_upper = week.upper()
     exact: list[Path] = []
     prefix: list[Path] = []
-    for entry in root.iterdir():
-        if not entry.is_dir():
-            continue
+    for entry in inventory.subdirs(root):
         if entry.name.upper() == week_upper:
             exact.append(entry)
             continue
         if entry.name.upper().startswith(week_upper):
             prefix.append(entry)
-        for child in entry.iterdir():
-            if child.is_dir() and child.name.upper() == week_upper:
+        for child in inventory.subdirs(entry):
+            if child.name.upper() == week_upper:
                 exact.append(child)
     if exact:
         return exact
@@ -492,27 +482,24 @@ def cleanup_request_logs(log_path: Path) -> None:
 
 
 def detect_existing_artifact_type(path: Path) -> str | None:
-    if path.name.endswith(".request.json") or path.name.endswith(".request.error.json"):
-        return None
-    if path.suffix == ".mp3":
-        return "audio"
-    if path.suffix == ".png":
-        return "infographic"
-    if path.suffix == ".json":
-        return "quiz"
-    return None
+    return artifact_type_for_name(path.name)
+
 
+def count_existing_outputs(
+    week_dirs: list[Path],
+    content_types: list[str],
+    *,
+    inventories: dict[Path, OutputInventory] | None = None,
+) -> dict[str, int]:
+    """Count outputs per type; ``inventories`` maps each week dir to the inventory that lists it."""
 
-def count_existing_outputs(week_dirs: list[Path], content_types: list[str]) -> dict[str, int]:
     counts = {artifact_type: 0 for artifact_type in content_types}
     for week_dir in week_dirs:
-        for entry in week_dir.iterdir():
-            if not entry.is_file():
+        inventory = (inventories or {}).get(week_dir) or load_output_inventory(week_dir.parent)
+        for entry in inventory.files(week_dir):
+            if entry.artifact_type not in counts:
                 continue
-            artifact_type = detect_existing_artifact_type(entry)
-            if artifact_type not in counts:
-                continue
-            counts[artifact_type] += 1
+            counts[entry.artifact_type] += 1
     return counts
 
 
@@ -666,6 +653,375 @@ def wait_and_download(
         return False, "download"
 
 
+class DownloadJob(NamedTuple):
+    log_path: Path
+    notebook_id: str
+    artifact_id: str
+    artifact_type: str
+    output_path: Path
+    quiz_format: str | None
+    candidates: tuple[tuple[str | None, str], ...]
+
+
+class MediaNotReadyError(RuntimeError):
+    """The media URL answered with HTML; NotebookLM has not published the file yet."""
+
+
+class TruncatedMediaError(RuntimeError):
+    """The media stream ended before the advertised length."""
+
+
+class NotebookLMArtifactClient:
+    """One authenticated ``notebooklm-py`` client (plus cookie-scoped HTTP client) per profile."""
+
+    def __init__(self, storage_path: str | None):
+        self.storage_path = storage_path
+        self.http = None
+        self._client = None
+        self._stack = contextlib.AsyncExitStack()
+
+    async def __aenter__(self) -> "NotebookLMArtifactClient":
+        import httpx
+        from notebooklm import NotebookLMClient
+        from notebooklm.auth import load_httpx_cookies
+
+        storage = Path(self.storage_path).expanduser() if self.storage_path else None
+        try:
+            self._client = await self._stack.enter_async_context(
+                await NotebookLMClient.from_storage(str(storage) if storage else None)
+            )
+            cookies = await asyncio.to_thread(load_httpx_cookies, storage)
+            self.http = await self._stack.enter_async_context(
+                httpx.AsyncClient(cookies=cookies, follow_redirects=True, timeout=120.0)
+            )
+        except BaseException:
+            await self._stack.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._stack.aclose()
+
+    async def artifact_status(self, notebook_id: str, artifact_id: str) -> str | None:
+        for artifact in await self._client.artifacts.list(notebook_id):
+            if str(getattr(artifact, "id", "")) == artifact_id:
+                return str(getattr(artifact, "status_str", None) or artifact.status)
+        return None
+
+    async def wait(self, notebook_id: str, artifact_id: str, *, timeout: int, interval: int) -> tuple[str, str | None]:
+        final = await self._client.artifacts.wait_for_completion(
+            notebook_id,
+            artifact_id,
+            initial_interval=float(min(interval, 10)),
+            max_interval=float(max(interval, 1)),
+            timeout=float(timeout),
+        )
+        return str(final.status), getattr(final, "url", None)
+
+    async def media_url(self, notebook_id: str, artifact_id: str) -> str | None:
+        artifact = await self._client.artifacts.get(notebook_id, artifact_id)
+        return getattr(artifact, "url", None)
+
+    async def download_quiz(self, notebook_id: str, artifact_id: str, output_path: Path, output_format: str) -> None:
+        await self._client.artifacts.download_quiz(
+            notebook_id,
+            str(output_path),
+            artifact_id,
+            output_format=output_format,
+        )
+
+
+class ProfileClientPool:
+    """Open each storage path's client once and share it across concurrent downloads."""
+
+    def __init__(self, client_factory=NotebookLMArtifactClient):
+        self._client_factory = client_factory
+        self._clients: dict[str | None, object] = {}
+        self._errors: dict[str | None, BaseException] = {}
+        self._locks: dict[str | None, asyncio.Lock] = {}
+        self._stack = contextlib.AsyncExitStack()
+
+    async def get(self, storage_path: str | None):
+        lock = self._locks.setdefault(storage_path, asyncio.Lock())
+        async with lock:
+            if storage_path in self._errors:
+                raise self._errors[storage_path]
+            if storage_path not in self._clients:
+                try:
+                    self._clients[storage_path] = await self._stack.enter_async_context(
+                        self._client_factory(storage_path)
+                    )
+                except Exception as exc:
+                    self._errors[storage_path] = exc
+                    raise
+            return self._clients[storage_path]
+
+    async def aclose(self) -> None:
+        await self._stack.aclose()
+
+
+def part_path_for(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + PART_SUFFIX)
+
+
+def part_validator_path_for(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + PART_VALIDATOR_SUFFIX)
+
+
+def _response_validator(response) -> str:
+    """Strong ETag, else Last-Modified: the values ``If-Range`` accepts."""
+
+    etag = str(response.headers.get("etag") or "").strip()
+    if etag and not etag.startswith("W/"):
+        return etag
+    return str(response.headers.get("last-modified") or "").strip()
+
+
+def _expected_total_bytes(response, offset: int) -> int | None:
+    content_range = str(response.headers.get("content-range") or "")
+    if response.status_code == 206 and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1].strip()
+        return int(total) if total.isdigit() else None
+    length = str(response.headers.get("content-length") or "").strip()
+    if not length.isdigit():
+        return None
+    return int(length) + (offset if response.status_code == 206 else 0)
+
+
+async def stream_media(
+    http,
+    url: str,
+    output_path: Path,
+    *,
+    attempts: int = MEDIA_RESUME_ATTEMPTS,
+    retry_delay_seconds: float = 1.0,
+) -> bool:
+    """Stream ``url`` into ``<output>.part`` and rename it into place once complete.
+
+    The response's ETag or Last-Modified is kept next to the ``.part`` file, and
+    a resume sends it as ``If-Range`` so a changed remote file comes back whole
+    instead of being appended to the old prefix. A ``.part`` without a validator,
+    or a 206 whose validator differs, starts over from zero. Returns whether a
+    resume was used.
+    """
+
+    import httpx
+
+    part_path = part_path_for(output_path)
+    validator_path = part_validator_path_for(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    resumed = False
+    last_error: Exception | None = None
+    for attempt in range(attempts):
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        try:
+            validator = validator_path.read_text(encoding="utf-8").strip() if offset else ""
+        except OSError:
+            validator = ""
+        if not validator:
+            offset = 0
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset else {}
+        try:
+            async with http.stream("GET", url, headers=headers) as response:
+                if response.status_code == 416 and offset:
+                    part_path.unlink()
+                    continue
+                content_type = str(response.headers.get("content-type") or "").lower()
+                if "text/html" in content_type:
+                    raise MediaNotReadyError("Received HTML instead of media file")
+                response.raise_for_status()
+                append = bool(offset) and response.status_code == 206
+                if append and _response_validator(response) != validator:
+                    # The server ignored If-Range for a file that has since changed.
+                    part_path.unlink()
+                    continue
+                if not append:
+                    validator_path.write_text(_response_validator(response), encoding="utf-8")
+                resumed = resumed or append
+                expected = _expected_total_bytes(response, offset if append else 0)
+                # Unsized iteration writes bytes as they arrive, so a dropped
+                # connection still leaves the received prefix for the next Range.
+                with part_path.open("ab" if append else "wb") as handle:
+                    async for chunk in response.aiter_bytes():
+                        handle.write(chunk)
+            size = part_path.stat().st_size
+            if expected is not None and size < expected:
+                raise TruncatedMediaError(f"media truncated at {size}/{expected} bytes: {output_path.name}")
+            os.replace(part_path, output_path)
+            validator_path.unlink(missing_ok=True)
+            return resumed
+        except (httpx.TransportError, TruncatedMediaError) as exc:
+            last_error = exc
+            if attempt + 1 < attempts:
+                await asyncio.sleep(retry_delay_seconds)
+    raise TruncatedMediaError(f"media download incomplete after {attempts} attempts: {last_error}")
+
+
+async def wait_and_download_async(
+    client,
+    job: DownloadJob,
+    *,
+    timeout: int,
+    interval: int,
+    transfer_slots: asyncio.Semaphore,
+) -> str:
+    try:
+        status, url = await client.wait(job.notebook_id, job.artifact_id, timeout=timeout, interval=interval)
+    except Exception as exc:  # noqa: BLE001 - classified like CLI output.
+        print(f"Wait failed for {job.artifact_id}: {exc}")
+        return "auth" if is_auth_error(str(exc)) else "wait"
+    if status.lower() != "completed":
+        print(f"Artifact {job.artifact_id} finished waiting with status {status}")
+        return "wait"
+
+    deadline = time.monotonic() + timeout if timeout > 0 else None
+    while True:
+        try:
+            async with transfer_slots:
+                if job.artifact_type == "quiz":
+                    part_path = part_path_for(job.output_path)
+                    await client.download_quiz(
+                        job.notebook_id,
+                        job.artifact_id,
+                        part_path,
+                        job.quiz_format or "json",
+                    )
+                    os.replace(part_path, job.output_path)
+                else:
+                    url = url or await client.media_url(job.notebook_id, job.artifact_id)
+                    if not url:
+                        raise MediaNotReadyError("artifact has no media URL yet")
+                    if await stream_media(client.http, url, job.output_path):
+                        print(f"Resumed partial download: {job.output_path}")
+            print(f"Downloaded: {job.output_path}")
+            return "ok"
+        except MediaNotReadyError:
+            if deadline is not None and time.monotonic() >= deadline:
+                return "wait"
+            sleep_seconds = interval if interval > 0 else 30
+            if deadline is not None:
+                sleep_seconds = max(1, min(sleep_seconds, int(deadline - time.monotonic())))
+            print(
+                f"Media URL for {job.artifact_id} returned HTML after artifact completion; "
+                f"retrying in {sleep_seconds}s..."
+            )
+            url = None
+            await asyncio.sleep(sleep_seconds)
+        except Exception as exc:  # noqa: BLE001 - classified like CLI output.
+            print(f"Download failed for {job.artifact_id}: {exc}")
+            return "auth" if is_auth_error(str(exc)) else "download"
+
+
+async def download_job_async(
+    job: DownloadJob,
+    pool: ProfileClientPool,
+    *,
+    timeout: int,
+    interval: int,
+    transfer_slots: asyncio.Semaphore,
+) -> tuple[bool, bool]:
+    """Async twin of the CLI candidate loop; returns ``(success, cleanup_ok)``."""
+
+    if job.output_path.exists() and job.output_path.stat().st_size > 0:
+        print(f"Skipping existing: {job.output_path}")
+        return True, True
+
+    for storage_path, auth_source in job.candidates:
+        if storage_path and not Path(storage_path).expanduser().exists():
+            print(f"Warning: storage file not found: {storage_path}")
+            continue
+        print(f"Waiting for {job.artifact_id} (notebook {job.notebook_id}) using {auth_source}...")
+        try:
+            client = await pool.get(storage_path)
+        except Exception as exc:  # noqa: BLE001 - classified like CLI output.
+            if is_auth_error(str(exc)):
+                print(f"Auth failed with {auth_source}, trying next profile...")
+                continue
+            print(f"Could not open NotebookLM client with {auth_source}: {exc}")
+            break
+        try:
+            status = await client.artifact_status(job.notebook_id, job.artifact_id)
+        except Exception as exc:  # noqa: BLE001 - classified like CLI output.
+            if is_auth_error(str(exc)):
+                print(f"Auth failed with {auth_source} while listing artifact; trying next profile...")
+                continue
+            if is_timeout_error(str(exc)):
+                print("Artifact status check timed out; proceeding to wait anyway.")
+        else:
+            if status is None:
+                print("Warning: artifact not found in list; proceeding to wait anyway.")
+            else:
+                print(f"Artifact status before wait: {status}")
+                if status.upper() in {"FAILED", "ERROR"}:
+                    print("Artifact already failed; skipping download.")
+                    return True, False
+        reason = await wait_and_download_async(
+            client,
+            job,
+            timeout=timeout,
+            interval=interval,
+            transfer_slots=transfer_slots,
+        )
+        if reason == "ok":
+            return True, True
+        if reason == "auth":
+            print(f"Auth failed with {auth_source}, trying next profile...")
+            continue
+        if reason == "wait":
+            print("Wait failed; skipping remaining auth candidates for this artifact.")
+        break
+    return False, False
+
+
+async def download_jobs_async(
+    jobs: list[DownloadJob],
+    *,
+    timeout: int,
+    interval: int,
+    max_concurrent_downloads: int,
+    client_factory=NotebookLMArtifactClient,
+) -> list[tuple[bool, bool]]:
+    """Wait for every job concurrently; at most ``max_concurrent_downloads`` transfers run at once."""
+
+    pool = ProfileClientPool(client_factory)
+    transfer_slots = asyncio.Semaphore(max(max_concurrent_downloads, 1))
+    try:
+        return list(
+            await asyncio.gather(
+                *(
+                    download_job_async(
+                        job,
+                        pool,
+                        timeout=timeout,
+                        interval=interval,
+                        transfer_slots=transfer_slots,
+                    )
+                    for job in jobs
+                )
+            )
+        )
+    finally:
+        await pool.aclose()
+
+
+def async_downloader_available() -> bool:
+    return all(importlib.util.find_spec(name) is not None for name in ("notebooklm", "httpx"))
+
+
+def report_download_result(
+    log_path: Path,
+    *,
+    success: bool,
+    cleanup_ok: bool,
+    candidate_count: int,
+    cleanup_requests: bool,
+) -> None:
+    if not success:
+        print(f"Failed to download after trying {candidate_count} auth option(s).")
+    elif cleanup_requests and cleanup_ok:
+        cleanup_request_logs(log_path)
+
+
 def find_repo_root(start: Path) -> Path:
     for candidate in [start] + list(start.parents):
         if (candidate / "requirements.txt").exists() and (candidate / "shows").exists():
@@ -760,6 +1116,21 @@ def main() -> int:
         default=15,
         help="Polling interval in seconds (default: 15).",
     )
+    parser.add_argument(
+        "--downloader",
+        choices=["async", "cli"],
+        default="async",
+        help=(
+            "async waits for and downloads artifacts concurrently in-process with one client per "
+            "profile; cli shells out to the notebooklm CLI one artifact at a time (default: async)."
+        ),
+    )
+    parser.add_argument(
+        "--max-concurrent-downloads",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT_DOWNLOADS,
+        help=f"Concurrent transfers for --downloader async (default: {DEFAULT_MAX_CONCURRENT_DOWNLOADS}).",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -800,6 +1171,12 @@ def main() -> int:
         raise SystemExit(f"Output root exists but is not a directory: {output_root}")
     notebooklm = repo_root / args.notebooklm
 
+    use_async = args.downloader == "async" and not args.dry_run
+    if use_async and not async_downloader_available():
+        print("Warning: notebooklm/httpx not importable; falling back to --downloader cli.")
+        use_async = False
+    async_jobs: list[DownloadJob] = []
+
     week_inputs = parse_weeks(args.week, args.weeks)
     extra_roots: list[Path] = []
     if not args.disable_default_extra_roots:
@@ -822,8 +1199,12 @@ def main() -> int:
 
     for week_input in week_inputs:
         week_dirs: list[Path] = []
+        week_inventories: dict[Path, OutputInventory] = {}
         for root in roots:
-            week_dirs.extend(find_week_dirs(root, week_input))
+            inventory = load_output_inventory(root)
+            for week_dir in find_week_dirs(root, week_input, inventory=inventory):
+                week_dirs.append(week_dir)
+                week_inventories[week_dir] = inventory
         if not week_dirs:
             print(f"No output folder found for {week_input} under: {', '.join(str(r) for r in roots)}")
             continue
@@ -831,13 +1212,16 @@ def main() -> int:
         request_logs_set: set[Path] = set()
         error_logs_set: set[Path] = set()
         for week_dir in week_dirs:
-            request_logs_set.update(week_dir.glob("*.request.json"))
-            error_logs_set.update(week_dir.glob("*.request.error.json"))
+            for entry in week_inventories[week_dir].files(week_dir):
+                if entry.request_status == "queued":
+                    request_logs_set.add(entry.path)
+                elif entry.request_status == "error":
+                    error_logs_set.add(entry.path)
         request_logs = sorted(request_logs_set)
         error_logs = sorted(error_logs_set)
 
         if not request_logs:
-            existing_counts = count_existing_outputs(week_dirs, content_types)
+            existing_counts = count_existing_outputs(week_dirs, content_types, inventories=week_inventories)
             existing_summary = format_existing_output_counts(existing_counts)
             if error_logs:
                 if existing_summary:
@@ -901,6 +1285,19 @@ def main() -> int:
                 for storage_path, auth_source in candidates:
                     print(f"AUTH: {auth_source} -> {storage_path or 'default'}")
                 continue
+            if use_async:
+                async_jobs.append(
+                    DownloadJob(
+                        log_path=log_path,
+                        notebook_id=str(notebook_id),
+                        artifact_id=str(artifact_id),
+                        artifact_type=artifact_type,
+                        output_path=output_file,
+                        quiz_format=quiz_format if artifact_type == "quiz" else None,
+                        candidates=tuple(candidates),
+                    )
+                )
+                continue
 
             success = False
             cleanup_ok = False
@@ -956,10 +1353,32 @@ def main() -> int:
                 if reason != "auth":
                     break
 
-            if not success:
-                print(f"Failed to download after trying {len(candidates)} auth option(s).")
-            elif args.cleanup_requests and cleanup_ok:
-                cleanup_request_logs(log_path)
+            report_download_result(
+                log_path,
+                success=success,
+                cleanup_ok=cleanup_ok,
+                candidate_count=len(candidates),
+                cleanup_requests=args.cleanup_requests,
+            )
+
+    if async_jobs:
+        print(f"Downloading {len(async_jobs)} artifact(s) concurrently...")
+        results = asyncio.run(
+            download_jobs_async(
+                async_jobs,
+                timeout=args.timeout,
+                interval=args.interval,
+                max_concurrent_downloads=args.max_concurrent_downloads,
+            )
+        )
+        for job, (success, cleanup_ok) in zip(async_jobs, results):
+            report_download_result(
+                job.log_path,
+                success=success,
+                cleanup_ok=cleanup_ok,
+                candidate_count=len(job.candidates),
+                cleanup_requests=args.cleanup_requests,
+            )
 
     return 0
 
@@ -2,20 +2,34 @@
 from __future__ import annotations
 
 import argparse
+import copy
+import hashlib
 import json
 import mimetypes
 import os
 import re
 import shutil
+import sys
 import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import NamedTuple
 from pathlib import Path
 
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from notebooklm_queue.usage_ledger import track_generation, usage_scope  # noqa: E402
+
 GEMINI_JUDGE_MODEL = "gemini-3.1-pro-preview"
 GEMINI_FILE_POLL_INTERVAL_SECONDS = 2
 GEMINI_FILE_POLL_TIMEOUT_SECONDS = 90
+JUDGE_WORKERS_DEFAULT = 3
+JUDGE_REQUESTS_PER_MINUTE_DEFAULT = 10.0
+CHECKPOINT_EVERY_DEFAULT = 5
 
 
 class UploadedFile(NamedTuple):
@@ -39,7 +53,7 @@ def utc_now() -> str:
 
 
 def repo_root() -> Path:
-    return Path(__file__).resolve().parents[3]
+    return REPO_ROOT
 
 
 def load_prompt_config() -> dict:
@@ -144,6 +158,76 @@ def delete_uploaded_files(client: object, uploaded_files: list[UploadedFile]) ->
             print(f"Warning: could not delete Gemini upload {uploaded.name}: {exc}")
 
 
+def sha256_for_path(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadPool:
+    """Run-scoped Gemini uploads keyed by file sha256, shared across entries.
+
+    Concurrent callers asking for the same file wait on the first upload. A failed
+    upload is forgotten so a later entry can retry it. ``close`` deletes every
+    uploaded file once at the end of the run.
+    """
+
+    def __init__(self, client: object):
+        self.client = client
+        self._lock = threading.Lock()
+        self._uploads: dict[str, Future] = {}
+        self.upload_count = 0
+        self.reuse_count = 0
+
+    def get(self, path: Path) -> UploadedFile:
+        key = sha256_for_path(path)
+        with self._lock:
+            future = self._uploads.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._uploads[key] = future
+                self.upload_count += 1
+            else:
+                self.reuse_count += 1
+        if owner:
+            try:
+                future.set_result(upload_source_file(self.client, path))
+            except Exception as exc:
+                with self._lock:
+                    self._uploads.pop(key, None)
+                future.set_exception(exc)
+        return future.result()
+
+    def close(self) -> None:
+        with self._lock:
+            futures = list(self._uploads.values())
+            self._uploads = {}
+        uploaded = [future.result() for future in futures if future.done() and future.exception() is None]
+        delete_uploaded_files(self.client, uploaded)
+
+
+class RateLimiter:
+    """Thread-safe minimum spacing between judge requests."""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval_seconds = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if self.interval_seconds <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval_seconds
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
 def resolve_source_file(raw: str, entry: dict, config: dict) -> Path | None:
     if not raw:
         return None
@@ -382,6 +466,8 @@ def judge_entry(
     request_retries: int,
     request_backoff_seconds: float,
     dry_run: bool,
+    upload_pool: UploadPool | None = None,
+    rate_limiter: RateLimiter | None = None,
 ) -> tuple[str, dict]:
     run_dir = manifest_path.parent
     source_paths = source_files_for_entry(entry, config)
@@ -418,8 +504,11 @@ def judge_entry(
                 for path in source_paths
             ]
             for path in source_paths:
-                uploaded = upload_source_file(client, path)
-                uploaded_files.append(uploaded)
+                if upload_pool is not None:
+                    uploaded = upload_pool.get(path)
+                else:
+                    uploaded = upload_source_file(client, path)
+                    uploaded_files.append(uploaded)
                 contents.append(
                     genai_types.Part.from_uri(
                         file_uri=uploaded.uri,
@@ -428,30 +517,37 @@ def judge_entry(
                 )
             contents.append(genai_types.Part.from_text(text=prompt))
             response = None
-            for attempt in range(request_retries + 1):
-                try:
-                    response = client.models.generate_content(
-                        model=model,
-                        contents=contents,
-                        config=genai_types.GenerateContentConfig(
-                            system_instruction=(
-                                "You are a strict academic QA reviewer for university psychology "
-                                "podcast episodes. Judge source fidelity and pedagogical usefulness, "
-                                "not entertainment value."
+            with usage_scope(stage="ab_judge", lecture_key=entry.get("lecture_key")), track_generation(
+                provider="gemini", model=model
+            ) as usage:
+                for attempt in range(request_retries + 1):
+                    usage.attempts = attempt + 1
+                    if rate_limiter is not None:
+                        rate_limiter.wait()
+                    try:
+                        response = client.models.generate_content(
+                            model=model,
+                            contents=contents,
+                            config=genai_types.GenerateContentConfig(
+                                system_instruction=(
+                                    "You are a strict academic QA reviewer for university psychology "
+                                    "podcast episodes. Judge source fidelity and pedagogical usefulness, "
+                                    "not entertainment value."
+                                ),
+                                max_output_tokens=max_output_tokens,
                             ),
-                            max_output_tokens=max_output_tokens,
-                        ),
-                    )
-                    break
-                except Exception as exc:
-                    if attempt >= request_retries or not is_transient_gemini_error(exc):
-                        raise
-                    wait_seconds = request_backoff_seconds * (2**attempt)
-                    print(
-                        f"{entry['sample_id']}: transient Gemini error; "
-                        f"retrying in {wait_seconds:g}s ({attempt + 1}/{request_retries})"
-                    )
-                    time.sleep(wait_seconds)
+                        )
+                        usage.add_response(response)
+                        break
+                    except Exception as exc:
+                        if attempt >= request_retries or not is_transient_gemini_error(exc):
+                            raise
+                        wait_seconds = request_backoff_seconds * (2**attempt)
+                        print(
+                            f"{entry['sample_id']}: transient Gemini error; "
+                            f"retrying in {wait_seconds:g}s ({attempt + 1}/{request_retries})"
+                        )
+                        time.sleep(wait_seconds)
             if response is None:
                 raise RuntimeError(f"Gemini judge request did not return for {entry['sample_id']}")
             report = extract_gemini_text(response)
@@ -556,9 +652,46 @@ def build_parser() -> argparse.ArgumentParser:
         default=10.0,
         help="Base exponential backoff for transient Gemini judge failures.",
     )
+    parser.add_argument(
+        "--judge-workers",
+        type=int,
+        default=JUDGE_WORKERS_DEFAULT,
+        help="Entries judged concurrently. Source uploads are shared across entries by sha256.",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=JUDGE_REQUESTS_PER_MINUTE_DEFAULT,
+        help="Rate limit for Gemini judge requests across all workers. Use 0 to disable.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=CHECKPOINT_EVERY_DEFAULT,
+        help="Write the manifest and judgment summary after this many finished entries.",
+    )
     return parser
 
 
+def judge_entry_copy(entry: dict, **kwargs) -> tuple[str, dict, dict]:
+    """Judge a private copy of ``entry`` and return its review block for the caller to merge."""
+
+    entry = copy.deepcopy(entry)
+    report_rel, parsed = judge_entry(entry=entry, **kwargs)
+    return report_rel, parsed, entry["review"]
+
+
+def write_checkpoint(manifest_path: Path, manifest: dict, *, model: str, failed: int, final: bool) -> None:
+    if final:
+        manifest["status"] = "judged" if failed == 0 else "judge_partial"
+        manifest["judged_at"] = utc_now()
+    else:
+        manifest["status"] = "judging"
+    manifest["judge_model"] = model
+    write_json(manifest_path, manifest)
+    write_summary(manifest_path, manifest)
+
+
 def main() -> int:
     args = build_parser().parse_args()
     manifest_path = Path(args.manifest).expanduser().resolve()
@@ -575,6 +708,7 @@ def main() -> int:
     completed = 0
     skipped = 0
     failed = 0
+    pending: list[dict] = []
     for entry in manifest.get("entries", []):
         sample_id = entry.get("sample_id")
         if sample_filter and sample_id not in sample_filter:
@@ -585,46 +719,72 @@ def main() -> int:
             print(f"{sample_id}: skipped existing judgment")
             skipped += 1
             continue
-        try:
-            report_rel, parsed = judge_entry(
-                client=client,
-                genai_types=genai_types,
-                model=args.model,
-                manifest_path=manifest_path,
-                judge_prompt_template=judge_prompt_template,
-                entry=entry,
-                config=config,
-                max_transcript_chars=args.max_transcript_chars,
-                max_output_tokens=args.max_output_tokens,
-                request_retries=args.request_retries,
-                request_backoff_seconds=args.request_backoff_seconds,
-                dry_run=args.dry_run,
-            )
-            print(
-                f"{sample_id}: judged -> {report_rel} "
-                f"winner={parsed.get('overall_winner') or 'unknown'}"
-            )
-            completed += 1
-        except Exception as exc:
-            failed += 1
-            entry.setdefault("review", {}).update(
-                {
-                    "status": "judge_failed",
-                    "judge_model": args.model,
-                    "judge_error": str(exc),
-                    "judged_at": utc_now(),
-                }
-            )
-            print(f"FAILED {sample_id}: {exc}")
-            if not sample_filter:
-                continue
-            raise
-
-    manifest["status"] = "judged" if failed == 0 else "judge_partial"
-    manifest["judged_at"] = utc_now()
-    manifest["judge_model"] = args.model
-    write_json(manifest_path, manifest)
-    write_summary(manifest_path, manifest)
+        pending.append(entry)
+
+    upload_pool = UploadPool(client) if client is not None else None
+    rate_limiter = RateLimiter(args.requests_per_minute)
+    first_error: Exception | None = None
+    finished_since_checkpoint = 0
+    try:
+        # Workers judge private copies; only this thread mutates the manifest, so
+        # checkpoints never serialize an entry while it is being updated.
+        with ThreadPoolExecutor(max_workers=max(1, args.judge_workers)) as pool:
+            futures = {
+                pool.submit(
+                    judge_entry_copy,
+                    entry,
+                    client=client,
+                    genai_types=genai_types,
+                    model=args.model,
+                    manifest_path=manifest_path,
+                    judge_prompt_template=judge_prompt_template,
+                    config=config,
+                    max_transcript_chars=args.max_transcript_chars,
+                    max_output_tokens=args.max_output_tokens,
+                    request_retries=args.request_retries,
+                    request_backoff_seconds=args.request_backoff_seconds,
+                    dry_run=args.dry_run,
+                    upload_pool=upload_pool,
+                    rate_limiter=rate_limiter,
+                ): entry
+                for entry in pending
+            }
+            for future in as_completed(futures):
+                entry = futures[future]
+                sample_id = entry.get("sample_id")
+                try:
+                    report_rel, parsed, review = future.result()
+                except Exception as exc:
+                    failed += 1
+                    entry.setdefault("review", {}).update(
+                        {
+                            "status": "judge_failed",
+                            "judge_model": args.model,
+                            "judge_error": str(exc),
+                            "judged_at": utc_now(),
+                        }
+                    )
+                    print(f"FAILED {sample_id}: {exc}")
+                    if sample_filter and first_error is None:
+                        first_error = exc
+                else:
+                    entry["review"] = review
+                    print(
+                        f"{sample_id}: judged -> {report_rel} "
+                        f"winner={parsed.get('overall_winner') or 'unknown'}"
+                    )
+                    completed += 1
+                finished_since_checkpoint += 1
+                if args.checkpoint_every > 0 and finished_since_checkpoint >= args.checkpoint_every:
+                    write_checkpoint(manifest_path, manifest, model=args.model, failed=failed, final=False)
+                    finished_since_checkpoint = 0
+    finally:
+        if upload_pool is not None:
+            upload_pool.close()
+
+    write_checkpoint(manifest_path, manifest, model=args.model, failed=failed, final=True)
+    if first_error is not None:
+        raise first_error
     print(f"Done. completed={completed} skipped={skipped} failed={failed}")
     return 1 if failed else 0
 
@@ -16,23 +16,36 @@ Pipeline phases:
 
 All phases are idempotent. The script can be safely re-run at any point.
 
+Phases 1-4 run per week as a chain of DAG nodes, with up to
+--max-parallel-weeks weeks in flight at once. Publish and activation
+finalize run once, behind a barrier, for every week that reached
+register. Each node's status is written to a checkpoint file as soon as
+it finishes, so a rerun after a crash resumes each week at its first node
+that is not ``done``.
+
 Usage:
   ./rollout_week.py --week W11L1 --dry-run
   ./rollout_week.py --week W11L1
   ./rollout_week.py --weeks W11L1,W11L2
   ./rollout_week.py --week W11L1 --skip-generate
   ./rollout_week.py --week W11L1 --skip-publish
+  ./rollout_week.py --weeks W11L1,W11L2,W12L1 --max-parallel-weeks 3
+  ./rollout_week.py --week W11L1 --reset-checkpoint
 """
 from __future__ import annotations
 
 import argparse
 import hashlib
 import json
+import os
 import re
 import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -42,6 +55,7 @@ REPO_ROOT = Path(__file__).resolve().parents[3]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from notebooklm_queue.output_inventory import load_output_inventory  # noqa: E402
 from regeneration_identity import (  # noqa: E402
     canonical_source_name,
     classify_episode,
@@ -67,7 +81,8 @@ DRIVE_MOUNT = Path(
 AUDIO_URL_TEMPLATE = "https://drive.google.com/uc?export=download&id={file_id}"
 DRIVE_MAIN_FOLDER_ID = "1lJD1TPU_Re7feq99Wj98RnWKbDjsi3qm"
 
-# How many times to retry generation when all profiles are rate-limited.
+# How many generation waves to run: retries when all profiles are rate-limited,
+# and rollout waves while weeks still have outputs left to generate.
 # Each retry sleeps GENERATE_RETRY_SLEEP seconds (awake time) before re-running.
 GENERATE_MAX_RETRIES = 8
 GENERATE_RETRY_SLEEP = 14400  # 4 h — long enough for per-account quotas to reset
@@ -80,6 +95,22 @@ DRIVE_SYNC_POLL = 10
 PUSH_MAX_RETRIES = 3
 ACTIVATABLE_ROLLOUT_STATES = {"b_registered", "b_feed_verified", "b_active"}
 
+# Download polling per week: NotebookLM keeps rendering after generate returns.
+DOWNLOAD_POLL_SECONDS = 900
+DOWNLOAD_MAX_POLLS = 16
+
+# Rollout DAG: per-week nodes run concurrently; batch nodes run behind a barrier.
+WEEK_NODES = ("generate", "download", "upload", "register")
+BATCH_NODES = ("publish", "finalize")
+NODE_DONE = "done"
+NODE_PARTIAL = "partial"
+NODE_FAILED = "failed"
+DEFAULT_MAX_PARALLEL_WEEKS = 2
+DEFAULT_CHECKPOINT_PATH = Path.home() / ".cache" / "psyk-podcast" / "rollout_week_checkpoint.json"
+
+# Concurrent week tasks share regeneration_registry.json.
+REGISTRY_LOCK = threading.Lock()
+
 
 def utc_now() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -314,27 +345,14 @@ def scan_week_output(week_key: str) -> dict[str, str]:
       "queued"  — .request.json exists (generation queued, not yet downloaded)
       "error"   — .request.error.json exists (last attempt failed)
       "missing" — nothing (never attempted or cleaned up)
+
+    Reads the shared output inventory, so repeated calls only re-list
+    directories whose mtime changed.
     """
     week_dir = OUTPUT_ROOT / week_key
     if not week_dir.exists():
         return {}
-
-    status: dict[str, str] = {}
-    for p in week_dir.iterdir():
-        name = p.name
-        if name.endswith(".request.error.json"):
-            base = name[: -len(".request.error.json")]
-            # Only record error if no better status already known.
-            status.setdefault(base, "error")
-        elif name.endswith(".request.json"):
-            base = name[: -len(".request.json")]
-            # request.json beats error.json.
-            status[base] = "queued"
-        elif name.endswith(".mp3"):
-            # mp3 beats everything.
-            status[name] = "mp3"
-
-    return status
+    return load_output_inventory(OUTPUT_ROOT).output_status(week_dir)
 
 
 def planned_mp3_count(week_key: str) -> int:
@@ -601,14 +619,8 @@ def phase_register(
         log("register", "nothing to register")
         return []
 
-    registry = read_json(REGISTRY_PATH)
-    entries_by_lid = {
-        str(e.get("logical_episode_id")): e
-        for e in registry["entries"]
-        if isinstance(e, dict) and e.get("logical_episode_id")
-    }
-
     if dry_run:
+        entries_by_lid = _entries_by_lid(read_json(REGISTRY_PATH))
         log("register", "dry-run: validating LID→registry mapping for planned outputs")
         ok = 0
         bad = 0
@@ -626,11 +638,31 @@ def phase_register(
         return []
 
     svc = _drive_service()
+    candidates_by_week = {wk: wait_for_drive_sync(svc, wk, mp3_paths) for wk, mp3_paths in uploaded.items()}
+    with REGISTRY_LOCK:
+        return _register_drive_candidates(uploaded, candidates_by_week)
+
+
+def _entries_by_lid(registry: dict) -> dict[str, dict]:
+    return {
+        str(e.get("logical_episode_id")): e
+        for e in registry["entries"]
+        if isinstance(e, dict) and e.get("logical_episode_id")
+    }
+
+
+def _register_drive_candidates(
+    uploaded: dict[str, list[Path]],
+    candidates_by_week: dict[str, dict[str, dict[str, str | int | None]]],
+) -> list[dict]:
+    """Read-modify-write the registry; callers hold REGISTRY_LOCK."""
+    registry = read_json(REGISTRY_PATH)
+    entries_by_lid = _entries_by_lid(registry)
     now = utc_now()
     updated_entries: list[dict] = []
 
     for wk, mp3_paths in uploaded.items():
-        drive_candidates = wait_for_drive_sync(svc, wk, mp3_paths)
+        drive_candidates = candidates_by_week.get(wk, {})
 
         for mp3_path in mp3_paths:
             fname = mp3_path.name
@@ -903,6 +935,23 @@ def phase_finalize_activation(week_keys: list[str], dry_run: bool) -> int:
     if dry_run:
         log("activate", "dry-run: would mark b_registered entries as b_active")
         return 0
+    with REGISTRY_LOCK:
+        changed = _mark_registered_entries_active(week_keys)
+    if not changed:
+        log("activate", "no b_registered entries to finalize")
+        return 0
+    log("activate", f"marked {changed} entries as b_active")
+
+    rc = _stage_and_commit(
+        ["shows/personlighedspsykologi-en/regeneration_registry.json"],
+        f"Finalize B-variant activation for {'+'.join(week_keys)}",
+    )
+    if rc != 0:
+        return rc
+    return _push_main_with_rebase()
+
+
+def _mark_registered_entries_active(week_keys: list[str]) -> int:
     registry = read_json(REGISTRY_PATH)
     changed = 0
     for entry in registry.get("entries", []):
@@ -917,20 +966,259 @@ def phase_finalize_activation(week_keys: list[str], dry_run: bool) -> int:
             continue
         stage_rollout_state(entry, "b_active", active_variant="B")
         changed += 1
-    if not changed:
-        log("activate", "no b_registered entries to finalize")
+    if changed:
+        registry["summary"] = recompute_registry_summary(registry["entries"])
+        write_json(REGISTRY_PATH, registry)
+    return changed
+
+
+# ── Checkpointed rollout DAG ─────────────────────────────────────────────────
+
+class RolloutCheckpoint:
+    """Per-week node status, rewritten atomically after every node.
+
+    Layout: {"version": 1, "weeks": {"W11L1": {"generate": {"status": ..., "at": ...}}}}.
+    Only ``done`` nodes are skipped on rerun; ``partial`` and ``failed`` rerun.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            payload = read_json(path)
+        except (OSError, ValueError):
+            payload = {}
+        weeks = payload.get("weeks") if isinstance(payload, dict) else None
+        self.weeks: dict[str, dict[str, dict[str, Any]]] = weeks if isinstance(weeks, dict) else {}
+
+    def node(self, week_key: str, node: str) -> dict[str, Any]:
+        with self._lock:
+            return dict(self.weeks.get(week_key, {}).get(node) or {})
+
+    def status(self, week_key: str, node: str) -> str | None:
+        return self.node(week_key, node).get("status")
+
+    def mark(self, week_key: str, node: str, status: str, **details: Any) -> None:
+        with self._lock:
+            self.weeks.setdefault(week_key, {})[node] = {"status": status, "at": utc_now(), **details}
+            self._save()
+
+    def clear(self, week_key: str, nodes: list[str]) -> None:
+        with self._lock:
+            week = self.weeks.get(week_key, {})
+            removed = [node for node in nodes if week.pop(node, None) is not None]
+            if removed:
+                self._save()
+
+    def reset(self, week_keys: list[str]) -> None:
+        with self._lock:
+            for week_key in week_keys:
+                self.weeks.pop(week_key, None)
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({"version": 1, "weeks": self.weeks}, handle, ensure_ascii=False, indent=2, sort_keys=True)
+            handle.write("\n")
+        os.replace(tmp_name, self.path)
+
+
+def _week_mp3s(week_key: str) -> list[Path]:
+    week_dir = OUTPUT_ROOT / week_key
+    return sorted(week_dir.glob("*.mp3")) if week_dir.exists() else []
+
+
+def node_generate(week_key: str, checkpoint: RolloutCheckpoint) -> tuple[str, dict[str, Any]]:
+    """Run one generation pass, sleeping and retrying only while every profile is rate-limited.
+
+    Outputs still missing afterwards make the node ``partial``: download, upload
+    and register publish what exists, and the next rollout wave generates the rest.
+    """
+    queued = mp3s = errors = 0
+    attempt = 0
+    for attempt in range(1, GENERATE_MAX_RETRIES + 1):
+        queued, mp3s, errors = phase_generate([week_key], dry_run=False)
+        if queued or mp3s or errors:
+            break
+        # Nothing queued, downloaded or errored: pure rate-limit exhaustion.
+        if attempt < GENERATE_MAX_RETRIES:
+            log("generate", f"{week_key}: all profiles rate-limited; "
+                            f"sleeping {GENERATE_RETRY_SLEEP / 3600:.1f}h before attempt {attempt + 1}")
+            sleep_awake(GENERATE_RETRY_SLEEP, "generate")
+    remaining = planned_mp3_count(week_key)
+    details = {"attempts": attempt, "queued": queued, "mp3": mp3s, "errors": errors, "remaining": remaining}
+    if remaining == 0 and errors == 0:
+        return NODE_DONE, details
+    return (NODE_PARTIAL if queued or mp3s else NODE_FAILED), details
+
+
+def node_download(week_key: str, checkpoint: RolloutCheckpoint) -> tuple[str, dict[str, Any]]:
+    for poll in range(1, DOWNLOAD_MAX_POLLS + 1):
+        if phase_download([week_key], dry_run=False, allow_failure=True):
+            return NODE_DONE, {"polls": poll, "mp3": len(_week_mp3s(week_key))}
+        if poll < DOWNLOAD_MAX_POLLS:
+            sleep_awake(DOWNLOAD_POLL_SECONDS, "download", log_interval=DOWNLOAD_POLL_SECONDS)
+    present = len(_week_mp3s(week_key))
+    return (NODE_PARTIAL if present else NODE_FAILED), {"polls": DOWNLOAD_MAX_POLLS, "mp3": present}
+
+
+def node_upload(week_key: str, checkpoint: RolloutCheckpoint) -> tuple[str, dict[str, Any]]:
+    expected = _week_mp3s(week_key)
+    if not expected:
+        return NODE_FAILED, {"error": "no MP3s in output directory"}
+    copied = phase_upload([week_key], dry_run=False).get(week_key, [])
+    files = [path.name for path in copied]
+    if not files:
+        return NODE_FAILED, {"files": files}
+    return (NODE_DONE if len(files) == len(expected) else NODE_PARTIAL), {"files": files}
+
+
+def node_register(week_key: str, checkpoint: RolloutCheckpoint) -> tuple[str, dict[str, Any]]:
+    mp3s = _week_mp3s(week_key)
+    uploaded_names = checkpoint.node(week_key, "upload").get("files")
+    if isinstance(uploaded_names, list):
+        names = set(uploaded_names)
+        mp3s = [path for path in mp3s if path.name in names]
+    if not mp3s:
+        return NODE_FAILED, {"error": "no uploaded MP3s to register"}
+    entries = phase_register({week_key: mp3s}, dry_run=False)
+    lids = sorted(str(entry.get("logical_episode_id") or "") for entry in entries)
+    status = NODE_DONE if entries else NODE_PARTIAL
+    return status, {"registered": len(entries), "logical_episode_ids": lids}
+
+
+WEEK_NODE_RUNNERS = {
+    "generate": node_generate,
+    "download": node_download,
+    "upload": node_upload,
+    "register": node_register,
+}
+
+
+def run_week_chain(week_key: str, checkpoint: RolloutCheckpoint, skip: set[str]) -> str:
+    """Run one week's nodes in order, resuming after the last ``done`` node.
+
+    Returns the week's terminal status: ``failed`` stops the chain, ``partial``
+    nodes still let later nodes run with whatever exists so far. Once a node
+    runs, every later node (including publish and finalize) is cleared, since
+    its ``done`` status no longer covers the outputs this pass may add.
+    """
+    reran = False
+    for index, node in enumerate(WEEK_NODES):
+        if not reran and checkpoint.status(week_key, node) == NODE_DONE:
+            log(node, f"{week_key}: done in checkpoint — resuming past it")
+            continue
+        if node in skip:
+            log(node, f"{week_key}: skipped")
+            continue
+        if not reran:
+            reran = True
+            checkpoint.clear(week_key, [*WEEK_NODES[index + 1:], *BATCH_NODES])
+        try:
+            status, details = WEEK_NODE_RUNNERS[node](week_key, checkpoint)
+        except Exception as exc:  # noqa: BLE001 - record the failure, keep other weeks going.
+            log(node, f"{week_key}: ERROR: {exc}")
+            checkpoint.mark(week_key, node, NODE_FAILED, error=str(exc))
+            return NODE_FAILED
+        checkpoint.mark(week_key, node, status, **details)
+        log(node, f"{week_key}: {status}")
+        if status == NODE_FAILED:
+            return NODE_FAILED
+    return NODE_DONE
+
+
+def run_batch_nodes(week_keys: list[str], checkpoint: RolloutCheckpoint, skip: set[str]) -> int:
+    """Barrier step: publish and finalize every week that reached register, once, in this thread."""
+    ready = [
+        wk for wk in week_keys
+        if "register" in skip or checkpoint.status(wk, "register") in {NODE_DONE, NODE_PARTIAL}
+    ]
+    if "publish" in skip:
+        log("publish", "skipped")
         return 0
-    registry["summary"] = recompute_registry_summary(registry["entries"])
-    write_json(REGISTRY_PATH, registry)
-    log("activate", f"marked {changed} entries as b_active")
 
-    rc = _stage_and_commit(
-        ["shows/personlighedspsykologi-en/regeneration_registry.json"],
-        f"Finalize B-variant activation for {'+'.join(week_keys)}",
-    )
+    to_publish = [wk for wk in ready if checkpoint.status(wk, "publish") != NODE_DONE]
+    if to_publish:
+        registered = sum(int(checkpoint.node(wk, "register").get("registered") or 0) for wk in to_publish)
+        if registered or "register" in skip:
+            rc = phase_publish(to_publish, dry_run=False)
+            if rc != 0:
+                for wk in to_publish:
+                    checkpoint.mark(wk, "publish", NODE_FAILED, exit_code=rc)
+                log("rollout", f"WARNING: publish failed (exit {rc}); rerun to resume")
+                return rc
+        else:
+            log("rollout", "no new registry updates — skipping publish")
+        for wk in to_publish:
+            checkpoint.mark(wk, "publish", NODE_DONE, batch=to_publish)
+
+    to_finalize = [
+        wk for wk in ready
+        if checkpoint.status(wk, "publish") == NODE_DONE and checkpoint.status(wk, "finalize") != NODE_DONE
+    ]
+    if to_finalize:
+        rc = phase_finalize_activation(to_finalize, dry_run=False)
+        if rc != 0:
+            for wk in to_finalize:
+                checkpoint.mark(wk, "finalize", NODE_FAILED, exit_code=rc)
+            log("rollout", f"WARNING: activation finalize failed (exit {rc}); rerun to resume")
+            return rc
+        for wk in to_finalize:
+            checkpoint.mark(wk, "finalize", NODE_DONE, batch=to_finalize)
+    return 0
+
+
+def run_rollout(
+    week_keys: list[str],
+    *,
+    checkpoint_path: Path = DEFAULT_CHECKPOINT_PATH,
+    max_parallel_weeks: int = DEFAULT_MAX_PARALLEL_WEEKS,
+    skip: set[str] | None = None,
+    reset: bool = False,
+) -> int:
+    skip = set(skip or ())
+    checkpoint = RolloutCheckpoint(checkpoint_path)
+    if reset:
+        checkpoint.reset(week_keys)
+    log("rollout", f"checkpoint: {checkpoint_path}")
+
+    # Wave loop: every wave runs the pending week chains, publishes what they
+    # produced, then sleeps and re-runs the weeks whose generation is partial.
+    week_results: dict[str, str] = {}
+    pending = list(week_keys)
+    rc = 0
+    for wave in range(1, GENERATE_MAX_RETRIES + 1):
+        log("rollout", f"── wave {wave}/{GENERATE_MAX_RETRIES}: {', '.join(pending)} ──")
+        workers = max(1, min(int(max_parallel_weeks), len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rollout-week") as pool:
+            futures = {wk: pool.submit(run_week_chain, wk, checkpoint, skip) for wk in pending}
+            week_results.update({wk: future.result() for wk, future in futures.items()})
+
+        rc = run_batch_nodes(week_keys, checkpoint, skip)
+
+        pending = [wk for wk in week_keys if checkpoint.status(wk, "generate") == NODE_PARTIAL]
+        if not pending or "generate" in skip:
+            break
+        if wave < GENERATE_MAX_RETRIES:
+            log("rollout", f"{len(pending)} week(s) still generating; "
+                           f"sleeping {GENERATE_RETRY_SLEEP / 3600:.1f}h before wave {wave + 1}")
+            sleep_awake(GENERATE_RETRY_SLEEP, "rollout")
+    else:
+        log("rollout", f"WARNING: max waves reached; still partial: {', '.join(pending)}")
+
+    for wk in week_keys:
+        statuses = "  ".join(
+            f"{node}={checkpoint.status(wk, node) or '-'}" for node in WEEK_NODES + BATCH_NODES
+        )
+        log("rollout", f"{wk}: {statuses}")
+    if "publish" not in skip and rc == 0 and all_registered(week_keys):
+        log("rollout", "all in-scope episodes are B-active — complete")
     if rc != 0:
         return rc
-    return _push_main_with_rebase()
+    failed = any(result == NODE_FAILED for result in week_results.values())
+    return 1 if failed or pending else 0
 
 
 # ── Completion check ─────────────────────────────────────────────────────────
@@ -951,18 +1239,6 @@ def all_registered(week_keys: list[str]) -> bool:
     return True
 
 
-def pending_count(week_keys: list[str]) -> int:
-    """Return number of in-scope entries not yet B-active."""
-    registry = read_json(REGISTRY_PATH)
-    return sum(
-        1
-        for entry in registry["entries"]
-        if str(entry.get("lecture_key") or "") in week_keys
-        and (entry.get("rollout") or {}).get("in_scope")
-        and entry.get("active_variant") != "B"
-    )
-
-
 # ── Dry-run summary ───────────────────────────────────────────────────────────
 
 def print_dry_run_plan(week_keys: list[str]) -> None:
@@ -1009,6 +1285,12 @@ def parse_args() -> argparse.Namespace:
                    help="Skip Drive upload phase (assume files already in Drive)")
     p.add_argument("--skip-publish", action="store_true",
                    help="Skip git commit/push and feed workflow trigger")
+    p.add_argument("--max-parallel-weeks", type=int, default=DEFAULT_MAX_PARALLEL_WEEKS,
+                   help=f"Weeks progressing concurrently (default: {DEFAULT_MAX_PARALLEL_WEEKS})")
+    p.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT_PATH,
+                   help=f"Node status checkpoint file (default: {DEFAULT_CHECKPOINT_PATH})")
+    p.add_argument("--reset-checkpoint", action="store_true",
+                   help="Forget checkpointed node status for the selected weeks before running")
     return p.parse_args()
 
 
@@ -1047,88 +1329,23 @@ def main() -> int:
         phase_finalize_activation(week_keys, dry_run=True)
         return 0
 
-    # ── Wave loop: each wave generates what it can, then immediately downloads,
-    #    uploads, registers, excludes, and publishes — no waiting for the full batch.
-    for attempt in range(1, GENERATE_MAX_RETRIES + 1):
-        log("rollout", f"── wave {attempt}/{GENERATE_MAX_RETRIES} ──")
-
-        # 1. Generate ─────────────────────────────────────────────────────────
-        if not args.skip_generate:
-            queued, mp3s_now, errors = phase_generate(week_keys, dry_run=False)
-            if queued == 0 and mp3s_now == 0 and errors == 0:
-                # Pure rate-limit exhaustion — no profiles available at all.
-                if attempt < GENERATE_MAX_RETRIES:
-                    log("rollout",
-                        f"all profiles rate-limited; sleeping {GENERATE_RETRY_SLEEP/3600:.1f}h "
-                        f"before wave {attempt + 1}")
-                    sleep_awake(GENERATE_RETRY_SLEEP, "rollout")
-                continue
-        else:
-            log("generate", "skipped")
-
-        # 2. Download whatever got queued this wave ────────────────────────────
-        if not args.skip_download:
-            phase_download(week_keys, dry_run=False, allow_failure=True)
-        else:
-            log("download", "skipped")
-
-        # 3. Collect available MP3s ───────────────────────────────────────────
-        mp3s_present = {
-            wk: sorted((OUTPUT_ROOT / wk).glob("*.mp3"))
-            for wk in week_keys
-            if (OUTPUT_ROOT / wk).exists()
-        }
-        total_mp3s = sum(len(v) for v in mp3s_present.values())
-
-        if total_mp3s == 0:
-            log("rollout", "wave produced no MP3s yet")
-        else:
-            log("rollout", f"{total_mp3s} MP3(s) available — uploading/registering/publishing")
-
-            # 4. Upload ───────────────────────────────────────────────────────
-            if not args.skip_upload:
-                uploaded = phase_upload(week_keys, dry_run=False)
-            else:
-                log("upload", "skipped — treating local MP3s as already in Drive")
-                uploaded = mp3s_present
-
-            # 5. Register + Exclude ───────────────────────────────────────────
-            updated_entries = phase_register(uploaded, dry_run=False)
-            phase_exclude(updated_entries, dry_run=False)
-
-            # 6. Publish what's new ───────────────────────────────────────────
-            if updated_entries:
-                if not args.skip_publish:
-                    rc = phase_publish(week_keys, dry_run=False)
-                    if rc != 0:
-                        log("rollout", f"WARNING: publish failed (exit {rc}); will retry next wave")
-                    else:
-                        rc = phase_finalize_activation(week_keys, dry_run=False)
-                        if rc != 0:
-                            log("rollout", f"WARNING: activation finalize failed (exit {rc}); will retry next wave")
-                else:
-                    log("publish", "skipped")
-            else:
-                log("rollout", "no new registry updates this wave — skipping publish")
-
-        # Check if everything is done ─────────────────────────────────────────
-        if all_registered(week_keys):
-            log("rollout", "all in-scope episodes are B-active — complete")
-            break
-
-        if args.skip_generate:
-            break  # no retry loop when generation is skipped
-
-        remaining = pending_count(week_keys)
-        if attempt < GENERATE_MAX_RETRIES:
-            log("rollout",
-                f"{remaining} episode(s) still pending; sleeping {GENERATE_RETRY_SLEEP/3600:.1f}h "
-                f"before wave {attempt + 1}")
-            sleep_awake(GENERATE_RETRY_SLEEP, "rollout")
-    else:
-        log("rollout", "WARNING: max waves reached; some episodes may still be pending")
-
-    return 0
+    skip = {
+        node
+        for node, flag in (
+            ("generate", args.skip_generate),
+            ("download", args.skip_download),
+            ("upload", args.skip_upload),
+            ("publish", args.skip_publish),
+        )
+        if flag
+    }
+    return run_rollout(
+        week_keys,
+        checkpoint_path=args.checkpoint,
+        max_parallel_weeks=args.max_parallel_weeks,
+        skip=skip,
+        reset=args.reset_checkpoint,
+    )
 
 
 if __name__ == "__main__":
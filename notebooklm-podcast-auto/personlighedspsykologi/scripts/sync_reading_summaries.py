@@ -10,8 +10,16 @@ import sys
 from pathlib import Path
 from typing import Any
 
-WEEK_SELECTOR_PATTERN = re.compile(r"^(?:W)?0*(\d{1,2})(?:L0*(\d{1,2}))?$", re.IGNORECASE)
-WEEK_DIR_PATTERN = re.compile(r"^W0*(\d{1,2})(?:L0*(\d{1,2}))?\b", re.IGNORECASE)
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from notebooklm_queue.output_inventory import (  # noqa: E402
+    load_output_inventory,
+    parse_week_dir_label,
+    parse_week_selector,
+)
+
 WEEK_LECTURE_KEY_PATTERN = re.compile(r"\bW0*(\d{1,2})L0*(\d{1,2})\b", re.IGNORECASE)
 CFG_TAG_PATTERN = re.compile(
     r"(?:\s+\{[a-z0-9._:+-]+=[^{}\s]+(?:\s+[a-z0-9._:+-]+=[^{}\s]+)*\})+"
@@ -47,35 +55,14 @@ def parse_weeks(week: str | None, weeks: str | None) -> list[str]:
     return items
 
 
-def parse_week_selector(value: str) -> tuple[int, int | None] | None:
-    match = WEEK_SELECTOR_PATTERN.fullmatch(value.strip())
-    if not match:
-        return None
-    week_num = int(match.group(1))
-    lesson_num = int(match.group(2)) if match.group(2) else None
-    return week_num, lesson_num
-
-
-def parse_week_dir_label(value: str) -> tuple[int, int | None] | None:
-    match = WEEK_DIR_PATTERN.match(value.strip())
-    if not match:
-        return None
-    week_num = int(match.group(1))
-    lesson_num = int(match.group(2)) if match.group(2) else None
-    return week_num, lesson_num
-
-
 def _iter_candidate_dirs(root: Path) -> list[Path]:
     candidates: list[Path] = []
     if not root.exists():
         return candidates
-    for entry in sorted(root.iterdir(), key=lambda path: path.name.casefold()):
-        if not entry.is_dir():
-            continue
+    inventory = load_output_inventory(root)
+    for entry in sorted(inventory.subdirs(root), key=lambda path: path.name.casefold()):
         candidates.append(entry)
-        for child in sorted(entry.iterdir(), key=lambda path: path.name.casefold()):
-            if child.is_dir():
-                candidates.append(child)
+        candidates.extend(sorted(inventory.subdirs(entry), key=lambda path: path.name.casefold()))
     return candidates
 
 
@@ -348,14 +335,12 @@ def discover_episode_keys(output_root: Path, week_inputs: list[str]) -> tuple[li
     seen_keys: set[str] = set()
     duplicates: list[str] = []
     seen_files: set[Path] = set()
+    inventory = load_output_inventory(output_root)
     for week_dir in week_dirs:
-        for file_path in sorted(week_dir.rglob("*")):
-            if not file_path.is_file():
-                continue
-            resolved_file = file_path.resolve()
-            if resolved_file in seen_files:
+        for file_path in sorted(item.path for item in inventory.files(week_dir, recursive=True)):
+            if file_path in seen_files:
                 continue
-            seen_files.add(resolved_file)
+            seen_files.add(file_path)
             if not _is_audio_file(file_path):
                 continue
             if is_weekly_overview_name(file_path.name):
@@ -378,14 +363,12 @@ def discover_weekly_overview_keys(output_root: Path, week_inputs: list[str]) ->
     seen_keys: set[str] = set()
     duplicates: list[str] = []
     seen_files: set[Path] = set()
+    inventory = load_output_inventory(output_root)
     for week_dir in week_dirs:
-        for file_path in sorted(week_dir.rglob("*")):
-            if not file_path.is_file():
-                continue
-            resolved_file = file_path.resolve()
-            if resolved_file in seen_files:
+        for file_path in sorted(item.path for item in inventory.files(week_dir, recursive=True)):
+            if file_path in seen_files:
                 continue
-            seen_files.add(resolved_file)
+            seen_files.add(file_path)
             if not _is_audio_file(file_path):
                 continue
             if not is_weekly_overview_name(file_path.name):
@@ -10,12 +10,15 @@ import re
 import shlex
 import subprocess
 import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
 MAX_UPLOAD_BYTES_DEFAULT = 24 * 1024 * 1024
 NORMALIZED_AUDIO_SUFFIX = ".stt.mp3"
+SEGMENT_WORKERS_DEFAULT = 4
 
 
 def read_json(path: Path) -> dict:
@@ -383,6 +386,112 @@ def transcribe_segment(
     return text, payload
 
 
+def segment_cache_key(*, segment_sha256: str, backend: str, model: str, prompt: str) -> str:
+    prompt_sha256 = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = "|".join((segment_sha256, backend, model, prompt_sha256))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def read_segment_cache(cache_dir: Path, key: str) -> dict | None:
+    path = cache_dir / f"{key}.json"
+    try:
+        payload = read_json(path)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or not str(payload.get("text") or "").strip():
+        return None
+    return payload
+
+
+def write_segment_cache(cache_dir: Path, key: str, payload: dict) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{key}.", suffix=".tmp", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+            handle.write("\n")
+        os.replace(tmp_name, cache_dir / f"{key}.json")
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def transcribe_segments(
+    *,
+    client: object,
+    segments: list[Path],
+    backend: str,
+    model: str,
+    prompt: str,
+    cache_dir: Path,
+    run_dir: Path,
+    workers: int,
+    force: bool = False,
+) -> tuple[list[dict], int]:
+    """Transcribe segments concurrently, reusing cached results; returns results in segment order.
+
+    With ``workers <= 1`` segments run sequentially and each prompt carries the
+    previous transcript tail. Concurrent runs send the base prompt to every
+    segment. Successful segments are cached before any failure is raised, so a
+    rerun only repeats the segments that failed. ``force`` skips cache reads but
+    still refreshes the cache.
+    """
+
+    def run_one(index: int, segment_path: Path, segment_prompt: str) -> tuple[dict, bool]:
+        segment_sha256 = sha256_for_path(segment_path)
+        key = segment_cache_key(segment_sha256=segment_sha256, backend=backend, model=model, prompt=segment_prompt)
+        cached = None if force else read_segment_cache(cache_dir, key)
+        cache_hit = cached is not None
+        if cached is None:
+            text, payload = transcribe_segment(client=client, audio_path=segment_path, model=model, prompt=segment_prompt)
+            cached = {"text": text, "response": payload}
+            write_segment_cache(cache_dir, key, cached)
+        result = {
+            "index": index,
+            "path": relpath_or_absolute(segment_path, run_dir),
+            "size_bytes": segment_path.stat().st_size,
+            "sha256": segment_sha256,
+            "cache_key": key,
+            "text": str(cached["text"]).strip(),
+            "response": cached.get("response", {}),
+        }
+        return result, cache_hit
+
+    results: list[dict | None] = [None] * len(segments)
+    errors: dict[int, Exception] = {}
+    cache_hits = 0
+    if workers <= 1:
+        carry_prompt = prompt
+        for index, segment_path in enumerate(segments, start=1):
+            try:
+                result, cache_hit = run_one(index, segment_path, carry_prompt)
+            except Exception as exc:
+                errors[index] = exc
+                break
+            results[index - 1] = result
+            cache_hits += int(cache_hit)
+            carry_prompt = prompt + "\nPrevious transcript tail:\n" + result["text"][-1200:]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(segments)) or 1) as pool:
+            futures = {
+                index: pool.submit(run_one, index, segment_path, prompt)
+                for index, segment_path in enumerate(segments, start=1)
+            }
+            for index, future in futures.items():
+                try:
+                    result, cache_hit = future.result()
+                except Exception as exc:
+                    errors[index] = exc
+                    continue
+                results[index - 1] = result
+                cache_hits += int(cache_hit)
+
+    if errors:
+        details = "; ".join(f"segment {index}: {exc}" for index, exc in sorted(errors.items()))
+        raise RuntimeError(f"{len(errors)} of {len(segments)} segment(s) failed: {details}")
+    return [result for result in results if result is not None], cache_hits
+
+
 def resolve_paths(manifest_path: Path, entry: dict, side: str) -> dict[str, Path]:
     run_dir = manifest_path.parent
     side_obj = entry[side]
@@ -393,6 +502,7 @@ def resolve_paths(manifest_path: Path, entry: dict, side: str) -> dict[str, Path
     stt_prompt = run_dir / "stt_prompts" / side_label / f"{entry['sample_id']}.txt"
     normalized_audio = run_dir / ".cache" / side_label / f"{entry['sample_id']}{NORMALIZED_AUDIO_SUFFIX}"
     segment_dir = run_dir / ".cache" / side_label / f"{entry['sample_id']}_segments"
+    segment_cache_dir = run_dir / ".cache" / "stt_segments"
     return {
         "run_dir": run_dir,
         "transcript_txt": transcript_txt,
@@ -401,6 +511,7 @@ def resolve_paths(manifest_path: Path, entry: dict, side: str) -> dict[str, Path
         "stt_prompt": stt_prompt,
         "normalized_audio": normalized_audio,
         "segment_dir": segment_dir,
+        "segment_cache_dir": segment_cache_dir,
     }
 
 
@@ -424,6 +535,7 @@ def transcribe_entry(
     request_backoff_seconds: float,
     force: bool,
     dry_run: bool,
+    segment_workers: int = SEGMENT_WORKERS_DEFAULT,
 ) -> tuple[str, str]:
     side_obj = entry[side]
     local_audio_path = str(side_obj.get("local_audio_path") or "").strip()
@@ -514,30 +626,19 @@ def transcribe_entry(
     else:
         segments = [normalized_audio]
 
-    segment_results: list[dict] = []
-    full_text_parts: list[str] = []
-    carry_prompt = prompt
-    for index, segment_path in enumerate(segments, start=1):
-        text, payload = transcribe_segment(
-            client=client,
-            audio_path=segment_path,
-            model=model,
-            prompt=carry_prompt,
-        )
-        full_text_parts.append(text)
-        carry_prompt = prompt + "\nPrevious transcript tail:\n" + text[-1200:]
-        segment_results.append(
-            {
-                "index": index,
-                "path": relpath_or_absolute(segment_path, run_dir),
-                "size_bytes": segment_path.stat().st_size,
-                "sha256": sha256_for_path(segment_path),
-                "text": text,
-                "response": payload,
-            }
-        )
+    segment_results, cache_hits = transcribe_segments(
+        client=client,
+        segments=segments,
+        backend=backend,
+        model=model,
+        prompt=prompt,
+        cache_dir=paths["segment_cache_dir"],
+        run_dir=run_dir,
+        workers=segment_workers,
+        force=force,
+    )
 
-    full_text = "\n\n".join(part.strip() for part in full_text_parts if part.strip()).strip() + "\n"
+    full_text = "\n\n".join(result["text"] for result in segment_results if result["text"]).strip() + "\n"
     transcript_txt.write_text(full_text, encoding="utf-8")
 
     transcript_payload = {
@@ -567,7 +668,9 @@ def transcribe_entry(
     side_obj["stt_prompt_path"] = relpath_or_absolute(stt_prompt, run_dir)
     side_obj["normalized_audio_path"] = relpath_or_absolute(normalized_audio, run_dir)
     side_obj["segment_count"] = len(segment_results)
-    return "completed", f"{entry['sample_id']}: transcribed {len(segment_results)} segment(s)"
+    return "completed", (
+        f"{entry['sample_id']}: transcribed {len(segment_results)} segment(s) ({cache_hits} from cache)"
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -657,6 +760,12 @@ def build_parser() -> argparse.ArgumentParser:
         default=5.0,
         help="Base backoff in seconds for ElevenLabs retries.",
     )
+    parser.add_argument(
+        "--segment-workers",
+        type=int,
+        default=SEGMENT_WORKERS_DEFAULT,
+        help="Concurrent OpenAI segment uploads. Use 1 to carry the previous transcript tail into each prompt.",
+    )
     parser.add_argument("--force", action="store_true", help="Re-transcribe even when outputs already exist.")
     parser.add_argument("--dry-run", action="store_true", help="Plan the transcription run without API calls or writes.")
     return parser
@@ -701,6 +810,7 @@ def main() -> int:
                 request_backoff_seconds=args.request_backoff_seconds,
                 force=args.force,
                 dry_run=args.dry_run,
+                segment_workers=args.segment_workers,
             )
         except Exception as exc:
             entry[side]["transcription_status"] = "failed"
@@ -1,10 +1,17 @@
+import asyncio
+import contextlib
 import importlib.util
 import os
 import tempfile
+import threading
+import time
 import unittest
 import unittest.mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+import httpx
+
 
 def _load_module():
     repo_root = Path(__file__).resolve().parents[3]
@@ -22,6 +29,79 @@ def _load_module():
     return module
 
 
+MEDIA = bytes(range(256)) * 64
+MEDIA_ETAG = '"media-v1"'
+
+
+class _MediaHandler(BaseHTTPRequestHandler):
+    """Local NotebookLM media stand-in: delayed, truncated-then-resumable and HTML-first responses."""
+
+    def log_message(self, *_args):
+        return None
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("Range")))
+            count = sum(1 for path, _ in server.requests if path == self.path)
+        range_header = self.headers.get("Range")
+        offset = int(range_header.split("=", 1)[1].rstrip("-")) if range_header else 0
+        if self.headers.get("If-Range") not in {None, MEDIA_ETAG}:
+            offset = 0
+        if self.path.startswith("/html-first") and count == 1:
+            body = b"<html>not ready</html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(0.3)
+        body = MEDIA[offset:]
+        self.send_response(206 if offset else 200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", MEDIA_ETAG)
+        if offset:
+            self.send_header("Content-Range", f"bytes {offset}-{len(MEDIA) - 1}/{len(MEDIA)}")
+        self.end_headers()
+        if self.path.startswith("/truncated") and count == 1:
+            self.wfile.write(body[: len(body) // 3])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class _FakeArtifactClient:
+    auth_failures: set = set()
+
+    def __init__(self, storage_path, base_url):
+        self.storage_path = storage_path
+        self.base_url = base_url
+        self.http = None
+
+    async def __aenter__(self):
+        if self.storage_path in self.auth_failures:
+            raise RuntimeError("Authentication expired or invalid. Run 'notebooklm login'.")
+        self.http = httpx.AsyncClient()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.http.aclose()
+
+    async def artifact_status(self, notebook_id, artifact_id):
+        return "in_progress"
+
+    async def wait(self, notebook_id, artifact_id, *, timeout, interval):
+        await asyncio.sleep(0.5)
+        return "completed", f"{self.base_url}/{artifact_id}"
+
+    async def media_url(self, notebook_id, artifact_id):
+        return f"{self.base_url}/{artifact_id}"
+
+
 class DownloadWeekTests(unittest.TestCase):
     def test_default_output_root_prefers_environment_override(self):
         mod = _load_module()
@@ -102,6 +182,141 @@ class DownloadWeekTests(unittest.TestCase):
             "audio=7, infographic=2",
         )
 
+    @contextlib.contextmanager
+    def _media_server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _MediaHandler)
+        server.lock = threading.Lock()
+        server.requests = []
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server, f"http://127.0.0.1:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _job(self, mod, root: Path, artifact_id: str, candidates):
+        output = root / f"{artifact_id}.mp3"
+        return mod.DownloadJob(
+            log_path=output.with_name(output.name + ".request.json"),
+            notebook_id="nb-1",
+            artifact_id=artifact_id,
+            artifact_type="audio",
+            output_path=output,
+            quiz_format=None,
+            candidates=tuple(candidates),
+        )
+
+    def test_stream_media_resumes_partial_file_with_range(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir, self._media_server() as (server, base_url):
+            output = Path(tmpdir) / "episode.mp3"
+            mod.part_path_for(output).write_bytes(MEDIA[:1000])
+            mod.part_validator_path_for(output).write_text(MEDIA_ETAG, encoding="utf-8")
+
+            async def run():
+                async with httpx.AsyncClient() as http:
+                    return await mod.stream_media(http, f"{base_url}/full", output)
+
+            resumed = asyncio.run(run())
+
+            self.assertTrue(resumed)
+            self.assertEqual(output.read_bytes(), MEDIA)
+            self.assertFalse(mod.part_path_for(output).exists())
+            self.assertFalse(mod.part_validator_path_for(output).exists())
+        self.assertEqual(server.requests, [("/full", "bytes=1000-")])
+
+    def test_stream_media_restarts_when_the_remote_file_changed_or_is_unvalidated(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir, self._media_server() as (server, base_url):
+            changed = Path(tmpdir) / "changed.mp3"
+            mod.part_path_for(changed).write_bytes(b"stale" * 200)
+            mod.part_validator_path_for(changed).write_text('"media-v0"', encoding="utf-8")
+            unvalidated = Path(tmpdir) / "unvalidated.mp3"
+            mod.part_path_for(unvalidated).write_bytes(b"stale" * 200)
+
+            async def run():
+                async with httpx.AsyncClient() as http:
+                    return [
+                        await mod.stream_media(http, f"{base_url}/changed", changed),
+                        await mod.stream_media(http, f"{base_url}/unvalidated", unvalidated),
+                    ]
+
+            resumed = asyncio.run(run())
+
+            self.assertEqual(resumed, [False, False])
+            self.assertEqual(changed.read_bytes(), MEDIA)
+            self.assertEqual(unvalidated.read_bytes(), MEDIA)
+        self.assertEqual(server.requests, [("/changed", "bytes=1000-"), ("/unvalidated", None)])
+
+    def test_download_jobs_async_runs_concurrently_and_recovers_truncated_media(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir, self._media_server() as (server, base_url):
+            root = Path(tmpdir)
+            good = root / "good.json"
+            stale = root / "stale.json"
+            good.write_text("{}", encoding="utf-8")
+            stale.write_text("{}", encoding="utf-8")
+            _FakeArtifactClient.auth_failures = {str(stale)}
+            candidates = [(str(stale), "profiles:stale"), (str(good), "profiles:good")]
+            jobs = [
+                self._job(mod, root, "slow-1", candidates),
+                self._job(mod, root, "slow-2", candidates),
+                self._job(mod, root, "truncated-1", candidates),
+                self._job(mod, root, "html-first-1", candidates),
+            ]
+
+            started = time.monotonic()
+            results = asyncio.run(
+                mod.download_jobs_async(
+                    jobs,
+                    timeout=30,
+                    interval=1,
+                    max_concurrent_downloads=4,
+                    client_factory=lambda storage_path: _FakeArtifactClient(storage_path, base_url),
+                )
+            )
+            elapsed = time.monotonic() - started
+
+            self.assertEqual(results, [(True, True)] * 4)
+            for job in jobs:
+                self.assertEqual(job.output_path.read_bytes(), MEDIA)
+                self.assertFalse(mod.part_path_for(job.output_path).exists())
+        truncated_ranges = [value for path, value in server.requests if path == "/truncated-1"]
+        self.assertEqual(truncated_ranges[0], None)
+        self.assertTrue(truncated_ranges[1].startswith("bytes="))
+        self.assertLess(elapsed, 2.5)
+
+    def test_download_jobs_async_reports_failure_without_cleanup_semantics_change(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir, self._media_server() as (_server, base_url):
+            root = Path(tmpdir)
+            stale = root / "stale.json"
+            stale.write_text("{}", encoding="utf-8")
+            _FakeArtifactClient.auth_failures = {str(stale)}
+            job = self._job(mod, root, "slow-1", [(str(stale), "profiles:stale")])
+            job.log_path.write_text("{}", encoding="utf-8")
+
+            [(success, cleanup_ok)] = asyncio.run(
+                mod.download_jobs_async(
+                    [job],
+                    timeout=30,
+                    interval=1,
+                    max_concurrent_downloads=1,
+                    client_factory=lambda storage_path: _FakeArtifactClient(storage_path, base_url),
+                )
+            )
+            mod.report_download_result(
+                job.log_path,
+                success=success,
+                cleanup_ok=cleanup_ok,
+                candidate_count=1,
+                cleanup_requests=True,
+            )
+
+            self.assertEqual((success, cleanup_ok), (False, False))
+            self.assertTrue(job.log_path.exists())
+
 
 if __name__ == "__main__":
     unittest.main()
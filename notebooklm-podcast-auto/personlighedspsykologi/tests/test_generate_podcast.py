@@ -3,7 +3,9 @@ import asyncio
 import io
 import json
 import os
+import random
 import tempfile
+import time
 import unittest
 from datetime import datetime
 from pathlib import Path
@@ -25,7 +27,88 @@ def _load_module():
     return module
 
 
+class _FakeLatencySources:
+    """Fake NotebookLM sources API with randomized upload and processing latency."""
+
+    def __init__(self, *, seed: int, error_once=(), raise_once=()):
+        self.random = random.Random(seed)
+        self.error_once = set(error_once)
+        self.raise_once = set(raise_once)
+        self.records: dict[str, SimpleNamespace] = {}
+        self.next_id = 0
+        self.add_calls: list[tuple[str, bool]] = []
+        self.deleted: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.upload_latencies: list[float] = []
+        self.processing_latencies: list[float] = []
+
+    async def _add(self, title: str, url: str | None, wait: bool) -> SimpleNamespace:
+        self.add_calls.append((title, wait))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        upload = self.random.uniform(0.01, 0.04)
+        self.upload_latencies.append(upload)
+        try:
+            await asyncio.sleep(upload)
+        finally:
+            self.in_flight -= 1
+        if title in self.raise_once:
+            self.raise_once.discard(title)
+            raise RuntimeError(f"upload dropped: {title}")
+        processing = self.random.uniform(0.02, 0.08)
+        self.processing_latencies.append(processing)
+        errored = title in self.error_once
+        self.error_once.discard(title)
+        self.next_id += 1
+        record = SimpleNamespace(
+            id=f"src-{self.next_id}",
+            title=title,
+            url=url,
+            ready_at=time.monotonic() + processing,
+            errored=errored,
+        )
+        self.records[record.id] = record
+        return record
+
+    async def add_url(self, notebook_id, url, *, wait=False, wait_timeout=120.0):
+        return await self._add(url, url, wait)
+
+    async def add_file(self, notebook_id, file_path, *, wait=False, wait_timeout=120.0):
+        return await self._add(Path(file_path).name, None, wait)
+
+    async def add_text(self, notebook_id, title, content, *, wait=False, wait_timeout=120.0):
+        return await self._add(title, None, wait)
+
+    async def delete(self, notebook_id, source_id):
+        self.deleted.append(source_id)
+        self.records.pop(source_id, None)
+
+    async def list(self, notebook_id):
+        now = time.monotonic()
+        return [
+            SimpleNamespace(
+                id=record.id,
+                title=record.title,
+                url=record.url,
+                is_ready=not record.errored and now >= record.ready_at,
+                is_error=record.errored and now >= record.ready_at,
+            )
+            for record in self.records.values()
+        ]
+
+
 class GeneratePodcastTests(unittest.TestCase):
+    def setUp(self):
+        index_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(index_dir.cleanup)
+        env_patch = patch.dict(
+            os.environ,
+            {"NOTEBOOKLM_REQUEST_LOG_INDEX_PATH": str(Path(index_dir.name) / "request-log-index.json")},
+        )
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+
     def test_rate_limit_profile_cooldown_defaults_to_one_hour(self):
         with patch.dict(os.environ, {}, clear=True):
             mod = _load_module()
@@ -611,6 +694,83 @@ class GeneratePodcastTests(unittest.TestCase):
             asyncio.run(mod._resolve_notebook(client, "Target", reuse=False))
         self.assertFalse(client.notebooks.deleted)
 
+    def _latency_sources(self) -> list[dict]:
+        sources = [{"kind": "file", "value": f"/tmp/reading-{index}.pdf"} for index in range(6)]
+        sources.append({"kind": "url", "value": "https://example.org/lecture"})
+        sources.append({"kind": "text", "title": "Lecture notes", "content": "Notes"})
+        return sources
+
+    def test_add_sources_uploads_concurrently_and_waits_once_for_readiness(self):
+        mod = _load_module()
+        fake_sources = _FakeLatencySources(seed=7)
+        client = SimpleNamespace(sources=fake_sources)
+
+        started = time.monotonic()
+        with patch.object(mod, "SOURCE_READY_INITIAL_POLL_SECONDS", 0.01):
+            with patch("sys.stdout", new_callable=io.StringIO):
+                asyncio.run(
+                    mod._add_sources(client, "nb-1", self._latency_sources(), 5.0, skip_existing=False, concurrency=3)
+                )
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(len(fake_sources.add_calls), 8)
+        self.assertTrue(all(wait is False for _title, wait in fake_sources.add_calls))
+        self.assertEqual(fake_sources.max_in_flight, 3)
+        serial_time = sum(fake_sources.upload_latencies) + sum(fake_sources.processing_latencies)
+        self.assertLess(elapsed, serial_time)
+
+    def test_add_sources_readds_only_failed_and_errored_sources(self):
+        mod = _load_module()
+        fake_sources = _FakeLatencySources(
+            seed=11,
+            error_once={"reading-2.pdf"},
+            raise_once={"https://example.org/lecture"},
+        )
+        client = SimpleNamespace(sources=fake_sources)
+
+        with patch.object(mod, "SOURCE_READY_INITIAL_POLL_SECONDS", 0.01):
+            with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                asyncio.run(
+                    mod._add_sources(client, "nb-1", self._latency_sources(), 5.0, skip_existing=False, concurrency=4)
+                )
+
+        titles = [title for title, _wait in fake_sources.add_calls]
+        self.assertEqual(titles.count("reading-2.pdf"), 2)
+        self.assertEqual(titles.count("https://example.org/lecture"), 2)
+        self.assertEqual(len(titles), 10)
+        self.assertEqual(len(fake_sources.deleted), 1)
+        self.assertIn("Re-adding sources", stdout.getvalue())
+
+    def test_add_sources_propagates_rate_limit_errors_for_profile_rotation(self):
+        mod = _load_module()
+
+        class RateLimitedSources(_FakeLatencySources):
+            async def add_url(self, notebook_id, url, *, wait=False, wait_timeout=120.0):
+                raise RuntimeError("Rate limit exceeded")
+
+        client = SimpleNamespace(sources=RateLimitedSources(seed=3))
+
+        with patch("sys.stdout", new_callable=io.StringIO):
+            with self.assertRaisesRegex(RuntimeError, "Rate limit"):
+                asyncio.run(
+                    mod._add_sources(client, "nb-1", self._latency_sources(), 5.0, skip_existing=False, concurrency=2)
+                )
+
+    def test_readiness_wait_times_out_with_not_ready_error(self):
+        mod = _load_module()
+        fake_sources = _FakeLatencySources(seed=5)
+        client = SimpleNamespace(sources=fake_sources)
+        sources = [{"kind": "text", "title": "Slow", "content": "x"}]
+
+        async def scenario():
+            await fake_sources.add_text("nb-1", "Slow", "x")
+            fake_sources.records["src-1"].ready_at = time.monotonic() + 60
+            await mod._wait_for_sources_ready(client, "nb-1", sources, timeout=0.05, initial_interval=0.01)
+
+        with patch("sys.stdout", new_callable=io.StringIO):
+            with self.assertRaisesRegex(RuntimeError, "Sources not ready after waiting"):
+                asyncio.run(scenario())
+
     def test_wait_mode_persists_request_log_before_waiting_for_completion(self):
         mod = _load_module()
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -693,6 +853,201 @@ class GeneratePodcastTests(unittest.TestCase):
         self.assertEqual(payload["notebook_id"], "nb-123")
         self.assertTrue(output_exists)
 
+    def _batch_args(self, tmpdir: str, **overrides):
+        values = dict(
+            output=str(Path(tmpdir) / "W1L1 {type=quiz difficulty=medium}.json"),
+            source=[str(Path(tmpdir) / "source.pdf")],
+            sources_file=None,
+            batch_file=None,
+            skip_existing=False,
+            notebook_title="Notebook",
+            append_profile_to_notebook_title=False,
+            reuse_notebook=False,
+            source_timeout=30,
+            ensure_sources_ready=False,
+            artifact_type="quiz",
+            instructions="Prompt",
+            audio_format="deep-dive",
+            audio_length="default",
+            language="da",
+            artifact_retries=0,
+            artifact_retry_backoff=5.0,
+            infographic_orientation=None,
+            infographic_detail=None,
+            quiz_quantity=None,
+            quiz_difficulty="all",
+            quiz_format="json",
+            report_format="study-guide",
+            wait=True,
+            generation_timeout=30,
+            initial_interval=1,
+            rotate_on_rate_limit=True,
+        )
+        values.update(overrides)
+        return SimpleNamespace(**values)
+
+    def test_batch_generates_all_quiz_difficulties_in_one_notebook_session(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            requests: list[str] = []
+            in_flight = {"now": 0, "max": 0}
+
+            class FakeClientContext:
+                async def __aenter__(self):
+                    return SimpleNamespace(artifacts=FakeArtifacts())
+
+                async def __aexit__(self, exc_type, exc, tb):
+                    return False
+
+            class FakeArtifacts:
+                async def wait_for_completion(self, notebook_id, artifact_id, timeout, initial_interval):
+                    await asyncio.sleep(0.01)
+                    return SimpleNamespace(is_complete=True, task_id=artifact_id)
+
+                async def download_quiz(self, notebook_id, output, artifact_id, output_format):
+                    Path(output).write_text(json.dumps({"artifact_id": artifact_id}), encoding="utf-8")
+
+            async def fake_generate_quiz(client, notebook_id, **kwargs):
+                requests.append(kwargs["difficulty"].name.lower())
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                await asyncio.sleep(0.02)
+                in_flight["now"] -= 1
+                return SimpleNamespace(task_id=f"quiz-{kwargs['difficulty'].name.lower()}")
+
+            from_storage_calls: list[str | None] = []
+
+            async def fake_from_storage(storage_path):
+                from_storage_calls.append(storage_path)
+                return FakeClientContext()
+
+            resolve_calls: list[str] = []
+
+            async def fake_resolve(client, title, reuse):
+                resolve_calls.append(title)
+                return SimpleNamespace(id="nb-1", title=title)
+
+            add_calls: list[str] = []
+
+            async def fake_add_sources(client, notebook_id, sources, timeout, **kwargs):
+                add_calls.append(notebook_id)
+
+            args = self._batch_args(tmpdir)
+            with patch.dict(os.environ, {"NOTEBOOKLM_HOME": tmpdir}):
+                with patch.object(mod, "_load_sources", return_value=[{"kind": "file", "value": "source.pdf"}]):
+                    with patch.object(mod, "_build_auth_candidates", return_value=[(None, {"profile": "good", "source": "profile"})]):
+                        with patch.object(mod.NotebookLMClient, "from_storage", side_effect=fake_from_storage):
+                            with patch.object(mod, "_resolve_notebook", side_effect=fake_resolve):
+                                with patch.object(mod, "_add_sources", side_effect=fake_add_sources):
+                                    with patch.object(mod, "_generate_quiz_with_retry", side_effect=fake_generate_quiz):
+                                        with patch("sys.stdout", new_callable=io.StringIO):
+                                            exit_code = mod._run_all_quiz_difficulties(args)
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(resolve_calls, ["Notebook"])
+            self.assertEqual(add_calls, ["nb-1"])
+            self.assertEqual(from_storage_calls, [None, None])
+            self.assertEqual(sorted(requests), ["easy", "hard", "medium"])
+            self.assertEqual(in_flight["max"], 3)
+            for difficulty in ("easy", "medium", "hard"):
+                output = Path(tmpdir) / f"W1L1 {{type=quiz difficulty={difficulty}}}.json"
+                self.assertTrue(output.exists())
+                payload = json.loads(output.with_suffix(".json.request.json").read_text(encoding="utf-8"))
+                self.assertEqual(payload["quiz_difficulty"], difficulty)
+                self.assertEqual(payload["artifact_id"], f"quiz-{difficulty}")
+                self.assertEqual(payload["notebook_id"], "nb-1")
+
+    def test_batch_rotates_only_rate_limited_jobs_to_next_profile(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            batch_file = Path(tmpdir) / "batch.json"
+            batch_file.write_text(
+                json.dumps(
+                    [
+                        {"artifact_type": "report", "output": str(Path(tmpdir) / "report.md")},
+                        {"artifact_type": "audio", "output": str(Path(tmpdir) / "episode.mp3")},
+                    ]
+                ),
+                encoding="utf-8",
+            )
+            seen: list[tuple[str, str]] = []
+
+            class FakeClientContext:
+                def __init__(self, storage_path):
+                    self.storage_path = storage_path
+
+                async def __aenter__(self):
+                    return SimpleNamespace(storage_path=self.storage_path)
+
+                async def __aexit__(self, exc_type, exc, tb):
+                    return False
+
+            async def fake_from_storage(storage_path):
+                return FakeClientContext(storage_path)
+
+            async def fake_resolve(client, title, reuse):
+                return SimpleNamespace(id=f"nb-{client.storage_path}", title=title)
+
+            async def fake_report(client, notebook_id, **kwargs):
+                seen.append(("report", client.storage_path))
+                return SimpleNamespace(task_id=f"report-{client.storage_path}")
+
+            async def fake_audio(client, notebook_id, **kwargs):
+                seen.append(("audio", client.storage_path))
+                if client.storage_path == "first":
+                    raise RuntimeError("Rate limit exceeded for audio overviews")
+                return SimpleNamespace(task_id=f"audio-{client.storage_path}")
+
+            args = self._batch_args(tmpdir, batch_file=str(batch_file), quiz_difficulty=None, wait=False)
+            jobs = mod._load_batch_jobs(args)
+            candidates = [
+                ("first", {"profile": "first", "source": "profile"}),
+                ("second", {"profile": "second", "source": "profile"}),
+            ]
+            with patch.dict(os.environ, {"NOTEBOOKLM_HOME": tmpdir}):
+                with patch.object(mod, "_load_sources", return_value=[{"kind": "file", "value": "source.pdf"}]):
+                    with patch.object(mod, "_build_auth_candidates", return_value=candidates):
+                        with patch.object(mod.NotebookLMClient, "from_storage", side_effect=fake_from_storage):
+                            with patch.object(mod, "_resolve_notebook", side_effect=fake_resolve):
+                                with patch.object(mod, "_add_sources", return_value=None):
+                                    with patch.object(mod, "_generate_report_with_retry", side_effect=fake_report):
+                                        with patch.object(mod, "_generate_audio_with_retry", side_effect=fake_audio):
+                                            with patch("sys.stdout", new_callable=io.StringIO):
+                                                exit_code = asyncio.run(mod._generate_batch(args, jobs))
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(sorted(seen), [("audio", "first"), ("audio", "second"), ("report", "first")])
+            report_log = json.loads((Path(tmpdir) / "report.md.request.json").read_text(encoding="utf-8"))
+            audio_log = json.loads((Path(tmpdir) / "episode.mp3.request.json").read_text(encoding="utf-8"))
+            self.assertEqual(report_log["artifact_id"], "report-first")
+            self.assertEqual(audio_log["artifact_id"], "audio-second")
+            self.assertEqual(audio_log["rotation_attempts"][0]["error_type"], "rate_limit")
+            state = json.loads((Path(tmpdir) / "profile_state.json").read_text(encoding="utf-8"))
+            self.assertGreater(state["profiles"]["first"]["cooldown_until"], time.time())
+            self.assertEqual(state["profiles"]["second"]["success_count"], 1)
+
+    def test_batch_file_rejects_unknown_keys_and_duplicate_outputs(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            batch_file = Path(tmpdir) / "batch.json"
+            args = self._batch_args(tmpdir, batch_file=str(batch_file), quiz_difficulty=None)
+
+            batch_file.write_text(json.dumps([{"output": "a.mp3", "storage": "x"}]), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "unsupported keys: storage"):
+                mod._load_batch_jobs(args)
+
+            batch_file.write_text(json.dumps([{"output": "a.mp3"}, {"output": "a.mp3"}]), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "repeats outputs"):
+                mod._load_batch_jobs(args)
+
+            batch_file.write_text(
+                json.dumps([{"artifact_type": "quiz", "quiz_difficulty": "all", "output": "quiz.json"}]),
+                encoding="utf-8",
+            )
+            jobs = mod._load_batch_jobs(args)
+            self.assertEqual([job.quiz_difficulty for job in jobs], ["easy", "medium", "hard"])
+            self.assertEqual(len({job.output for job in jobs}), 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,14 @@
 import importlib.util
 import json
+import os
+import sys
 import tempfile
+import threading
+import time
+import types
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 def _load_module():
@@ -21,6 +27,47 @@ def _load_module():
     return module
 
 
+class FakeGeminiClient:
+    """Gemini-shaped fake that counts uploads, deletes and judge requests."""
+
+    def __init__(self, *, upload_latency_seconds=0.0):
+        self.upload_latency_seconds = upload_latency_seconds
+        self.uploads: list[str] = []
+        self.deleted: list[str] = []
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.files = types.SimpleNamespace(upload=self.upload, delete=self.delete, get=None)
+        self.models = types.SimpleNamespace(generate_content=self.generate_content)
+
+    def upload(self, *, file, config):
+        time.sleep(self.upload_latency_seconds)
+        with self._lock:
+            self.uploads.append(Path(file).name)
+            name = f"files/{len(self.uploads)}"
+        return types.SimpleNamespace(name=name, uri=f"https://example.invalid/{name}", mime_type="application/pdf")
+
+    def delete(self, *, name):
+        with self._lock:
+            self.deleted.append(name)
+
+    def generate_content(self, *, model, contents, config):
+        with self._lock:
+            self.requests += 1
+        return types.SimpleNamespace(
+            text="## Verdict\n- Overall winner: B\n- Confidence: medium\n",
+            usage_metadata=types.SimpleNamespace(prompt_token_count=1200, candidates_token_count=300),
+        )
+
+
+FAKE_GENAI_TYPES = types.SimpleNamespace(
+    Part=types.SimpleNamespace(
+        from_text=lambda text: ("text", text),
+        from_uri=lambda file_uri, mime_type: ("uri", file_uri),
+    ),
+    GenerateContentConfig=lambda **kwargs: kwargs,
+)
+
+
 class JudgeEpisodeABReviewTests(unittest.TestCase):
     def test_build_judge_prompt_includes_rubric_context_and_transcripts(self):
         mod = _load_module()
@@ -125,6 +172,119 @@ class JudgeEpisodeABReviewTests(unittest.TestCase):
             self.assertTrue((run_dir / "judgments" / "sample.md").exists())
             self.assertEqual(entry["review"]["status"], "judged_dry_run")
 
+    def _write_run(self, run_dir: Path, sources: dict[str, str]) -> Path:
+        entries = []
+        for sample_id, source_name in sources.items():
+            source = run_dir / "sources" / source_name
+            source.parent.mkdir(parents=True, exist_ok=True)
+            source.write_bytes(source_name.encode("utf-8"))
+            for side in ("before", "after"):
+                transcript = run_dir / "transcripts" / side / f"{sample_id}.txt"
+                transcript.parent.mkdir(parents=True, exist_ok=True)
+                transcript.write_text(f"{side} transcript", encoding="utf-8")
+            entries.append(
+                {
+                    "sample_id": sample_id,
+                    "prompt_type": "short",
+                    "lecture_key": "W01L1",
+                    "baseline": {"speaker_transcript_path": f"transcripts/before/{sample_id}.txt"},
+                    "candidate": {"speaker_transcript_path": f"transcripts/after/{sample_id}.txt"},
+                    "source_context": {"source_files": [str(source)]},
+                }
+            )
+        manifest_path = run_dir / "manifest.json"
+        manifest_path.write_text(json.dumps({"entries": entries}), encoding="utf-8")
+        (run_dir / "judge_prompt.md").write_text("# Judge Prompt", encoding="utf-8")
+        return manifest_path
+
+    def test_upload_pool_uploads_shared_file_once_across_threads(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "reading.pdf"
+            source.write_bytes(b"pdf")
+            client = FakeGeminiClient(upload_latency_seconds=0.05)
+            pool = mod.UploadPool(client)
+
+            threads = [threading.Thread(target=pool.get, args=(source,)) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            pool.close()
+
+        self.assertEqual(client.uploads, ["reading.pdf"])
+        self.assertEqual(pool.reuse_count, 4)
+        self.assertEqual(client.deleted, ["files/1"])
+
+    def test_main_judges_concurrently_with_shared_uploads_and_checkpoints(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            run_dir = Path(tmpdir)
+            manifest_path = self._write_run(
+                run_dir,
+                {
+                    "sample_a": "shared.pdf",
+                    "sample_b": "shared.pdf",
+                    "sample_c": "shared.pdf",
+                    "sample_d": "other.pdf",
+                },
+            )
+            client = FakeGeminiClient(upload_latency_seconds=0.02)
+            argv = [
+                "judge_episode_ab_review.py",
+                "--manifest",
+                str(manifest_path),
+                "--judge-prompt",
+                str(run_dir / "judge_prompt.md"),
+                "--judge-workers",
+                "4",
+                "--requests-per-minute",
+                "0",
+                "--checkpoint-every",
+                "2",
+            ]
+            summaries = []
+            original_write_summary = mod.write_summary
+            ledger_path = run_dir / "usage-ledger.jsonl"
+            with mock.patch.object(sys, "argv", argv), mock.patch.dict(
+                os.environ, {"NOTEBOOKLM_USAGE_LEDGER_PATH": str(ledger_path)}
+            ), mock.patch.object(
+                mod, "gemini_client", return_value=(client, FAKE_GENAI_TYPES)
+            ), mock.patch.object(mod, "load_prompt_config", return_value={}), mock.patch.object(
+                mod,
+                "write_summary",
+                side_effect=lambda path, manifest: summaries.append(manifest["status"])
+                or original_write_summary(path, manifest),
+            ):
+                exit_code = mod.main()
+
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            summary = json.loads((run_dir / "judgments" / "summary.json").read_text(encoding="utf-8"))
+            ledger = [json.loads(line) for line in ledger_path.read_text(encoding="utf-8").splitlines()]
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(len(ledger), 4)
+        self.assertEqual(
+            {(row["stage"], row["lecture_key"], row["model"], row["status"]) for row in ledger},
+            {("ab_judge", "W01L1", mod.GEMINI_JUDGE_MODEL, "ok")},
+        )
+        self.assertEqual(sum(row["input_tokens"] for row in ledger), 4 * 1200)
+        self.assertEqual(sorted(client.uploads), ["other.pdf", "shared.pdf"])
+        self.assertEqual(sorted(client.deleted), ["files/1", "files/2"])
+        self.assertEqual(client.requests, 4)
+        self.assertEqual(summaries, ["judging", "judging", "judged"])
+        self.assertEqual(summary["counts"], {"B": 4})
+        self.assertEqual(manifest["status"], "judged")
+        self.assertEqual({entry["review"]["status"] for entry in manifest["entries"]}, {"judged"})
+
+    def test_rate_limiter_spaces_requests(self):
+        mod = _load_module()
+        limiter = mod.RateLimiter(requests_per_minute=60.0 * 20)
+        started = time.monotonic()
+        for _ in range(4):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - started, 0.14)
+
 
 if __name__ == "__main__":
     unittest.main()
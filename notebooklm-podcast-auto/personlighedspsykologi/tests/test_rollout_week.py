@@ -1,6 +1,10 @@
 import importlib.util
+import json
+import tempfile
+import threading
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 def _load_module():
@@ -56,5 +60,169 @@ class RolloutWeekTests(unittest.TestCase):
         self.assertEqual(merged["history"][0]["episode_key"], "old-id")
 
 
+class _Crash(BaseException):
+    """Simulates the process dying mid-node (not caught like an ordinary error)."""
+
+
+class RolloutDagTests(unittest.TestCase):
+    def setUp(self):
+        self.mod = _load_module()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.checkpoint = self.tmp / "checkpoint.json"
+        self.calls = {name: [] for name in ("generate", "download", "upload", "register", "publish", "finalize")}
+        self.crash = {}
+        self.lock = threading.Lock()
+        for name, attr, stub in (
+            ("generate", "phase_generate", self._generate),
+            ("download", "phase_download", self._download),
+            ("upload", "phase_upload", self._upload),
+            ("register", "phase_register", self._register),
+            ("publish", "phase_publish", self._publish),
+            ("finalize", "phase_finalize_activation", self._finalize),
+        ):
+            patcher = mock.patch.object(self.mod, attr, stub)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for attr, value in (
+            ("OUTPUT_ROOT", self.tmp / "output"),
+            ("planned_mp3_count", lambda week_key: 0),
+            ("all_registered", lambda week_keys: True),
+            ("sleep_awake", lambda *args, **kwargs: None),
+        ):
+            patcher = mock.patch.object(self.mod, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _record(self, name, value):
+        with self.lock:
+            self.calls[name].append(value)
+        error = self.crash.pop((name, value if isinstance(value, str) else None), None)
+        if error is not None:
+            raise error
+
+    def _generate(self, week_keys, dry_run):
+        (week_key,) = week_keys
+        week_dir = self.mod.OUTPUT_ROOT / week_key
+        week_dir.mkdir(parents=True, exist_ok=True)
+        (week_dir / f"{week_key} - Alle kilder.mp3").write_bytes(b"mp3")
+        self._record("generate", week_key)
+        return 0, 1, 0
+
+    def _download(self, week_keys, dry_run, allow_failure=False):
+        self._record("download", week_keys[0])
+        return True
+
+    def _upload(self, week_keys, dry_run):
+        self._record("upload", week_keys[0])
+        return {week_keys[0]: sorted((self.mod.OUTPUT_ROOT / week_keys[0]).glob("*.mp3"))}
+
+    def _register(self, uploaded, dry_run):
+        (week_key,) = uploaded
+        self._record("register", week_key)
+        return [{"logical_episode_id": f"{week_key}::weekly"}]
+
+    def _publish(self, week_keys, dry_run):
+        self._record("publish", "+".join(week_keys))
+        return 0
+
+    def _finalize(self, week_keys, dry_run):
+        self._record("finalize", "+".join(week_keys))
+        return 0
+
+    def _run(self, **kwargs):
+        with mock.patch("builtins.print"):
+            return self.mod.run_rollout(["W01L1", "W02L1"], checkpoint_path=self.checkpoint, **kwargs)
+
+    def test_rerun_resumes_each_week_at_first_incomplete_node(self):
+        self.crash[("register", "W02L1")] = RuntimeError("Drive API unavailable")
+
+        self.assertEqual(self._run(), 1)
+        self.assertEqual(self.calls["publish"], ["W01L1"])
+        statuses = json.loads(self.checkpoint.read_text(encoding="utf-8"))["weeks"]
+        self.assertEqual(statuses["W02L1"]["register"]["status"], "failed")
+        self.assertEqual(statuses["W02L1"]["upload"]["status"], "done")
+
+        for calls in self.calls.values():
+            calls.clear()
+        self.crash[("publish", "W02L1")] = _Crash()
+        with self.assertRaises(_Crash):
+            self._run()
+        self.assertEqual(self.calls["generate"] + self.calls["download"] + self.calls["upload"], [])
+        self.assertEqual(self.calls["register"], ["W02L1"])
+
+        for calls in self.calls.values():
+            calls.clear()
+        self.assertEqual(self._run(), 0)
+        self.assertEqual(self.calls["register"], [])
+        self.assertEqual(self.calls["publish"], ["W02L1"])
+        self.assertEqual(self.calls["finalize"], ["W02L1"])
+        statuses = json.loads(self.checkpoint.read_text(encoding="utf-8"))["weeks"]
+        self.assertTrue(all(node["status"] == "done" for week in statuses.values() for node in week.values()))
+
+    def test_weeks_run_concurrently_and_publish_waits_at_barrier(self):
+        both_generating = threading.Barrier(2, timeout=5)
+        original = self._generate
+
+        def generate(week_keys, dry_run):
+            both_generating.wait()
+            return original(week_keys, dry_run)
+
+        with mock.patch.object(self.mod, "phase_generate", generate):
+            self.assertEqual(self._run(max_parallel_weeks=2), 0)
+
+        self.assertEqual(sorted(self.calls["register"]), ["W01L1", "W02L1"])
+        self.assertEqual(self.calls["publish"], ["W01L1+W02L1"])
+        self.assertEqual(self.calls["finalize"], ["W01L1+W02L1"])
+
+    def test_partial_generation_is_published_then_retried_in_the_next_wave(self):
+        remaining = iter([3, 0, 0])
+        sleeps = []
+        with mock.patch.object(self.mod, "planned_mp3_count", lambda week_key: next(remaining)), \
+                mock.patch.object(self.mod, "sleep_awake", lambda seconds, *args, **kwargs: sleeps.append(seconds)):
+            self.assertEqual(self._run(max_parallel_weeks=1), 0)
+
+        # Wave 1 publishes both weeks; wave 2 re-runs only W01L1's chain after one sleep.
+        self.assertEqual(sleeps, [self.mod.GENERATE_RETRY_SLEEP])
+        self.assertEqual(self.calls["generate"], ["W01L1", "W02L1", "W01L1"])
+        self.assertEqual(self.calls["download"], ["W01L1", "W02L1", "W01L1"])
+        self.assertEqual(self.calls["register"], ["W01L1", "W02L1", "W01L1"])
+        self.assertEqual(self.calls["publish"], ["W01L1+W02L1", "W01L1"])
+        statuses = json.loads(self.checkpoint.read_text(encoding="utf-8"))["weeks"]
+        self.assertEqual(statuses["W01L1"]["generate"]["status"], "done")
+        self.assertEqual(statuses["W01L1"]["publish"]["status"], "done")
+
+    def test_rollout_fails_while_a_week_is_still_partial_after_the_last_wave(self):
+        sleeps = []
+        with mock.patch.object(self.mod, "GENERATE_MAX_RETRIES", 2), \
+                mock.patch.object(self.mod, "planned_mp3_count", lambda week_key: 1 if week_key == "W01L1" else 0), \
+                mock.patch.object(self.mod, "sleep_awake", lambda seconds, *args, **kwargs: sleeps.append(seconds)):
+            self.assertEqual(self._run(max_parallel_weeks=1), 1)
+
+        self.assertEqual(sleeps, [self.mod.GENERATE_RETRY_SLEEP])
+        self.assertEqual(self.calls["generate"], ["W01L1", "W02L1", "W01L1"])
+        statuses = json.loads(self.checkpoint.read_text(encoding="utf-8"))["weeks"]
+        self.assertEqual(statuses["W01L1"]["generate"]["status"], "partial")
+        self.assertEqual(statuses["W01L1"]["publish"]["status"], "done")
+
+    def test_generate_node_sleeps_only_on_rate_limit_exhaustion(self):
+        results = iter([(0, 0, 0), (0, 0, 0)])
+        sleeps = []
+
+        def generate(week_keys, dry_run):
+            result = next(results, None)
+            return result if result is not None else self._generate(week_keys, dry_run)
+
+        with mock.patch.object(self.mod, "phase_generate", generate), \
+                mock.patch.object(self.mod, "planned_mp3_count", lambda week_key: 0), \
+                mock.patch.object(self.mod, "sleep_awake", lambda seconds, *args, **kwargs: sleeps.append(seconds)):
+            self.assertEqual(self._run(max_parallel_weeks=1), 0)
+
+        self.assertEqual(sleeps, [self.mod.GENERATE_RETRY_SLEEP] * 2)
+        statuses = json.loads(self.checkpoint.read_text(encoding="utf-8"))["weeks"]
+        self.assertEqual(statuses["W01L1"]["generate"]["attempts"], 3)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
 import importlib.util
 import sys
 import tempfile
+import threading
+import time
 import types
 import unittest
 from pathlib import Path
@@ -23,6 +25,34 @@ def _load_module():
     return module
 
 
+class FakeSTTClient:
+    """OpenAI-shaped fake that records calls, sleeps, and fails selected segments."""
+
+    def __init__(self, *, fail_names=(), latency_seconds=0.0):
+        self.fail_names = set(fail_names)
+        self.latency_seconds = latency_seconds
+        self.calls: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self.audio = types.SimpleNamespace(transcriptions=types.SimpleNamespace(create=self.create))
+
+    def create(self, *, model, file, response_format, prompt, include):
+        name = Path(file.name).name
+        with self._lock:
+            self.calls.append(name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency_seconds)
+            if name in self.fail_names:
+                raise ConnectionResetError(f"injected failure for {name}")
+            return {"text": f"text of {name}"}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
 class TranscribeEpisodeABReviewTests(unittest.TestCase):
     def test_build_stt_prompt_includes_source_labels_and_key_points(self):
         mod = _load_module()
@@ -223,6 +253,95 @@ class TranscribeEpisodeABReviewTests(unittest.TestCase):
         self.assertEqual(fake_requests.post.call_count, 2)
         sleep_mock.assert_called_once_with(0.1)
 
+    def _segments(self, root: Path, count: int) -> list[Path]:
+        segments = []
+        for index in range(count):
+            path = root / f"segment-{index:03d}.mp3"
+            path.write_bytes(f"audio {index}".encode("utf-8"))
+            segments.append(path)
+        return segments
+
+    def test_transcribe_segments_runs_concurrently_and_stitches_in_order(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            segments = self._segments(root, 6)
+            client = FakeSTTClient(latency_seconds=0.05)
+
+            results, cache_hits = mod.transcribe_segments(
+                client=client,
+                segments=segments,
+                backend="openai",
+                model="gpt-4o-transcribe",
+                prompt="prompt",
+                cache_dir=root / "cache",
+                run_dir=root,
+                workers=3,
+            )
+
+        self.assertEqual(cache_hits, 0)
+        self.assertEqual([result["index"] for result in results], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([result["text"] for result in results], [f"text of segment-{i:03d}.mp3" for i in range(6)])
+        self.assertGreater(client.max_active, 1)
+        self.assertLessEqual(client.max_active, 3)
+
+    def test_transcribe_segments_rerun_only_retries_failed_segments(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            segments = self._segments(root, 5)
+            kwargs = dict(
+                segments=segments,
+                backend="openai",
+                model="gpt-4o-transcribe",
+                prompt="prompt",
+                cache_dir=root / "cache",
+                run_dir=root,
+                workers=4,
+            )
+            failing = FakeSTTClient(fail_names={"segment-001.mp3", "segment-003.mp3"}, latency_seconds=0.01)
+            with self.assertRaisesRegex(RuntimeError, "2 of 5 segment\\(s\\) failed"):
+                mod.transcribe_segments(client=failing, **kwargs)
+
+            healthy = FakeSTTClient()
+            results, cache_hits = mod.transcribe_segments(client=healthy, **kwargs)
+
+            changed_prompt = FakeSTTClient()
+            mod.transcribe_segments(client=changed_prompt, **{**kwargs, "prompt": "other prompt"})
+
+            forced = FakeSTTClient()
+            _results, forced_hits = mod.transcribe_segments(client=forced, force=True, **kwargs)
+
+        self.assertEqual(sorted(healthy.calls), ["segment-001.mp3", "segment-003.mp3"])
+        self.assertEqual((len(forced.calls), forced_hits), (5, 0))
+        self.assertEqual(cache_hits, 3)
+        self.assertEqual([result["text"] for result in results], [f"text of segment-{i:03d}.mp3" for i in range(5)])
+        self.assertEqual(len(changed_prompt.calls), 5)
+
+    def test_transcribe_segments_single_worker_carries_previous_tail(self):
+        mod = _load_module()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            segments = self._segments(root, 2)
+            client = FakeSTTClient()
+            prompts = []
+            original = client.create
+            client.audio.transcriptions.create = lambda **kw: prompts.append(kw["prompt"]) or original(**kw)
+
+            mod.transcribe_segments(
+                client=client,
+                segments=segments,
+                backend="openai",
+                model="gpt-4o-transcribe",
+                prompt="prompt",
+                cache_dir=root / "cache",
+                run_dir=root,
+                workers=1,
+            )
+
+        self.assertEqual(prompts[0], "prompt")
+        self.assertIn("Previous transcript tail:\ntext of segment-000.mp3", prompts[1])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,6 +6,7 @@ import hashlib
 import json
 import os
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -13,6 +14,21 @@ from .show_config import load_show_config, resolve_show_config_path, serialize_s
 
 WEEK_LECTURE_PATTERN = re.compile(r"^(W\d+L\d+)\b", re.IGNORECASE)
 
+# Config hashes keyed by the (label, path, stat signature) of every hashed file,
+# so repeated discovery passes only re-read config files that actually changed.
+# Files modified within the racy window are never cached because a same-size
+# rewrite inside one mtime tick would otherwise keep an identical signature.
+_CONFIG_HASH_CACHE: dict[tuple[tuple[str, str, tuple[int, int, int] | None], ...], str] = {}
+_CONFIG_HASH_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _file_stat_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
 
 def _canonical_lecture_key(value: str) -> str | None:
     match = WEEK_LECTURE_PATTERN.match(str(value).strip())
@@ -64,19 +80,27 @@ class ShowAdapter:
                 override_path=show_config_path,
             )
             override_label = serialize_show_config_path(repo_root=repo_root, path=resolved_override)
+        entries: list[tuple[str, Path]] = []
         for relative in self.config_paths:
             if relative == self.show_config_path and resolved_override is not None:
-                path = resolved_override
-                label = override_label or relative
+                entries.append((override_label or relative, resolved_override))
             else:
-                path = repo_root / relative
-                label = relative
+                entries.append((relative, repo_root / relative))
+        cache_key = tuple((label, str(path), _file_stat_signature(path)) for label, path in entries)
+        cached = _CONFIG_HASH_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        for label, path in entries:
             digest.update(label.encode("utf-8"))
             digest.update(b"\0")
             if path.exists():
                 digest.update(path.read_bytes())
             digest.update(b"\0")
-        return digest.hexdigest()[:16]
+        config_hash = digest.hexdigest()[:16]
+        racy_cutoff_ns = time.time_ns() - _CONFIG_HASH_RACY_WINDOW_NS
+        if all(signature is None or signature[1] < racy_cutoff_ns for _, _, signature in cache_key):
+            _CONFIG_HASH_CACHE[cache_key] = config_hash
+        return config_hash
 
     def load_show_config(
         self,
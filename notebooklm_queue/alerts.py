@@ -7,6 +7,7 @@ import os
 import smtplib
 import socket
 import subprocess
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from email.message import EmailMessage
@@ -17,7 +18,7 @@ from urllib import request as urllib_request
 
 from .constants import STATE_BLOCKED_AUTH_STALE, STATE_DEAD_LETTER, STATE_RETRY_SCHEDULED
 from .failure_modes import looks_like_auth_error, looks_like_rate_limit
-from .store import QueueStore, _load_json, _write_json_atomic, utc_now_iso
+from .store import QueueLockError, QueueStore, _load_json, _write_json_atomic
 
 ALERT_KIND_AUTH_STALE = "auth_stale"
 ALERT_KIND_RATE_LIMIT_EXHAUSTED = "rate_limit_exhausted"
@@ -43,6 +44,10 @@ def _show_alerts_root(store: QueueStore, show_slug: str) -> Path:
     return _alerts_root(store) / show_slug
 
 
+def _alert_spool_root(store: QueueStore) -> Path:
+    return _alerts_root(store) / "spool"
+
+
 def _lowered(text: str | None) -> str:
     return str(text or "").lower()
 
@@ -61,6 +66,18 @@ def _alert_dedup_seconds() -> int:
     return _int_env("NOTEBOOKLM_QUEUE_ALERT_DEDUP_SECONDS", 21600)
 
 
+def _delivery_retries() -> int:
+    return _int_env("NOTEBOOKLM_QUEUE_ALERT_DELIVERY_RETRIES", 2)
+
+
+def _delivery_backoff_seconds() -> int:
+    return _int_env("NOTEBOOKLM_QUEUE_ALERT_DELIVERY_BACKOFF_SECONDS", 2)
+
+
+def _max_drain_attempts() -> int:
+    return _int_env("NOTEBOOKLM_QUEUE_ALERT_MAX_DRAIN_ATTEMPTS", 5)
+
+
 def _rate_limit_alert_attempts() -> int:
     return _int_env("NOTEBOOKLM_QUEUE_RATE_LIMIT_ALERT_ATTEMPTS", 3)
 
@@ -142,80 +159,204 @@ def emit_failure_alert(
 
     now = datetime.now(tz=UTC)
     occurred_at = now.replace(microsecond=0).isoformat()
-    dedup_seconds = max(_alert_dedup_seconds(), 0)
+    alert_payload: dict[str, Any] = {
+        "version": 1,
+        "occurred_at": occurred_at,
+        "kind": decision.kind,
+        "summary": decision.summary,
+        "fingerprint": decision.fingerprint,
+        "delivery_status": "spooled",
+        "show_slug": show_slug,
+        "subject_slug": str(job.get("subject_slug") or ""),
+        "job_id": str(job.get("job_id") or ""),
+        "lecture_key": str(job.get("lecture_key") or ""),
+        "content_types": list(job.get("content_types") or []),
+        "state": failed_state,
+        "attempt_count": int(job.get("attempt_count") or 0),
+        "note": note,
+        "error": str(error_text or ""),
+        "failure_mode": failure_mode_code,
+        "run_id": str(manifest.get("run_id") or ""),
+        "manifest_phase_names": [str(phase.get("name") or "") for phase in list(manifest.get("phases") or [])],
+        "manifest_path": str(
+            dict(job.get("artifacts") or {}).get("execution", {}).get("latest_run_manifest") or ""
+        ),
+        "host": socket.gethostname(),
+        "deliveries": [],
+    }
+    filename = f"{occurred_at.replace(':', '').replace('-', '')}-{decision.kind}-{job.get('job_id')}.json"
+    alert_path = _show_alerts_root(store, show_slug) / filename
+    alert_payload["alert_path"] = str(alert_path)
+
+    # Only file writes happen under the lock; delivery is left to drain_alert_spool.
+    with store.acquire_global_lock("alerts", blocking=True):
+        alert_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(alert_path, alert_payload)
+        spool_root = _alert_spool_root(store)
+        spool_root.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(spool_root / filename, alert_payload)
+    return alert_payload
+
+
+def drain_alert_spool(
+    *,
+    store: QueueStore,
+    blocking: bool = False,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """Deliver spooled alerts, folding repeats of one fingerprint into a digest.
+
+    The first alert for a fingerprint is delivered on the next drain. Repeats
+    within ``NOTEBOOKLM_QUEUE_ALERT_DEDUP_SECONDS`` of the last delivery stay
+    spooled and go out as one digest with counts once the window has passed.
+    Delivery happens outside the ``alerts`` lock, so emitters never wait on a
+    slow channel; a separate ``alerts-drain`` lock keeps drains from overlapping.
+    """
+
+    current = (now or datetime.now(tz=UTC)).astimezone(UTC)
+    report: dict[str, Any] = {
+        "drained_at": current.replace(microsecond=0).isoformat(),
+        "status": "ok",
+        "delivered": [],
+        "held": 0,
+        "failed": 0,
+    }
+    try:
+        with store.acquire_global_lock("alerts-drain", blocking=blocking):
+            _drain_alert_spool_locked(store=store, now=current, report=report)
+    except QueueLockError:
+        report["status"] = "lock_held"
+    return report
+
 
+def _drain_alert_spool_locked(*, store: QueueStore, now: datetime, report: dict[str, Any]) -> None:
+    dedup_seconds = max(_alert_dedup_seconds(), 0)
+    with store.acquire_global_lock("alerts", blocking=True):
+        state = _load_json(_alerts_state_path(store))
+        spooled: dict[str, list[tuple[Path, dict[str, Any]]]] = {}
+        spool_root = _alert_spool_root(store)
+        for path in sorted(spool_root.glob("*.json")) if spool_root.exists() else []:
+            payload = _load_json(path)
+            if payload.get("fingerprint"):
+                spooled.setdefault(str(payload["fingerprint"]), []).append((path, payload))
+
+    seen = state.get("seen") if isinstance(state.get("seen"), dict) else {}
+    outcomes: list[tuple[str, list[tuple[Path, dict[str, Any]]], list[dict[str, Any]], bool]] = []
+    for fingerprint, entries in sorted(spooled.items()):
+        last_sent_at = _parse_iso(seen.get(fingerprint))
+        if dedup_seconds > 0 and last_sent_at is not None and (now - last_sent_at).total_seconds() < dedup_seconds:
+            report["held"] += len(entries)
+            continue
+        message = _digest_payload([payload for _, payload in entries])
+        deliveries = _deliver_alert_with_retries(message)
+        failed = bool(deliveries) and all(item.get("status") == "failed" for item in deliveries)
+        outcomes.append((fingerprint, entries, deliveries, failed))
+        if failed:
+            report["failed"] += len(entries)
+        else:
+            report["delivered"].append(
+                {"fingerprint": fingerprint, "count": len(entries), "deliveries": deliveries}
+            )
+
+    sent_at = now.replace(microsecond=0).isoformat()
     with store.acquire_global_lock("alerts", blocking=True):
         state = _load_json(_alerts_state_path(store))
         seen = state.get("seen") if isinstance(state.get("seen"), dict) else {}
-        last_seen_raw = seen.get(decision.fingerprint) if isinstance(seen, dict) else None
-        last_seen_at = None
-        if isinstance(last_seen_raw, str):
-            try:
-                last_seen_at = datetime.fromisoformat(last_seen_raw)
-            except ValueError:
-                last_seen_at = None
-        suppressed = False
-        if dedup_seconds > 0 and last_seen_at is not None:
-            suppressed = (now - last_seen_at).total_seconds() < dedup_seconds
-
-        alert_payload: dict[str, Any] = {
-            "version": 1,
-            "occurred_at": occurred_at,
-            "kind": decision.kind,
-            "summary": decision.summary,
-            "fingerprint": decision.fingerprint,
-            "suppressed": suppressed,
-            "show_slug": show_slug,
-            "subject_slug": str(job.get("subject_slug") or ""),
-            "job_id": str(job.get("job_id") or ""),
-            "lecture_key": str(job.get("lecture_key") or ""),
-            "content_types": list(job.get("content_types") or []),
-            "state": failed_state,
-            "attempt_count": int(job.get("attempt_count") or 0),
-            "note": note,
-            "error": str(error_text or ""),
-            "failure_mode": failure_mode_code,
-            "run_id": str(manifest.get("run_id") or ""),
-            "manifest_phase_names": [str(phase.get("name") or "") for phase in list(manifest.get("phases") or [])],
-            "manifest_path": str(
-                dict(job.get("artifacts") or {}).get("execution", {}).get("latest_run_manifest") or ""
-            ),
-            "host": socket.gethostname(),
-            "deliveries": [],
-        }
+        attempts = state.get("drain_attempts") if isinstance(state.get("drain_attempts"), dict) else {}
+        for fingerprint, entries, deliveries, failed in outcomes:
+            if failed:
+                attempts[fingerprint] = int(attempts.get(fingerprint) or 0) + 1
+                if attempts[fingerprint] < max(_max_drain_attempts(), 1):
+                    continue
+                status = "failed"
+                destination = _alert_spool_root(store) / "failed"
+                destination.mkdir(parents=True, exist_ok=True)
+            else:
+                seen[fingerprint] = sent_at
+                status = "digested" if len(entries) > 1 else "sent"
+                destination = None
+            attempts.pop(fingerprint, None)
+            for spool_path, payload in entries:
+                _record_alert_delivery(payload, status=status, deliveries=deliveries, delivered_at=sent_at)
+                if destination is not None:
+                    os.replace(spool_path, destination / spool_path.name)
+                else:
+                    spool_path.unlink(missing_ok=True)
+        state["seen"] = seen
+        state["drain_attempts"] = attempts
+        _write_json_atomic(_alerts_state_path(store), state)
+
+
+def _parse_iso(value: Any) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
 
-        if not suppressed:
-            alert_payload["deliveries"].extend(_deliver_alert(alert_payload))
-            if isinstance(seen, dict):
-                seen[decision.fingerprint] = occurred_at
-            state["seen"] = seen
-            _write_json_atomic(_alerts_state_path(store), state)
-
-        alerts_root = _show_alerts_root(store, show_slug)
-        alerts_root.mkdir(parents=True, exist_ok=True)
-        filename = f"{occurred_at.replace(':', '').replace('-', '')}-{decision.kind}-{job.get('job_id')}.json"
-        alert_path = alerts_root / filename
-        _write_json_atomic(alert_path, alert_payload)
-        alert_payload["alert_path"] = str(alert_path)
-        return alert_payload
+
+def _digest_payload(payloads: list[dict[str, Any]]) -> dict[str, Any]:
+    ordered = sorted(payloads, key=lambda item: str(item.get("occurred_at") or ""))
+    latest = dict(ordered[-1])
+    if len(ordered) == 1:
+        return latest
+    latest["summary"] = f"{latest.get('summary') or 'Queue alert'} ({len(ordered)} occurrences)"
+    latest["digest"] = {
+        "count": len(ordered),
+        "first_occurred_at": ordered[0].get("occurred_at"),
+        "last_occurred_at": ordered[-1].get("occurred_at"),
+        "job_ids": sorted({str(item.get("job_id") or "") for item in ordered} - {""}),
+        "lecture_keys": sorted({str(item.get("lecture_key") or "") for item in ordered} - {""}),
+    }
+    return latest
 
 
-def _deliver_alert(payload: dict[str, Any]) -> list[dict[str, Any]]:
+def _record_alert_delivery(
+    payload: dict[str, Any],
+    *,
+    status: str,
+    deliveries: list[dict[str, Any]],
+    delivered_at: str,
+) -> None:
+    alert_path = Path(str(payload.get("alert_path") or ""))
+    if not alert_path.is_file():
+        return
+    record = _load_json(alert_path)
+    record.update({"delivery_status": status, "delivered_at": delivered_at, "deliveries": deliveries})
+    _write_json_atomic(alert_path, record)
+
+
+def _deliver_alert_with_retries(payload: dict[str, Any]) -> list[dict[str, Any]]:
     deliveries: list[dict[str, Any]] = []
+    for channel, deliver in _alert_channels():
+        result: dict[str, Any] = {}
+        for attempt in range(max(_delivery_retries(), 0) + 1):
+            if attempt:
+                time.sleep(max(_delivery_backoff_seconds(), 0) * attempt)
+            try:
+                result = deliver(payload)
+            except Exception as exc:  # noqa: BLE001 - a channel failure must not stop the drain.
+                result = {"channel": channel, "status": "failed", "error": str(exc)}
+            if result.get("status") != "failed":
+                break
+        result["attempts"] = attempt + 1
+        deliveries.append(result)
+    return deliveries
 
+
+def _alert_channels() -> list[tuple[str, Any]]:
+    channels: list[tuple[str, Any]] = []
     webhook_url = str(os.environ.get("NOTEBOOKLM_QUEUE_ALERT_WEBHOOK_URL") or "").strip()
     if webhook_url:
-        deliveries.append(_deliver_webhook(payload, webhook_url))
-
+        channels.append(("webhook", lambda payload: _deliver_webhook(payload, webhook_url)))
     email_to = str(os.environ.get("NOTEBOOKLM_QUEUE_ALERT_EMAIL_TO") or "").strip()
     if email_to:
-        deliveries.append(_deliver_email(payload, email_to))
-
+        channels.append(("email", lambda payload: _deliver_email(payload, email_to)))
     command = str(os.environ.get("NOTEBOOKLM_QUEUE_ALERT_COMMAND") or "").strip()
     if command:
-        deliveries.append(_deliver_command(payload, command))
-
-    return deliveries
+        channels.append(("command", lambda payload: _deliver_command(payload, command)))
+    return channels
 
 
 def _deliver_webhook(payload: dict[str, Any], webhook_url: str) -> dict[str, Any]:
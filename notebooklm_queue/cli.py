@@ -7,11 +7,13 @@ import json
 from pathlib import Path
 from typing import Any
 
+from .alerts import drain_alert_spool
 from .constants import DEFAULT_STORAGE_ROOT, STATE_GENERATING, STATE_QUEUED
 from .downstream import DownstreamOptions, sync_downstream_publication
-from .discovery import discover_show_jobs, enqueue_discovered_jobs
+from .discovery import discover_show_jobs, enqueue_discovered_jobs, plan_show_discovery
 from .execution import ExecutionOptions, execute_job, refresh_retry_schedules
 from .metadata import MetadataOptions, rebuild_repo_metadata
+from .metrics import collect_queue_metrics, render_openmetrics, serve_metrics, write_metrics_file
 from .models import JobIdentity
 from .notebook_reclaim import NotebookReclaimOptions, reclaim_notebooks
 from .orchestrator import DrainShowOptions, ServeShowOptions, drain_show_queue, serve_show_queue
@@ -21,6 +23,7 @@ from .publish import PublishOptions, UploadOptions, prepare_publish_bundle, uplo
 from .repo_publish import RepoPublishOptions, publish_repo_artifacts
 from .runner import build_dry_run_plan
 from .store import QueueLockError, QueueStore
+from .usage_ledger import REPORT_GROUPS, default_ledger_path, load_price_table, read_ledger, summarize_usage
 
 
 def _print_json(payload: Any) -> None:
@@ -102,6 +105,37 @@ def build_parser() -> argparse.ArgumentParser:
     reconcile = subparsers.add_parser("reconcile", help="Rebuild queue indexes from job files.")
     reconcile.add_argument("--show-slug")
 
+    drain_alerts = subparsers.add_parser(
+        "drain-alerts",
+        help="Deliver spooled queue alerts, digesting repeats of the same failure.",
+    )
+    drain_alerts.add_argument("--blocking-lock", action="store_true")
+
+    usage_report = subparsers.add_parser(
+        "usage-report",
+        help="Aggregate the Gemini/OpenAI usage ledger by stage, lecture, day and model.",
+    )
+    usage_report.add_argument("--ledger-path", type=Path)
+    usage_report.add_argument("--prices-file", type=Path)
+    usage_report.add_argument("--group-by", action="append", choices=REPORT_GROUPS, dest="groups", default=[])
+    usage_report.add_argument("--since", help="Only include records at or after this ISO date/time.")
+
+    metrics = subparsers.add_parser(
+        "metrics",
+        help=(
+            "Print queue metrics in OpenMetrics text format, write them to a file in Prometheus text format, "
+            "or serve them over HTTP."
+        ),
+    )
+    metrics.add_argument(
+        "--output",
+        type=Path,
+        help="Atomically write the metrics to this file in Prometheus text format instead of stdout.",
+    )
+    metrics.add_argument("--serve", action="store_true", help="Serve GET /metrics until interrupted.")
+    metrics.add_argument("--host", default="127.0.0.1")
+    metrics.add_argument("--port", type=int, default=9464)
+
     lock = subparsers.add_parser("lock-check", help="Acquire and release a show lock.")
     lock.add_argument("--show-slug", required=True)
 
@@ -133,6 +167,8 @@ def build_parser() -> argparse.ArgumentParser:
     refresh_profiles_parser.add_argument("--reclaim-apply", action="store_true")
     refresh_profiles_parser.add_argument("--no-probe", action="store_true")
     refresh_profiles_parser.add_argument("--probe-timeout-seconds", type=int, default=60)
+    refresh_profiles_parser.add_argument("--refresh-timeout-seconds", type=int, default=300)
+    refresh_profiles_parser.add_argument("--max-concurrency", type=int, default=4)
 
     reclaim = subparsers.add_parser(
         "reclaim-notebooks",
@@ -159,6 +195,11 @@ def build_parser() -> argparse.ArgumentParser:
     discover.add_argument("--content-type", action="append", dest="content_types", default=[])
     discover.add_argument("--include-published", action="store_true")
     discover.add_argument("--enqueue", action="store_true")
+    discover.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print the create/refresh/supersede plan against the stored jobs without writing anything.",
+    )
     discover.add_argument("--priority", type=int, default=100)
 
     dry_run = subparsers.add_parser("run-dry", help="Resolve the exact dry-run generate/download plan for a queued job.")
@@ -339,6 +380,40 @@ def main(argv: list[str] | None = None) -> int:
         _print_json(store.reconcile_indexes(show_slug=args.show_slug))
         return 0
 
+    if args.command == "drain-alerts":
+        payload = drain_alert_spool(store=store, blocking=args.blocking_lock)
+        _print_json(payload)
+        return 0 if payload["status"] == "ok" and not payload["failed"] else 1
+
+    if args.command == "usage-report":
+        ledger_path = args.ledger_path or default_ledger_path()
+        records = read_ledger(ledger_path) if ledger_path is not None else iter(())
+        report = summarize_usage(
+            records,
+            prices=load_price_table(args.prices_file),
+            groups=args.groups or REPORT_GROUPS,
+            since=args.since,
+        )
+        _print_json({"ledger_path": ledger_path, **report})
+        return 0
+
+    if args.command == "metrics":
+        if args.serve:
+            server = serve_metrics(store=store, host=args.host, port=args.port)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+            return 0
+        if args.output:
+            write_metrics_file(store=store, path=args.output)
+            _print_json({"metrics_path": args.output})
+            return 0
+        print(render_openmetrics(collect_queue_metrics(store=store)), end="")
+        return 0
+
     if args.command == "lock-check":
         try:
             with store.acquire_show_lock(args.show_slug):
@@ -381,6 +456,8 @@ def main(argv: list[str] | None = None) -> int:
                 reclaim_dry_run=not bool(args.reclaim_apply),
                 probe_after_refresh=not bool(args.no_probe),
                 probe_timeout_seconds=int(args.probe_timeout_seconds),
+                refresh_timeout_seconds=int(args.refresh_timeout_seconds),
+                max_concurrency=int(args.max_concurrency),
             ),
         )
         _print_json(payload)
@@ -416,7 +493,16 @@ def main(argv: list[str] | None = None) -> int:
     if args.command == "discover":
         repo_root = Path(args.repo_root).resolve()
         content_types = tuple(args.content_types) if args.content_types else None
-        if args.enqueue:
+        if args.plan:
+            payload = plan_show_discovery(
+                repo_root=repo_root,
+                store=store,
+                show_slug=args.show_slug,
+                content_types=content_types,
+                show_config_path=Path(args.show_config).resolve() if args.show_config else None,
+                include_published=bool(args.include_published),
+            ).to_payload()
+        elif args.enqueue:
             payload = enqueue_discovered_jobs(
                 repo_root=repo_root,
                 store=store,
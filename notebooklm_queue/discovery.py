@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass
 from pathlib import Path
 import re
 
-from .adapters import get_show_adapter
+from .adapters import ShowAdapter, get_show_adapter
 from .constants import STATE_DEAD_LETTER, TERMINAL_STATES
 from .models import JobIdentity
 from .show_config import load_show_config, resolve_show_config_path, serialize_show_config_path
@@ -15,16 +16,68 @@ from .store import QueueStore
 LECTURE_KEY_PATTERN = re.compile(r"^W(\d+)L(\d+)$", re.IGNORECASE)
 
 
-def discover_show_jobs(
+@dataclass(frozen=True, slots=True)
+class DiscoveryPlan:
+    """Diff of discovered lecture identities against the stored queue jobs."""
+
+    show_slug: str
+    subject_slug: str
+    content_types: tuple[str, ...]
+    config_hash: str
+    discovered: list[dict[str, object]]
+    new_job_ids: list[str]
+    existing_job_ids: list[str]
+    superseded: list[dict[str, object]]
+
+    def to_payload(self) -> dict[str, object]:
+        lecture_by_job_id = {
+            str(item["job_id"]): str(item["identity"].lecture_key)
+            for item in self.discovered
+        }
+        return {
+            "show_slug": self.show_slug,
+            "subject_slug": self.subject_slug,
+            "content_types": list(self.content_types),
+            "config_hash": self.config_hash,
+            "discovered_count": len(self.discovered),
+            "create": [
+                {"job_id": job_id, "lecture_key": lecture_by_job_id[job_id]}
+                for job_id in self.new_job_ids
+            ],
+            "refresh": [
+                {"job_id": job_id, "lecture_key": lecture_by_job_id[job_id]}
+                for job_id in self.existing_job_ids
+            ],
+            "supersede": [
+                {
+                    "job_id": str(entry.get("job_id") or ""),
+                    "lecture_key": str(entry.get("lecture_key") or ""),
+                    "state": str(entry.get("state") or ""),
+                    "config_hash": str(entry.get("config_hash") or ""),
+                }
+                for entry in self.superseded
+            ],
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class _DiscoveryContext:
+    adapter: ShowAdapter
+    content_types: tuple[str, ...]
+    config_hash: str
+    serialized_show_config_path: str | None
+    published_lecture_keys: set[str]
+
+
+def _discovery_context(
     *,
     repo_root: Path,
     show_slug: str,
-    content_types: tuple[str, ...] | None = None,
-    show_config_path: str | Path | None = None,
-    include_published: bool = False,
-) -> list[dict[str, object]]:
+    content_types: tuple[str, ...] | None,
+    show_config_path: str | Path | None,
+    include_published: bool,
+) -> _DiscoveryContext:
     adapter = get_show_adapter(show_slug)
-    effective_content_types = content_types or adapter.default_content_types
     config_hash = adapter.config_hash(repo_root, show_config_path=show_config_path)
     serialized_show_config_path = None
     resolved_show_config_path = None
@@ -38,7 +91,7 @@ def discover_show_jobs(
             repo_root=repo_root,
             path=resolved_show_config_path,
         )
-    published_lecture_keys = set()
+    published_lecture_keys: set[str] = set()
     if not include_published:
         config = load_show_config(
             repo_root=repo_root,
@@ -46,19 +99,30 @@ def discover_show_jobs(
             override_path=resolved_show_config_path,
         )
         published_lecture_keys = _published_lecture_keys(repo_root=repo_root, config=config)
+    return _DiscoveryContext(
+        adapter=adapter,
+        content_types=content_types or adapter.default_content_types,
+        config_hash=config_hash,
+        serialized_show_config_path=serialized_show_config_path,
+        published_lecture_keys=published_lecture_keys,
+    )
+
+
+def _discover_jobs_for_context(*, repo_root: Path, context: _DiscoveryContext) -> list[dict[str, object]]:
+    adapter = context.adapter
     jobs: list[dict[str, object]] = []
     for lecture in adapter.discover_lectures(repo_root):
-        if _normalized_lecture_key(lecture.lecture_key) in published_lecture_keys:
+        if _normalized_lecture_key(lecture.lecture_key) in context.published_lecture_keys:
             continue
         metadata = dict(lecture.metadata)
-        if serialized_show_config_path is not None:
-            metadata["show_config_path"] = serialized_show_config_path
+        if context.serialized_show_config_path is not None:
+            metadata["show_config_path"] = context.serialized_show_config_path
         identity = JobIdentity(
             show_slug=adapter.show_slug,
             subject_slug=adapter.subject_slug,
             lecture_key=lecture.lecture_key,
-            content_types=effective_content_types,
-            config_hash=config_hash,
+            content_types=context.content_types,
+            config_hash=context.config_hash,
         )
         jobs.append(
             {
@@ -70,7 +134,25 @@ def discover_show_jobs(
     return jobs
 
 
-def enqueue_discovered_jobs(
+def discover_show_jobs(
+    *,
+    repo_root: Path,
+    show_slug: str,
+    content_types: tuple[str, ...] | None = None,
+    show_config_path: str | Path | None = None,
+    include_published: bool = False,
+) -> list[dict[str, object]]:
+    context = _discovery_context(
+        repo_root=repo_root,
+        show_slug=show_slug,
+        content_types=content_types,
+        show_config_path=show_config_path,
+        include_published=include_published,
+    )
+    return _discover_jobs_for_context(repo_root=repo_root, context=context)
+
+
+def plan_show_discovery(
     *,
     repo_root: Path,
     store: QueueStore,
@@ -78,58 +160,109 @@ def enqueue_discovered_jobs(
     content_types: tuple[str, ...] | None = None,
     show_config_path: str | Path | None = None,
     include_published: bool = False,
-    priority: int = 100,
-) -> dict[str, list[dict[str, object]]]:
-    adapter = get_show_adapter(show_slug)
-    effective_content_types = content_types or adapter.default_content_types
-    current_config_hash = adapter.config_hash(repo_root, show_config_path=show_config_path)
-    published_lecture_keys: set[str] = set()
-    if not include_published:
-        config = load_show_config(
-            repo_root=repo_root,
-            default_path=adapter.show_config_path,
-            override_path=show_config_path,
-        )
-        published_lecture_keys = _published_lecture_keys(repo_root=repo_root, config=config)
-    discovered = discover_show_jobs(
+) -> DiscoveryPlan:
+    context = _discovery_context(
         repo_root=repo_root,
         show_slug=show_slug,
-        content_types=effective_content_types,
+        content_types=content_types,
         show_config_path=show_config_path,
         include_published=include_published,
     )
+    adapter = context.adapter
+    discovered = _discover_jobs_for_context(repo_root=repo_root, context=context)
+    stored_jobs = store.list_jobs(show_slug=adapter.show_slug)
+    stored_job_ids = {str(entry.get("job_id") or "") for entry in stored_jobs}
+    new_job_ids: list[str] = []
+    existing_job_ids: list[str] = []
+    for item in discovered:
+        job_id = str(item["job_id"])
+        if job_id in stored_job_ids:
+            existing_job_ids.append(job_id)
+        else:
+            new_job_ids.append(job_id)
     current_lecture_keys = {
         _normalized_lecture_key(str(item["identity"].lecture_key))
         for item in discovered
         if isinstance(item.get("identity"), JobIdentity)
     }
-    superseded = _dead_letter_superseded_records(
-        store=store,
+    superseded = _superseded_records(
+        stored_jobs=stored_jobs,
+        subject_slug=adapter.subject_slug,
+        content_types=context.content_types,
+        current_config_hash=context.config_hash,
+        current_lecture_keys=current_lecture_keys | context.published_lecture_keys,
+    )
+    return DiscoveryPlan(
         show_slug=adapter.show_slug,
         subject_slug=adapter.subject_slug,
-        content_types=effective_content_types,
-        current_config_hash=current_config_hash,
-        current_lecture_keys=current_lecture_keys | published_lecture_keys,
+        content_types=context.content_types,
+        config_hash=context.config_hash,
+        discovered=discovered,
+        new_job_ids=new_job_ids,
+        existing_job_ids=existing_job_ids,
+        superseded=superseded,
     )
-    created: list[dict[str, object]] = []
-    for item in discovered:
-        payload = store.upsert_job(
-            item["identity"],
-            metadata=item["metadata"],
-            priority=priority,
+
+
+def apply_discovery_plan(
+    *,
+    store: QueueStore,
+    plan: DiscoveryPlan,
+    priority: int = 100,
+) -> dict[str, list[dict[str, object]]]:
+    superseded: list[dict[str, object]] = []
+    for entry in plan.superseded:
+        superseded.append(
+            store.transition_job(
+                show_slug=plan.show_slug,
+                job_id=str(entry["job_id"]),
+                state=STATE_DEAD_LETTER,
+                note=(
+                    "Superseded by current discovery config "
+                    f"{plan.config_hash}; stale non-terminal queue record removed from runnable backlog."
+                ),
+                details={
+                    "superseded_by_config_hash": plan.config_hash,
+                    "superseded_lecture_key": _normalized_lecture_key(str(entry.get("lecture_key") or "")),
+                },
+                expected_states={str(entry.get("state") or "").strip()},
+            )
         )
-        created.append(payload)
+    created = store.upsert_jobs(
+        [(item["identity"], item["metadata"]) for item in plan.discovered],
+        priority=priority,
+    )
     return {
-        "discovered": discovered,
+        "discovered": plan.discovered,
         "enqueued": created,
         "superseded": superseded,
     }
 
 
-def _dead_letter_superseded_records(
+def enqueue_discovered_jobs(
     *,
+    repo_root: Path,
     store: QueueStore,
     show_slug: str,
+    content_types: tuple[str, ...] | None = None,
+    show_config_path: str | Path | None = None,
+    include_published: bool = False,
+    priority: int = 100,
+) -> dict[str, list[dict[str, object]]]:
+    plan = plan_show_discovery(
+        repo_root=repo_root,
+        store=store,
+        show_slug=show_slug,
+        content_types=content_types,
+        show_config_path=show_config_path,
+        include_published=include_published,
+    )
+    return apply_discovery_plan(store=store, plan=plan, priority=priority)
+
+
+def _superseded_records(
+    *,
+    stored_jobs: list[dict[str, object]],
     subject_slug: str,
     content_types: tuple[str, ...],
     current_config_hash: str,
@@ -139,7 +272,7 @@ def _dead_letter_superseded_records(
         return []
     superseded: list[dict[str, object]] = []
     expected_content_types = _content_types_key(content_types)
-    for entry in store.list_jobs(show_slug=show_slug):
+    for entry in stored_jobs:
         state = str(entry.get("state") or "").strip()
         if state in TERMINAL_STATES:
             continue
@@ -152,21 +285,7 @@ def _dead_letter_superseded_records(
         lecture_key = _normalized_lecture_key(str(entry.get("lecture_key") or ""))
         if lecture_key not in current_lecture_keys:
             continue
-        updated = store.transition_job(
-            show_slug=show_slug,
-            job_id=str(entry["job_id"]),
-            state=STATE_DEAD_LETTER,
-            note=(
-                "Superseded by current discovery config "
-                f"{current_config_hash}; stale non-terminal queue record removed from runnable backlog."
-            ),
-            details={
-                "superseded_by_config_hash": current_config_hash,
-                "superseded_lecture_key": lecture_key,
-            },
-            expected_states={state},
-        )
-        superseded.append(updated)
+        superseded.append(entry)
     return superseded
 
 
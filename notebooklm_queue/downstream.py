@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import json
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from dataclasses import dataclass
 from pathlib import Path
@@ -32,6 +34,7 @@ class DownstreamOptions:
     gh_bin: str = os.environ.get("NOTEBOOKLM_QUEUE_GH_BIN") or "gh"
     timeout_seconds: int = int(os.environ.get("NOTEBOOKLM_QUEUE_DOWNSTREAM_TIMEOUT_SECONDS") or "900")
     poll_interval_seconds: int = int(os.environ.get("NOTEBOOKLM_QUEUE_DOWNSTREAM_POLL_SECONDS") or "10")
+    max_poll_interval_seconds: int = int(os.environ.get("NOTEBOOKLM_QUEUE_DOWNSTREAM_MAX_POLL_SECONDS") or "60")
     gh_timeout_seconds: int = int(os.environ.get("NOTEBOOKLM_QUEUE_GH_TIMEOUT_SECONDS") or "60")
     freudd_workflow_file: str = (
         os.environ.get("NOTEBOOKLM_QUEUE_FREUDD_DEPLOY_WORKFLOW_FILE") or "deploy-freudd-portal.yml"
@@ -103,9 +106,14 @@ def sync_downstream_publication(
         manifest["downstream"] = downstream_payload
 
         try:
-            for target in targets:
-                result = _wait_for_workflow_target(repo_root=options.repo_root, commit_sha=commit_sha, target=target, options=options)
-                downstream_payload["targets"].append(result)
+            downstream_payload["targets"].extend(
+                _wait_for_workflow_targets(
+                    repo_root=options.repo_root,
+                    commit_sha=commit_sha,
+                    targets=targets,
+                    options=options,
+                )
+            )
         except DownstreamSyncError as exc:
             return _finalize_failure(
                 store=store,
@@ -267,50 +275,87 @@ def _build_targets(
     ]
 
 
-def _wait_for_workflow_target(
+def _wait_for_workflow_targets(
     *,
     repo_root: Path,
     commit_sha: str,
-    target: DownstreamTarget,
+    targets: list[DownstreamTarget],
     options: DownstreamOptions,
-) -> dict[str, Any]:
+) -> list[dict[str, Any]]:
+    """Wait for every target under one deadline, polling each pending workflow once per round."""
+    if not targets:
+        return []
     deadline = time.monotonic() + max(int(options.timeout_seconds), 1)
-    last_status = "not_found"
-    while time.monotonic() <= deadline:
-        run = _find_workflow_run(
-            repo_root=repo_root,
-            commit_sha=commit_sha,
-            workflow_file=target.workflow_file,
-            gh_bin=options.gh_bin,
-            timeout_seconds=options.gh_timeout_seconds,
-        )
-        if run is None:
-            last_status = "not_found"
-            time.sleep(max(int(options.poll_interval_seconds), 1))
-            continue
-        status = str(run.get("status") or "")
-        conclusion = str(run.get("conclusion") or "")
-        if status == "completed":
-            if conclusion == "success":
-                return {
-                    "name": target.name,
-                    "workflow_file": target.workflow_file,
-                    "status": status,
-                    "conclusion": conclusion,
-                    "run_id": run.get("databaseId"),
-                    "url": run.get("url"),
-                    "changed_paths": list(target.changed_paths),
-                }
+    base_interval = max(float(options.poll_interval_seconds), 1.0)
+    max_interval = max(float(options.max_poll_interval_seconds), base_interval)
+    results: dict[str, dict[str, Any]] = {}
+    last_status: dict[str, str] = {target.name: "not_found" for target in targets}
+    attempt = 0
+    while True:
+        pending_files = sorted({target.workflow_file for target in targets if target.name not in results})
+        with ThreadPoolExecutor(max_workers=len(pending_files)) as executor:
+            runs = dict(
+                zip(
+                    pending_files,
+                    executor.map(
+                        lambda workflow_file: _find_workflow_run(
+                            repo_root=repo_root,
+                            commit_sha=commit_sha,
+                            workflow_file=workflow_file,
+                            gh_bin=options.gh_bin,
+                            timeout_seconds=options.gh_timeout_seconds,
+                        ),
+                        pending_files,
+                    ),
+                )
+            )
+        for target in targets:
+            if target.name in results:
+                continue
+            run = runs.get(target.workflow_file)
+            if run is None:
+                last_status[target.name] = "not_found"
+                continue
+            status = str(run.get("status") or "")
+            conclusion = str(run.get("conclusion") or "")
+            if status != "completed":
+                last_status[target.name] = status or "in_progress"
+                continue
+            if conclusion != "success":
+                raise DownstreamSyncError(
+                    f"Downstream workflow failed for {target.name}: "
+                    f"status={status} conclusion={conclusion} url={run.get('url') or ''}".strip()
+                )
+            results[target.name] = {
+                "name": target.name,
+                "workflow_file": target.workflow_file,
+                "status": status,
+                "conclusion": conclusion,
+                "run_id": run.get("databaseId"),
+                "url": run.get("url"),
+                "changed_paths": list(target.changed_paths),
+            }
+        if len(results) == len(targets):
+            return [results[target.name] for target in targets]
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            pending = ", ".join(
+                f"{target.workflow_file} (last_status={last_status[target.name]})"
+                for target in targets
+                if target.name not in results
+            )
             raise DownstreamSyncError(
-                f"Downstream workflow failed for {target.name}: "
-                f"status={status} conclusion={conclusion} url={run.get('url') or ''}".strip()
+                f"Timed out waiting for downstream workflow {pending} for commit {commit_sha}."
             )
-        last_status = status or "in_progress"
-        time.sleep(max(int(options.poll_interval_seconds), 1))
-    raise DownstreamSyncError(
-        f"Timed out waiting for downstream workflow {target.workflow_file} for commit {commit_sha} "
-        f"(last_status={last_status})."
-    )
+        delay = min(base_interval * (2**attempt), max_interval)
+        time.sleep(min(max(random.uniform(delay / 2, delay), 1.0), remaining))
+        attempt += 1
+
+
+# gh binaries that rejected `run list --commit`; those fall back to a wider
+# unfiltered window and filter on headSha locally.
+_GH_WITHOUT_COMMIT_FILTER: set[str] = set()
+_RUN_LIST_FIELDS = "databaseId,headSha,status,conclusion,url,workflowName,createdAt"
 
 
 def _find_workflow_run(
@@ -321,21 +366,21 @@ def _find_workflow_run(
     gh_bin: str,
     timeout_seconds: int,
 ) -> dict[str, Any] | None:
-    completed = run_process(
-        [
-            gh_bin,
-            "run",
-            "list",
-            "--workflow",
-            workflow_file,
-            "--limit",
-            "20",
-            "--json",
-            "databaseId,headSha,status,conclusion,url,workflowName,createdAt",
-        ],
-        cwd=repo_root,
-        timeout_seconds=timeout_seconds,
-    )
+    command = [gh_bin, "run", "list", "--workflow", workflow_file]
+    if gh_bin not in _GH_WITHOUT_COMMIT_FILTER:
+        completed = run_process(
+            [*command, "--commit", commit_sha, "--limit", "20", "--json", _RUN_LIST_FIELDS],
+            cwd=repo_root,
+            timeout_seconds=timeout_seconds,
+        )
+        if completed.returncode != 0 and "--commit" in (completed.stderr or ""):
+            _GH_WITHOUT_COMMIT_FILTER.add(gh_bin)
+    if gh_bin in _GH_WITHOUT_COMMIT_FILTER:
+        completed = run_process(
+            [*command, "--limit", "100", "--json", _RUN_LIST_FIELDS],
+            cwd=repo_root,
+            timeout_seconds=timeout_seconds,
+        )
     if completed.returncode != 0:
         raise DownstreamSyncError(
             f"Failed to query downstream workflow runs with {gh_bin}: "
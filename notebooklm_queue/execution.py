@@ -30,6 +30,7 @@ from .failure_modes import (
     FAILURE_MODE_RATE_LIMIT,
     classify_failure_mode,
 )
+from .output_inventory import OutputInventory, load_output_inventory
 from .processes import run_phase_command
 from .store import QueueStore, parse_utcish_iso, utc_now_iso
 DEFAULT_TRANSIENT_RETRY_SECONDS = 900
@@ -348,30 +349,12 @@ def _failure_details(*, failure_mode_code: str | None) -> dict[str, Any]:
     return {"failure_mode": failure_mode_code}
 
 
-def _find_lecture_dirs(*, output_root: Path, lecture_key: str) -> list[Path]:
+def _find_lecture_dirs(*, output_root: Path, lecture_key: str, inventory: OutputInventory) -> list[Path]:
     if not output_root.exists():
         return []
-    matches: list[Path] = []
-    exact = output_root / lecture_key
-    if exact.exists() and exact.is_dir():
-        matches.append(exact)
-    for candidate in sorted(output_root.glob(f"{lecture_key}*"), key=lambda path: path.name):
-        if candidate.is_dir() and candidate not in matches:
-            matches.append(candidate)
-    return matches
-
-
-def _artifact_type_for_output(path: Path) -> str | None:
-    name = path.name
-    if name.endswith(".request.json") or name.endswith(".request.error.json"):
-        return None
-    if path.suffix == ".mp3":
-        return "audio"
-    if path.suffix == ".png":
-        return "infographic"
-    if path.suffix == ".json":
-        return "quiz"
-    return None
+    candidates = [path for path in inventory.subdirs(output_root) if path.name.startswith(lecture_key)]
+    exact = [path for path in candidates if path.name == lecture_key]
+    return exact + sorted((path for path in candidates if path.name != lecture_key), key=lambda path: path.name)
 
 
 def _relative_to_repo(repo_root: Path, path: Path) -> str:
@@ -392,26 +375,29 @@ def _collect_output_progress(
     pending_request_logs: list[str] = []
     error_request_logs: list[str] = []
     publishable_artifacts: list[dict[str, Any]] = []
-    lecture_dirs = _find_lecture_dirs(output_root=adapter.output_root_path(repo_root), lecture_key=lecture_key)
+    output_root = adapter.output_root_path(repo_root)
+    inventory = load_output_inventory(output_root)
+    lecture_dirs = _find_lecture_dirs(output_root=output_root, lecture_key=lecture_key, inventory=inventory)
 
     for lecture_dir in lecture_dirs:
-        for request_log in sorted(lecture_dir.glob("*.request.json"), key=lambda path: path.name):
-            pending_request_logs.append(_relative_to_repo(repo_root, request_log))
-        for error_log in sorted(lecture_dir.glob("*.request.error.json"), key=lambda path: path.name):
-            error_request_logs.append(_relative_to_repo(repo_root, error_log))
-        for artifact_path in lecture_dir.iterdir():
-            if not artifact_path.is_file():
+        for entry in inventory.files(lecture_dir):
+            if entry.request_status == "queued":
+                pending_request_logs.append(_relative_to_repo(repo_root, entry.path))
+                continue
+            if entry.request_status == "error":
+                error_request_logs.append(_relative_to_repo(repo_root, entry.path))
                 continue
-            artifact_type = _artifact_type_for_output(artifact_path)
-            if artifact_type not in counts:
+            if entry.artifact_type not in counts:
                 continue
-            counts[artifact_type] += 1
+            counts[entry.artifact_type] += 1
             publishable_artifacts.append(
                 {
-                    "relative_path": _relative_to_repo(repo_root, artifact_path),
-                    "artifact_type": artifact_type,
-                    "size": artifact_path.stat().st_size,
-                    "sha256": _sha256_file(artifact_path),
+                    "relative_path": _relative_to_repo(repo_root, entry.path),
+                    "artifact_type": entry.artifact_type,
+                    # Stat directly: the artifact is hashed below, and an in-place rewrite
+                    # would not show up in the inventory's directory-mtime refresh.
+                    "size": entry.path.stat().st_size,
+                    "sha256": _sha256_file(entry.path),
                 }
             )
 
@@ -581,9 +567,12 @@ def _quarantine_stale_request_logs(
     abandoned_at = now.strftime("%Y%m%dT%H%M%SZ")
     current_profiles = _load_current_profiles_from_env()
     quarantined: list[dict[str, Any]] = []
-    lecture_dirs = _find_lecture_dirs(output_root=adapter.output_root_path(repo_root), lecture_key=lecture_key)
+    output_root = adapter.output_root_path(repo_root)
+    inventory = load_output_inventory(output_root)
+    lecture_dirs = _find_lecture_dirs(output_root=output_root, lecture_key=lecture_key, inventory=inventory)
     for lecture_dir in lecture_dirs:
-        for request_log in sorted(lecture_dir.glob("*.request.json"), key=lambda path: path.name):
+        request_logs = [entry.path for entry in inventory.files(lecture_dir) if entry.request_status == "queued"]
+        for request_log in request_logs:
             payload = _load_request_log(request_log)
             artifact_type = str(payload.get("artifact_type") or "audio")
             if artifact_type not in content_types:
@@ -13,6 +13,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from .source_chunking import select_source_text
+from .source_text_cache import SourceTextError, read_source_text as read_cached_source_text
+from .usage_ledger import track_generation
+
 DEFAULT_GEMINI_PREPROCESSING_MODEL = "gemini-3.1-pro-preview"
 GEMINI_FILE_POLL_INTERVAL_SECONDS = 2
 GEMINI_FILE_POLL_TIMEOUT_SECONDS = 180
@@ -280,15 +284,21 @@ def generation_config_metadata() -> dict[str, Any]:
     }
 
 
-def _inline_source_payload(path: Path, *, max_chars: int) -> str:
+def _inline_source_payload(
+    path: Path,
+    *,
+    max_chars: int,
+    relevance_terms: list[str] | None = None,
+    source_selection: list[dict[str, Any]] | None = None,
+) -> str:
     try:
-        text = path.read_text(encoding="utf-8", errors="replace")
-    except OSError as exc:
-        raise GeminiPreprocessingInputError(f"failed to read source file {path}: {exc}") from exc
-    text = text.strip()
-    if len(text) > max_chars:
-        text = text[:max_chars].rstrip() + "\n[...truncated...]"
-    return "\n".join([f"### Source file: {path.name}", text])
+        text = read_cached_source_text(path)
+    except SourceTextError as exc:
+        raise GeminiPreprocessingInputError(str(exc)) from exc
+    selection = select_source_text(text, max_chars=max_chars, relevance_terms=relevance_terms)
+    if source_selection is not None:
+        source_selection.append({"source_name": path.name, **selection.to_payload()})
+    return "\n".join([f"### Source file: {path.name}", selection.text])
 
 
 def _build_contents(
@@ -297,6 +307,8 @@ def _build_contents(
     user_prompt: str,
     source_paths: list[Path],
     max_inline_source_chars: int,
+    relevance_terms: list[str] | None = None,
+    source_selection: list[dict[str, Any]] | None = None,
 ) -> tuple[list[object], list[GeminiUploadedFile]]:
     contents: list[object] = [backend.support.Part.from_text(text=user_prompt)]
     uploaded_files: list[GeminiUploadedFile] = []
@@ -326,7 +338,12 @@ def _build_contents(
         else:
             contents.append(
                 backend.support.Part.from_text(
-                    text=_inline_source_payload(path, max_chars=max_inline_source_chars)
+                    text=_inline_source_payload(
+                        path,
+                        max_chars=max_inline_source_chars,
+                        relevance_terms=relevance_terms,
+                        source_selection=source_selection,
+                    )
                 )
             )
     return contents, uploaded_files
@@ -379,61 +396,68 @@ def generate_json(
     thinking_level: str = DEFAULT_GEMINI_THINKING_LEVEL,
     retry_count: int = 1,
     retry_sleep_seconds: int = GEMINI_RATE_LIMIT_RETRY_SECONDS,
+    relevance_terms: list[str] | None = None,
+    source_selection: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     if backend.provider != "gemini":
         raise GeminiPreprocessingInputError(f"unsupported preprocessing provider: {backend.provider}")
     source_paths = source_paths or []
 
-    for attempt in range(retry_count + 1):
-        uploaded_files: list[GeminiUploadedFile] = []
-        try:
-            contents, uploaded_files = _build_contents(
-                backend=backend,
-                user_prompt=user_prompt,
-                source_paths=source_paths,
-                max_inline_source_chars=max_inline_source_chars,
-            )
-            response = backend.client.models.generate_content(
-                model=backend.model,
-                contents=contents,
-                config=build_generate_content_config(
-                    support=backend.support,
-                    system_instruction=system_instruction,
-                    max_output_tokens=max_output_tokens,
-                    response_json_schema=response_json_schema,
-                    thinking_level=thinking_level,
-                ),
-            )
-            text = extract_gemini_text(response)
-            if not text:
-                diagnostics = gemini_response_diagnostics(response)
-                suffix = f" ({diagnostics})" if diagnostics else ""
-                raise GeminiPreprocessingGenerationError(f"Gemini returned an empty response{suffix}")
+    with track_generation(provider="gemini", model=backend.model) as usage:
+        for attempt in range(retry_count + 1):
+            usage.attempts = attempt + 1
+            uploaded_files: list[GeminiUploadedFile] = []
             try:
-                return parse_json_response(text)
-            except GeminiPreprocessingGenerationError as exc:
-                diagnostics = gemini_response_diagnostics(response)
-                if diagnostics:
-                    raise GeminiPreprocessingGenerationError(f"{exc} ({diagnostics})") from exc
-                raise
-        except Exception as exc:
-            if _is_non_retryable_quota_error(exc):
-                raise GeminiPreprocessingGenerationError(_quota_error_summary(exc)) from exc
-            if _is_rate_limit_error(exc) and attempt < retry_count:
-                print(
-                    "Gemini preprocessing hit a rate limit; waiting before retrying.",
-                    file=sys.stderr,
+                contents, uploaded_files = _build_contents(
+                    backend=backend,
+                    user_prompt=user_prompt,
+                    source_paths=source_paths,
+                    max_inline_source_chars=max_inline_source_chars,
+                    relevance_terms=relevance_terms,
+                    source_selection=source_selection if attempt == 0 else None,
+                )
+                response = backend.client.models.generate_content(
+                    model=backend.model,
+                    contents=contents,
+                    config=build_generate_content_config(
+                        support=backend.support,
+                        system_instruction=system_instruction,
+                        max_output_tokens=max_output_tokens,
+                        response_json_schema=response_json_schema,
+                        thinking_level=thinking_level,
+                    ),
                 )
-                time.sleep(retry_sleep_seconds)
-                continue
-            if isinstance(exc, GeminiPreprocessingError):
-                raise
-            raise GeminiPreprocessingGenerationError(f"Gemini preprocessing failed: {exc}") from exc
-        finally:
-            if uploaded_files:
-                delete_gemini_uploaded_files(backend.client, uploaded_files)
-
-    raise GeminiPreprocessingGenerationError("Gemini preprocessing failed after retries")
+                usage.add_response(response)
+                text = extract_gemini_text(response)
+                if not text:
+                    diagnostics = gemini_response_diagnostics(response)
+                    suffix = f" ({diagnostics})" if diagnostics else ""
+                    raise GeminiPreprocessingGenerationError(f"Gemini returned an empty response{suffix}")
+                try:
+                    return parse_json_response(text)
+                except GeminiPreprocessingGenerationError as exc:
+                    diagnostics = gemini_response_diagnostics(response)
+                    if diagnostics:
+                        raise GeminiPreprocessingGenerationError(f"{exc} ({diagnostics})") from exc
+                    raise
+            except Exception as exc:
+                if _is_non_retryable_quota_error(exc):
+                    raise GeminiPreprocessingGenerationError(_quota_error_summary(exc)) from exc
+                if _is_rate_limit_error(exc) and attempt < retry_count:
+                    print(
+                        "Gemini preprocessing hit a rate limit; waiting before retrying.",
+                        file=sys.stderr,
+                    )
+                    time.sleep(retry_sleep_seconds)
+                    continue
+                if isinstance(exc, GeminiPreprocessingError):
+                    raise
+                raise GeminiPreprocessingGenerationError(f"Gemini preprocessing failed: {exc}") from exc
+            finally:
+                if uploaded_files:
+                    delete_gemini_uploaded_files(backend.client, uploaded_files)
+
+        raise GeminiPreprocessingGenerationError("Gemini preprocessing failed after retries")
 
 
 def preflight_gemini_json_generation(
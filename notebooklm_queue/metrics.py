@@ -0,0 +1,236 @@
+"""OpenMetrics and Prometheus text export of queue state, phase durations and failure modes."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterable
+
+from .profile_capacity import inspect_profile_capacity
+from .store import QueueStore, _load_json, _write_text_atomic
+
+METRICS_PATH_ENV_VAR = "NOTEBOOKLM_QUEUE_METRICS_PATH"
+METRICS_DISABLED_VALUES = {"0", "off", "none", "false"}
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+MANIFEST_SUMMARY_VERSION = 1
+UNCLASSIFIED_FAILURE_MODE = "unclassified"
+PHASE_DURATION_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0, 7200.0)
+
+
+@dataclass(slots=True)
+class MetricFamily:
+    name: str
+    type: str
+    help: str
+    samples: list[tuple[str, dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, labels: dict[str, str], value: float, *, suffix: str = "") -> None:
+        self.samples.append((suffix, labels, value))
+
+
+def default_metrics_path(store: QueueStore) -> Path | None:
+    """Metrics file location, or ``None`` when ``NOTEBOOKLM_QUEUE_METRICS_PATH=off``."""
+
+    raw = str(os.environ.get(METRICS_PATH_ENV_VAR) or "").strip()
+    if raw.lower() in METRICS_DISABLED_VALUES:
+        return None
+    return Path(raw).expanduser() if raw else store.root / "metrics" / "queue.prom"
+
+
+def _manifest_summary(payload: dict[str, Any]) -> dict[str, Any]:
+    phases = list(payload.get("phases") or [])
+    # Publish manifests keep their metadata-rebuild phases in a nested block.
+    phases.extend(dict(payload.get("metadata") or {}).get("phases") or [])
+    failure_mode = ""
+    if payload.get("status") == "failed" and "run_id" in payload:
+        failure_mode = str(payload.get("failure_mode") or UNCLASSIFIED_FAILURE_MODE)
+    return {
+        "phases": [
+            [str(phase.get("name") or "unknown"), float(phase.get("duration_seconds") or 0.0)]
+            for phase in phases
+            if isinstance(phase, dict) and phase.get("duration_seconds") is not None
+        ],
+        "failure_mode": failure_mode,
+    }
+
+
+def _load_manifest_summaries(store: QueueStore) -> dict[str, dict[str, Any]]:
+    """Summarize every run and publish manifest, re-reading only files whose mtime changed.
+
+    Manifests carry full phase stdout/stderr, so the extracted phase durations and
+    failure mode are cached under ``metrics/manifest-summaries.json``.
+    """
+
+    cache_path = store.root / "metrics" / "manifest-summaries.json"
+    cached = _load_json(cache_path)
+    entries = cached.get("manifests") if cached.get("version") == MANIFEST_SUMMARY_VERSION else None
+    previous: dict[str, Any] = entries if isinstance(entries, dict) else {}
+    summaries: dict[str, dict[str, Any]] = {}
+    changed = False
+    for root in (store.runs_root, store.publish_root):
+        if not root.exists():
+            continue
+        for path in sorted(root.glob("*/*.json")):
+            key = path.relative_to(store.root).as_posix()
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+            except OSError:
+                continue
+            entry = previous.get(key)
+            if not isinstance(entry, dict) or entry.get("mtime_ns") != mtime_ns:
+                entry = {"mtime_ns": mtime_ns, "show_slug": path.parent.name, **_manifest_summary(_load_json(path))}
+                changed = True
+            summaries[key] = entry
+    if changed or len(summaries) != len(previous):
+        try:
+            _write_text_atomic(
+                cache_path,
+                json.dumps({"version": MANIFEST_SUMMARY_VERSION, "manifests": summaries}, separators=(",", ":")) + "\n",
+            )
+        except OSError:
+            pass
+    return summaries
+
+
+def _job_families(store: QueueStore) -> list[MetricFamily]:
+    jobs = MetricFamily("notebooklm_queue_jobs", "gauge", "Jobs per show and queue state.")
+    attempts = MetricFamily(
+        "notebooklm_queue_job_attempts", "gauge", "Execution attempts summed over current jobs per show."
+    )
+    state_counts: Counter[tuple[str, str]] = Counter()
+    attempt_counts: Counter[str] = Counter()
+    for job in store.list_jobs():
+        show_slug = str(job.get("show_slug") or "unknown")
+        state_counts[(show_slug, str(job.get("state") or "unknown"))] += 1
+        attempt_counts[show_slug] += int(job.get("attempt_count") or 0)
+    for (show_slug, state), count in sorted(state_counts.items()):
+        jobs.add({"show": show_slug, "state": state}, count)
+    for show_slug, count in sorted(attempt_counts.items()):
+        attempts.add({"show": show_slug}, count)
+    return [jobs, attempts]
+
+
+def _manifest_families(store: QueueStore) -> list[MetricFamily]:
+    durations = MetricFamily(
+        "notebooklm_queue_phase_duration_seconds",
+        "histogram",
+        "Duration of external phase commands recorded in run and publish manifests.",
+    )
+    failures = MetricFamily(
+        "notebooklm_queue_run_failures", "counter", "Failed execution runs per show and failure mode."
+    )
+    observations: dict[tuple[str, str], list[float]] = defaultdict(list)
+    failure_counts: Counter[tuple[str, str]] = Counter()
+    for summary in _load_manifest_summaries(store).values():
+        show_slug = str(summary.get("show_slug") or "unknown")
+        for name, duration in summary.get("phases") or []:
+            observations[(show_slug, str(name))].append(float(duration))
+        if summary.get("failure_mode"):
+            failure_counts[(show_slug, str(summary["failure_mode"]))] += 1
+    for (show_slug, phase), values in sorted(observations.items()):
+        labels = {"show": show_slug, "phase": phase}
+        for bound in PHASE_DURATION_BUCKETS:
+            count = sum(value <= bound for value in values)
+            durations.add({**labels, "le": _format_value(bound)}, count, suffix="_bucket")
+        durations.add({**labels, "le": "+Inf"}, len(values), suffix="_bucket")
+        durations.add(labels, len(values), suffix="_count")
+        durations.add(labels, round(sum(values), 3), suffix="_sum")
+    for (show_slug, mode), count in sorted(failure_counts.items()):
+        failures.add({"show": show_slug, "failure_mode": mode}, count, suffix="_total")
+    return [durations, failures]
+
+
+def _profile_families(capacity: dict[str, Any]) -> list[MetricFamily]:
+    status = MetricFamily(
+        "notebooklm_profile_status", "gauge", "Current status of each NotebookLM profile (1 = active)."
+    )
+    successes = MetricFamily("notebooklm_profile_successes", "counter", "Successful runs recorded per profile.")
+    failures = MetricFamily("notebooklm_profile_failures", "counter", "Failed runs recorded per profile.")
+    for profile in capacity.get("profiles") or []:
+        labels = {"profile": str(profile.get("name") or "unknown")}
+        status.add({**labels, "status": str(profile.get("status") or "unknown")}, 1)
+        successes.add(labels, int(profile.get("success_count") or 0), suffix="_total")
+        failures.add(labels, int(profile.get("failure_count") or 0), suffix="_total")
+    return [status, successes, failures]
+
+
+def collect_queue_metrics(*, store: QueueStore, capacity: dict[str, Any] | None = None) -> list[MetricFamily]:
+    """Build metric families from the store's indexes, manifests and profile state."""
+
+    return [
+        *_job_families(store),
+        *_manifest_families(store),
+        *_profile_families(capacity if capacity is not None else inspect_profile_capacity()),
+    ]
+
+
+def _format_value(value: float) -> str:
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render(families: Iterable[MetricFamily], *, openmetrics: bool) -> str:
+    lines: list[str] = []
+    for family in families:
+        # The classic text format names a counter family after its ``_total`` samples.
+        name = family.name if openmetrics or family.type != "counter" else f"{family.name}_total"
+        lines.append(f"# TYPE {name} {family.type}")
+        lines.append(f"# HELP {name} {_escape_label(family.help)}")
+        for suffix, labels, value in family.samples:
+            label_text = ",".join(f'{key}="{_escape_label(str(item))}"' for key, item in labels.items())
+            rendered = f"{family.name}{suffix}{{{label_text}}}" if label_text else f"{family.name}{suffix}"
+            lines.append(f"{rendered} {_format_value(value)}")
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def render_openmetrics(families: Iterable[MetricFamily]) -> str:
+    return _render(families, openmetrics=True)
+
+
+def render_prometheus_text(families: Iterable[MetricFamily]) -> str:
+    """Classic Prometheus text format, as parsed by node_exporter's textfile collector."""
+
+    return _render(families, openmetrics=False)
+
+
+def write_metrics_file(*, store: QueueStore, path: Path | None = None) -> Path | None:
+    """Atomically rewrite the metrics file in Prometheus text format; ``None`` when export is disabled."""
+
+    target = path if path is not None else default_metrics_path(store)
+    if target is None:
+        return None
+    _write_text_atomic(target, render_prometheus_text(collect_queue_metrics(store=store)))
+    return target
+
+
+def serve_metrics(*, store: QueueStore, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+    """Return an HTTP server answering ``GET /metrics`` with freshly collected metrics.
+
+    The caller runs ``serve_forever`` (or a thread around it) and shuts it down.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_openmetrics(collect_queue_metrics(store=store)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            return None
+
+    return ThreadingHTTPServer((host, int(port)), Handler)
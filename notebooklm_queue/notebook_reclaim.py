@@ -25,6 +25,8 @@ from .profile_capacity import (
     _resolve_profile_state_file,
     _resolve_profiles_file,
 )
+from .profile_leases import ProfileAllocator
+from .request_log_index import RequestLogIndex, load_request_log_index
 from .store import QueueLockError, QueueStore, _write_json_atomic
 
 ClientFactory = Callable[[Path], Awaitable[Any]]
@@ -46,6 +48,7 @@ class NotebookReclaimOptions:
     profiles: tuple[str, ...] = ()
     repo_root: Path = field(default_factory=Path.cwd)
     request_log_roots: tuple[Path, ...] = ()
+    request_log_index_path: Path | None = None
     target_free_slots: int = DEFAULT_TARGET_FREE_SLOTS
     max_deletions: int = DEFAULT_MAX_DELETIONS
     dry_run: bool = True
@@ -154,7 +157,7 @@ def _reclaim_notebooks_unlocked(
         _persist_reclaim_report(store=store, payload=result)
         return result
 
-    state, state_warnings = _load_profile_state(state_file)
+    _state, state_warnings = _load_profile_state(state_file)
     if state_warnings:
         result["warnings"] = state_warnings
 
@@ -165,6 +168,14 @@ def _reclaim_notebooks_unlocked(
         requested = set(requested_profiles)
         ordered_names = [name for name in ordered_names if name in requested]
 
+    # One request-log scan per pass; every candidate notebook queries the index.
+    request_log_index = load_request_log_index(request_log_roots, path=options.request_log_index_path)
+    result["request_log_index"] = {
+        "path": str(request_log_index.path),
+        "scanned_dirs": request_log_index.scanned_dirs,
+        "parsed_logs": request_log_index.parsed_logs,
+    }
+
     profile_results: list[dict[str, Any]] = []
     for name in ordered_names:
         storage_path = profiles[name]
@@ -174,22 +185,24 @@ def _reclaim_notebooks_unlocked(
                 storage_path=storage_path,
                 client_factory=client_factory,
                 request_log_roots=request_log_roots,
+                request_log_index=request_log_index,
                 target_free_slots=max(int(options.target_free_slots), 0),
                 max_deletions=max(int(options.max_deletions), 0),
                 dry_run=bool(options.dry_run),
             )
         )
         profile_results.append(profile_result)
-        _record_profile_reclaim_result(
-            state,
-            name,
-            profile_result=profile_result,
-            now=current,
-        )
 
-    state["updated_at"] = current.replace(microsecond=0).isoformat()
-    state["updated_by"] = "notebooklm_queue.reclaim_notebooks"
-    _write_json_atomic(state_file, state)
+    # The reclaim pass can take minutes; apply its fields to a fresh read under the
+    # profile-state flock so leases and counters written meanwhile survive.
+    ProfileAllocator(state_file).update_profiles(
+        {
+            item["name"]: _profile_reclaim_fields(profile_result=item, now=current)
+            for item in profile_results
+        },
+        updated_at=current.replace(microsecond=0).isoformat(),
+        updated_by="notebooklm_queue.reclaim_notebooks",
+    )
 
     result["profiles"] = profile_results
     result["summary"] = _summarize_results(profile_results)
@@ -207,6 +220,7 @@ async def _reclaim_one_profile(
     storage_path: Path,
     client_factory: ClientFactory,
     request_log_roots: tuple[Path, ...],
+    request_log_index: RequestLogIndex,
     target_free_slots: int,
     max_deletions: int,
     dry_run: bool,
@@ -276,6 +290,7 @@ async def _reclaim_one_profile(
                     client=client,
                     notebook_id=str(getattr(candidate, "id", "") or ""),
                     request_log_roots=request_log_roots,
+                    request_log_index=request_log_index,
                 )
                 if blocker:
                     skipped.append(notebook_payload(candidate, reason=blocker))
@@ -341,29 +356,14 @@ def _request_log_roots(repo_root: Path, configured: tuple[Path, ...]) -> tuple[P
     return tuple(resolved)
 
 
-def _record_profile_reclaim_result(
-    state: dict[str, Any],
-    profile: str,
-    *,
-    profile_result: dict[str, Any],
-    now: datetime,
-) -> None:
-    profiles = state.setdefault("profiles", {})
-    if not isinstance(profiles, dict):
-        profiles = {}
-        state["profiles"] = profiles
-    entry = profiles.get(profile)
-    if not isinstance(entry, dict):
-        entry = {}
-        profiles[profile] = entry
-    entry["last_reclaim_attempt"] = now.timestamp()
-    entry["last_reclaim_status"] = profile_result.get("status")
-    entry["last_reclaim_deleted_count"] = int(profile_result.get("deleted_count") or 0)
-    entry["last_reclaim_dry_run"] = bool(profile_result.get("dry_run"))
-    if profile_result.get("status") == "failed":
-        entry["last_reclaim_error"] = profile_result.get("error")
-    else:
-        entry["last_reclaim_error"] = None
+def _profile_reclaim_fields(*, profile_result: dict[str, Any], now: datetime) -> dict[str, Any]:
+    return {
+        "last_reclaim_attempt": now.timestamp(),
+        "last_reclaim_status": profile_result.get("status"),
+        "last_reclaim_deleted_count": int(profile_result.get("deleted_count") or 0),
+        "last_reclaim_dry_run": bool(profile_result.get("dry_run")),
+        "last_reclaim_error": profile_result.get("error") if profile_result.get("status") == "failed" else None,
+    }
 
 
 def _summarize_results(results: list[dict[str, Any]]) -> dict[str, int]:
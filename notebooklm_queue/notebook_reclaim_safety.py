@@ -3,18 +3,24 @@
 from __future__ import annotations
 
 from datetime import datetime
-import json
 from pathlib import Path
 from typing import Any
 
+from .request_log_index import RequestLogIndex, load_request_log_index
+
 
 async def reclaim_blocker_for_notebook(
     *,
     client: Any,
     notebook_id: str,
     request_log_roots: tuple[Path, ...],
+    request_log_index: RequestLogIndex | None = None,
 ) -> str | None:
-    """Return a human-readable reason when a notebook should not be deleted."""
+    """Return a human-readable reason when a notebook should not be deleted.
+
+    Pass a ``request_log_index`` refreshed once per pass when checking several
+    notebooks; otherwise the index is refreshed for this one call.
+    """
 
     if not notebook_id:
         return "missing notebook id"
@@ -38,45 +44,39 @@ async def reclaim_blocker_for_notebook(
             )
             return f"pending artifacts still exist: {labels}"
 
-    undownloaded_logs = find_undownloaded_request_logs(request_log_roots, notebook_id)
+    undownloaded_logs = find_undownloaded_request_logs(
+        request_log_roots,
+        notebook_id,
+        index=request_log_index,
+    )
     if undownloaded_logs:
         sample = ", ".join(str(path) for path in undownloaded_logs[:3])
         return f"local request logs still point to missing outputs: {sample}"
     return None
 
 
-def find_undownloaded_request_logs(search_roots: tuple[Path, ...], notebook_id: str) -> list[Path]:
+def find_undownloaded_request_logs(
+    search_roots: tuple[Path, ...],
+    notebook_id: str,
+    *,
+    index: RequestLogIndex | None = None,
+) -> list[Path]:
     """Find local request logs for a notebook whose target output is absent or empty."""
 
+    if index is None:
+        index = load_request_log_index(search_roots)
     matches: list[Path] = []
-    for search_root in search_roots:
-        if not search_root.exists():
+    for record in index.records_for(notebook_id):
+        output_path = record.output_path
+        if output_path is None or not output_path.exists():
+            matches.append(record.log_path)
             continue
-        for log_path in search_root.rglob("*.request.json"):
-            try:
-                payload = json.loads(log_path.read_text(encoding="utf-8"))
-            except (OSError, UnicodeDecodeError, json.JSONDecodeError):
-                continue
-            if not isinstance(payload, dict):
-                continue
-            if str(payload.get("notebook_id") or "").strip() != notebook_id:
-                continue
-            output_value = str(payload.get("output_path") or "").strip()
-            if not output_value:
-                matches.append(log_path)
-                continue
-            output_path = Path(output_value).expanduser()
-            if not output_path.is_absolute():
-                output_path = (search_root / output_path).resolve()
-            if not output_path.exists():
-                matches.append(log_path)
+        try:
+            if output_path.is_file() and output_path.stat().st_size > 0:
                 continue
-            try:
-                if output_path.is_file() and output_path.stat().st_size > 0:
-                    continue
-            except OSError:
-                pass
-            matches.append(log_path)
+        except OSError:
+            pass
+        matches.append(record.log_path)
     return matches
 
 
@@ -7,18 +7,20 @@ import os
 import re
 import shutil
 import subprocess
-import tempfile
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
 
+from .source_chunking import SELECTION_STRATEGY_FULL, select_source_text
+from .source_text_cache import SourceTextError, read_source_text as read_cached_source_text
+from .usage_ledger import track_generation
+
 DEFAULT_OPENAI_PREPROCESSING_MODEL = "gpt-5.5"
 DEFAULT_OPENAI_REASONING_EFFORT = "medium"
 DEFAULT_MAX_INLINE_SOURCE_CHARS = 180000
 DEFAULT_MAX_OUTPUT_TOKENS = 8192
 DEFAULT_OPENAI_REQUEST_TIMEOUT_SECONDS = 180
-DEFAULT_OPENAI_OCR_TIMEOUT_SECONDS = 600
 OPENAI_PREPROCESSING_GENERATION_CONFIG_VERSION = "openai-preprocessing-generation-config-v1"
 OPENAI_TRANSIENT_RETRY_DELAYS_SECONDS = (5, 15, 30)
 OPENAI_BITWARDEN_SECRET_KEYS = (
@@ -233,89 +235,25 @@ def _emit_progress(progress_logger: ProgressLogger | None, message: str) -> None
 
 
 def _read_source_text(path: Path, *, progress_logger: ProgressLogger | None = None) -> str:
-    suffix = path.suffix.lower()
-    if suffix == ".pdf":
-        try:
-            from pypdf import PdfReader
-        except ImportError as exc:  # pragma: no cover - depends on local environment
-            raise OpenAIPreprocessingInputError("pypdf package not installed - pip install pypdf") from exc
-        try:
-            reader = PdfReader(str(path))
-        except Exception as exc:
-            raise OpenAIPreprocessingInputError(f"failed to open PDF source file {path}: {exc}") from exc
-        page_chunks: list[str] = []
-        for index, page in enumerate(reader.pages, start=1):
-            try:
-                extracted = page.extract_text() or ""
-            except Exception:
-                extracted = ""
-            extracted = extracted.strip()
-            if extracted:
-                page_chunks.append(f"### Page {index}\n{extracted}")
-        if page_chunks:
-            return "\n\n".join(page_chunks)
-        _emit_progress(
-            progress_logger,
-            f"[openai_preprocessing] no extractable PDF text in {path.name}; falling back to OCR",
-        )
-        return _ocr_pdf_text(path, progress_logger=progress_logger)
     try:
-        return path.read_text(encoding="utf-8", errors="replace").strip()
-    except OSError as exc:
-        raise OpenAIPreprocessingInputError(f"failed to read source file {path}: {exc}") from exc
-
-
-def _ocr_pdf_text(path: Path, *, progress_logger: ProgressLogger | None = None) -> str:
-    if shutil.which("ocrmypdf") is None:
-        raise OpenAIPreprocessingInputError(
-            f"failed to extract text from PDF source file {path} and ocrmypdf is not available"
-        )
-    with tempfile.TemporaryDirectory(prefix="openai-preprocessing-ocr-") as temp_dir_str:
-        temp_dir = Path(temp_dir_str)
-        sidecar_path = temp_dir / "ocr.txt"
-        output_pdf_path = temp_dir / "ocr.pdf"
-        try:
-            _emit_progress(progress_logger, f"[openai_preprocessing] OCR starting for {path.name}")
-            result = subprocess.run(
-                [
-                    "ocrmypdf",
-                    "--skip-text",
-                    "--sidecar",
-                    str(sidecar_path),
-                    str(path),
-                    str(output_pdf_path),
-                ],
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=DEFAULT_OPENAI_OCR_TIMEOUT_SECONDS,
-            )
-        except subprocess.TimeoutExpired as exc:
-            raise OpenAIPreprocessingInputError(
-                f"OCR timed out for PDF source file {path} after {DEFAULT_OPENAI_OCR_TIMEOUT_SECONDS}s"
-            ) from exc
-        except OSError as exc:
-            raise OpenAIPreprocessingInputError(f"failed to OCR PDF source file {path}: {exc}") from exc
-        if result.returncode != 0:
-            detail = (result.stderr or result.stdout or "").strip()
-            raise OpenAIPreprocessingInputError(
-                f"failed to OCR PDF source file {path}: {detail or f'exit code {result.returncode}'}"
-            )
-        try:
-            text = sidecar_path.read_text(encoding="utf-8", errors="replace").strip()
-        except OSError as exc:
-            raise OpenAIPreprocessingInputError(f"failed to read OCR sidecar for {path}: {exc}") from exc
-        if not text:
-            raise OpenAIPreprocessingInputError(f"OCR produced no text for PDF source file {path}")
-        _emit_progress(progress_logger, f"[openai_preprocessing] OCR finished for {path.name} ({len(text)} chars)")
-        return text
+        return read_cached_source_text(path, progress_logger=progress_logger)
+    except SourceTextError as exc:
+        raise OpenAIPreprocessingInputError(str(exc)) from exc
 
 
-def _inline_source_payload(path: Path, *, max_chars: int) -> str:
-    text = _read_source_text(path)
-    if len(text) > max_chars:
-        text = text[:max_chars].rstrip() + "\n[...truncated...]"
-    return "\n".join([f"### Source file: {path.name}", text])
+def _inline_source_payload(
+    path: Path,
+    *,
+    max_chars: int,
+    relevance_terms: list[str] | None = None,
+    source_selection: list[dict[str, Any]] | None = None,
+) -> str:
+    return _inline_source_payload_with_progress(
+        path,
+        max_chars=max_chars,
+        relevance_terms=relevance_terms,
+        source_selection=source_selection,
+    )
 
 
 def _build_user_prompt_with_sources(
@@ -323,6 +261,8 @@ def _build_user_prompt_with_sources(
     user_prompt: str,
     source_paths: list[Path],
     max_inline_source_chars: int,
+    relevance_terms: list[str] | None = None,
+    source_selection: list[dict[str, Any]] | None = None,
     progress_logger: ProgressLogger | None = None,
 ) -> str:
     parts = [user_prompt.strip()]
@@ -333,6 +273,8 @@ def _build_user_prompt_with_sources(
             _inline_source_payload_with_progress(
                 path,
                 max_chars=max_inline_source_chars,
+                relevance_terms=relevance_terms,
+                source_selection=source_selection,
                 progress_logger=progress_logger,
             )
         )
@@ -343,16 +285,23 @@ def _inline_source_payload_with_progress(
     path: Path,
     *,
     max_chars: int,
+    relevance_terms: list[str] | None = None,
+    source_selection: list[dict[str, Any]] | None = None,
     progress_logger: ProgressLogger | None = None,
 ) -> str:
     text = _read_source_text(path, progress_logger=progress_logger)
-    if len(text) > max_chars:
+    selection = select_source_text(text, max_chars=max_chars, relevance_terms=relevance_terms)
+    if selection.strategy != SELECTION_STRATEGY_FULL:
         _emit_progress(
             progress_logger,
-            f"[openai_preprocessing] truncating {path.name} from {len(text)} to {max_chars} chars",
+            (
+                f"[openai_preprocessing] fitting {path.name} from {len(text)} to {max_chars} chars "
+                f"({selection.strategy}, pages {list(selection.included_pages)})"
+            ),
         )
-        text = text[:max_chars].rstrip() + "\n[...truncated...]"
-    return "\n".join([f"### Source file: {path.name}", text])
+    if source_selection is not None:
+        source_selection.append({"source_name": path.name, **selection.to_payload()})
+    return "\n".join([f"### Source file: {path.name}", selection.text])
 
 
 def _response_text(response: Any) -> str:
@@ -441,8 +390,17 @@ def generate_json(
     max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
     max_inline_source_chars: int = DEFAULT_MAX_INLINE_SOURCE_CHARS,
     response_json_schema: dict[str, Any] | None = None,
+    relevance_terms: list[str] | None = None,
+    source_selection: list[dict[str, Any]] | None = None,
     progress_logger: ProgressLogger | None = None,
 ) -> dict[str, Any]:
+    """Call OpenAI for a JSON object.
+
+    ``relevance_terms`` switch over-budget sources from leading truncation to
+    BM25 chunk selection; per-source page coverage is appended to
+    ``source_selection`` when given.
+    """
+
     if backend.provider != "openai":
         raise OpenAIPreprocessingInputError(f"unsupported preprocessing provider: {backend.provider}")
     source_paths = source_paths or []
@@ -450,6 +408,8 @@ def generate_json(
         user_prompt=user_prompt,
         source_paths=source_paths,
         max_inline_source_chars=max_inline_source_chars,
+        relevance_terms=relevance_terms,
+        source_selection=source_selection,
         progress_logger=progress_logger,
     )
     text_config: dict[str, Any]
@@ -467,52 +427,55 @@ def generate_json(
 
     last_exc: Exception | None = None
     total_attempts = len(OPENAI_TRANSIENT_RETRY_DELAYS_SECONDS) + 1
-    for attempt, delay_seconds in enumerate((0, *OPENAI_TRANSIENT_RETRY_DELAYS_SECONDS), start=1):
-        if delay_seconds:
-            time.sleep(delay_seconds)
-        try:
-            _emit_progress(
-                progress_logger,
-                (
-                    f"[openai_preprocessing] OpenAI request attempt {attempt}/{total_attempts} "
-                    f"({backend.model}, timeout={DEFAULT_OPENAI_REQUEST_TIMEOUT_SECONDS}s)"
-                ),
-            )
-            response = backend.client.responses.create(
-                model=backend.model,
-                input=[
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user", "content": combined_user_prompt},
-                ],
-                max_output_tokens=max_output_tokens,
-                text=text_config,
-                reasoning={"effort": DEFAULT_OPENAI_REASONING_EFFORT},
-                timeout=DEFAULT_OPENAI_REQUEST_TIMEOUT_SECONDS,
-            )
-            text = _response_text(response)
-            if not text:
-                raise OpenAIPreprocessingGenerationError("OpenAI returned an empty response")
-            _emit_progress(progress_logger, f"[openai_preprocessing] OpenAI request succeeded on attempt {attempt}/{total_attempts}")
-            return parse_json_response(text)
-        except Exception as exc:
-            if isinstance(exc, OpenAIPreprocessingError):
-                last_exc = exc
-            else:
-                last_exc = OpenAIPreprocessingGenerationError(f"OpenAI preprocessing failed: {exc}")
-            if attempt >= total_attempts or not _is_retryable_openai_error(exc):
-                raise last_exc
-            next_delay_seconds = OPENAI_TRANSIENT_RETRY_DELAYS_SECONDS[attempt - 1]
-            _emit_progress(
-                progress_logger,
-                (
-                    f"[openai_preprocessing] transient OpenAI failure on attempt {attempt}/{total_attempts}: "
-                    f"{_exception_summary(exc)}; retrying in {next_delay_seconds}s"
-                ),
-            )
-            continue
-    if last_exc is not None:
-        raise last_exc
-    raise OpenAIPreprocessingGenerationError("OpenAI preprocessing failed after retries")
+    with track_generation(provider="openai", model=backend.model) as usage:
+        for attempt, delay_seconds in enumerate((0, *OPENAI_TRANSIENT_RETRY_DELAYS_SECONDS), start=1):
+            usage.attempts = attempt
+            if delay_seconds:
+                time.sleep(delay_seconds)
+            try:
+                _emit_progress(
+                    progress_logger,
+                    (
+                        f"[openai_preprocessing] OpenAI request attempt {attempt}/{total_attempts} "
+                        f"({backend.model}, timeout={DEFAULT_OPENAI_REQUEST_TIMEOUT_SECONDS}s)"
+                    ),
+                )
+                response = backend.client.responses.create(
+                    model=backend.model,
+                    input=[
+                        {"role": "system", "content": system_instruction},
+                        {"role": "user", "content": combined_user_prompt},
+                    ],
+                    max_output_tokens=max_output_tokens,
+                    text=text_config,
+                    reasoning={"effort": DEFAULT_OPENAI_REASONING_EFFORT},
+                    timeout=DEFAULT_OPENAI_REQUEST_TIMEOUT_SECONDS,
+                )
+                usage.add_response(response)
+                text = _response_text(response)
+                if not text:
+                    raise OpenAIPreprocessingGenerationError("OpenAI returned an empty response")
+                _emit_progress(progress_logger, f"[openai_preprocessing] OpenAI request succeeded on attempt {attempt}/{total_attempts}")
+                return parse_json_response(text)
+            except Exception as exc:
+                if isinstance(exc, OpenAIPreprocessingError):
+                    last_exc = exc
+                else:
+                    last_exc = OpenAIPreprocessingGenerationError(f"OpenAI preprocessing failed: {exc}")
+                if attempt >= total_attempts or not _is_retryable_openai_error(exc):
+                    raise last_exc
+                next_delay_seconds = OPENAI_TRANSIENT_RETRY_DELAYS_SECONDS[attempt - 1]
+                _emit_progress(
+                    progress_logger,
+                    (
+                        f"[openai_preprocessing] transient OpenAI failure on attempt {attempt}/{total_attempts}: "
+                        f"{_exception_summary(exc)}; retrying in {next_delay_seconds}s"
+                    ),
+                )
+                continue
+        if last_exc is not None:
+            raise last_exc
+        raise OpenAIPreprocessingGenerationError("OpenAI preprocessing failed after retries")
 
 
 def preflight_openai_json_generation(
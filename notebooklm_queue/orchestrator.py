@@ -9,6 +9,7 @@ from pathlib import Path
 import time
 from typing import Any, Callable
 
+from .alerts import drain_alert_spool
 from .constants import (
     BLOCKED_STATES,
     STATE_DOWNLOADING,
@@ -24,6 +25,7 @@ from .discovery import enqueue_discovered_jobs
 from .downstream import DownstreamOptions, sync_downstream_publication
 from .execution import ExecutionOptions, execute_job, repair_retryable_failures
 from .metadata import MetadataOptions, rebuild_repo_metadata
+from .metrics import write_metrics_file
 from .profile_capacity import inspect_profile_capacity, summarize_profile_capacity
 from .publish import PublishOptions, UploadOptions, prepare_publish_bundle, upload_publish_bundle
 from .repo_publish import RepoPublishOptions, publish_repo_artifacts
@@ -188,6 +190,13 @@ def drain_show_queue(
             break
 
     stopped_due_to_cap = iterations >= max_stage_runs and profile_capacity_wait is None
+    # Alerts spooled by failed stages are delivered here, after the stages have
+    # released their show locks; an overlapping drain elsewhere just reports lock_held.
+    alert_drain = drain_alert_spool(store=store, blocking=False)
+    try:
+        metrics_path = write_metrics_file(store=store)
+    except OSError:
+        metrics_path = None
     return {
         "show_slug": show_slug,
         "show_config_path": (
@@ -205,6 +214,13 @@ def drain_show_queue(
         "profile_capacity_wait": profile_capacity_wait,
         "stage_results": stage_results,
         "queue_summary": store.summarize_jobs(show_slug=show_slug),
+        "alert_drain": {
+            "status": alert_drain["status"],
+            "delivered_count": len(alert_drain["delivered"]),
+            "held_count": alert_drain["held"],
+            "failed_count": alert_drain["failed"],
+        },
+        "metrics_path": str(metrics_path) if metrics_path is not None else None,
     }
 
 
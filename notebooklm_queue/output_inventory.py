@@ -0,0 +1,258 @@
+"""Persistent inventory of a NotebookLM output tree, refreshed by directory mtime."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .store import _load_json, _write_text_atomic
+
+OUTPUT_INVENTORY_DIR_ENV_VAR = "NOTEBOOKLM_OUTPUT_INVENTORY_DIR"
+DEFAULT_OUTPUT_INVENTORY_DIR = Path.home() / ".cache" / "psyk-podcast" / "output-inventory"
+INVENTORY_DISABLED_VALUES = {"0", "off", "none", "false"}
+INVENTORY_VERSION = 1
+REQUEST_LOG_SUFFIX = ".request.json"
+REQUEST_ERROR_SUFFIX = ".request.error.json"
+
+WEEK_SELECTOR_PATTERN = re.compile(r"^(?:W)?0*(\d{1,2})(?:L0*(\d{1,2}))?$", re.IGNORECASE)
+WEEK_DIR_PATTERN = re.compile(r"^W0*(\d{1,2})(?:L0*(\d{1,2}))?\b", re.IGNORECASE)
+CFG_TAG_PATTERN = re.compile(r"\{([^{}]+)\}(?=\.[^.]+$)")
+OUTPUT_STATUS_RANK = {"error": 0, "queued": 1, "mp3": 2}
+# Directory mtimes are coarse on some filesystems; a listing taken this soon after
+# the last change may have missed a same-tick write, so it is redone next refresh.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def parse_week_selector(value: str) -> tuple[int, int | None] | None:
+    match = WEEK_SELECTOR_PATTERN.fullmatch(value.strip())
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2)) if match.group(2) else None
+
+
+def parse_week_dir_label(value: str) -> tuple[int, int | None] | None:
+    match = WEEK_DIR_PATTERN.match(value.strip())
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2)) if match.group(2) else None
+
+
+def artifact_type_for_name(name: str) -> str | None:
+    if name.endswith(REQUEST_LOG_SUFFIX) or name.endswith(REQUEST_ERROR_SUFFIX):
+        return None
+    suffix = Path(name).suffix
+    if suffix == ".mp3":
+        return "audio"
+    if suffix == ".png":
+        return "infographic"
+    if suffix == ".json":
+        return "quiz"
+    return None
+
+
+def request_log_target(name: str) -> tuple[str, str] | None:
+    """Return ``(output_name, status)`` for request logs, ``None`` for other files."""
+
+    if name.endswith(REQUEST_ERROR_SUFFIX):
+        return name[: -len(REQUEST_ERROR_SUFFIX)], "error"
+    if name.endswith(REQUEST_LOG_SUFFIX):
+        return name[: -len(REQUEST_LOG_SUFFIX)], "queued"
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class InventoryFile:
+    path: Path
+    size: int
+    mtime_ns: int
+    artifact_type: str | None
+    cfg_tag: str
+    request_status: str
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+def _file_entry(name: str, size: int, mtime_ns: int) -> dict[str, Any]:
+    target = request_log_target(name)
+    cfg_match = CFG_TAG_PATTERN.search(name)
+    return {
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "artifact_type": artifact_type_for_name(name),
+        "cfg_tag": cfg_match.group(1) if cfg_match else "",
+        "request_status": target[1] if target else "",
+    }
+
+
+def default_inventory_path(output_root: Path) -> Path | None:
+    raw = str(os.environ.get(OUTPUT_INVENTORY_DIR_ENV_VAR) or "").strip()
+    if raw.lower() in INVENTORY_DISABLED_VALUES:
+        return None
+    root = Path(raw).expanduser() if raw else DEFAULT_OUTPUT_INVENTORY_DIR
+    digest = hashlib.sha256(str(Path(output_root).absolute()).encode("utf-8")).hexdigest()[:16]
+    return root / f"{digest}.json"
+
+
+class OutputInventory:
+    """Cached listing of every directory and file under one output root.
+
+    ``refresh`` stats each known directory once; only directories whose mtime
+    changed, or changed just before they were last listed, are listed again.
+    File sizes and mtimes come from that listing, so a file rewritten in place
+    without touching its directory keeps its old stat until the directory
+    changes. ``lock`` serializes refresh and save for threads sharing one
+    instance.
+    """
+
+    def __init__(self, output_root: Path, path: Path | None = None):
+        self.output_root = Path(output_root)
+        self.path = path
+        payload = _load_json(path) if path is not None else {}
+        dirs = payload.get("dirs") if payload.get("version") == INVENTORY_VERSION else None
+        self._dirs: dict[str, dict[str, Any]] = dirs if isinstance(dirs, dict) else {}
+        self.scanned_dirs = 0
+        self.changed = False
+        self.lock = threading.Lock()
+
+    def _entry(self, directory: Path) -> dict[str, Any]:
+        try:
+            relative = Path(directory).relative_to(self.output_root)
+        except ValueError:
+            return {}
+        key = "" if str(relative) == "." else relative.as_posix()
+        return self._dirs.get(key) or {}
+
+    def refresh(self) -> OutputInventory:
+        self.scanned_dirs = 0
+        visited: set[str] = set()
+        pending = [""]
+        while pending:
+            key = pending.pop()
+            directory = self.output_root / key if key else self.output_root
+            try:
+                real_key = os.path.realpath(directory)
+                mtime_ns = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+            if real_key in visited:
+                continue
+            visited.add(real_key)
+            visited.add(key)
+            cached = self._dirs.get(key)
+            if (
+                not isinstance(cached, dict)
+                or cached.get("mtime_ns") != mtime_ns
+                or int(cached.get("scanned_at_ns") or 0) - mtime_ns < RACY_WINDOW_NS
+            ):
+                cached = self._scan_directory(directory, mtime_ns)
+                self._dirs[key] = cached
+                self.changed = True
+            pending.extend(f"{key}/{name}" if key else name for name in reversed(cached["subdirs"]))
+        for key in [key for key in self._dirs if key not in visited]:
+            del self._dirs[key]
+            self.changed = True
+        return self
+
+    def _scan_directory(self, directory: Path, mtime_ns: int) -> dict[str, Any]:
+        self.scanned_dirs += 1
+        scanned_at_ns = time.time_ns()
+        subdirs: list[str] = []
+        files: dict[str, Any] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[entry.name] = _file_entry(entry.name, stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return {
+            "mtime_ns": mtime_ns,
+            "scanned_at_ns": scanned_at_ns,
+            "subdirs": sorted(subdirs),
+            "files": dict(sorted(files.items())),
+        }
+
+    def subdirs(self, directory: Path) -> list[Path]:
+        cached = self._entry(directory)
+        return [Path(directory) / name for name in cached.get("subdirs", [])]
+
+    def files(self, directory: Path, *, recursive: bool = False) -> list[InventoryFile]:
+        directory = Path(directory)
+        cached = self._entry(directory)
+        found = [
+            InventoryFile(
+                path=directory / name,
+                size=int(entry.get("size") or 0),
+                mtime_ns=int(entry.get("mtime_ns") or 0),
+                artifact_type=entry.get("artifact_type"),
+                cfg_tag=str(entry.get("cfg_tag") or ""),
+                request_status=str(entry.get("request_status") or ""),
+            )
+            for name, entry in dict(cached.get("files") or {}).items()
+        ]
+        if recursive:
+            for child in self.subdirs(directory):
+                found.extend(self.files(child, recursive=True))
+        return found
+
+    def output_status(self, directory: Path) -> dict[str, str]:
+        """Map output names to ``mp3``, ``queued`` or ``error`` like ``rollout_week`` expects."""
+
+        status: dict[str, str] = {}
+        for item in self.files(directory):
+            target = request_log_target(item.name)
+            if target is not None:
+                output_name, value = target
+            elif item.path.suffix == ".mp3":
+                output_name, value = item.name, "mp3"
+            else:
+                continue
+            # A downloaded mp3 beats a pending request, which beats an error log.
+            if OUTPUT_STATUS_RANK[value] > OUTPUT_STATUS_RANK.get(status.get(output_name, ""), -1):
+                status[output_name] = value
+        return status
+
+    def save(self) -> None:
+        if self.path is None or not self.changed:
+            return
+        payload = {"version": INVENTORY_VERSION, "output_root": str(self.output_root), "dirs": self._dirs}
+        _write_text_atomic(self.path, json.dumps(payload, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self.changed = False
+
+
+_INVENTORIES: dict[str, OutputInventory] = {}
+_INVENTORIES_LOCK = threading.Lock()
+
+
+def load_output_inventory(output_root: Path, *, path: Path | None = None) -> OutputInventory:
+    """Return a refreshed inventory for ``output_root``, reusing one instance per process."""
+
+    output_root = Path(output_root)
+    inventory_path = path if path is not None else default_inventory_path(output_root)
+    key = f"{output_root.absolute()}|{inventory_path}"
+    with _INVENTORIES_LOCK:
+        inventory = _INVENTORIES.get(key)
+        if inventory is None:
+            inventory = _INVENTORIES[key] = OutputInventory(output_root, inventory_path)
+    with inventory.lock:
+        inventory.refresh()
+        try:
+            inventory.save()
+        except OSError:
+            pass
+    return inventory
@@ -23,7 +23,9 @@ from notebooklm_queue.gemini_preprocessing import (
     generation_config_metadata,
     make_gemini_backend,
 )
+from notebooklm_queue.source_chunking import lecture_relevance_terms
 from notebooklm_queue.source_intelligence_schemas import utc_now_iso
+from notebooklm_queue.usage_ledger import record_cache_hit, usage_scope
 
 try:
     from notebooklm_queue import personlighedspsykologi_recursive as recursive
@@ -3521,6 +3523,8 @@ def call_json_generator(
     max_output_tokens: int,
     response_json_schema: dict[str, Any] | None,
     generation_stats: dict[str, Any] | None = None,
+    relevance_terms: list[str] | None = None,
+    source_selection: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     if json_generator is not None:
         if generation_stats is not None:
@@ -3533,6 +3537,8 @@ def call_json_generator(
             source_paths=source_paths,
             max_output_tokens=max_output_tokens,
             response_json_schema=response_json_schema,
+            relevance_terms=relevance_terms,
+            source_selection=source_selection,
         )
     active_backend = backend or make_gemini_backend(model=model)
     last_exc: Exception | None = None
@@ -3558,6 +3564,8 @@ def call_json_generator(
                 source_paths=source_paths,
                 max_output_tokens=max_output_tokens,
                 response_json_schema=response_json_schema,
+                relevance_terms=relevance_terms,
+                source_selection=source_selection if attempt == 1 else None,
             )
         except Exception as exc:
             last_exc = exc
@@ -3606,6 +3614,8 @@ def build_printout_for_source(
     generation_provider: str = "gemini",
     generation_config_metadata_override: dict[str, Any] | None = None,
     output_layout: str = OUTPUT_LAYOUT_CANONICAL,
+    glossary_path: Path = recursive.DEFAULT_COURSE_GLOSSARY_PATH,
+    theory_map_path: Path = recursive.DEFAULT_COURSE_THEORY_MAP_PATH,
 ) -> dict[str, Any]:
     _validate_review_variant_metadata(variant_metadata)
     output_layout = _normalize_output_layout(output_layout)
@@ -3739,6 +3749,12 @@ def build_printout_for_source(
                     "markdown_paths": rendered["markdown_paths"],
                     "pdf_paths": rendered["pdf_paths"],
                 }
+            record_cache_hit(
+                provider=generation_provider,
+                model=model,
+                stage="printout",
+                lecture_key=str(source.get("lecture_key") or "").strip(),
+            )
             return {
                 "source_id": source_id,
                 "status": "skipped_existing",
@@ -3752,24 +3768,33 @@ def build_printout_for_source(
     reading_title = _reading_title_from_source({**source_card_source, **source})
     length_budget = build_printout_length_budget(source=source, source_card=source_card)
     generation_stats: dict[str, Any] = {}
+    source_selection: list[dict[str, Any]] = []
+    relevance_terms = lecture_relevance_terms(
+        lecture_key,
+        glossary_path=glossary_path if glossary_path.is_absolute() else repo_root / glossary_path,
+        theory_map_path=theory_map_path if theory_map_path.is_absolute() else repo_root / theory_map_path,
+    )
     try:
-        response = call_json_generator(
-            backend=backend,
-            json_generator=json_generator,
-            model=model,
-            system_instruction=system_instruction or printout_system_instruction(),
-            user_prompt=(user_prompt_builder or printout_user_prompt)(
-                source=source,
-                source_card=source_card,
-                lecture_context=_compact_lecture_context(revised_lecture_substrate_dir, lecture_key),
-                course_context=_compact_course_context(course_synthesis_path),
-                length_budget=length_budget,
-            ),
-            source_paths=source_paths,
-            max_output_tokens=32768,
-            response_json_schema=None,
-            generation_stats=generation_stats,
-        )
+        with usage_scope(stage="printout", lecture_key=lecture_key):
+            response = call_json_generator(
+                backend=backend,
+                json_generator=json_generator,
+                model=model,
+                system_instruction=system_instruction or printout_system_instruction(),
+                user_prompt=(user_prompt_builder or printout_user_prompt)(
+                    source=source,
+                    source_card=source_card,
+                    lecture_context=_compact_lecture_context(revised_lecture_substrate_dir, lecture_key),
+                    course_context=_compact_course_context(course_synthesis_path),
+                    length_budget=length_budget,
+                ),
+                source_paths=source_paths,
+                max_output_tokens=32768,
+                response_json_schema=None,
+                generation_stats=generation_stats,
+                relevance_terms=relevance_terms,
+                source_selection=source_selection,
+            )
     except Exception as exc:
         generation_stats["last_error_kind"] = type(exc).__name__
         generation_stats["last_error_summary"] = _sanitized_generation_error(exc)
@@ -3824,6 +3849,8 @@ def build_printout_for_source(
         "printouts": printouts,
         "scaffolds": printouts,
     }
+    if source_selection:
+        artifact["provenance"]["source_selection"] = source_selection
     artifact["variant"] = dict(variant_metadata or {})
     artifact["variant"].setdefault("mode", _default_variant_mode_for_output_layout(output_layout))
     rendered = render_printout_files(artifact=artifact, output_dir=out_dir, render_pdf=render_pdf)
@@ -31,6 +31,7 @@ from notebooklm_queue.source_intelligence_schemas import (
     validate_revised_lecture_substrate,
     validate_source_card,
 )
+from notebooklm_queue.usage_ledger import record_cache_hit, usage_scope
 
 SUBJECT_SLUG = "personlighedspsykologi"
 COURSE_TITLE = "Personlighedspsykologi"
@@ -312,6 +313,8 @@ def _call_json_generator(
     source_paths: list[Path] | None = None,
     max_output_tokens: int = 8192,
     response_json_schema: dict[str, Any] | None = None,
+    usage_stage: str = "",
+    usage_lecture_key: str = "",
 ) -> dict[str, Any]:
     if json_generator is not None:
         return json_generator(
@@ -321,14 +324,15 @@ def _call_json_generator(
             max_output_tokens=max_output_tokens,
         )
     active_backend = backend or make_gemini_backend(model=model)
-    return generate_json(
-        backend=active_backend,
-        system_instruction=system_instruction,
-        user_prompt=user_prompt,
-        source_paths=source_paths or [],
-        max_output_tokens=max_output_tokens,
-        response_json_schema=response_json_schema,
-    )
+    with usage_scope(stage=usage_stage, lecture_key=usage_lecture_key):
+        return generate_json(
+            backend=active_backend,
+            system_instruction=system_instruction,
+            user_prompt=user_prompt,
+            source_paths=source_paths or [],
+            max_output_tokens=max_output_tokens,
+            response_json_schema=response_json_schema,
+        )
 
 
 def _string_schema(description: str = "") -> dict[str, Any]:
@@ -1145,6 +1149,8 @@ def build_source_card_for_source(
         backend=backend,
         json_generator=json_generator,
         model=model,
+        usage_stage="source_card",
+        usage_lecture_key=canonicalize_lecture_key(str(source.get("lecture_key") or "")),
         system_instruction=_source_card_system_instruction(),
         user_prompt=_source_card_prompt(source=source, policy=policy),
         source_paths=source_paths,
@@ -1235,6 +1241,12 @@ def build_source_cards(
                 source_catalog_path=source_catalog_path,
                 policy_path=policy_path,
             ):
+                record_cache_hit(
+                    provider="gemini",
+                    model=model,
+                    stage="source_card",
+                    lecture_key=canonicalize_lecture_key(str(source.get("lecture_key") or "")),
+                )
                 results.append({"source_id": source_id, "status": "skipped_existing", "output_path": str(output_path)})
                 continue
             if dry_run:
@@ -1453,6 +1465,8 @@ def build_lecture_substrate_for_lecture(
         backend=backend,
         json_generator=json_generator,
         model=model,
+        usage_stage="lecture_substrate",
+        usage_lecture_key=lecture_key,
         system_instruction=_lecture_substrate_system_instruction(),
         user_prompt=_lecture_substrate_prompt(bundle=bundle, source_cards=source_cards, missing_sources=missing_sources),
         source_paths=raw_source_paths,
@@ -1529,6 +1543,7 @@ def build_lecture_substrates(
                 source_card_dir=source_card_dir,
                 source_catalog_path=source_catalog_path,
             ):
+                record_cache_hit(provider="gemini", model=model, stage="lecture_substrate", lecture_key=lecture_key)
                 results.append({"lecture_key": lecture_key, "status": "skipped_existing", "output_path": str(output_path)})
                 continue
             if dry_run:
@@ -1705,6 +1720,7 @@ def build_course_synthesis(
             theory_map_path=resolved_theory_map_path,
             concept_graph_path=resolved_concept_graph_path,
         ):
+            record_cache_hit(provider="gemini", model=model, stage="course_synthesis", lecture_key="")
             return {"status": "skipped_existing", "output_path": str(output_path)}
         if dry_run:
             return {"status": "planned_stale_rebuild", "output_path": str(output_path), "lecture_count": len(lecture_keys)}
@@ -1722,6 +1738,7 @@ def build_course_synthesis(
         backend=backend,
         json_generator=json_generator,
         model=model,
+        usage_stage="course_synthesis",
         system_instruction=_course_synthesis_system_instruction(),
         user_prompt=_course_synthesis_prompt(
             lecture_substrates=lecture_substrates,
@@ -1824,6 +1841,8 @@ def build_revised_lecture_substrate_for_lecture(
         backend=backend,
         json_generator=json_generator,
         model=model,
+        usage_stage="revised_lecture_substrate",
+        usage_lecture_key=lecture_key,
         system_instruction=_downward_revision_system_instruction(),
         user_prompt=_downward_revision_prompt(
             lecture_substrate=lecture_substrate,
@@ -1886,6 +1905,7 @@ def build_revised_lecture_substrates(
                 lecture_substrate_dir=lecture_substrate_dir,
                 course_synthesis_path=course_synthesis_path,
             ):
+                record_cache_hit(provider="gemini", model=model, stage="revised_lecture_substrate", lecture_key=lecture_key)
                 results.append({"lecture_key": lecture_key, "status": "skipped_existing", "output_path": str(output_path)})
                 continue
             if dry_run:
@@ -2026,6 +2046,8 @@ def build_podcast_substrate_for_lecture(
         backend=backend,
         json_generator=json_generator,
         model=model,
+        usage_stage="podcast_substrate",
+        usage_lecture_key=lecture_key,
         system_instruction=_podcast_substrate_system_instruction(),
         user_prompt=_podcast_substrate_prompt(
             revised_lecture_substrate=revised,
@@ -2100,6 +2122,7 @@ def build_podcast_substrates(
                 course_synthesis_path=course_synthesis_path,
                 source_weighting_path=source_weighting_path,
             ):
+                record_cache_hit(provider="gemini", model=model, stage="podcast_substrate", lecture_key=lecture_key)
                 results.append({"lecture_key": lecture_key, "status": "skipped_existing", "output_path": str(output_path)})
                 continue
             if dry_run:
@@ -8,6 +8,7 @@ import os
 from pathlib import Path
 from typing import Any
 
+from .profile_leases import live_leases, read_profile_state
 from .profile_state import classify_profile_state, max_validation_age_from_env
 
 PROFILES_FILE_ENV_VAR = "NOTEBOOKLM_PROFILES_FILE"
@@ -16,6 +17,7 @@ PROFILE_STATE_FILE_ENV_VAR = "NOTEBOOKLM_PROFILE_STATE_FILE"
 NOTEBOOKLM_HOME_ENV_VAR = "NOTEBOOKLM_HOME"
 
 DEFAULT_MANUAL_WAIT_SECONDS = 900
+LEASED_RECHECK_SECONDS = 60
 
 
 def inspect_profile_capacity(
@@ -86,6 +88,7 @@ def inspect_profile_capacity(
     cooldown_untils: list[float] = []
 
     state_profiles = state.get("profiles") if isinstance(state.get("profiles"), dict) else {}
+    leases = live_leases(state, now_ts=current_ts)
     for name in ordered_names:
         storage_path = profiles[name]
         entry = state_profiles.get(name) if isinstance(state_profiles.get(name), dict) else {}
@@ -94,6 +97,7 @@ def inspect_profile_capacity(
             storage_path=storage_path,
             state_entry=entry,
             now_ts=current_ts,
+            lease=leases.get(name),
         )
         profile_records.append(record)
         status = str(record["status"])
@@ -110,6 +114,7 @@ def inspect_profile_capacity(
     manual_required = (
         not has_capacity
         and next_available_ts is None
+        and not status_counts.get("leased")
         and _requires_manual_intervention(status_counts)
     )
     next_available_at = (
@@ -123,6 +128,8 @@ def inspect_profile_capacity(
             wait_seconds = max(int(next_available_ts - current_ts), 1)
         else:
             wait_seconds = _fallback_wait_seconds()
+        if status_counts.get("leased"):
+            wait_seconds = min(wait_seconds, LEASED_RECHECK_SECONDS)
 
     base_payload.update(
         {
@@ -218,17 +225,7 @@ def _load_profiles(path: Path) -> tuple[dict[str, Path], list[str]]:
 
 
 def _load_profile_state(path: Path) -> tuple[dict[str, Any], list[str]]:
-    if not path.exists():
-        return {"profiles": {}}, []
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
-        return {"profiles": {}}, [f"profile_state_invalid:{path}:{exc}"]
-    if not isinstance(payload, dict):
-        return {"profiles": {}}, ["profile_state_schema_invalid"]
-    if not isinstance(payload.get("profiles"), dict):
-        payload["profiles"] = {}
-    return payload, []
+    return read_profile_state(path)
 
 
 def _profile_record(
@@ -237,6 +234,7 @@ def _profile_record(
     storage_path: Path,
     state_entry: dict[str, Any],
     now_ts: float,
+    lease: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     cooldown_until = _coerce_float(state_entry.get("cooldown_until"), 0.0)
     last_used = _coerce_float(state_entry.get("last_used"), 0.0)
@@ -250,11 +248,17 @@ def _profile_record(
         now_ts=now_ts,
         max_validation_age_seconds=max_validation_age_from_env(),
     )
+    status = classified.status
+    reason = classified.reason
+    if status == "usable" and lease is not None:
+        status = "leased"
+        reason = f"leased_by_pid_{lease.get('pid')}"
+    lease_expires_at = _coerce_float((lease or {}).get("expires_at"), 0.0)
 
     return {
         "name": name,
-        "status": classified.status,
-        "reason": classified.reason,
+        "status": status,
+        "reason": reason,
         "storage_path": str(storage_path),
         "storage_exists": storage_exists,
         "storage_mtime_epoch": storage_mtime,
@@ -277,6 +281,9 @@ def _profile_record(
             else None
         ),
         "cooldown_remaining_seconds": classified.cooldown_remaining_seconds,
+        "lease_holder_pid": (lease or {}).get("pid"),
+        "lease_holder_host": (lease or {}).get("host"),
+        "lease_expires_at_epoch": lease_expires_at if lease_expires_at else None,
     }
 
 
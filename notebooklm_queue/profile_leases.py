@@ -0,0 +1,340 @@
+"""Lease-based NotebookLM profile allocation over the shared profile-state ledger."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+import uuid
+
+from .store import _write_json_atomic
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+LEASE_SECONDS_ENV_VAR = "NOTEBOOKLM_PROFILE_LEASE_SECONDS"
+LEASE_WAIT_SECONDS_ENV_VAR = "NOTEBOOKLM_PROFILE_LEASE_WAIT_SECONDS"
+DEFAULT_LEASE_SECONDS = 4 * 60 * 60
+DEFAULT_LEASE_WAIT_SECONDS = 15 * 60
+DEFAULT_LEASE_POLL_SECONDS = 5.0
+
+
+class ProfileLeaseError(RuntimeError):
+    """Raised when the profile-state ledger cannot be locked."""
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileLease:
+    profile: str
+    token: str
+    pid: int
+    host: str
+    acquired_at: float
+    expires_at: float
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "token": self.token,
+            "pid": self.pid,
+            "host": self.host,
+            "acquired_at": self.acquired_at,
+            "expires_at": self.expires_at,
+        }
+
+
+def lease_seconds_from_env(default: int = DEFAULT_LEASE_SECONDS) -> int:
+    return _int_env(LEASE_SECONDS_ENV_VAR, default)
+
+
+def lease_wait_seconds_from_env(default: int = DEFAULT_LEASE_WAIT_SECONDS) -> int:
+    return _int_env(LEASE_WAIT_SECONDS_ENV_VAR, default)
+
+
+def profile_state_lock_path(state_path: Path) -> Path:
+    return state_path.with_name(state_path.name + ".lock")
+
+
+@contextmanager
+def locked_profile_state(state_path: Path, *, shared: bool = False) -> Iterator[dict[str, Any]]:
+    """Yield the parsed ledger under a flock; exclusive holders persist their mutations on exit."""
+
+    if fcntl is None:  # pragma: no cover
+        raise ProfileLeaseError("fcntl is unavailable on this platform")
+    state_path = Path(state_path)
+    lock_path = profile_state_lock_path(state_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a+", encoding="utf-8") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            state, _warnings = _read_state(state_path)
+            before = json.dumps(state, sort_keys=True)
+            yield state
+            if not shared and json.dumps(state, sort_keys=True) != before:
+                _write_json_atomic(state_path, state)
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def read_profile_state(state_path: Path) -> tuple[dict[str, Any], list[str]]:
+    """Return a consistent snapshot of the ledger plus parse warnings."""
+
+    state_path = Path(state_path)
+    if not state_path.exists():
+        return {"profiles": {}}, []
+    if fcntl is None:  # pragma: no cover
+        return _read_state(state_path)
+    lock_path = profile_state_lock_path(state_path)
+    with lock_path.open("a+", encoding="utf-8") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_SH)
+        try:
+            return _read_state(state_path)
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def live_leases(state: dict[str, Any], *, now_ts: float) -> dict[str, dict[str, Any]]:
+    raw = state.get("leases")
+    if not isinstance(raw, dict):
+        return {}
+    return {
+        str(name): dict(record)
+        for name, record in raw.items()
+        if isinstance(record, dict) and _lease_is_live(record, now_ts=now_ts)
+    }
+
+
+def profile_entry_changes(
+    before: dict[str, Any], after: dict[str, Any]
+) -> tuple[dict[str, Any], list[str]]:
+    """Split the difference between two snapshots of one profile entry into set and removed keys."""
+
+    changed = {key: value for key, value in after.items() if key not in before or before[key] != value}
+    return changed, sorted(key for key in before if key not in after)
+
+
+class ProfileAllocator:
+    """Grant exclusive, time-bounded leases on NotebookLM profiles.
+
+    Leases live next to the per-profile counters in ``profile_state.json`` and
+    every read-modify-write happens under one flock. A lease held by a process
+    that no longer exists on this host is treated as released.
+    """
+
+    def __init__(self, state_path: Path, *, lease_seconds: int | None = None):
+        self.state_path = Path(state_path)
+        self.lease_seconds = max(int(lease_seconds if lease_seconds is not None else lease_seconds_from_env()), 1)
+
+    def acquire(self, candidates: Iterable[str], *, now_ts: float | None = None) -> ProfileLease | None:
+        """Lease the first candidate that is neither cooling down nor leased elsewhere."""
+
+        with locked_profile_state(self.state_path) as state:
+            now = time.time() if now_ts is None else float(now_ts)
+            leases = _prune_leases(state, now_ts=now)
+            profiles = _profiles(state)
+            for name in candidates:
+                entry = profiles.get(name) if isinstance(profiles.get(name), dict) else {}
+                if _coerce_float(entry.get("cooldown_until"), 0.0) > now or name in leases:
+                    continue
+                lease = ProfileLease(
+                    profile=name,
+                    token=uuid.uuid4().hex,
+                    pid=os.getpid(),
+                    host=socket.gethostname(),
+                    acquired_at=now,
+                    expires_at=now + self.lease_seconds,
+                )
+                leases[name] = lease.to_payload()
+                entry = _profile_entry(state, name)
+                entry["last_leased"] = now
+                entry["lease_count"] = int(_coerce_float(entry.get("lease_count"), 0.0)) + 1
+                return lease
+        return None
+
+    def acquire_blocking(
+        self,
+        candidates: Iterable[str],
+        *,
+        wait_seconds: float,
+        poll_seconds: float = DEFAULT_LEASE_POLL_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> ProfileLease | None:
+        names = list(candidates)
+        deadline = time.monotonic() + max(float(wait_seconds), 0.0)
+        while True:
+            lease = self.acquire(names)
+            if lease is not None or time.monotonic() >= deadline:
+                return lease
+            sleep(max(min(poll_seconds, deadline - time.monotonic()), 0.0))
+
+    def renew(self, lease: ProfileLease) -> ProfileLease | None:
+        with locked_profile_state(self.state_path) as state:
+            now = time.time()
+            leases = _prune_leases(state, now_ts=now)
+            current = leases.get(lease.profile)
+            if not isinstance(current, dict) or current.get("token") != lease.token:
+                return None
+            renewed = ProfileLease(
+                profile=lease.profile,
+                token=lease.token,
+                pid=lease.pid,
+                host=lease.host,
+                acquired_at=lease.acquired_at,
+                expires_at=now + self.lease_seconds,
+            )
+            leases[lease.profile] = renewed.to_payload()
+            return renewed
+
+    def release(self, lease: ProfileLease | None) -> bool:
+        if lease is None:
+            return False
+        with locked_profile_state(self.state_path) as state:
+            leases = _prune_leases(state, now_ts=time.time())
+            current = leases.get(lease.profile)
+            if not isinstance(current, dict) or current.get("token") != lease.token:
+                return False
+            leases.pop(lease.profile, None)
+            return True
+
+    def record_result(
+        self,
+        profile: str,
+        *,
+        success: bool,
+        error_type: str | None,
+        cooldown_seconds: int | None,
+        now_ts: float | None = None,
+    ) -> dict[str, Any]:
+        """Apply one generation outcome to the profile counters atomically."""
+
+        with locked_profile_state(self.state_path) as state:
+            now = time.time() if now_ts is None else float(now_ts)
+            entry = _profile_entry(state, profile)
+            entry["last_used"] = now
+            if success:
+                entry["success_count"] = int(_coerce_float(entry.get("success_count"), 0.0)) + 1
+                entry["last_error"] = None
+                entry["cooldown_until"] = 0
+            else:
+                entry["failure_count"] = int(_coerce_float(entry.get("failure_count"), 0.0)) + 1
+                entry["last_error"] = error_type
+                if cooldown_seconds:
+                    until = now + cooldown_seconds
+                    entry["cooldown_until"] = max(_coerce_float(entry.get("cooldown_until"), 0.0), until)
+            return dict(entry)
+
+    def update_profiles(
+        self,
+        changes: dict[str, dict[str, Any]],
+        *,
+        removed_fields: dict[str, Iterable[str]] | None = None,
+        **top_level: Any,
+    ) -> None:
+        """Merge per-profile field changes (and top-level keys) into the current ledger.
+
+        ``removed_fields`` names per-profile keys to delete, so a caller that
+        dropped a field from its snapshot does not have it resurrected here.
+        """
+
+        with locked_profile_state(self.state_path) as state:
+            for name, fields in changes.items():
+                _profile_entry(state, name).update(fields)
+            for name, keys in (removed_fields or {}).items():
+                entry = _profile_entry(state, name)
+                for key in keys:
+                    entry.pop(key, None)
+            state.update(top_level)
+
+    def active_leases(self, *, now_ts: float | None = None) -> dict[str, dict[str, Any]]:
+        state, _warnings = read_profile_state(self.state_path)
+        return live_leases(state, now_ts=time.time() if now_ts is None else float(now_ts))
+
+
+def _read_state(path: Path) -> tuple[dict[str, Any], list[str]]:
+    if not path.exists():
+        return {"profiles": {}}, []
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        return {"profiles": {}}, [f"profile_state_invalid:{path}:{exc}"]
+    if not isinstance(payload, dict):
+        return {"profiles": {}}, ["profile_state_schema_invalid"]
+    if not isinstance(payload.get("profiles"), dict):
+        payload["profiles"] = {}
+    return payload, []
+
+
+def _profiles(state: dict[str, Any]) -> dict[str, Any]:
+    profiles = state.get("profiles")
+    if not isinstance(profiles, dict):
+        profiles = {}
+        state["profiles"] = profiles
+    return profiles
+
+
+def _profile_entry(state: dict[str, Any], profile: str) -> dict[str, Any]:
+    profiles = _profiles(state)
+    entry = profiles.get(profile)
+    if not isinstance(entry, dict):
+        entry = {}
+        profiles[profile] = entry
+    return entry
+
+
+def _prune_leases(state: dict[str, Any], *, now_ts: float) -> dict[str, Any]:
+    leases = state.get("leases")
+    if not isinstance(leases, dict):
+        leases = {}
+    expired = [
+        name
+        for name, record in leases.items()
+        if not isinstance(record, dict) or not _lease_is_live(record, now_ts=now_ts)
+    ]
+    for name in expired:
+        leases.pop(name, None)
+    state["leases"] = leases
+    return leases
+
+
+def _lease_is_live(record: dict[str, Any], *, now_ts: float) -> bool:
+    if _coerce_float(record.get("expires_at"), 0.0) <= now_ts:
+        return False
+    if str(record.get("host") or "") != socket.gethostname():
+        return True
+    return _pid_alive(int(_coerce_float(record.get("pid"), 0.0)))
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _coerce_float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = str(os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return default
@@ -8,7 +8,6 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 import os
 from pathlib import Path
-import subprocess
 import sys
 from typing import Any
 
@@ -22,6 +21,7 @@ from .profile_capacity import (
     _resolve_profile_state_file,
     _resolve_profiles_file,
 )
+from .profile_leases import ProfileAllocator, profile_entry_changes
 from .profile_state import profile_auth_is_unrecovered
 from .store import QueueLockError, QueueStore, _write_json_atomic
 
@@ -56,6 +56,8 @@ class ProfileRefreshOptions:
     reclaim_dry_run: bool = True
     probe_after_refresh: bool = True
     probe_timeout_seconds: int = 60
+    refresh_timeout_seconds: int = 300
+    max_concurrency: int = 4
 
 
 def refresh_profiles(
@@ -167,12 +169,11 @@ def _refresh_profiles_unlocked(
         result["unknown_profiles"] = unknown
         ordered_names = [name for name in ordered_names if name in set(requested_profiles)]
 
-    profile_results: list[dict[str, Any]] = []
-    for name in ordered_names:
-        storage_path = profiles[name]
-        profile_result = _refresh_one_profile(
-            name=name,
-            storage_path=storage_path,
+    entries_before = {name: dict(_profile_state_entry(state, name)) for name in ordered_names}
+    profile_results = _run_async(
+        _refresh_profiles_concurrently(
+            names=ordered_names,
+            profiles=profiles,
             state=state,
             refresher=refresher,
             prober=prober,
@@ -181,12 +182,20 @@ def _refresh_profiles_unlocked(
             force=bool(options.force),
             probe_after_refresh=bool(options.probe_after_refresh),
             probe_timeout_seconds=max(int(options.probe_timeout_seconds), 1),
+            refresh_timeout_seconds=max(int(options.refresh_timeout_seconds), 1),
+            max_concurrency=max(int(options.max_concurrency), 1),
         )
-        profile_results.append(profile_result)
+    )
 
-    state["updated_at"] = current.replace(microsecond=0).isoformat()
-    state["updated_by"] = "notebooklm_queue.refresh_profiles"
-    _write_json_atomic(state_file, state)
+    entry_changes = {
+        name: profile_entry_changes(entries_before[name], _profile_state_entry(state, name)) for name in ordered_names
+    }
+    ProfileAllocator(state_file).update_profiles(
+        {name: changed for name, (changed, _removed) in entry_changes.items()},
+        removed_fields={name: removed for name, (_changed, removed) in entry_changes.items() if removed},
+        updated_at=current.replace(microsecond=0).isoformat(),
+        updated_by="notebooklm_queue.refresh_profiles",
+    )
 
     reclaim_reports = []
     if options.reclaim_on_recovery or options.reclaim_on_auth_recovery:
@@ -218,7 +227,63 @@ def _refresh_profiles_unlocked(
     return result
 
 
-def _refresh_one_profile(
+async def _refresh_profiles_concurrently(
+    *,
+    names: list[str],
+    profiles: dict[str, Path],
+    state: dict[str, Any],
+    refresher: RefreshCallable,
+    prober: ProbeCallable,
+    now_ts: float,
+    min_refresh_age_seconds: int,
+    force: bool,
+    probe_after_refresh: bool,
+    probe_timeout_seconds: int,
+    refresh_timeout_seconds: int,
+    max_concurrency: int,
+) -> list[dict[str, Any]]:
+    """Refresh profiles on one event loop, at most ``max_concurrency`` at a time.
+
+    Each profile only mutates its own state entry, and results keep the input
+    order so reports read the same as a sequential pass.
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(name: str) -> dict[str, Any]:
+        async with semaphore:
+            return await _refresh_one_profile(
+                name=name,
+                storage_path=profiles[name],
+                state=state,
+                refresher=refresher,
+                prober=prober,
+                now_ts=now_ts,
+                min_refresh_age_seconds=min_refresh_age_seconds,
+                force=force,
+                probe_after_refresh=probe_after_refresh,
+                probe_timeout_seconds=probe_timeout_seconds,
+                refresh_timeout_seconds=refresh_timeout_seconds,
+            )
+
+    # The default refresher hides NOTEBOOKLM_AUTH_JSON while it runs; doing that
+    # per coroutine would let interleaved refreshes restore it under each other.
+    previous_auth_json = os.environ.pop("NOTEBOOKLM_AUTH_JSON", None)
+    try:
+        return list(await asyncio.gather(*(run_one(name) for name in names)))
+    finally:
+        if previous_auth_json is not None:
+            os.environ["NOTEBOOKLM_AUTH_JSON"] = previous_auth_json
+
+
+async def _with_timeout(awaitable: Awaitable[None], *, timeout_seconds: int, phase: str) -> None:
+    try:
+        await asyncio.wait_for(awaitable, timeout=timeout_seconds)
+    except asyncio.TimeoutError as exc:
+        raise TimeoutError(f"profile {phase} timed out after {timeout_seconds}s") from exc
+
+
+async def _refresh_one_profile(
     *,
     name: str,
     storage_path: Path,
@@ -230,6 +295,7 @@ def _refresh_one_profile(
     force: bool,
     probe_after_refresh: bool,
     probe_timeout_seconds: int,
+    refresh_timeout_seconds: int,
 ) -> dict[str, Any]:
     entry = _profile_state_entry(state, name)
     storage_exists = storage_path.exists()
@@ -282,7 +348,11 @@ def _refresh_one_profile(
     previous_error = str(entry.get("last_error") or "").strip() or None
     previous_cooldown_until = _coerce_float(entry.get("cooldown_until"), 0.0)
     try:
-        _run_async(refresher(name, storage_path))
+        await _with_timeout(
+            refresher(name, storage_path),
+            timeout_seconds=refresh_timeout_seconds,
+            phase="refresh",
+        )
     except Exception as exc:  # noqa: BLE001 - operator report needs the exact failure.
         error_type = _classify_refresh_error(exc)
         _record_refresh_failure(
@@ -306,15 +376,17 @@ def _refresh_one_profile(
     if probe_after_refresh:
         try:
             if prober is _default_probe_profile:
-                _run_async(
-                    _default_probe_profile(
-                        name,
-                        storage_path,
-                        timeout_seconds=probe_timeout_seconds,
-                    )
+                await _default_probe_profile(
+                    name,
+                    storage_path,
+                    timeout_seconds=probe_timeout_seconds,
                 )
             else:
-                _run_async(prober(name, storage_path))
+                await _with_timeout(
+                    prober(name, storage_path),
+                    timeout_seconds=probe_timeout_seconds,
+                    phase="probe",
+                )
         except Exception as exc:  # noqa: BLE001 - operator report needs the exact failure.
             error_type = _classify_refresh_error(exc)
             _record_probe_failure(
@@ -420,17 +492,24 @@ async def _default_probe_profile(
     timeout = timeout_seconds
     if timeout is None:
         timeout = _int_env("NOTEBOOKLM_PROFILE_REFRESH_PROBE_TIMEOUT_SECONDS", 60)
-    cmd = [notebooklm_bin, "--storage", str(storage_path), "list", "--json"]
-    result = subprocess.run(
-        cmd,
-        text=True,
-        capture_output=True,
-        timeout=max(timeout, 1),
-        check=False,
+    process = await asyncio.create_subprocess_exec(
+        notebooklm_bin,
+        "--storage",
+        str(storage_path),
+        "list",
+        "--json",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
     )
-    if result.returncode != 0:
-        output = ((result.stdout or "") + (result.stderr or "")).strip()
-        raise RuntimeError(output or f"profile probe failed with exit code {result.returncode}")
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=max(timeout, 1))
+    except asyncio.TimeoutError as exc:
+        process.kill()
+        await process.wait()
+        raise TimeoutError(f"profile probe timed out after {max(timeout, 1)}s") from exc
+    if process.returncode != 0:
+        output = (stdout.decode(errors="replace") + stderr.decode(errors="replace")).strip()
+        raise RuntimeError(output or f"profile probe failed with exit code {process.returncode}")
 
 
 def _record_refresh_success(entry: dict[str, Any], *, now_ts: float) -> None:
@@ -568,12 +647,11 @@ def _now(value: datetime | None) -> datetime:
     return (value or datetime.now(tz=UTC)).astimezone(UTC)
 
 
-def _run_async(awaitable: Awaitable[None]) -> None:
+def _run_async(awaitable: Awaitable[Any]) -> Any:
     try:
         asyncio.get_running_loop()
     except RuntimeError:
-        asyncio.run(awaitable)
-        return
+        return asyncio.run(awaitable)
     raise RuntimeError("refresh_profiles cannot run inside an active event loop")
 
 
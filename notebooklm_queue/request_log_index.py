@@ -0,0 +1,247 @@
+"""Persistent ``notebook_id -> request log`` index for notebook reclaim checks."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from .output_inventory import RACY_WINDOW_NS
+from .store import _load_json, _write_text_atomic
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+REQUEST_LOG_INDEX_PATH_ENV_VAR = "NOTEBOOKLM_REQUEST_LOG_INDEX_PATH"
+DEFAULT_REQUEST_LOG_INDEX_PATH = Path.home() / ".cache" / "psyk-podcast" / "request-log-index.json"
+REQUEST_LOG_SUFFIX = ".request.json"
+INDEX_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class RequestLogRecord:
+    log_path: Path
+    output_path: Path | None
+    mtime_ns: int
+
+
+def default_index_path() -> Path:
+    raw = str(os.environ.get(REQUEST_LOG_INDEX_PATH_ENV_VAR) or "").strip()
+    return Path(raw).expanduser() if raw else DEFAULT_REQUEST_LOG_INDEX_PATH
+
+
+def _read_request_log(log_path: Path) -> dict[str, str] | None:
+    try:
+        payload = json.loads(log_path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    return _log_fields(payload)
+
+
+def _log_fields(payload: dict[str, Any]) -> dict[str, str]:
+    return {
+        "notebook_id": str(payload.get("notebook_id") or "").strip(),
+        "output_path": str(payload.get("output_path") or "").strip(),
+    }
+
+
+def _resolve_output_path(raw_value: str, search_root: Path) -> Path | None:
+    if not raw_value:
+        return None
+    output_path = Path(raw_value).expanduser()
+    if not output_path.is_absolute():
+        output_path = (search_root / output_path).resolve()
+    return output_path
+
+
+class RequestLogIndex:
+    """Cache of parsed ``*.request.json`` logs keyed by directory.
+
+    ``refresh`` walks each search root once: directories whose mtime is unchanged
+    (and was not still racy when they were listed) reuse their cached listing, and
+    logs whose ``(mtime_ns, size)`` is unchanged are not re-parsed. Writers call
+    ``record`` to keep entries warm; the module-level helpers hold the index lock
+    around each load-modify-save so concurrent writers do not drop each other.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path is not None else default_index_path()
+        payload = _load_json(self.path)
+        dirs = payload.get("dirs") if payload.get("version") == INDEX_VERSION else None
+        self._dirs: dict[str, dict[str, Any]] = dirs if isinstance(dirs, dict) else {}
+        self._by_notebook: dict[str, list[RequestLogRecord]] = {}
+        self.scanned_dirs = 0
+        self.parsed_logs = 0
+
+    def refresh(self, search_roots: tuple[Path, ...]) -> None:
+        self._by_notebook = {}
+        self.scanned_dirs = 0
+        self.parsed_logs = 0
+        visited: set[str] = set()
+        for search_root in search_roots:
+            if search_root.is_dir():
+                self._refresh_tree(Path(search_root), visited)
+        for key in [key for key in self._dirs if key not in visited and _is_under_any(key, search_roots)]:
+            del self._dirs[key]
+
+    def _refresh_tree(self, search_root: Path, visited: set[str]) -> None:
+        pending = [search_root]
+        while pending:
+            directory = pending.pop()
+            key = str(directory)
+            try:
+                real_key = os.path.realpath(directory)
+                mtime_ns = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+            if key in visited or real_key in visited:
+                continue
+            visited.update({key, real_key})
+
+            cached = self._dirs.get(key)
+            if (
+                not isinstance(cached, dict)
+                or cached.get("mtime_ns") != mtime_ns
+                or int(cached.get("scanned_at_ns") or 0) - mtime_ns < RACY_WINDOW_NS
+            ):
+                cached = self._scan_directory(directory, mtime_ns, cached)
+                self._dirs[key] = cached
+            pending.extend(directory / name for name in reversed(cached["subdirs"]))
+
+            logs = cached["logs"]
+            for name in list(logs):
+                entry = self._fresh_entry(directory / name, logs[name])
+                if entry is None:
+                    del logs[name]
+                    continue
+                logs[name] = entry
+                if entry["notebook_id"]:
+                    self._by_notebook.setdefault(entry["notebook_id"], []).append(
+                        RequestLogRecord(
+                            log_path=directory / name,
+                            output_path=_resolve_output_path(entry["output_path"], search_root),
+                            mtime_ns=int(entry["mtime_ns"]),
+                        )
+                    )
+
+    def _scan_directory(self, directory: Path, mtime_ns: int, previous: Any) -> dict[str, Any]:
+        self.scanned_dirs += 1
+        scanned_at_ns = time.time_ns()
+        previous_logs = previous.get("logs") if isinstance(previous, dict) else None
+        previous_logs = previous_logs if isinstance(previous_logs, dict) else {}
+        subdirs: list[str] = []
+        logs: dict[str, Any] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            subdirs.append(entry.name)
+                        elif entry.name.endswith(REQUEST_LOG_SUFFIX) and entry.is_file():
+                            logs[entry.name] = previous_logs.get(entry.name) or {}
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return {
+            "mtime_ns": mtime_ns,
+            "scanned_at_ns": scanned_at_ns,
+            "subdirs": sorted(subdirs),
+            "logs": dict(sorted(logs.items())),
+        }
+
+    def _fresh_entry(self, log_path: Path, entry: Any) -> dict[str, Any] | None:
+        try:
+            stat = log_path.stat()
+        except OSError:
+            return None
+        if (
+            isinstance(entry, dict)
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+            and "notebook_id" in entry
+        ):
+            return entry
+        self.parsed_logs += 1
+        fields = _read_request_log(log_path) or {"notebook_id": "", "output_path": ""}
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, **fields}
+
+    def records_for(self, notebook_id: str) -> list[RequestLogRecord]:
+        return list(self._by_notebook.get(notebook_id, ()))
+
+    def record(self, log_path: Path, payload: dict[str, Any]) -> None:
+        """Store a freshly written log so the next refresh does not re-parse it."""
+
+        log_path = Path(log_path).absolute()
+        stat = log_path.stat()
+        directory = self._dirs.setdefault(str(log_path.parent), {"mtime_ns": None, "subdirs": [], "logs": {}})
+        directory.setdefault("logs", {})[log_path.name] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            **_log_fields(payload),
+        }
+
+    def save(self) -> None:
+        payload = {"version": INDEX_VERSION, "dirs": self._dirs}
+        _write_text_atomic(self.path, json.dumps(payload, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+
+def _is_under_any(directory: str, roots: tuple[Path, ...]) -> bool:
+    path = Path(directory)
+    return any(path == root or root in path.parents for root in roots)
+
+
+@contextmanager
+def _locked_index(path: Path | None) -> Iterator[Path]:
+    """Hold an exclusive flock next to the index file for one load-modify-save."""
+
+    index_path = Path(path) if path is not None else default_index_path()
+    if fcntl is None:  # pragma: no cover
+        yield index_path
+        return
+    lock_path = index_path.with_name(index_path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a+", encoding="utf-8") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield index_path
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def load_request_log_index(search_roots: tuple[Path, ...], *, path: Path | None = None) -> RequestLogIndex:
+    """Load, refresh and persist the index for one reclaim pass."""
+
+    try:
+        with _locked_index(path) as index_path:
+            index = RequestLogIndex(index_path)
+            index.refresh(search_roots)
+            try:
+                index.save()
+            except OSError:
+                pass
+    except OSError:
+        # No writable lock file next to the index: refresh in memory only.
+        index = RequestLogIndex(path)
+        index.refresh(search_roots)
+    return index
+
+
+def record_request_log(log_path: Path, payload: dict[str, Any], *, path: Path | None = None) -> None:
+    """Writer hook: best-effort update of the shared index after writing ``log_path``."""
+
+    try:
+        with _locked_index(path) as index_path:
+            index = RequestLogIndex(index_path)
+            index.record(log_path, payload)
+            index.save()
+    except OSError:
+        pass
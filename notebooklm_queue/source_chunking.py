@@ -0,0 +1,279 @@
+"""Relevance-ranked chunk selection for inline source payloads."""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+TRUNCATION_MARKER = "[...truncated...]"
+OMISSION_MARKER = "[...]"
+DEFAULT_MAX_CHUNK_CHARS = 6000
+BM25_K1 = 1.5
+BM25_B = 0.75
+SELECTION_STRATEGY_FULL = "full_text"
+SELECTION_STRATEGY_TRUNCATE = "leading_truncation"
+SELECTION_STRATEGY_BM25 = "bm25_chunks"
+
+_PAGE_MARKER_RE = re.compile(r"^### Page (\d+)\s*$", re.MULTILINE)
+_HEADING_RE = re.compile(r"^(?:#{1,6} \S.*|[0-9]+(?:\.[0-9]+)*\.? [A-ZÆØÅ][^\n]{2,80})$")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True, slots=True)
+class SourceChunk:
+    index: int
+    pages: tuple[int, ...]
+    heading: str
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkSelection:
+    text: str
+    strategy: str
+    included_pages: tuple[int, ...]
+    omitted_pages: tuple[int, ...]
+    included_chunk_count: int
+    chunk_count: int
+    source_chars: int
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "included_pages": list(self.included_pages),
+            "omitted_pages": list(self.omitted_pages),
+            "included_chunk_count": self.included_chunk_count,
+            "chunk_count": self.chunk_count,
+            "source_chars": self.source_chars,
+            "selected_chars": len(self.text),
+        }
+
+
+def tokenize(text: str) -> list[str]:
+    return [token.casefold() for token in _TOKEN_RE.findall(text) if len(token) > 1]
+
+
+def _page_sections(text: str) -> list[tuple[int | None, str]]:
+    """Split on ``### Page N`` markers (pypdf cache output) or form feeds (OCR sidecars)."""
+
+    markers = list(_PAGE_MARKER_RE.finditer(text))
+    if markers:
+        sections: list[tuple[int | None, str]] = []
+        preamble = text[: markers[0].start()].strip()
+        if preamble:
+            sections.append((None, preamble))
+        for position, marker in enumerate(markers):
+            end = markers[position + 1].start() if position + 1 < len(markers) else len(text)
+            sections.append((int(marker.group(1)), text[marker.end() : end].strip()))
+        return sections
+    if "\f" in text:
+        return [(index, page.strip()) for index, page in enumerate(text.split("\f"), start=1)]
+    return [(None, text.strip())]
+
+
+def _split_oversized(text: str, max_chunk_chars: int) -> list[str]:
+    if len(text) <= max_chunk_chars:
+        return [text]
+    pieces: list[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        while len(paragraph) > max_chunk_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(paragraph[:max_chunk_chars])
+            paragraph = paragraph[max_chunk_chars:].strip()
+        if current and len(current) + 2 + len(paragraph) > max_chunk_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_source_chunks(text: str, *, max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS) -> list[SourceChunk]:
+    """Split extracted text into chunks that start at page or heading boundaries."""
+
+    chunks: list[SourceChunk] = []
+    heading = ""
+    for page, body in _page_sections(text):
+        if not body:
+            continue
+        blocks: list[tuple[str, list[str]]] = [(heading, [])]
+        for line in body.splitlines():
+            stripped = line.strip()
+            if stripped and _HEADING_RE.match(stripped) and blocks[-1][1]:
+                blocks.append((stripped.lstrip("# ").strip(), []))
+            elif stripped and _HEADING_RE.match(stripped):
+                blocks[-1] = (stripped.lstrip("# ").strip(), blocks[-1][1])
+            blocks[-1][1].append(line)
+        for block_heading, lines in blocks:
+            block_text = "\n".join(lines).strip()
+            if not block_text:
+                continue
+            heading = block_heading
+            for piece in _split_oversized(block_text, max_chunk_chars):
+                chunks.append(
+                    SourceChunk(
+                        index=len(chunks),
+                        pages=(page,) if page is not None else (),
+                        heading=block_heading,
+                        text=piece,
+                    )
+                )
+    return chunks
+
+
+def bm25_scores(chunks: list[SourceChunk], query_terms: Iterable[str]) -> list[float]:
+    """Score chunks with Okapi BM25 against the (deduplicated) tokens of ``query_terms``."""
+
+    documents = [tokenize(f"{chunk.heading}\n{chunk.text}") for chunk in chunks]
+    query = sorted({token for term in query_terms for token in tokenize(term)})
+    if not documents or not query:
+        return [0.0 for _ in chunks]
+    average_length = sum(len(document) for document in documents) / len(documents) or 1.0
+    document_frequency = Counter(token for document in documents for token in set(document))
+    scores: list[float] = []
+    for document in documents:
+        frequencies = Counter(document)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * len(document) / average_length)
+        score = 0.0
+        for token in query:
+            frequency = frequencies.get(token, 0)
+            if not frequency:
+                continue
+            df = document_frequency[token]
+            idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+            score += idf * frequency * (BM25_K1 + 1) / (frequency + length_norm)
+        scores.append(score)
+    return scores
+
+
+def _all_pages(chunks: list[SourceChunk]) -> tuple[int, ...]:
+    return tuple(sorted({page for chunk in chunks for page in chunk.pages}))
+
+
+def select_source_text(
+    text: str,
+    *,
+    max_chars: int,
+    relevance_terms: Iterable[str] | None = None,
+    max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS,
+) -> ChunkSelection:
+    """Fit ``text`` into ``max_chars``.
+
+    Without relevance terms this keeps the historical leading truncation. With
+    terms, the highest-scoring chunks are packed greedily and emitted in
+    document order, with an omission marker wherever chunks were skipped.
+    """
+
+    terms = [term for term in (relevance_terms or []) if str(term).strip()]
+    chunks = split_source_chunks(text, max_chunk_chars=max_chunk_chars)
+    pages = _all_pages(chunks)
+    if len(text) <= max_chars:
+        return ChunkSelection(text, SELECTION_STRATEGY_FULL, pages, (), len(chunks), len(chunks), len(text))
+    if not terms:
+        return _leading_truncation(text, chunks, max_chars=max_chars, max_chunk_chars=max_chunk_chars)
+
+    scores = bm25_scores(chunks, terms)
+    separator_chars = len(OMISSION_MARKER) + 4
+    budget = max_chars - separator_chars
+    chosen: set[int] = set()
+    for index in sorted(range(len(chunks)), key=lambda item: (-scores[item], item)):
+        chunk = chunks[index]
+        label = _chunk_label(chunk)
+        cost = len(label) + len(chunk.text) + separator_chars
+        if cost <= budget:
+            chosen.add(index)
+            budget -= cost
+    if not chosen:
+        return _leading_truncation(text, chunks, max_chars=max_chars, max_chunk_chars=max_chunk_chars)
+    rendered: list[str] = []
+    previous: int | None = None
+    for index in sorted(chosen):
+        if (previous is None and index > 0) or (previous is not None and index != previous + 1):
+            rendered.append(OMISSION_MARKER)
+        rendered.append(_chunk_label(chunks[index]) + chunks[index].text)
+        previous = index
+    if previous is not None and previous != len(chunks) - 1:
+        rendered.append(OMISSION_MARKER)
+    included = _all_pages([chunks[index] for index in chosen])
+    return ChunkSelection(
+        "\n\n".join(rendered),
+        SELECTION_STRATEGY_BM25,
+        included,
+        tuple(page for page in pages if page not in included),
+        len(chosen),
+        len(chunks),
+        len(text),
+    )
+
+
+def _leading_truncation(
+    text: str,
+    chunks: list[SourceChunk],
+    *,
+    max_chars: int,
+    max_chunk_chars: int,
+) -> ChunkSelection:
+    truncated = text[:max_chars].rstrip()
+    kept_chunks = split_source_chunks(truncated, max_chunk_chars=max_chunk_chars)
+    kept_pages = _all_pages(kept_chunks)
+    return ChunkSelection(
+        truncated + "\n" + TRUNCATION_MARKER,
+        SELECTION_STRATEGY_TRUNCATE,
+        kept_pages,
+        tuple(page for page in _all_pages(chunks) if page not in kept_pages),
+        len(kept_chunks),
+        len(chunks),
+        len(text),
+    )
+
+
+def _chunk_label(chunk: SourceChunk) -> str:
+    return f"### Page {chunk.pages[0]}\n" if chunk.pages else ""
+
+
+def lecture_relevance_terms(
+    lecture_key: str,
+    *,
+    glossary_path: Path,
+    theory_map_path: Path,
+) -> list[str]:
+    """Collect glossary labels/aliases and theory ids/labels scoped to ``lecture_key``."""
+
+    lecture_key = str(lecture_key or "").strip().upper()
+    if not lecture_key:
+        return []
+    terms: list[str] = []
+    for path, collection, id_key in (
+        (glossary_path, "terms", "term_id"),
+        (theory_map_path, "theories", "theory_id"),
+    ):
+        payload = _read_json_object(path)
+        for entry in payload.get(collection) or []:
+            if not isinstance(entry, dict):
+                continue
+            lecture_keys = {str(key).strip().upper() for key in entry.get("lecture_keys") or []}
+            if lecture_key not in lecture_keys:
+                continue
+            identifier = str(entry.get(id_key) or "").strip()
+            values = [identifier.replace("_", " "), str(entry.get("label") or "")]
+            values.extend(str(alias) for alias in entry.get("aliases") or [])
+            terms.extend(value.strip() for value in values if value.strip())
+    return list(dict.fromkeys(terms))
+
+
+def _read_json_object(path: Path) -> dict[str, Any]:
+    try:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
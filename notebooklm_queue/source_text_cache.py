@@ -0,0 +1,340 @@
+"""Content-addressed cache of extracted PDF page text and OCR sidecars."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from .store import _write_json_atomic
+
+SOURCE_TEXT_CACHE_DIR_ENV_VAR = "NOTEBOOKLM_SOURCE_TEXT_CACHE_DIR"
+DEFAULT_SOURCE_TEXT_CACHE_DIR = Path.home() / ".cache" / "psyk-podcast" / "source-text"
+EXTRACTOR_VERSION = "pypdf-page-text-v1"
+OCR_SIDECAR_VERSION = "ocrmypdf-sidecar-v1"
+DEFAULT_OCR_TIMEOUT_SECONDS = 600
+RECORD_FILENAME = "record.json"
+OCR_SIDECAR_FILENAME = "ocr.txt"
+
+ProgressLogger = Callable[[str], None]
+
+
+class SourceTextError(RuntimeError):
+    """Raised when a source file cannot be read, extracted, or OCR'd."""
+
+
+@dataclass(frozen=True, slots=True)
+class PdfExtraction:
+    sha256: str
+    extractor_version: str
+    page_texts: tuple[str, ...]
+    empty_pages: tuple[int, ...]
+    ocr_text: str | None
+    cache_hit: bool
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_texts)
+
+    @property
+    def ocr_pages(self) -> tuple[int, ...]:
+        return self.empty_pages if self.ocr_text else ()
+
+    def text(self) -> str:
+        """Render page text the way inline prompts expect, or the OCR sidecar if no page had text."""
+
+        chunks = [f"### Page {index}\n{text}" for index, text in enumerate(self.page_texts, start=1) if text]
+        if chunks:
+            return "\n\n".join(chunks)
+        return self.ocr_text or ""
+
+
+def default_cache_root() -> Path:
+    raw = str(os.environ.get(SOURCE_TEXT_CACHE_DIR_ENV_VAR) or "").strip()
+    return Path(raw).expanduser() if raw else DEFAULT_SOURCE_TEXT_CACHE_DIR
+
+
+def _emit_progress(progress_logger: ProgressLogger | None, message: str) -> None:
+    if progress_logger is None:
+        return
+    try:
+        progress_logger(message)
+    except Exception:
+        return
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SourceTextCache:
+    """Store pypdf page text and OCR output under ``<root>/<sha[:2]>/<sha>/<extractor version>/``.
+
+    Entries are keyed by file content, so renamed or copied readings share one
+    extraction, and bumping ``EXTRACTOR_VERSION`` invalidates everything.
+    """
+
+    def __init__(self, root: Path | None = None, *, ocr_timeout_seconds: int = DEFAULT_OCR_TIMEOUT_SECONDS):
+        self.root = Path(root) if root is not None else default_cache_root()
+        self.ocr_timeout_seconds = ocr_timeout_seconds
+        self.hits = 0
+        self.misses = 0
+        self._digests: dict[tuple[str, int, int], str] = {}
+
+    def entry_dir(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256 / EXTRACTOR_VERSION
+
+    def file_sha256(self, path: Path) -> str:
+        try:
+            stat = path.stat()
+            key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+            if key not in self._digests:
+                self._digests[key] = _file_sha256(path)
+        except OSError as exc:
+            raise SourceTextError(f"failed to read source file {path}: {exc}") from exc
+        return self._digests[key]
+
+    def lookup(self, sha256: str) -> PdfExtraction | None:
+        entry_dir = self.entry_dir(sha256)
+        try:
+            record = json.loads((entry_dir / RECORD_FILENAME).read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        if not isinstance(record, dict) or record.get("extractor_version") != EXTRACTOR_VERSION:
+            return None
+        pages = record.get("page_texts")
+        if not isinstance(pages, list):
+            return None
+        ocr_text = None
+        if record.get("ocr_status") == "ok":
+            try:
+                ocr_text = (entry_dir / OCR_SIDECAR_FILENAME).read_text(encoding="utf-8")
+            except OSError:
+                return None
+        return PdfExtraction(
+            sha256=sha256,
+            extractor_version=EXTRACTOR_VERSION,
+            page_texts=tuple(str(page) for page in pages),
+            empty_pages=tuple(int(page) for page in record.get("empty_pages") or []),
+            ocr_text=ocr_text,
+            cache_hit=True,
+        )
+
+    def cached_page_count(self, path: Path, *, sha256: str | None = None) -> int | None:
+        """Return the page count from an existing entry without extracting anything on a miss."""
+
+        extraction = self.lookup(sha256 or self.file_sha256(path))
+        return extraction.page_count if extraction is not None else None
+
+    def extract_pdf(
+        self,
+        path: Path,
+        *,
+        ocr: bool = True,
+        progress_logger: ProgressLogger | None = None,
+    ) -> PdfExtraction:
+        sha256 = self.file_sha256(path)
+        cached = self.lookup(sha256)
+        if cached is not None and (cached.ocr_text or not ocr or any(cached.page_texts)):
+            self.hits += 1
+            return cached
+        self.misses += 1
+        page_texts = cached.page_texts if cached is not None else _pypdf_page_texts(path)
+        empty_pages = tuple(index for index, text in enumerate(page_texts, start=1) if not text)
+        ocr_text = None
+        if ocr and not any(page_texts):
+            _emit_progress(
+                progress_logger,
+                f"[source_text_cache] no extractable PDF text in {path.name}; falling back to OCR",
+            )
+            ocr_text = _ocrmypdf_sidecar(path, timeout_seconds=self.ocr_timeout_seconds, progress_logger=progress_logger)
+        extraction = PdfExtraction(
+            sha256=sha256,
+            extractor_version=EXTRACTOR_VERSION,
+            page_texts=page_texts,
+            empty_pages=empty_pages,
+            ocr_text=ocr_text,
+            cache_hit=False,
+        )
+        self._store(path, extraction)
+        return extraction
+
+    def read_source_text(self, path: Path, *, progress_logger: ProgressLogger | None = None) -> str:
+        """Return inline-ready text for ``path``; PDFs go through the cache, other files are read directly."""
+
+        if path.suffix.lower() != ".pdf":
+            try:
+                return path.read_text(encoding="utf-8", errors="replace").strip()
+            except OSError as exc:
+                raise SourceTextError(f"failed to read source file {path}: {exc}") from exc
+        text = self.extract_pdf(path, progress_logger=progress_logger).text()
+        if not text:
+            raise SourceTextError(f"OCR produced no text for PDF source file {path}")
+        return text
+
+    def _store(self, path: Path, extraction: PdfExtraction) -> None:
+        entry_dir = self.entry_dir(extraction.sha256)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        if extraction.ocr_text:
+            _write_text_atomic(entry_dir / OCR_SIDECAR_FILENAME, extraction.ocr_text)
+        _write_json_atomic(
+            entry_dir / RECORD_FILENAME,
+            {
+                "sha256": extraction.sha256,
+                "extractor_version": EXTRACTOR_VERSION,
+                "ocr_sidecar_version": OCR_SIDECAR_VERSION if extraction.ocr_text else None,
+                "source_name": path.name,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "page_count": extraction.page_count,
+                "empty_pages": list(extraction.empty_pages),
+                "ocr_pages": list(extraction.ocr_pages),
+                "ocr_status": "ok" if extraction.ocr_text else "not_run",
+                "page_texts": list(extraction.page_texts),
+            },
+        )
+
+
+_DEFAULT_CACHES: dict[Path, SourceTextCache] = {}
+
+
+def default_cache() -> SourceTextCache:
+    root = default_cache_root()
+    if root not in _DEFAULT_CACHES:
+        _DEFAULT_CACHES[root] = SourceTextCache(root)
+    return _DEFAULT_CACHES[root]
+
+
+def read_source_text(path: Path, *, progress_logger: ProgressLogger | None = None) -> str:
+    return default_cache().read_source_text(path, progress_logger=progress_logger)
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as handle:
+        handle.write(text)
+        temp_path = Path(handle.name)
+    temp_path.replace(path)
+
+
+def _pypdf_page_texts(path: Path) -> tuple[str, ...]:
+    try:
+        from pypdf import PdfReader
+    except ImportError as exc:  # pragma: no cover - depends on local environment
+        raise SourceTextError("pypdf package not installed - pip install pypdf") from exc
+    try:
+        reader = PdfReader(str(path))
+    except Exception as exc:
+        raise SourceTextError(f"failed to open PDF source file {path}: {exc}") from exc
+    texts: list[str] = []
+    for page in reader.pages:
+        try:
+            extracted = page.extract_text() or ""
+        except Exception:
+            extracted = ""
+        texts.append(extracted.strip())
+    return tuple(texts)
+
+
+def _ocrmypdf_sidecar(path: Path, *, timeout_seconds: int, progress_logger: ProgressLogger | None) -> str:
+    if shutil.which("ocrmypdf") is None:
+        raise SourceTextError(f"failed to extract text from PDF source file {path} and ocrmypdf is not available")
+    with tempfile.TemporaryDirectory(prefix="source-text-ocr-") as temp_dir_str:
+        temp_dir = Path(temp_dir_str)
+        sidecar_path = temp_dir / "ocr.txt"
+        output_pdf_path = temp_dir / "ocr.pdf"
+        try:
+            _emit_progress(progress_logger, f"[source_text_cache] OCR starting for {path.name}")
+            result = subprocess.run(
+                ["ocrmypdf", "--skip-text", "--sidecar", str(sidecar_path), str(path), str(output_pdf_path)],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=timeout_seconds,
+            )
+        except subprocess.TimeoutExpired as exc:
+            raise SourceTextError(f"OCR timed out for PDF source file {path} after {timeout_seconds}s") from exc
+        except OSError as exc:
+            raise SourceTextError(f"failed to OCR PDF source file {path}: {exc}") from exc
+        if result.returncode != 0:
+            detail = (result.stderr or result.stdout or "").strip()
+            raise SourceTextError(f"failed to OCR PDF source file {path}: {detail or f'exit code {result.returncode}'}")
+        try:
+            text = sidecar_path.read_text(encoding="utf-8", errors="replace").strip()
+        except OSError as exc:
+            raise SourceTextError(f"failed to read OCR sidecar for {path}: {exc}") from exc
+    if not text:
+        raise SourceTextError(f"OCR produced no text for PDF source file {path}")
+    _emit_progress(progress_logger, f"[source_text_cache] OCR finished for {path.name} ({len(text)} chars)")
+    return text
+
+
+def _warm_one(path_str: str, root_str: str, ocr: bool) -> dict[str, Any]:
+    path = Path(path_str)
+    cache = SourceTextCache(Path(root_str))
+    try:
+        extraction = cache.extract_pdf(path, ocr=ocr)
+    except SourceTextError as exc:
+        return {"path": path_str, "status": "error", "error": str(exc)}
+    return {
+        "path": path_str,
+        "status": "hit" if extraction.cache_hit else "miss",
+        "sha256": extraction.sha256,
+        "page_count": extraction.page_count,
+        "empty_pages": len(extraction.empty_pages),
+        "ocr_pages": len(extraction.ocr_pages),
+    }
+
+
+def iter_pdf_paths(paths: Iterable[Path]) -> list[Path]:
+    found: set[Path] = set()
+    for path in paths:
+        if path.is_dir():
+            found.update(candidate for candidate in path.rglob("*") if candidate.is_file() and candidate.suffix.lower() == ".pdf")
+        elif path.is_file() and path.suffix.lower() == ".pdf":
+            found.add(path)
+    return sorted(found)
+
+
+def warm_source_text_cache(
+    paths: Iterable[Path],
+    *,
+    cache_root: Path | None = None,
+    workers: int | None = None,
+    ocr: bool = True,
+) -> dict[str, Any]:
+    """Extract every PDF under ``paths`` into the cache with a process pool and report hits/misses."""
+
+    root = Path(cache_root) if cache_root is not None else default_cache_root()
+    pdf_paths = iter_pdf_paths(Path(path) for path in paths)
+    max_workers = max(int(workers or os.cpu_count() or 1), 1)
+    args = [(str(path), str(root), ocr) for path in pdf_paths]
+    if max_workers == 1 or len(args) <= 1:
+        results = [_warm_one(*item) for item in args]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_warm_one, *zip(*args)))
+    counts = {"hit": 0, "miss": 0, "error": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    return {
+        "cache_root": str(root),
+        "extractor_version": EXTRACTOR_VERSION,
+        "file_count": len(results),
+        "hit_count": counts["hit"],
+        "miss_count": counts["miss"],
+        "error_count": counts["error"],
+        "ocr_file_count": sum(1 for result in results if result.get("ocr_pages")),
+        "files": results,
+    }
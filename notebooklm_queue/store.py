@@ -142,8 +142,67 @@ class QueueStore:
         priority: int = 100,
         blocked_reason: str | None = None,
     ) -> dict[str, Any]:
+        self.ensure_layout()
+        payload, changed = self._merged_job_payload(
+            identity,
+            now=utc_now_iso(),
+            initial_state=initial_state,
+            actor=actor,
+            note=note,
+            metadata=metadata,
+            priority=priority,
+            blocked_reason=blocked_reason,
+        )
+        if changed:
+            self.save_job(payload)
+        return payload
+
+    def upsert_jobs(
+        self,
+        items: list[tuple[JobIdentity, dict[str, Any] | None]],
+        *,
+        initial_state: str = STATE_QUEUED,
+        actor: str = "system",
+        note: str | None = None,
+        priority: int = 100,
+        blocked_reason: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Upsert many jobs, rewriting the show and global indexes only once."""
         self.ensure_layout()
         now = utc_now_iso()
+        payloads: list[dict[str, Any]] = []
+        changed_payloads: list[dict[str, Any]] = []
+        for identity, metadata in items:
+            payload, changed = self._merged_job_payload(
+                identity,
+                now=now,
+                initial_state=initial_state,
+                actor=actor,
+                note=note,
+                metadata=metadata,
+                priority=priority,
+                blocked_reason=blocked_reason,
+            )
+            payloads.append(payload)
+            if changed:
+                _write_json_atomic(self.job_path(identity.show_slug, str(payload["job_id"])), payload)
+                changed_payloads.append(payload)
+        if changed_payloads:
+            self._update_indexes_for_jobs(changed_payloads)
+        return payloads
+
+    def _merged_job_payload(
+        self,
+        identity: JobIdentity,
+        *,
+        now: str,
+        initial_state: str,
+        actor: str,
+        note: str | None,
+        metadata: dict[str, Any] | None,
+        priority: int,
+        blocked_reason: str | None,
+    ) -> tuple[dict[str, Any], bool]:
         job_id = identity.stable_key()
         existing = self.load_job(show_slug=identity.show_slug, job_id=job_id)
         if existing:
@@ -164,8 +223,7 @@ class QueueStore:
                 changed = True
             if changed:
                 existing["updated_at"] = now
-                self.save_job(existing)
-            return existing
+            return existing, changed
 
         payload: dict[str, Any] = {
             "version": QUEUE_VERSION,
@@ -197,8 +255,7 @@ class QueueStore:
                 }
             ],
         }
-        self.save_job(payload)
-        return payload
+        return payload, True
 
     def save_job(self, payload: dict[str, Any]) -> None:
         self.ensure_layout()
@@ -493,33 +550,42 @@ class QueueStore:
             yield lock_path
 
     def _update_indexes_for_job(self, payload: dict[str, Any]) -> None:
-        show_slug = str(payload.get("show_slug") or "").strip()
-        job_id = str(payload.get("job_id") or "").strip()
-        if not show_slug or not job_id:
+        self._update_indexes_for_jobs([payload])
+
+    def _update_indexes_for_jobs(self, payloads: list[dict[str, Any]]) -> None:
+        by_show: dict[str, dict[str, dict[str, Any]]] = {}
+        for payload in payloads:
+            show_slug = str(payload.get("show_slug") or "").strip()
+            job_id = str(payload.get("job_id") or "").strip()
+            if not show_slug or not job_id:
+                continue
+            by_show.setdefault(show_slug, {})[job_id] = self._job_index_entry(payload)
+        if not by_show:
             return
         with self.acquire_global_lock("indexes", blocking=True):
-            show_index = _load_json(self.show_index_path(show_slug))
-            entries = show_index.get("jobs") if isinstance(show_index.get("jobs"), list) else []
-            by_id = {
-                str(entry.get("job_id") or ""): entry
-                for entry in entries
-                if isinstance(entry, dict) and entry.get("job_id")
-            }
-            by_id[job_id] = self._job_index_entry(payload)
-            ordered = [by_id[key] for key in sorted(by_id.keys())]
-            _write_json_atomic(
-                self.show_index_path(show_slug),
-                {
-                    "version": QUEUE_VERSION,
-                    "show_slug": show_slug,
-                    "generated_at": utc_now_iso(),
-                    "job_count": len(ordered),
-                    "jobs": ordered,
-                },
-            )
             registry = self._load_global_jobs_index()
             jobs = _coerce_mapping(registry.get("jobs", {}))
-            jobs[job_id] = self._job_index_entry(payload)
+            for show_slug, updates in sorted(by_show.items()):
+                show_index = _load_json(self.show_index_path(show_slug))
+                entries = show_index.get("jobs") if isinstance(show_index.get("jobs"), list) else []
+                by_id = {
+                    str(entry.get("job_id") or ""): entry
+                    for entry in entries
+                    if isinstance(entry, dict) and entry.get("job_id")
+                }
+                by_id.update(updates)
+                ordered = [by_id[key] for key in sorted(by_id.keys())]
+                _write_json_atomic(
+                    self.show_index_path(show_slug),
+                    {
+                        "version": QUEUE_VERSION,
+                        "show_slug": show_slug,
+                        "generated_at": utc_now_iso(),
+                        "job_count": len(ordered),
+                        "jobs": ordered,
+                    },
+                )
+                jobs.update(updates)
             _write_json_atomic(
                 self.global_jobs_index_path,
                 {
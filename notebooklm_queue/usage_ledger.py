@@ -0,0 +1,291 @@
+"""Append-only token, latency and cost ledger for JSON generation calls."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .store import _load_json
+
+USAGE_LEDGER_PATH_ENV_VAR = "NOTEBOOKLM_USAGE_LEDGER_PATH"
+USAGE_PRICES_PATH_ENV_VAR = "NOTEBOOKLM_USAGE_PRICES_PATH"
+DEFAULT_USAGE_LEDGER_PATH = Path.home() / ".cache" / "psyk-podcast" / "usage-ledger.jsonl"
+LEDGER_DISABLED_VALUES = {"0", "off", "none", "false"}
+LEDGER_VERSION = 1
+REPORT_GROUPS = ("stage", "lecture", "day", "model")
+
+_SCOPE: ContextVar[dict[str, str]] = ContextVar("notebooklm_usage_scope", default={})
+
+
+def default_ledger_path() -> Path | None:
+    """Ledger location, or ``None`` when ``NOTEBOOKLM_USAGE_LEDGER_PATH=off``."""
+
+    raw = str(os.environ.get(USAGE_LEDGER_PATH_ENV_VAR) or "").strip()
+    if raw.lower() in LEDGER_DISABLED_VALUES:
+        return None
+    return Path(raw).expanduser() if raw else DEFAULT_USAGE_LEDGER_PATH
+
+
+@contextmanager
+def usage_scope(*, stage: str | None = None, lecture_key: str | None = None) -> Iterator[None]:
+    """Label generation calls made inside the block with a stage and lecture.
+
+    The scope is a context variable, so worker threads started inside the block
+    must open their own scope.
+    """
+
+    current = dict(_SCOPE.get())
+    if stage is not None:
+        current["stage"] = str(stage)
+    if lecture_key is not None:
+        current["lecture_key"] = str(lecture_key)
+    token = _SCOPE.set(current)
+    try:
+        yield
+    finally:
+        _SCOPE.reset(token)
+
+
+def _field(value: object, name: str) -> Any:
+    return value.get(name) if isinstance(value, dict) else getattr(value, name, None)
+
+
+def _int_attr(value: object, name: str) -> int:
+    raw = _field(value, name)
+    try:
+        return int(raw or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def gemini_response_usage(response: object) -> dict[str, int]:
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is None:
+        return {}
+    reasoning = _int_attr(metadata, "thoughts_token_count")
+    return {
+        "input_tokens": _int_attr(metadata, "prompt_token_count"),
+        # Thinking tokens are billed as output, so they are counted in output_tokens too.
+        "output_tokens": _int_attr(metadata, "candidates_token_count") + reasoning,
+        "reasoning_tokens": reasoning,
+        "cached_input_tokens": _int_attr(metadata, "cached_content_token_count"),
+    }
+
+
+def openai_response_usage(response: object) -> dict[str, int]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {}
+    return {
+        "input_tokens": _int_attr(usage, "input_tokens"),
+        "output_tokens": _int_attr(usage, "output_tokens"),
+        "reasoning_tokens": _int_attr(_field(usage, "output_tokens_details"), "reasoning_tokens"),
+        "cached_input_tokens": _int_attr(_field(usage, "input_tokens_details"), "cached_tokens"),
+    }
+
+
+_USAGE_EXTRACTORS = {"gemini": gemini_response_usage, "openai": openai_response_usage}
+
+
+class GenerationUsage:
+    """Accumulates usage across the attempts of one ``generate_json`` call."""
+
+    __slots__ = ("provider", "model", "attempts", "tokens")
+
+    def __init__(self, *, provider: str, model: str) -> None:
+        self.provider = provider
+        self.model = model
+        self.attempts = 0
+        self.tokens = {"input_tokens": 0, "output_tokens": 0, "reasoning_tokens": 0, "cached_input_tokens": 0}
+
+    def add_response(self, response: object) -> None:
+        extractor = _USAGE_EXTRACTORS.get(self.provider)
+        for key, value in (extractor(response) if extractor else {}).items():
+            self.tokens[key] = self.tokens.get(key, 0) + value
+
+
+@contextmanager
+def track_generation(*, provider: str, model: str) -> Iterator[GenerationUsage]:
+    """Record one ledger entry for the wrapped call, whether it returns or raises."""
+
+    usage = GenerationUsage(provider=provider, model=model)
+    started = time.monotonic()
+    status = "error"
+    try:
+        yield usage
+        status = "ok"
+    finally:
+        record_usage(
+            provider=provider,
+            model=model,
+            status=status,
+            cache_hit=False,
+            retries=max(usage.attempts - 1, 0),
+            wall_seconds=time.monotonic() - started,
+            **usage.tokens,
+        )
+
+
+def record_cache_hit(*, provider: str, model: str, stage: str | None = None, lecture_key: str | None = None) -> None:
+    """Record a stage result that was reused instead of generated."""
+
+    with usage_scope(stage=stage, lecture_key=lecture_key):
+        record_usage(provider=provider, model=model, status="ok", cache_hit=True)
+
+
+def record_usage(
+    *,
+    provider: str,
+    model: str,
+    status: str,
+    cache_hit: bool,
+    retries: int = 0,
+    wall_seconds: float = 0.0,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    reasoning_tokens: int = 0,
+    cached_input_tokens: int = 0,
+    path: Path | None = None,
+) -> None:
+    """Best-effort append of one JSON line; ledger failures never fail generation."""
+
+    ledger_path = path if path is not None else default_ledger_path()
+    if ledger_path is None:
+        return
+    scope = _SCOPE.get()
+    record = {
+        "version": LEDGER_VERSION,
+        "recorded_at": datetime.now(tz=UTC).replace(microsecond=0).isoformat(),
+        "provider": provider,
+        "model": model,
+        "stage": scope.get("stage", ""),
+        "lecture_key": scope.get("lecture_key", ""),
+        "status": status,
+        "cache": "hit" if cache_hit else "miss",
+        "retries": int(retries),
+        "wall_seconds": round(float(wall_seconds), 3),
+        "input_tokens": int(input_tokens),
+        "output_tokens": int(output_tokens),
+        "reasoning_tokens": int(reasoning_tokens),
+        "cached_input_tokens": int(cached_input_tokens),
+        "pid": os.getpid(),
+    }
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    try:
+        ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        # One write per line on an O_APPEND handle keeps concurrent writers from interleaving.
+        with ledger_path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+    except OSError:
+        pass
+
+
+def read_ledger(path: Path) -> Iterator[dict[str, Any]]:
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def load_price_table(path: Path | None = None) -> dict[str, dict[str, float]]:
+    """Load ``{model: {"input_per_million": x, "output_per_million": y}}``.
+
+    ``path`` defaults to ``NOTEBOOKLM_USAGE_PRICES_PATH``. A ``"*"`` entry prices
+    models that have no entry of their own; unpriced models report no cost.
+    """
+
+    if path is None:
+        raw = str(os.environ.get(USAGE_PRICES_PATH_ENV_VAR) or "").strip()
+        path = Path(raw).expanduser() if raw else None
+    payload = _load_json(path) if path is not None else {}
+    table: dict[str, dict[str, float]] = {}
+    for model, prices in payload.items():
+        if isinstance(prices, dict):
+            table[str(model)] = {
+                "input_per_million": float(prices.get("input_per_million") or 0.0),
+                "output_per_million": float(prices.get("output_per_million") or 0.0),
+            }
+    return table
+
+
+def estimate_cost(record: dict[str, Any], prices: dict[str, dict[str, float]]) -> float | None:
+    price = prices.get(str(record.get("model") or "")) or prices.get("*")
+    if price is None:
+        return None
+    return (
+        int(record.get("input_tokens") or 0) * price["input_per_million"]
+        + int(record.get("output_tokens") or 0) * price["output_per_million"]
+    ) / 1_000_000
+
+
+def _empty_bucket() -> dict[str, Any]:
+    return {
+        "calls": 0,
+        "cache_hits": 0,
+        "errors": 0,
+        "retries": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "reasoning_tokens": 0,
+        "wall_seconds": 0.0,
+        "estimated_cost_usd": 0.0,
+        "unpriced_calls": 0,
+    }
+
+
+def _add_to_bucket(bucket: dict[str, Any], record: dict[str, Any], cost: float | None) -> None:
+    bucket["calls"] += 1
+    bucket["cache_hits"] += int(record.get("cache") == "hit")
+    bucket["errors"] += int(record.get("status") != "ok")
+    for key in ("retries", "input_tokens", "output_tokens", "reasoning_tokens"):
+        bucket[key] += int(record.get(key) or 0)
+    bucket["wall_seconds"] = round(bucket["wall_seconds"] + float(record.get("wall_seconds") or 0.0), 3)
+    if cost is None:
+        bucket["unpriced_calls"] += 1
+    else:
+        bucket["estimated_cost_usd"] = round(bucket["estimated_cost_usd"] + cost, 6)
+
+
+def _group_key(record: dict[str, Any], group: str) -> str:
+    if group == "day":
+        return str(record.get("recorded_at") or "")[:10]
+    if group == "lecture":
+        return str(record.get("lecture_key") or "") or "(none)"
+    return str(record.get(group) or "") or "(none)"
+
+
+def summarize_usage(
+    records: Iterable[dict[str, Any]],
+    *,
+    prices: dict[str, dict[str, float]] | None = None,
+    groups: Iterable[str] = REPORT_GROUPS,
+    since: str | None = None,
+) -> dict[str, Any]:
+    """Aggregate ledger records into totals plus one table per requested group."""
+
+    prices = prices or {}
+    groups = [group for group in groups if group in REPORT_GROUPS]
+    report: dict[str, Any] = {"totals": _empty_bucket(), **{f"by_{group}": {} for group in groups}}
+    for record in records:
+        if since and str(record.get("recorded_at") or "") < since:
+            continue
+        cost = 0.0 if record.get("cache") == "hit" else estimate_cost(record, prices)
+        _add_to_bucket(report["totals"], record, cost)
+        for group in groups:
+            bucket = report[f"by_{group}"].setdefault(_group_key(record, group), _empty_bucket())
+            _add_to_bucket(bucket, record, cost)
+    for group in groups:
+        report[f"by_{group}"] = dict(sorted(report[f"by_{group}"].items()))
+    return report
@@ -22,6 +22,7 @@ REPO_ROOT = SCRIPT_DIR.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from loudness import loudness_from_app_properties  # noqa: E402
 from regeneration_identity import logical_episode_id  # noqa: E402
 from storage_backends import build_storage_backend, resolve_storage_provider
 
@@ -268,38 +269,39 @@ def build_episode_inventory_payload(
     for episode in episodes:
         if not isinstance(episode, dict):
             continue
-        serialized_episodes.append(
-            {
-                "episode_key": str(episode.get("episode_key") or episode.get("guid") or "").strip(),
-                "guid": str(episode.get("guid") or "").strip(),
-                "title": str(episode.get("title") or "").strip(),
-                "description": str(episode.get("description") or "").strip(),
-                "link": str(episode.get("link") or "").strip(),
-                "pub_date": str(episode.get("pubDate") or "").strip(),
-                "published_at": (
-                    episode["published_at"].isoformat()
-                    if isinstance(episode.get("published_at"), dt.datetime)
-                    else str(episode.get("published_at") or "").strip()
-                ),
-                "mime_type": str(episode.get("mimeType") or "").strip(),
-                "size": episode.get("size"),
-                "duration": str(episode.get("duration") or "").strip(),
-                "image": str(episode.get("image") or "").strip(),
-                "audio_url": str(episode.get("audio_url") or "").strip(),
-                "lecture_key": str(episode.get("lecture_key") or "").strip(),
-                "episode_kind": str(episode.get("episode_kind") or "").strip(),
-                "podcast_kind": str(episode.get("podcast_kind") or "").strip(),
-                "source_name": str(episode.get("source_name") or "").strip(),
-                "source_drive_file_id": str(episode.get("source_drive_file_id") or "").strip(),
-                "source_storage_provider": str(episode.get("source_storage_provider") or "").strip(),
-                "source_storage_key": str(episode.get("source_storage_key") or "").strip(),
-                "source_path": str(episode.get("source_path") or "").strip(),
-                "sort_week": episode.get("sort_week"),
-                "sort_lecture": episode.get("sort_lecture"),
-                "sort_tail": bool(episode.get("sort_tail")),
-                "sort_tail_index": episode.get("sort_tail_index"),
-            }
-        )
+        serialized = {
+            "episode_key": str(episode.get("episode_key") or episode.get("guid") or "").strip(),
+            "guid": str(episode.get("guid") or "").strip(),
+            "title": str(episode.get("title") or "").strip(),
+            "description": str(episode.get("description") or "").strip(),
+            "link": str(episode.get("link") or "").strip(),
+            "pub_date": str(episode.get("pubDate") or "").strip(),
+            "published_at": (
+                episode["published_at"].isoformat()
+                if isinstance(episode.get("published_at"), dt.datetime)
+                else str(episode.get("published_at") or "").strip()
+            ),
+            "mime_type": str(episode.get("mimeType") or "").strip(),
+            "size": episode.get("size"),
+            "duration": str(episode.get("duration") or "").strip(),
+            "image": str(episode.get("image") or "").strip(),
+            "audio_url": str(episode.get("audio_url") or "").strip(),
+            "lecture_key": str(episode.get("lecture_key") or "").strip(),
+            "episode_kind": str(episode.get("episode_kind") or "").strip(),
+            "podcast_kind": str(episode.get("podcast_kind") or "").strip(),
+            "source_name": str(episode.get("source_name") or "").strip(),
+            "source_drive_file_id": str(episode.get("source_drive_file_id") or "").strip(),
+            "source_storage_provider": str(episode.get("source_storage_provider") or "").strip(),
+            "source_storage_key": str(episode.get("source_storage_key") or "").strip(),
+            "source_path": str(episode.get("source_path") or "").strip(),
+            "sort_week": episode.get("sort_week"),
+            "sort_lecture": episode.get("sort_lecture"),
+            "sort_tail": bool(episode.get("sort_tail")),
+            "sort_tail_index": episode.get("sort_tail_index"),
+        }
+        if isinstance(episode.get("loudness"), dict) and episode["loudness"]:
+            serialized["loudness"] = dict(episode["loudness"])
+        serialized_episodes.append(serialized)
 
     return {
         "version": 2,
@@ -4357,6 +4359,7 @@ def build_episode_entry(
         "sort_lecture": lecture_number,
         "sort_tail": is_unassigned_tail,
         "audio_url": _render_public_media_url(file_entry, public_link_template),
+        "loudness": file_entry.get("loudness") or loudness_from_app_properties(file_entry.get("appProperties")),
     }
 
 
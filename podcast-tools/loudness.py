@@ -0,0 +1,231 @@
+"""Two-pass EBU R128 loudness normalisation with cached first-pass measurements."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+LOUDNORM_FILTER_VERSION = "ffmpeg-loudnorm-v1"
+LOUDNESS_CACHE_DIR_ENV_VAR = "PODCAST_LOUDNESS_CACHE_DIR"
+DEFAULT_TARGET_LUFS = -16.0
+DEFAULT_TRUE_PEAK_DB = -1.5
+DEFAULT_LOUDNESS_RANGE = 11.0
+DEFAULT_SAMPLE_RATE = 44100
+# Drive appProperties entries are capped at 124 bytes per key+value pair.
+APP_PROPERTY_KEY = "psyk_loudnorm"
+_MEASUREMENT_KEYS = ("input_i", "input_tp", "input_lra", "input_thresh", "target_offset")
+_JSON_BLOCK_RE = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}", re.DOTALL)
+
+
+class LoudnormError(RuntimeError):
+    pass
+
+
+def parse_loudnorm_config(raw: Any) -> Optional[Dict[str, Any]]:
+    """Normalise the ``transcode.loudnorm`` block; ``None`` when absent or disabled."""
+
+    if raw is True:
+        raw = {}
+    if not isinstance(raw, dict) or not raw.get("enabled", True):
+        return None
+    return {
+        "integrated_lufs": float(raw.get("integrated_lufs", DEFAULT_TARGET_LUFS)),
+        "true_peak_db": float(raw.get("true_peak_db", DEFAULT_TRUE_PEAK_DB)),
+        "loudness_range": float(raw.get("loudness_range", DEFAULT_LOUDNESS_RANGE)),
+        "sample_rate": int(raw.get("sample_rate", DEFAULT_SAMPLE_RATE)),
+    }
+
+
+def default_cache_root() -> Path:
+    raw = str(os.environ.get(LOUDNESS_CACHE_DIR_ENV_VAR) or "").strip()
+    if raw:
+        return Path(raw).expanduser()
+    return Path.home() / ".cache" / "psyk-podcast" / "loudness"
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _target_filter_args(settings: Dict[str, Any]) -> str:
+    return (
+        f"I={settings['integrated_lufs']:g}"
+        f":TP={settings['true_peak_db']:g}"
+        f":LRA={settings['loudness_range']:g}"
+    )
+
+
+def _target_tag(settings: Dict[str, Any]) -> str:
+    return hashlib.sha256(f"{LOUDNORM_FILTER_VERSION}|{_target_filter_args(settings)}".encode("utf-8")).hexdigest()[:12]
+
+
+def cache_path(cache_root: Path, sha256: str, settings: Dict[str, Any]) -> Path:
+    return Path(cache_root) / sha256[:2] / f"{sha256}-{_target_tag(settings)}.json"
+
+
+def parse_loudnorm_output(stderr: str) -> Dict[str, float]:
+    """Extract the JSON block ``loudnorm=print_format=json`` writes to stderr."""
+
+    matches = _JSON_BLOCK_RE.findall(stderr or "")
+    if not matches:
+        raise LoudnormError("loudnorm did not report measurements")
+    try:
+        payload = json.loads(matches[-1])
+    except ValueError as exc:
+        raise LoudnormError(f"loudnorm measurements were not valid JSON: {exc}") from exc
+    measurements: Dict[str, float] = {}
+    for key, value in payload.items():
+        try:
+            measurements[key] = float(value)
+        except (TypeError, ValueError):
+            continue
+    missing = [key for key in _MEASUREMENT_KEYS if key not in measurements]
+    if missing:
+        raise LoudnormError(f"loudnorm measurements missing {', '.join(missing)}")
+    return measurements
+
+
+def measure_loudness(source: Path, settings: Dict[str, Any]) -> Dict[str, float]:
+    """Run the analysis pass and return loudnorm's input measurements."""
+
+    command = [
+        os.environ.get("FFMPEG_BIN", "ffmpeg"),
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        str(source),
+        "-vn",
+        "-af",
+        f"loudnorm={_target_filter_args(settings)}:print_format=json",
+        "-f",
+        "null",
+        "-",
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+    stderr = result.stderr.decode("utf-8", errors="ignore")
+    if result.returncode != 0:
+        raise LoudnormError(f"loudnorm analysis failed with exit code {result.returncode}: {stderr[-500:]}")
+    return {key: value for key, value in parse_loudnorm_output(stderr).items() if key in _MEASUREMENT_KEYS}
+
+
+def cached_measurement(
+    source: Path,
+    settings: Dict[str, Any],
+    *,
+    cache_root: Optional[Path] = None,
+    sha256: Optional[str] = None,
+) -> Tuple[Dict[str, float], str, bool]:
+    """Return ``(measurement, sha256, cache_hit)``, running the analysis pass only on a miss."""
+
+    digest = sha256 or sha256_file(source)
+    path = cache_path(cache_root or default_cache_root(), digest, settings)
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        measurement = {key: float(payload["measurement"][key]) for key in _MEASUREMENT_KEYS}
+        return measurement, digest, True
+    except (OSError, KeyError, TypeError, ValueError):
+        pass
+    measurement = measure_loudness(source, settings)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "sha256": digest,
+        "filter_version": LOUDNORM_FILTER_VERSION,
+        "target": _target_filter_args(settings),
+        "measurement": measurement,
+    }
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False, suffix=".tmp") as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+        tmp_name = handle.name
+    os.replace(tmp_name, path)
+    return measurement, digest, False
+
+
+def second_pass_filter(measurement: Dict[str, float], settings: Dict[str, Any]) -> str:
+    return (
+        f"loudnorm={_target_filter_args(settings)}"
+        f":measured_I={measurement['input_i']:g}"
+        f":measured_TP={measurement['input_tp']:g}"
+        f":measured_LRA={measurement['input_lra']:g}"
+        f":measured_thresh={measurement['input_thresh']:g}"
+        f":offset={measurement['target_offset']:g}"
+        ":linear=true:print_format=json"
+    )
+
+
+def second_pass_args(measurement: Dict[str, float], settings: Dict[str, Any]) -> List[str]:
+    """ffmpeg arguments applying the measured normalisation; loudnorm resamples, so pin the rate."""
+
+    return ["-af", second_pass_filter(measurement, settings), "-ar", str(settings["sample_rate"])]
+
+
+def loudness_record(
+    measurement: Dict[str, float],
+    settings: Dict[str, Any],
+    *,
+    sha256: str,
+    second_pass_stderr: str = "",
+) -> Dict[str, Any]:
+    """Summary stored with the published episode (manifest item / inventory)."""
+
+    record: Dict[str, Any] = {
+        "filter_version": LOUDNORM_FILTER_VERSION,
+        "source_sha256": sha256,
+        "target_lufs": settings["integrated_lufs"],
+        "target_true_peak_db": settings["true_peak_db"],
+        "input_lufs": measurement["input_i"],
+        "input_true_peak_db": measurement["input_tp"],
+        "input_lra": measurement["input_lra"],
+    }
+    try:
+        output = parse_loudnorm_output(second_pass_stderr)
+    except LoudnormError:
+        return record
+    for source_key, record_key in (("output_i", "output_lufs"), ("output_tp", "output_true_peak_db")):
+        if source_key in output:
+            record[record_key] = output[source_key]
+    return record
+
+
+def loudness_app_properties(record: Dict[str, Any]) -> Dict[str, str]:
+    compact = {
+        "i": record.get("input_lufs"),
+        "tp": record.get("input_true_peak_db"),
+        "lra": record.get("input_lra"),
+        "ti": record.get("target_lufs"),
+        "ttp": record.get("target_true_peak_db"),
+    }
+    value = json.dumps({key: round(float(item), 2) for key, item in compact.items() if item is not None}, separators=(",", ":"))
+    return {APP_PROPERTY_KEY: value}
+
+
+def loudness_from_app_properties(app_properties: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(app_properties, dict):
+        return None
+    raw = app_properties.get(APP_PROPERTY_KEY)
+    if not raw:
+        return None
+    try:
+        compact = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(compact, dict):
+        return None
+    mapping = {
+        "i": "input_lufs",
+        "tp": "input_true_peak_db",
+        "lra": "input_lra",
+        "ti": "target_lufs",
+        "ttp": "target_true_peak_db",
+    }
+    return {mapping[key]: value for key, value in compact.items() if key in mapping}
@@ -556,7 +556,7 @@ def list_drive_files(
     files: List[Dict[str, Any]] = []
     pending: List[str] = [folder_id]
     seen: set[str] = set()
-    file_fields = "nextPageToken, files(id,name,mimeType,size,parents,modifiedTime,createdTime)"
+    file_fields = "nextPageToken, files(id,name,mimeType,size,parents,modifiedTime,createdTime,appProperties)"
     folder_fields = "nextPageToken, files(id,name)"
     mime_clause = _build_drive_mime_query(mime_type_filters)
 
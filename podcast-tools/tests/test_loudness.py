@@ -0,0 +1,179 @@
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+STUB_MEASUREMENT = {
+    "input_i": "-23.41",
+    "input_tp": "-4.20",
+    "input_lra": "7.10",
+    "input_thresh": "-33.80",
+    "output_i": "-16.02",
+    "output_tp": "-1.60",
+    "target_offset": "0.02",
+}
+
+
+def _load_module(name, relative_path):
+    module_path = REPO_ROOT / relative_path
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write_stub_ffmpeg(path: Path, log_path: Path) -> Path:
+    path.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        f"open({str(log_path)!r}, 'a').write(' '.join(sys.argv[1:]) + '\\n')\n"
+        "args = sys.argv[1:]\n"
+        f"report = {json.dumps(json.dumps(STUB_MEASUREMENT, indent=1))}\n"
+        "if args[-2:] != ['null', '-']:\n"
+        "    open(args[-1], 'wb').write(b'normalised')\n"
+        "if any('print_format=json' in arg for arg in args):\n"
+        "    sys.stderr.write('[Parsed_loudnorm_0 @ 0x1]\\n' + report + '\\n')\n",
+        encoding="utf-8",
+    )
+    path.chmod(0o755)
+    return path
+
+
+class LoudnessTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loudness = _load_module("loudness", "podcast-tools/loudness.py")
+        cls.transcode = _load_module("transcode_drive_media", "podcast-tools/transcode_drive_media.py")
+
+    def test_parse_config_defaults_and_disabled(self):
+        self.assertIsNone(self.loudness.parse_loudnorm_config(None))
+        self.assertIsNone(self.loudness.parse_loudnorm_config({"enabled": False}))
+        settings = self.loudness.parse_loudnorm_config({"integrated_lufs": -19})
+        self.assertEqual(settings["integrated_lufs"], -19.0)
+        self.assertEqual(settings["true_peak_db"], -1.5)
+
+    def test_app_properties_round_trip_fits_drive_limit(self):
+        record = {
+            "input_lufs": -23.413,
+            "input_true_peak_db": -4.2,
+            "input_lra": 7.1,
+            "target_lufs": -16.0,
+            "target_true_peak_db": -1.5,
+        }
+        properties = self.loudness.loudness_app_properties(record)
+        key, value = next(iter(properties.items()))
+        self.assertLessEqual(len(key.encode()) + len(value.encode()), 124)
+        parsed = self.loudness.loudness_from_app_properties(properties)
+        self.assertEqual(parsed["input_lufs"], -23.41)
+        self.assertEqual(parsed["target_true_peak_db"], -1.5)
+
+    def test_rerun_reuses_cached_first_pass(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            log_path = tmp / "ffmpeg.log"
+            ffmpeg = _write_stub_ffmpeg(tmp / "ffmpeg", log_path)
+            source = tmp / "episode.wav"
+            source.write_bytes(b"pcm")
+            cfg = self.transcode.parse_transcode_config(
+                {"transcode": {"enabled": True, "loudnorm": {"enabled": True}}}
+            )
+            env = {"FFMPEG_BIN": str(ffmpeg), self.loudness.LOUDNESS_CACHE_DIR_ENV_VAR: str(tmp / "cache")}
+            with mock.patch.dict(os.environ, env):
+                first = self.transcode.transcode_file(source, tmp / "first.mp3", cfg)
+                second = self.transcode.transcode_file(source, tmp / "second.mp3", cfg)
+
+            calls = log_path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(len([call for call in calls if call.endswith("null -")]), 1)
+            self.assertEqual(len(calls), 3)
+            self.assertIn("measured_I=-23.41", calls[-1])
+            self.assertIn("-ar 44100", calls[-1])
+            self.assertEqual(first, second)
+            self.assertEqual(first["input_lufs"], -23.41)
+            self.assertEqual(first["output_lufs"], -16.02)
+            self.assertEqual(first["source_sha256"], self.loudness.sha256_file(source))
+
+    def test_publish_records_loudness_on_manifest_item(self):
+        publish = _load_module("publish_local_show_to_r2", "scripts/publish_local_show_to_r2.py")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            ffmpeg = _write_stub_ffmpeg(tmp / "ffmpeg", tmp / "ffmpeg.log")
+            source = tmp / "episode.m4a"
+            source.write_bytes(b"aac")
+            cfg = publish.parse_transcode_config(
+                {"transcode": {"enabled": True, "source_mime_types": ["audio/mp4"], "loudnorm": {}}}
+            )
+            loudness = {}
+            env = {"FFMPEG_BIN": str(ffmpeg), self.loudness.LOUDNESS_CACHE_DIR_ENV_VAR: str(tmp / "cache")}
+            with mock.patch.dict(os.environ, env):
+                artifact = publish.prepare_artifact_file(
+                    source_file=source,
+                    source_mime_type="audio/mp4",
+                    tmp_root=tmp,
+                    transcode_cfg=cfg,
+                    loudness=loudness,
+                )
+
+            self.assertEqual(artifact.name, "episode.mp3")
+            self.assertEqual(loudness["target_lufs"], -16.0)
+            item = publish.build_manifest_item(
+                bucket="freudd",
+                object_key="shows/personal/episode.mp3",
+                source_name="episode.mp3",
+                source_path="episode.mp3",
+                path_parts=[],
+                mime_type="audio/mpeg",
+                size=10,
+                sha256="abc",
+                published_at="2026-01-01T00:00:00+00:00",
+                public_url="https://example.invalid/episode.mp3",
+                stable_guid="guid",
+                loudness=loudness,
+            )
+            self.assertEqual(item["loudness"]["input_lufs"], -23.41)
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg not installed")
+    def test_sine_wave_is_normalised_towards_target(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            source = tmp / "sine.wav"
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "sine=frequency=440:duration=3",
+                    "-af",
+                    "volume=-20dB",
+                    str(source),
+                ],
+                check=True,
+            )
+            cfg = self.transcode.parse_transcode_config(
+                {"transcode": {"enabled": True, "loudnorm": {"integrated_lufs": -16}}}
+            )
+            with mock.patch.dict(
+                os.environ,
+                {"FFMPEG_BIN": "ffmpeg", self.loudness.LOUDNESS_CACHE_DIR_ENV_VAR: str(tmp / "cache")},
+            ):
+                record = self.transcode.transcode_file(source, tmp / "sine.mp3", cfg)
+
+            self.assertLess(record["input_lufs"], -25.0)
+            self.assertAlmostEqual(record["output_lufs"], -16.0, delta=2.0)
+            self.assertTrue((tmp / "sine.mp3").stat().st_size > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,13 @@
 import importlib.util
 import io
 import json
+import os
 import sys
 import tempfile
 import unittest
-from contextlib import redirect_stdout
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
+from unittest import mock
 
 
 def _load_module():
@@ -14,10 +16,83 @@ def _load_module():
     spec = importlib.util.spec_from_file_location("transcode_drive_media", module_path)
     assert spec and spec.loader
     module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
     spec.loader.exec_module(module)
     return module
 
 
+MP3_PROBE = {
+    "streams": [{"codec_type": "audio", "codec_name": "mp3", "bit_rate": "160000"}],
+    "format": {"format_name": "mp3", "bit_rate": "160512"},
+}
+VIDEO_PROBE = {
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264"},
+        {"codec_type": "audio", "codec_name": "aac", "bit_rate": "128000"},
+    ],
+    "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2"},
+}
+
+
+class _FakeRequest:
+    def __init__(self, callback):
+        self._callback = callback
+
+    def execute(self):
+        return self._callback()
+
+
+class _FakeFiles:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def get_media(self, *, fileId, supportsAllDrives):
+        return self._drive.contents[fileId]
+
+    def update(self, **params):
+        def _execute():
+            media = params["media_body"]
+            self._drive.uploads[params["fileId"]] = {
+                "name": params["body"]["name"],
+                "mimetype": media.mimetype,
+                "content": Path(media.path).read_bytes(),
+            }
+            return {"id": params["fileId"]}
+
+        return _FakeRequest(_execute)
+
+
+class _FakeDrive:
+    def __init__(self, contents):
+        self.contents = contents
+        self.uploads = {}
+
+    def files(self):
+        return _FakeFiles(self)
+
+
+class _FakeDownloader:
+    def __init__(self, handle, payload):
+        self._handle = handle
+        self._payload = payload
+
+    def next_chunk(self):
+        self._handle.write(self._payload)
+        return None, True
+
+
+class _FakeUpload:
+    def __init__(self, path, *, mimetype, resumable):
+        self.path = path
+        self.mimetype = mimetype
+
+
+def _write_stub(path: Path, body: str) -> Path:
+    path.write_text(f"#!{sys.executable}\nimport sys\n{body}", encoding="utf-8")
+    path.chmod(0o755)
+    return path
+
+
 class TranscodeDriveMediaTests(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -136,6 +211,88 @@ class TranscodeDriveMediaTests(unittest.TestCase):
 
             self.assertIn("Transcode is skipped for storage provider 'r2'", stdout.getvalue())
 
+    def test_probe_matches_only_audio_in_target_codec_and_bitrate(self):
+        matches = self.mod.probe_matches_target
+        self.assertTrue(matches(MP3_PROBE, codec="libmp3lame", bitrate="160k", target_extension="mp3"))
+        self.assertFalse(matches(MP3_PROBE, codec="libmp3lame", bitrate="192k", target_extension="mp3"))
+        self.assertFalse(matches(VIDEO_PROBE, codec="aac", bitrate="128k", target_extension="m4a"))
+        self.assertFalse(matches(None, codec="libmp3lame", bitrate="160k", target_extension="mp3"))
+        with_cover = {
+            "streams": MP3_PROBE["streams"]
+            + [{"codec_type": "video", "codec_name": "mjpeg", "disposition": {"attached_pic": 1}}],
+            "format": MP3_PROBE["format"],
+        }
+        self.assertTrue(matches(with_cover, codec="libmp3lame", bitrate="160k", target_extension="mp3"))
+
+    def test_pipeline_transcodes_skips_matching_probe_and_reports_failures(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            ffmpeg_log = tmp / "ffmpeg.log"
+            ffmpeg = _write_stub(
+                tmp / "ffmpeg",
+                "source, destination = sys.argv[sys.argv.index('-i') + 1], sys.argv[-1]\n"
+                f"open({str(ffmpeg_log)!r}, 'a').write(source + '\\n')\n"
+                "data = open(source, 'rb').read()\n"
+                "if b'corrupt' in data:\n"
+                "    sys.exit(1)\n"
+                "open(destination, 'wb').write(b'mp3:' + data)\n",
+            )
+            ffprobe = _write_stub(
+                tmp / "ffprobe",
+                "data = open(sys.argv[-1], 'rb').read()\n"
+                "sys.stdout.write(data.decode() if data.startswith(b'{') else '{}')\n",
+            )
+            drive = _FakeDrive(
+                {
+                    "lecture": json.dumps(VIDEO_PROBE).encode(),
+                    "already": json.dumps(MP3_PROBE).encode(),
+                    "broken": b"corrupt",
+                }
+            )
+            source_files = [
+                {"id": "lecture", "name": "W1L1 lecture.mp4", "parents": ["folder"]},
+                {"id": "already", "name": "W1L2 upload.mp3", "parents": ["folder"]},
+                {"id": "broken", "name": "W1L3 broken.mp4", "parents": ["folder"]},
+                {"id": "orphan", "name": "orphan.mp4"},
+            ]
+            cfg = self.mod.parse_transcode_config({"transcode": {"enabled": True}})
+            factory_calls = []
+
+            def factory():
+                factory_calls.append(1)
+                return drive
+
+            env = {"FFMPEG_BIN": str(ffmpeg), "FFPROBE_BIN": str(ffprobe)}
+            with mock.patch.dict(os.environ, env), mock.patch.object(
+                self.mod, "MediaIoBaseDownload", _FakeDownloader
+            ), mock.patch.object(self.mod, "MediaFileUpload", _FakeUpload), redirect_stdout(
+                io.StringIO()
+            ), redirect_stderr(io.StringIO()):
+                report = self.mod.run_transcode_pipeline(
+                    source_files,
+                    service_factory=factory,
+                    transcode_cfg=cfg,
+                    supports_all_drives=True,
+                    workdir=tmp / "work",
+                    download_workers=2,
+                    transcode_workers=2,
+                    upload_workers=1,
+                )
+
+            self.assertEqual(sorted(report.completed), ["W1L1 lecture.mp4", "W1L2 upload.mp3"])
+            self.assertEqual(report.probe_skipped, ["W1L2 upload.mp3"])
+            self.assertEqual([(name, stage) for name, stage, _ in report.failures], [("W1L3 broken.mp4", "transcode")])
+            self.assertEqual(drive.uploads["lecture"]["name"], "W1L1 lecture.mp3")
+            self.assertEqual(drive.uploads["lecture"]["content"], b"mp3:" + json.dumps(VIDEO_PROBE).encode())
+            self.assertEqual(drive.uploads["already"]["content"], json.dumps(MP3_PROBE).encode())
+            self.assertEqual(drive.uploads["already"]["mimetype"], "audio/mpeg")
+            self.assertNotIn("broken", drive.uploads)
+            self.assertEqual(len(ffmpeg_log.read_text(encoding="utf-8").splitlines()), 2)
+            self.assertEqual(report.stage_counts, {"download": 3, "probe": 3, "transcode": 1, "upload": 2})
+            self.assertLessEqual(len(factory_calls), 3)
+            self.assertEqual(list((tmp / "work").iterdir()), [])
+            self.assertIn("Stage timings", report.format_timings())
+
 
 if __name__ == "__main__":
     unittest.main()
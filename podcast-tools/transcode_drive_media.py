@@ -6,11 +6,15 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import queue
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
@@ -18,6 +22,13 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
+from loudness import (
+    cached_measurement,
+    loudness_app_properties,
+    loudness_record,
+    parse_loudnorm_config,
+    second_pass_args,
+)
 from storage_backends import resolve_storage_provider
 
 try:
@@ -47,6 +58,17 @@ CFG_TAG_PATTERN = re.compile(
     r"(?:\s+\[[^\[\]]+\])?$",
     re.IGNORECASE,
 )
+# ffprobe reports decoder names; map the encoders we configure onto them.
+ENCODER_CODEC_NAMES = {
+    "libmp3lame": "mp3",
+    "libshine": "mp3",
+    "libfdk_aac": "aac",
+    "libopus": "opus",
+    "libvorbis": "vorbis",
+}
+PROBE_BITRATE_TOLERANCE = 0.05
+PIPELINE_STAGES = ("download", "probe", "transcode", "upload")
+_STOP = object()
 
 
 def load_json(path: Path) -> Dict[str, Any]:
@@ -297,7 +319,8 @@ def run_ffmpeg(
     codec: str,
     bitrate: str,
     extra_args: Optional[List[str]] = None,
-) -> None:
+    filter_args: Optional[List[str]] = None,
+) -> str:
     command = [
         os.environ.get("FFMPEG_BIN", "ffmpeg"),
         "-y",
@@ -309,13 +332,324 @@ def run_ffmpeg(
         "-b:a",
         bitrate,
     ]
+    if filter_args:
+        command.extend(filter_args)
     if extra_args:
         command.extend(extra_args)
     command.append(str(destination))
     result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+    stderr = result.stderr.decode("utf-8", errors="ignore")
     if result.returncode != 0:
-        sys.stderr.write(result.stderr.decode("utf-8", errors="ignore"))
+        sys.stderr.write(stderr)
         raise RuntimeError(f"ffmpeg failed with exit code {result.returncode}")
+    return stderr
+
+
+def transcode_file(
+    source: Path,
+    destination: Path,
+    transcode_cfg: Dict[str, Any],
+    *,
+    loudness_cache_root: Optional[Path] = None,
+) -> Optional[Dict[str, Any]]:
+    """Re-encode ``source``; with ``loudnorm`` configured, normalise it and return the loudness record."""
+
+    loudnorm = transcode_cfg.get("loudnorm")
+    filter_args: Optional[List[str]] = None
+    measurement: Dict[str, float] = {}
+    sha256 = ""
+    if loudnorm:
+        measurement, sha256, _ = cached_measurement(source, loudnorm, cache_root=loudness_cache_root)
+        filter_args = second_pass_args(measurement, loudnorm)
+    stderr = run_ffmpeg(
+        source,
+        destination,
+        codec=str(transcode_cfg["codec"]),
+        bitrate=str(transcode_cfg["bitrate"]),
+        extra_args=list(transcode_cfg.get("extra_args") or []),
+        filter_args=filter_args,
+    )
+    if not loudnorm:
+        return None
+    return loudness_record(measurement, loudnorm, sha256=sha256, second_pass_stderr=stderr)
+
+
+def upload_transcoded_file(
+    service,
+    file_id: str,
+    path: Path,
+    *,
+    target_name: str,
+    mime_type: str,
+    supports_all_drives: bool,
+    app_properties: Optional[Dict[str, str]] = None,
+) -> None:
+    media = MediaFileUpload(str(path), mimetype=mime_type, resumable=True)
+    update_body: Dict[str, Any] = {
+        "name": target_name,
+        "mimeType": mime_type,
+        "appProperties": {SOURCE_MARKER: "true", **(app_properties or {})},
+    }
+    params: Dict[str, Any] = {
+        "fileId": file_id,
+        "body": update_body,
+        "media_body": media,
+        "fields": "id,mimeType,name",
+    }
+    if supports_all_drives:
+        params["supportsAllDrives"] = True
+    service.files().update(**params).execute()
+
+
+def probe_media(path: Path) -> Optional[Dict[str, Any]]:
+    """Return ffprobe's format/stream JSON, or None when ffprobe is unavailable or fails."""
+
+    command = [
+        os.environ.get("FFPROBE_BIN", "ffprobe"),
+        "-v",
+        "error",
+        "-print_format",
+        "json",
+        "-show_format",
+        "-show_streams",
+        str(path),
+    ]
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        payload = json.loads(result.stdout.decode("utf-8", errors="ignore") or "{}")
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _parse_bitrate(value: Any) -> Optional[int]:
+    text = str(value or "").strip().lower()
+    if not text:
+        return None
+    multiplier = 1
+    if text[-1] in {"k", "m"}:
+        multiplier = 1000 if text[-1] == "k" else 1_000_000
+        text = text[:-1]
+    try:
+        return int(float(text) * multiplier)
+    except ValueError:
+        return None
+
+
+def probe_matches_target(
+    probe: Optional[Dict[str, Any]],
+    *,
+    codec: str,
+    bitrate: str,
+    target_extension: str,
+) -> bool:
+    """True when the probed file is already audio-only in the target codec, bitrate and container."""
+
+    if not probe:
+        return False
+    streams = [stream for stream in probe.get("streams") or [] if isinstance(stream, dict)]
+    audio = [stream for stream in streams if stream.get("codec_type") == "audio"]
+    video = [
+        stream
+        for stream in streams
+        if stream.get("codec_type") == "video" and not (stream.get("disposition") or {}).get("attached_pic")
+    ]
+    if len(audio) != 1 or video:
+        return False
+    expected_codec = ENCODER_CODEC_NAMES.get(codec, codec)
+    if str(audio[0].get("codec_name") or "").casefold() != expected_codec.casefold():
+        return False
+    probe_format = probe.get("format") or {}
+    format_names = {name.strip().casefold() for name in str(probe_format.get("format_name") or "").split(",")}
+    if target_extension.lstrip(".").casefold() not in format_names:
+        return False
+    expected_bitrate = _parse_bitrate(bitrate)
+    actual_bitrate = _parse_bitrate(audio[0].get("bit_rate")) or _parse_bitrate(probe_format.get("bit_rate"))
+    if not expected_bitrate or not actual_bitrate:
+        return False
+    return abs(actual_bitrate - expected_bitrate) <= expected_bitrate * PROBE_BITRATE_TOLERANCE
+
+
+@dataclass
+class TranscodeJob:
+    video: Dict[str, Any]
+    target_name: str
+    workdir: Path
+    source_path: Path
+    output_path: Path
+    probe_skipped: bool = False
+    loudness: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class PipelineReport:
+    completed: List[str] = field(default_factory=list)
+    probe_skipped: List[str] = field(default_factory=list)
+    failures: List[Tuple[str, str, str]] = field(default_factory=list)
+    stage_seconds: Dict[str, float] = field(default_factory=lambda: {stage: 0.0 for stage in PIPELINE_STAGES})
+    stage_counts: Dict[str, int] = field(default_factory=lambda: {stage: 0 for stage in PIPELINE_STAGES})
+    wall_seconds: float = 0.0
+
+    def format_timings(self) -> str:
+        parts = [
+            f"{stage} {self.stage_seconds[stage]:.1f}s/{self.stage_counts[stage]}"
+            for stage in PIPELINE_STAGES
+        ]
+        return "Stage timings (busy seconds/files): " + ", ".join(parts) + f"; wall {self.wall_seconds:.1f}s"
+
+
+def run_transcode_pipeline(
+    source_files: Sequence[Dict[str, Any]],
+    *,
+    service_factory,
+    transcode_cfg: Dict[str, Any],
+    supports_all_drives: bool,
+    workdir: Path,
+    download_workers: int = 2,
+    transcode_workers: Optional[int] = None,
+    upload_workers: int = 2,
+) -> PipelineReport:
+    """Download, transcode and upload through bounded queues so network and CPU overlap.
+
+    Each Drive-facing worker builds its own service via ``service_factory`` because
+    the Google client's HTTP transport is not thread-safe. Queue sizes cap how many
+    downloaded files sit on disk waiting for the next stage.
+    """
+
+    transcode_workers = max(1, int(transcode_workers or os.cpu_count() or 1))
+    download_workers = max(1, download_workers)
+    upload_workers = max(1, upload_workers)
+    report = PipelineReport()
+    lock = threading.Lock()
+    local = threading.local()
+
+    def service():
+        if not hasattr(local, "service"):
+            local.service = service_factory()
+        return local.service
+
+    def record(stage: str, started: float) -> None:
+        with lock:
+            report.stage_seconds[stage] += time.monotonic() - started
+            report.stage_counts[stage] += 1
+
+    def download(job: TranscodeJob) -> None:
+        print(f"Downloading {job.video['name']} ({job.video['id']})…")
+        started = time.monotonic()
+        job.source_path.parent.mkdir(parents=True, exist_ok=True)
+        download_drive_file(
+            service(),
+            job.video["id"],
+            job.source_path,
+            supports_all_drives=supports_all_drives,
+        )
+        record("download", started)
+
+    def transcode(job: TranscodeJob) -> None:
+        probe_skip = transcode_cfg.get("probe_skip", True) and not transcode_cfg.get("loudnorm")
+        if probe_skip and not transcode_cfg["extra_args"]:
+            started = time.monotonic()
+            matches = probe_matches_target(
+                probe_media(job.source_path),
+                codec=transcode_cfg["codec"],
+                bitrate=transcode_cfg["bitrate"],
+                target_extension=transcode_cfg["target_extension"],
+            )
+            record("probe", started)
+            if matches:
+                print(f"Skipping ffmpeg for {job.video['name']}: codec and bitrate already match.")
+                job.output_path = job.source_path
+                job.probe_skipped = True
+                return
+        print(f"Transcoding {job.video['name']} -> {job.target_name}…")
+        started = time.monotonic()
+        job.loudness = transcode_file(job.source_path, job.output_path, transcode_cfg)
+        record("transcode", started)
+
+    def upload(job: TranscodeJob) -> None:
+        print(f"Replacing Drive content with {job.target_name}…")
+        started = time.monotonic()
+        upload_transcoded_file(
+            service(),
+            job.video["id"],
+            job.output_path,
+            target_name=job.target_name,
+            mime_type=transcode_cfg["target_mime_type"],
+            supports_all_drives=supports_all_drives,
+            app_properties=loudness_app_properties(job.loudness) if job.loudness else None,
+        )
+        record("upload", started)
+        with lock:
+            report.completed.append(job.video["name"])
+            if job.probe_skipped:
+                report.probe_skipped.append(job.video["name"])
+        print(f"Completed {job.video['name']} -> {job.target_name} in-place.")
+
+    def worker(stage: str, handler, inbox: "queue.Queue[Any]", outbox: Optional["queue.Queue[Any]"]) -> None:
+        while True:
+            job = inbox.get()
+            if job is _STOP:
+                return
+            try:
+                handler(job)
+            except Exception as exc:  # noqa: BLE001
+                with lock:
+                    report.failures.append((job.video["name"], stage, str(exc)))
+                print(f"Failed to transcode {job.video['name']} ({stage}): {exc}", file=sys.stderr)
+                shutil.rmtree(job.workdir, ignore_errors=True)
+                continue
+            if outbox is None:
+                shutil.rmtree(job.workdir, ignore_errors=True)
+            else:
+                outbox.put(job)
+
+    download_queue: "queue.Queue[Any]" = queue.Queue()
+    transcode_queue: "queue.Queue[Any]" = queue.Queue(maxsize=transcode_workers)
+    upload_queue: "queue.Queue[Any]" = queue.Queue(maxsize=upload_workers)
+    stages = [
+        ("download", download, download_queue, transcode_queue, download_workers),
+        ("transcode", transcode, transcode_queue, upload_queue, transcode_workers),
+        ("upload", upload, upload_queue, None, upload_workers),
+    ]
+
+    started = time.monotonic()
+    for index, video in enumerate(source_files):
+        if not (video.get("parents") or []):
+            print(f"Skipping {video['name']}: no parent folder information.")
+            continue
+        target_name = format_target_name(video["name"], transcode_cfg["target_extension"])
+        job_dir = workdir / f"{index:04d}"
+        download_queue.put(
+            TranscodeJob(
+                video=video,
+                target_name=target_name,
+                workdir=job_dir,
+                source_path=job_dir / "source" / Path(video["name"]).name,
+                output_path=job_dir / target_name,
+            )
+        )
+    stage_threads: List[Tuple[List[threading.Thread], "queue.Queue[Any]"]] = []
+    for stage, handler, inbox, outbox, count in stages:
+        threads = [
+            threading.Thread(target=worker, args=(stage, handler, inbox, outbox), name=f"transcode-{stage}-{slot}")
+            for slot in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        stage_threads.append((threads, inbox))
+    # Stop each stage only after everything upstream has drained into it.
+    for threads, inbox in stage_threads:
+        for _ in threads:
+            inbox.put(_STOP)
+        for thread in threads:
+            thread.join()
+    report.wall_seconds = time.monotonic() - started
+    return report
 
 
 def parse_transcode_config(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -329,6 +663,11 @@ def parse_transcode_config(config: Dict[str, Any]) -> Dict[str, Any]:
         "codec": settings.get("codec", "libmp3lame"),
         "bitrate": settings.get("bitrate", "160k"),
         "extra_args": settings.get("extra_ffmpeg_args", []),
+        "probe_skip": bool(settings.get("skip_matching_probe", True)),
+        "download_workers": int(settings.get("download_workers", 2)),
+        "transcode_workers": settings.get("transcode_workers"),
+        "upload_workers": int(settings.get("upload_workers", 2)),
+        "loudnorm": parse_loudnorm_config(settings.get("loudnorm")),
     }
 
 
@@ -357,6 +696,11 @@ def main() -> None:
         type=Path,
         help="Append needs_transcode flag to the provided GitHub Actions output file",
     )
+    parser.add_argument(
+        "--transcode-workers",
+        type=int,
+        help="Parallel ffmpeg processes (default: transcode.transcode_workers or the CPU count)",
+    )
     args = parser.parse_args()
 
     config = load_json(args.config)
@@ -417,68 +761,23 @@ def main() -> None:
         print(f"Found {len(source_files)} matching media file(s); transcode required.")
         return
 
-    failures = 0
-    for video in source_files:
-        video_id = video["id"]
-        video_name = video["name"]
-
-        parents = video.get("parents") or []
-        if not parents:
-            print(f"Skipping {video_name}: no parent folder information.")
-            continue
-
-        target_name = format_target_name(video_name, transcode_cfg["target_extension"])
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
-            video_path = tmpdir_path / video_name
-            audio_path = tmpdir_path / target_name
-
-            try:
-                print(f"Downloading {video_name} ({video_id})…")
-                download_drive_file(
-                    drive_service,
-                    video_id,
-                    video_path,
-                    supports_all_drives=supports_all_drives,
-                )
-
-                print(f"Transcoding {video_name} -> {target_name}…")
-                run_ffmpeg(
-                    video_path,
-                    audio_path,
-                    codec=transcode_cfg["codec"],
-                    bitrate=transcode_cfg["bitrate"],
-                    extra_args=transcode_cfg["extra_args"],
-                )
-
-                print(f"Replacing Drive content with {target_name}…")
-                media = MediaFileUpload(
-                    str(audio_path), mimetype=transcode_cfg["target_mime_type"], resumable=True
-                )
-                update_body: Dict[str, Any] = {
-                    "name": target_name,
-                    "mimeType": transcode_cfg["target_mime_type"],
-                    "appProperties": {SOURCE_MARKER: "true"},
-                }
-                params: Dict[str, Any] = {
-                    "fileId": video_id,
-                    "body": update_body,
-                    "media_body": media,
-                    "fields": "id,mimeType,name",
-                }
-                if supports_all_drives:
-                    params["supportsAllDrives"] = True
-                drive_service.files().update(**params).execute()
-
-                print(f"Completed {video_name} -> {target_name} in-place.")
-
-            except Exception as exc:  # noqa: BLE001
-                failures += 1
-                print(f"Failed to transcode {video_name}: {exc}", file=sys.stderr)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        report = run_transcode_pipeline(
+            source_files,
+            service_factory=lambda: build_drive_service(service_account_path),
+            transcode_cfg=transcode_cfg,
+            supports_all_drives=supports_all_drives,
+            workdir=Path(tmpdir),
+            download_workers=transcode_cfg["download_workers"],
+            transcode_workers=args.transcode_workers or transcode_cfg["transcode_workers"],
+            upload_workers=transcode_cfg["upload_workers"],
+        )
+    print(report.format_timings())
+    if report.probe_skipped:
+        print(f"Skipped ffmpeg for {len(report.probe_skipped)} file(s) already matching the target codec/bitrate.")
 
-    if failures:
-        raise SystemExit(f"Encountered {failures} transcode failure(s).")
+    if report.failures:
+        raise SystemExit(f"Encountered {len(report.failures)} transcode failure(s).")
 
 
 if __name__ == "__main__":
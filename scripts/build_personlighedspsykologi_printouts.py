@@ -75,6 +75,8 @@ def _make_provider_json_generator(*, provider: str, model: str):
             source_paths=list(kwargs.get("source_paths") or []),
             max_output_tokens=int(kwargs.get("max_output_tokens") or 8192),
             response_json_schema=kwargs.get("response_json_schema"),
+            relevance_terms=kwargs.get("relevance_terms"),
+            source_selection=kwargs.get("source_selection"),
         )
 
     return _openai_json_generator, openai_preprocessing.generation_config_metadata()
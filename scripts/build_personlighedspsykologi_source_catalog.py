@@ -28,7 +28,7 @@ if str(REPO_ROOT) in sys.path:
     sys.path.remove(str(REPO_ROOT))
 sys.path.insert(0, str(REPO_ROOT))
 
-from notebooklm_queue import prompting
+from notebooklm_queue import prompting, source_text_cache
 from notebooklm_queue.json_artifact_utils import render_json, write_json_stably
 from notebooklm_queue.source_intelligence_policy import (
     evidence_origin_for_source,
@@ -183,7 +183,7 @@ def _has_summary(summary: object) -> bool:
     return bool(summary_lines or key_points)
 
 
-def _extract_file_metrics(path: Path) -> tuple[dict[str, Any], str]:
+def _extract_file_metrics(path: Path, *, sha256: str | None = None) -> tuple[dict[str, Any], str]:
     suffix = path.suffix.lower()
     if suffix != ".pdf":
         return (
@@ -197,21 +197,23 @@ def _extract_file_metrics(path: Path) -> tuple[dict[str, Any], str]:
             "",
         )
 
-    try:
-        reader = PdfReader(str(path), strict=False)
-    except Exception as exc:  # pragma: no cover - defensive against damaged PDFs
-        return (
-            {
-                "page_count": None,
-                "text_char_count": 0,
-                "estimated_word_count": 0,
-                "estimated_token_count": 0,
-                "text_extraction_status": f"read_error:{type(exc).__name__}",
-            },
-            "",
-        )
-
-    page_count = len(reader.pages)
+    # Reuse the page count from the shared extraction cache when it is warm; never extract here.
+    page_count = source_text_cache.default_cache().cached_page_count(path, sha256=sha256) if sha256 else None
+    if page_count is None:
+        try:
+            reader = PdfReader(str(path), strict=False)
+        except Exception as exc:  # pragma: no cover - defensive against damaged PDFs
+            return (
+                {
+                    "page_count": None,
+                    "text_char_count": 0,
+                    "estimated_word_count": 0,
+                    "estimated_token_count": 0,
+                    "text_extraction_status": f"read_error:{type(exc).__name__}",
+                },
+                "",
+            )
+        page_count = len(reader.pages)
     estimated_token_count = _estimate_tokens_from_pages(page_count)
     return (
         {
@@ -383,7 +385,7 @@ def build_source_catalog(
                     file_sizes,
                     strict=True,
                 ):
-                    file_metrics, _sample_text = _extract_file_metrics(source_path)
+                    file_metrics, _sample_text = _extract_file_metrics(source_path, sha256=file_hash)
                     metrics_by_file.append(file_metrics)
                     file_parts.append(
                         {
@@ -505,7 +507,7 @@ def build_source_catalog(
             subject_relative_path = _relativize(source_path, subject_root)
             file_size = source_path.stat().st_size
             sha256 = _sha256_file(source_path)
-            metrics, sample_text = _extract_file_metrics(source_path)
+            metrics, sample_text = _extract_file_metrics(source_path, sha256=sha256)
             sidecars = _existing_sidecar_paths(
                 candidates=prompting._source_prompt_sidecar_candidates(source_path, meta_prompting),
                 subject_root=subject_root,
@@ -4,15 +4,30 @@
 from __future__ import annotations
 
 import argparse
+import errno
 import hashlib
+import json
 import os
 import re
 import shutil
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, TextIO
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
 
 PERSONLIGHEDSPSYKOLOGI_OUTPUT_ROOT_ENV_VAR = "PERSONLIGHEDSPSYKOLOGI_OUTPUT_ROOT"
+MIRROR_MANIFEST_DIR_ENV_VAR = "MIRROR_MANIFEST_DIR"
+MIRROR_MANIFEST_VERSION = 1
+DEFAULT_COPY_WORKERS = 8
+LINK_MODES = ("copy", "hardlink")
+# Linux FICLONE ioctl: share extents on btrfs/XFS/bcachefs instead of copying bytes.
+FICLONE = 0x40049409
 
 SUBJECT_DEFAULTS: Dict[str, Dict[str, str]] = {
     "bioneuro": {
@@ -74,6 +89,21 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Use sha256 checksum comparison instead of size+mtime for change detection.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_COPY_WORKERS,
+        help=f"Parallel copy workers (default: {DEFAULT_COPY_WORKERS}).",
+    )
+    parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="copy",
+        help=(
+            "copy clones extents (reflink/copy_file_range) where supported and falls back to a byte copy; "
+            "hardlink links destination files to the source when both are on one filesystem."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -156,11 +186,105 @@ def sha256_file(path: Path) -> str:
     return digest.hexdigest()
 
 
+def default_manifest_dir() -> Path:
+    raw = str(os.getenv(MIRROR_MANIFEST_DIR_ENV_VAR) or "").strip()
+    if raw:
+        return Path(raw).expanduser()
+    return Path.home() / ".cache" / "psyk-podcast" / "mirror-manifests"
+
+
+class ChecksumManifest:
+    """Persisted ``relpath -> (size, mtime_ns, sha256)`` for one destination root.
+
+    Kept outside the destination so it never syncs to Drive. Entries are only
+    trusted while size and mtime_ns still match, so checksum mode hashes just
+    the files that changed since the previous run.
+    """
+
+    def __init__(self, path: Path, dest_root: Path) -> None:
+        self.path = path
+        self.dest_root = dest_root
+        self.entries: Dict[str, Dict[str, Tuple[int, int, str]]] = {"source": {}, "dest": {}}
+        self.hashed = 0
+        self.reused = 0
+
+    @classmethod
+    def for_dest_root(cls, dest_root: Path, manifest_dir: Optional[Path] = None) -> "ChecksumManifest":
+        key = hashlib.sha256(str(dest_root).encode("utf-8")).hexdigest()[:16]
+        manifest = cls((manifest_dir or default_manifest_dir()) / f"{dest_root.name or 'root'}-{key}.json", dest_root)
+        manifest.load()
+        return manifest
+
+    def load(self) -> None:
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != MIRROR_MANIFEST_VERSION:
+            return
+        for side in ("source", "dest"):
+            raw = payload.get(side)
+            if not isinstance(raw, dict):
+                continue
+            for rel, entry in raw.items():
+                if isinstance(entry, list) and len(entry) == 3:
+                    self.entries[side][rel] = (int(entry[0]), int(entry[1]), str(entry[2]))
+
+    def known(self, side: str, rel: Path, path: Path, stat: Optional[os.stat_result] = None) -> Optional[str]:
+        stat = stat or path.stat()
+        cached = self.entries[side].get(rel.as_posix())
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        return None
+
+    def digest(self, side: str, rel: Path, path: Path, stat: Optional[os.stat_result] = None) -> str:
+        stat = stat or path.stat()
+        cached = self.known(side, rel, path, stat)
+        if cached is not None:
+            self.reused += 1
+            return cached
+        digest = sha256_file(path)
+        self.hashed += 1
+        self.entries[side][rel.as_posix()] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def record(self, side: str, rel: Path, path: Path, digest: str) -> None:
+        stat = path.stat()
+        self.entries[side][rel.as_posix()] = (stat.st_size, stat.st_mtime_ns, digest)
+
+    def prune(self, side: str, keep: Iterable[Path]) -> None:
+        wanted = {rel.as_posix() for rel in keep}
+        self.entries[side] = {rel: entry for rel, entry in self.entries[side].items() if rel in wanted}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": MIRROR_MANIFEST_VERSION,
+            "dest_root": str(self.dest_root),
+            "source": {rel: list(entry) for rel, entry in sorted(self.entries["source"].items())},
+            "dest": {rel: list(entry) for rel, entry in sorted(self.entries["dest"].items())},
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.path.parent, delete=False, suffix=".tmp"
+        ) as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+            handle.write("\n")
+            tmp_name = handle.name
+        os.replace(tmp_name, self.path)
+
+
 def has_cfg_hash_token(path: Path) -> bool:
     return CFG_HASH_TOKEN_RE.search(path.name) is not None
 
 
-def files_identical(src: Path, dest: Path, use_checksum: bool) -> bool:
+def files_identical(
+    src: Path,
+    dest: Path,
+    use_checksum: bool,
+    *,
+    manifest: Optional[ChecksumManifest] = None,
+    rel: Optional[Path] = None,
+) -> bool:
     src_stat = src.stat()
     dest_stat = dest.stat()
     if src_stat.st_size != dest_stat.st_size:
@@ -170,15 +294,64 @@ def files_identical(src: Path, dest: Path, use_checksum: bool) -> bool:
     if not use_checksum and src_stat.st_mtime_ns == dest_stat.st_mtime_ns:
         return True
     if use_checksum:
+        if manifest is not None and rel is not None:
+            return manifest.digest("source", rel, src, src_stat) == manifest.digest("dest", rel, dest, dest_stat)
         return sha256_file(src) == sha256_file(dest)
     return False
 
 
-def maybe_copy(src: Path, dest: Path, dry_run: bool) -> None:
+def _clone_file(src: Path, dest: Path) -> None:
+    """Copy bytes preferring FICLONE, then ``copy_file_range``, then a plain copy."""
+
+    with src.open("rb") as src_handle, dest.open("wb") as dest_handle:
+        if fcntl is not None and sys.platform.startswith("linux"):
+            try:
+                fcntl.ioctl(dest_handle.fileno(), FICLONE, src_handle.fileno())
+                return
+            except OSError:
+                pass
+        copy_file_range = getattr(os, "copy_file_range", None)
+        if copy_file_range is not None:
+            remaining = os.fstat(src_handle.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = copy_file_range(src_handle.fileno(), dest_handle.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+            except OSError as exc:
+                if exc.errno not in {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF}:
+                    raise
+            src_handle.seek(0)
+            dest_handle.seek(0)
+            dest_handle.truncate()
+        shutil.copyfileobj(src_handle, dest_handle, 1024 * 1024)
+
+
+def copy_file(src: Path, dest: Path, link_mode: str = "copy") -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if link_mode == "hardlink":
+        staged = dest.with_name(f".{dest.name}.mirror-link")
+        try:
+            if staged.exists():
+                staged.unlink()
+            os.link(src, staged)
+            os.replace(staged, dest)
+            return
+        except OSError:
+            staged.unlink(missing_ok=True)
+    if dest.is_symlink() or (dest.exists() and dest.stat().st_nlink > 1):
+        dest.unlink()
+    _clone_file(src, dest)
+    shutil.copystat(src, dest)
+
+
+def maybe_copy(src: Path, dest: Path, dry_run: bool, link_mode: str = "copy") -> None:
     if dry_run:
         return
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dest)
+    copy_file(src, dest, link_mode)
 
 
 def maybe_unlink(path: Path, dry_run: bool) -> None:
@@ -232,6 +405,9 @@ def run_subject(
     dry_run: bool,
     delete: bool,
     checksum: bool,
+    workers: int = DEFAULT_COPY_WORKERS,
+    link_mode: str = "copy",
+    manifest_dir: Optional[Path] = None,
 ) -> int:
     if not source_root.exists():
         print(f"Error: source path not found: {source_root}", file=sys.stderr)
@@ -290,6 +466,8 @@ def run_subject(
         print_subject_summary(summary, stream=sys.stderr)
         return 2
 
+    manifest = ChecksumManifest.for_dest_root(dest_root, manifest_dir) if checksum else None
+    pending_copies: List[Tuple[Path, Path, Path]] = []
     for rel in sorted(source_files.keys(), key=lambda value: value.as_posix()):
         src = source_files[rel]
         dest = dest_root / rel
@@ -298,12 +476,12 @@ def run_subject(
                 summary.collisions += 1
                 print(f"COLLIDE {dest} (destination is a directory)", file=sys.stderr)
                 continue
-            if files_identical(src, dest, checksum):
+            if files_identical(src, dest, checksum, manifest=manifest, rel=rel):
                 summary.unchanged += 1
                 continue
             summary.updated += 1
             print(f"UPDATE  {src} -> {dest}")
-            maybe_copy(src, dest, dry_run)
+            pending_copies.append((rel, src, dest))
             continue
 
         if not dest.parent.exists() and dest.parent not in planned_dirs:
@@ -314,7 +492,9 @@ def run_subject(
             planned_dirs.add(dest.parent)
         summary.copied += 1
         print(f"COPY    {src} -> {dest}")
-        maybe_copy(src, dest, dry_run)
+        pending_copies.append((rel, src, dest))
+
+    copy_pending(pending_copies, dry_run=dry_run, workers=workers, link_mode=link_mode)
 
     if delete:
         stale_rel_paths = sorted(set(dest_files.keys()) - set(source_files.keys()), key=lambda value: value.as_posix())
@@ -325,6 +505,15 @@ def run_subject(
             maybe_unlink(stale, dry_run)
             summary.dirs_removed += remove_empty_parents(stale.parent, dest_root, dry_run)
 
+    if manifest is not None and not dry_run:
+        # A fresh copy has the source's bytes, so the next run need not hash either side.
+        for rel, src, dest in pending_copies:
+            manifest.record("dest", rel, dest, manifest.digest("source", rel, src))
+        manifest.prune("source", source_files.keys())
+        manifest.prune("dest", source_files.keys())
+        manifest.save()
+        print(f"Checksum manifest: {manifest.path} (hashed={manifest.hashed} reused={manifest.reused})")
+
     if summary.collisions:
         print_subject_summary(summary, stream=sys.stderr)
         return 2
@@ -333,6 +522,23 @@ def run_subject(
     return 0
 
 
+def copy_pending(
+    pending: List[Tuple[Path, Path, Path]],
+    *,
+    dry_run: bool,
+    workers: int,
+    link_mode: str,
+) -> None:
+    """Run the planned copies in a bounded pool; the first failure is re-raised after the pool drains."""
+
+    if dry_run or not pending:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+        futures = [pool.submit(maybe_copy, src, dest, dry_run, link_mode) for _, src, dest in pending]
+    for future in futures:
+        future.result()
+
+
 def print_subject_summary(summary: SyncSummary, stream: TextIO = sys.stdout) -> None:
     print(
         "\nSummary: "
@@ -360,6 +566,8 @@ def run_all_subjects(args: argparse.Namespace, repo_root: Path) -> int:
             dry_run=args.dry_run,
             delete=args.delete,
             checksum=args.checksum,
+            workers=args.workers,
+            link_mode=args.link_mode,
         )
         if subject_exit != 0:
             exit_code = subject_exit
@@ -389,6 +597,8 @@ def main() -> int:
         dry_run=args.dry_run,
         delete=args.delete,
         checksum=args.checksum,
+        workers=args.workers,
+        link_mode=args.link_mode,
     )
 
 
@@ -29,7 +29,7 @@ PODCAST_TOOLS_DIR = REPO_ROOT / "podcast-tools"
 if str(PODCAST_TOOLS_DIR) not in sys.path:
     sys.path.insert(0, str(PODCAST_TOOLS_DIR))
 
-from transcode_drive_media import format_target_name, parse_transcode_config, run_ffmpeg  # noqa: E402
+from transcode_drive_media import format_target_name, parse_transcode_config, transcode_file  # noqa: E402
 
 RETRYABLE_HTTP_STATUS_CODES = {408, 429, 500, 502, 503, 504}
 RETRYABLE_OS_ERROR_NUMBERS = {51, 54, 60, 65}
@@ -269,17 +269,14 @@ def prepare_artifact_file(
     source_mime_type: str,
     tmp_root: Path,
     transcode_cfg: Optional[Dict[str, Any]],
+    loudness: Optional[Dict[str, Any]] = None,
 ) -> Path:
     if not transcode_cfg or not mime_type_matches_filters(source_mime_type, transcode_cfg.get("source_mime_types")):
         return source_file
     artifact_file = tmp_root / format_target_name(source_file.name, str(transcode_cfg["target_extension"]))
-    run_ffmpeg(
-        source_file,
-        artifact_file,
-        codec=str(transcode_cfg["codec"]),
-        bitrate=str(transcode_cfg["bitrate"]),
-        extra_args=list(transcode_cfg.get("extra_args") or []),
-    )
+    record = transcode_file(source_file, artifact_file, transcode_cfg)
+    if record and loudness is not None:
+        loudness.update(record)
     return artifact_file
 
 
@@ -347,8 +344,9 @@ def build_manifest_item(
     published_at: str,
     public_url: str,
     stable_guid: str,
+    loudness: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    return {
+    item: Dict[str, Any] = {
         "object_key": object_key,
         "source_storage_key": object_key,
         "source_name": source_name,
@@ -363,6 +361,9 @@ def build_manifest_item(
         "public_url": public_url,
         "stable_guid": stable_guid,
     }
+    if loudness:
+        item["loudness"] = dict(loudness)
+    return item
 
 
 def validate_manifest_items(items: Iterable[Dict[str, Any]]) -> None:
@@ -514,11 +515,13 @@ def main(argv: Optional[List[str]] = None) -> int:
 
             print(f"[{index}/{len(files)}] {relative_source.as_posix()} -> {object_key}", flush=True)
 
+            loudness: Dict[str, Any] = {}
             artifact_file = prepare_artifact_file(
                 source_file=source_file,
                 source_mime_type=source_mime_type,
                 tmp_root=tmp_root,
                 transcode_cfg=transcode_cfg,
+                loudness=loudness,
             )
             local_size = int(artifact_file.stat().st_size)
 
@@ -536,6 +539,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                         published_at=published_at,
                         public_url=public_url,
                         stable_guid=stable_guid,
+                        loudness=loudness,
                     )
                 )
                 continue
@@ -590,6 +594,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                     published_at=published_at,
                     public_url=public_url,
                     stable_guid=stable_guid,
+                    loudness=loudness,
                 )
             )
 
@@ -33,6 +33,7 @@ from notebooklm_queue.personlighedspsykologi_notebooklm_flashcard_lab import (
     DEFAULT_GEMINI_FLASHCARD_REVIEW_MODEL,
     utc_now_iso,
 )
+from notebooklm_queue.usage_ledger import usage_scope
 
 DEFAULT_DECK_PATH = Path("shows/personlighedspsykologi-en/flashcards/notebooklm-fuld-matrix-personlighedspsykologi.json")
 DEFAULT_SUBSTRATES_PATH = Path("shows/personlighedspsykologi-en/flashcards/card_background_substrates.json")
@@ -375,7 +376,7 @@ def main() -> int:
         preflight_gemini_json_generation(model=str(args.model))
     try:
         backend = make_gemini_backend(model=str(args.model))
-        with _wall_clock_timeout(int(args.timeout_seconds)):
+        with _wall_clock_timeout(int(args.timeout_seconds)), usage_scope(stage="flashcard_background_review"):
             raw_review = generate_json(
                 backend=backend,
                 system_instruction=system_instruction(),
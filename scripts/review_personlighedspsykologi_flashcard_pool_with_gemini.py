@@ -37,6 +37,7 @@ from notebooklm_queue.personlighedspsykologi_flashcard_review import (
 from notebooklm_queue.personlighedspsykologi_notebooklm_flashcard_lab import (
     DEFAULT_GEMINI_FLASHCARD_REVIEW_MODEL,
 )
+from notebooklm_queue.usage_ledger import usage_scope
 
 
 class GeminiPoolReviewTimeout(TimeoutError):
@@ -150,7 +151,7 @@ def main() -> int:
 
     try:
         backend = make_gemini_backend(model=str(args.model))
-        with _wall_clock_timeout(int(args.timeout_seconds)):
+        with _wall_clock_timeout(int(args.timeout_seconds)), usage_scope(stage="flashcard_pool_review"):
             raw_review = generate_json(
                 backend=backend,
                 system_instruction=gemini_pool_review_system_instruction(),
@@ -45,6 +45,7 @@ from notebooklm_queue.personlighedspsykologi_flashcard_review import (
 from notebooklm_queue.personlighedspsykologi_notebooklm_flashcard_lab import (
     DEFAULT_GEMINI_FLASHCARD_REVIEW_MODEL,
 )
+from notebooklm_queue.usage_ledger import usage_scope
 
 
 class GeminiQualityComparisonTimeout(TimeoutError):
@@ -333,7 +334,7 @@ def main() -> int:
                 batch_output_path = batch_root / f"batch-{batch_index:03d}.review.json"
                 batch_md_path = batch_root / f"batch-{batch_index:03d}.review.md"
                 write_json_stably(batch_bundle_path, batch_bundle)
-                with _wall_clock_timeout(int(args.timeout_seconds)):
+                with _wall_clock_timeout(int(args.timeout_seconds)), usage_scope(stage="flashcard_quality_review"):
                     raw_review = generate_json(
                         backend=backend,
                         system_instruction=gemini_quality_observation_system_instruction(),
@@ -365,7 +366,7 @@ def main() -> int:
                 batch_reviews.append(batch_review)
             review = _aggregate_batch_reviews(full_bundle=bundle, batch_reviews=batch_reviews, model=str(args.model))
         else:
-            with _wall_clock_timeout(int(args.timeout_seconds)):
+            with _wall_clock_timeout(int(args.timeout_seconds)), usage_scope(stage="flashcard_quality_review"):
                 raw_review = generate_json(
                     backend=backend,
                     system_instruction=gemini_quality_comparison_system_instruction(),
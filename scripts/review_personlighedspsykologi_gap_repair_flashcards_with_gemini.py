@@ -46,6 +46,7 @@ from notebooklm_queue.personlighedspsykologi_notebooklm_flashcard_lab import (
     load_current_deck,
     load_matrix,
 )
+from notebooklm_queue.usage_ledger import usage_scope
 
 
 class GeminiReviewTimeout(TimeoutError):
@@ -157,7 +158,7 @@ def main() -> int:
 
     try:
         backend = make_gemini_backend(model=str(args.model))
-        with _wall_clock_timeout(int(args.timeout_seconds)):
+        with _wall_clock_timeout(int(args.timeout_seconds)), usage_scope(stage="gap_repair_flashcard_review"):
             raw_review = generate_json(
                 backend=backend,
                 system_instruction=gap_repair_review_system_instruction(),
@@ -37,6 +37,7 @@ from notebooklm_queue.personlighedspsykologi_notebooklm_flashcard_lab import (
     validate_gemini_flashcard_review,
     write_gemini_flashcard_review_markdown,
 )
+from notebooklm_queue.usage_ledger import usage_scope
 
 
 def parse_args() -> argparse.Namespace:
@@ -160,7 +161,7 @@ def main() -> int:
 
     try:
         backend = make_gemini_backend(model=str(args.model))
-        with _wall_clock_timeout(int(args.timeout_seconds)):
+        with _wall_clock_timeout(int(args.timeout_seconds)), usage_scope(stage="notebooklm_flashcard_review"):
             raw_review = generate_json(
                 backend=backend,
                 system_instruction=gemini_flashcard_review_system_instruction(),
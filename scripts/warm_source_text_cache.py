@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Pre-extract PDF page text (and OCR where needed) into the shared source-text cache."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) in sys.path:
+    sys.path.remove(str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT))
+
+from notebooklm_queue.source_text_cache import default_cache_root, warm_source_text_cache
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", type=Path, help="PDF files or directories to scan recursively.")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Cache root (default: NOTEBOOKLM_SOURCE_TEXT_CACHE_DIR or ~/.cache/psyk-podcast/source-text).",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--no-ocr", action="store_true", help="Only cache the pypdf text layer.")
+    parser.add_argument("--summary-only", action="store_true", help="Omit the per-file list from the report.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    report = warm_source_text_cache(
+        args.paths,
+        cache_root=args.cache_dir or default_cache_root(),
+        workers=args.workers,
+        ocr=not args.no_ocr,
+    )
+    if args.summary_only:
+        report.pop("files", None)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 1 if report.get("error_count") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
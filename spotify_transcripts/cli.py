@@ -13,6 +13,7 @@ from .discovery import load_show_sources
 from .exporter import export_show_transcripts
 from .paths import get_path_info
 from .playwright_client import download_episode_transcript, get_auth_status, login_via_browser
+from .search_index import build_search_index, search_show_transcripts
 from .service import build_show_queue, run_show_queue, sync_show_transcripts
 from .store import TranscriptStore
 from .verifier import verify_show_transcripts
@@ -101,6 +102,28 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional export file name written under spotify_transcripts/exports/.",
     )
+    export_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the digest ledger and rebuild every episode shard.",
+    )
+
+    index_parser = subparsers.add_parser("index-show", help="Build or refresh the SQLite FTS5 search index for one show.")
+    index_parser.add_argument("--show-slug", required=True)
+    index_parser.add_argument("--repo-root", type=Path, default=_repo_root())
+    index_parser.add_argument("--rebuild", action="store_true", help="Drop and re-index every episode.")
+
+    search_parser = subparsers.add_parser("search", help="Search indexed transcript segments for one show.")
+    search_parser.add_argument("--show-slug", required=True)
+    search_parser.add_argument("--repo-root", type=Path, default=_repo_root())
+    search_parser.add_argument("query", help="Search terms; every term must match within one segment.")
+    search_parser.add_argument("--limit", type=int, default=20)
+    search_parser.add_argument("--episode-key", default=None, help="Restrict hits to one episode.")
+    search_parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Query the existing index without refreshing changed episodes first.",
+    )
 
     verify_parser = subparsers.add_parser("verify-show", help="Verify transcript artifact completeness and integrity for one show.")
     verify_parser.add_argument("--show-slug", required=True)
@@ -110,6 +133,11 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Exit with code 1 when any integrity issues are detected.",
     )
+    verify_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the digest ledger, re-hash every referenced file, and re-check every episode.",
+    )
 
     sync_parser = subparsers.add_parser("sync", help="Download Spotify transcripts for a mapped show.")
     sync_parser.add_argument("--show-slug", required=True)
@@ -190,15 +218,38 @@ def main(argv: list[str] | None = None) -> int:
                 sources=sources,
                 store=store,
                 output_name=args.output_name,
+                full=bool(args.full),
             )
         )
         return 0
 
+    if args.command == "index-show":
+        repo_root = Path(args.repo_root).resolve()
+        sources = load_show_sources(repo_root=repo_root, show_slug=args.show_slug)
+        store = TranscriptStore(sources.show_root)
+        _print_json(build_search_index(sources=sources, store=store, rebuild=bool(args.rebuild)))
+        return 0
+
+    if args.command == "search":
+        repo_root = Path(args.repo_root).resolve()
+        sources = load_show_sources(repo_root=repo_root, show_slug=args.show_slug)
+        store = TranscriptStore(sources.show_root)
+        if not args.no_refresh:
+            build_search_index(sources=sources, store=store)
+        payload = search_show_transcripts(
+            store=store,
+            query=args.query,
+            limit=args.limit,
+            episode_key=args.episode_key,
+        )
+        _print_json({"show_slug": args.show_slug, **payload})
+        return 0
+
     if args.command == "verify-show":
         repo_root = Path(args.repo_root).resolve()
         sources = load_show_sources(repo_root=repo_root, show_slug=args.show_slug)
         store = TranscriptStore(sources.show_root)
-        payload = verify_show_transcripts(sources=sources, store=store)
+        payload = verify_show_transcripts(sources=sources, store=store, full=bool(args.full))
         _print_json(payload)
         return 1 if args.fail_on_issues and int(payload.get("issue_count") or 0) > 0 else 0
 
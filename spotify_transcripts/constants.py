@@ -5,6 +5,9 @@ from __future__ import annotations
 APP_NAME = "spotify-transcripts"
 MANIFEST_VERSION = 1
 NORMALIZED_TRANSCRIPT_VERSION = 1
+SEARCH_INDEX_VERSION = 1
+LEDGER_VERSION = 1
+EXPORT_SHARD_VERSION = 1
 DEFAULT_TIMEOUT_MS = 30_000
 SPOTIFY_WEB_URL = "https://open.spotify.com/"
 TRANSCRIPT_URL_MARKERS = (
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import tempfile
 from pathlib import Path
 from typing import Any
 
+from .constants import EXPORT_SHARD_VERSION
+from .ledger import TranscriptLedger
 from .models import ShowSources
-from .store import TranscriptStore, utc_now_iso
+from .store import TranscriptStore, _write_json_atomic, _write_text_atomic, utc_now_iso
 
 
 def _load_json(path: Path, label: str) -> dict[str, Any]:
@@ -31,16 +36,99 @@ def _combined_transcript_text(segments: list[dict[str, Any]]) -> str:
     return "\n".join(parts)
 
 
+def _shard_digest(*, normalized_sha256: str, header: dict[str, Any]) -> str:
+    rendered = json.dumps(
+        {"version": EXPORT_SHARD_VERSION, "normalized_sha256": normalized_sha256, "header": header},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(rendered.encode("utf-8")).hexdigest()
+
+
+def _write_episode_shard(path: Path, *, header: dict[str, Any], normalized_payload: dict[str, Any]) -> int:
+    raw_segments = normalized_payload.get("segments")
+    segments = raw_segments if isinstance(raw_segments, list) else []
+    episode_header = {
+        **header,
+        "language": normalized_payload.get("language"),
+        "available_translations": normalized_payload.get("available_translations") or [],
+        "segment_count": normalized_payload.get("segment_count"),
+        "transcript_text": _combined_transcript_text(segments),
+    }
+    lines = [json.dumps(episode_header, ensure_ascii=False)]
+    lines.extend(json.dumps(segment, ensure_ascii=False) for segment in segments)
+    _write_text_atomic(path, "\n".join(lines) + "\n")
+    return len(segments)
+
+
+def _write_combined_export(path: Path, *, index_payload: dict[str, Any], shard_dir: Path) -> None:
+    """Assemble the combined export by streaming each episode shard line by line."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write("{\n")
+            for key, value in index_payload.items():
+                if key == "episodes":
+                    continue
+                handle.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+            handle.write('  "episodes": [')
+            for episode_index, item in enumerate(index_payload["episodes"]):
+                with (shard_dir / str(item["shard"])).open(encoding="utf-8") as shard:
+                    header = json.loads(shard.readline())
+                    handle.write(",\n    " if episode_index else "\n    ")
+                    handle.write(json.dumps(header, ensure_ascii=False)[:-1])
+                    handle.write(', "segments": [')
+                    for segment_index, line in enumerate(shard):
+                        line = line.strip()
+                        if not line:
+                            continue
+                        handle.write(",\n      " if segment_index else "\n      ")
+                        handle.write(line)
+                    handle.write("\n    ]}")
+            handle.write("\n  ]\n}\n")
+        temp_path.replace(path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink(missing_ok=True)
+
+
+def _load_shard_index(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return {}
+    if not isinstance(payload, dict) or int(payload.get("shard_version") or 0) != EXPORT_SHARD_VERSION:
+        return {}
+    return payload
+
+
 def export_show_transcripts(
     *,
     sources: ShowSources,
     store: TranscriptStore,
     output_name: str | None = None,
+    full: bool = False,
 ) -> dict[str, Any]:
-    manifest = store.load_manifest()
     manifest_entries = store.load_entries_by_episode_key()
-    exported_episodes: list[dict[str, Any]] = []
+    file_name = output_name or f"{sources.show_slug}.combined.json"
+    export_path = store.export_dir / file_name
+    shard_dir = store.export_shard_dir(file_name)
+    index_path = shard_dir / "index.json"
+    previous_index = {} if full else _load_shard_index(index_path)
+    previous_by_key = {
+        str(item.get("episode_key") or ""): item
+        for item in previous_index.get("episodes") or []
+        if isinstance(item, dict)
+    }
+    ledger = TranscriptLedger(store, force_rehash=full)
+    index_entries: list[dict[str, Any]] = []
     omitted_episodes: list[dict[str, str]] = []
+    rebuilt: list[str] = []
 
     for source in sources.episodes:
         entry = manifest_entries.get(source.episode_key)
@@ -65,28 +153,53 @@ def export_show_transcripts(
             continue
 
         normalized_path = source.show_root / normalized_rel
-        normalized_payload = _load_json(normalized_path, f"normalized transcript for {source.episode_key}")
-        raw_segments = normalized_payload.get("segments")
-        segments = raw_segments if isinstance(raw_segments, list) else []
-        exported_episodes.append(
+        record = ledger.file_record(normalized_rel)
+        if record is None:
+            raise SystemExit(
+                f"Unable to read normalized transcript for {source.episode_key}: {normalized_path} (missing file)"
+            )
+        header = {
+            "episode_key": source.episode_key,
+            "title": source.title,
+            "pub_date": entry.get("pub_date"),
+            "spotify_url": source.spotify_url,
+            "spotify_episode_id": source.spotify_episode_id,
+            "status": entry.get("status"),
+            "downloaded_at": entry.get("downloaded_at"),
+        }
+        shard_digest = _shard_digest(normalized_sha256=str(record["sha256"]), header=header)
+        shard_name = f"{source.episode_key}.jsonl"
+        previous = previous_by_key.get(source.episode_key) or {}
+        if previous.get("shard_digest") == shard_digest and (shard_dir / shard_name).exists():
+            segment_count = int(previous.get("segment_count") or 0)
+        else:
+            normalized_payload = _load_json(normalized_path, f"normalized transcript for {source.episode_key}")
+            segment_count = _write_episode_shard(
+                shard_dir / shard_name,
+                header=header,
+                normalized_payload=normalized_payload,
+            )
+            rebuilt.append(source.episode_key)
+        index_entries.append(
             {
                 "episode_key": source.episode_key,
-                "title": source.title,
-                "pub_date": entry.get("pub_date"),
-                "spotify_url": source.spotify_url,
-                "spotify_episode_id": source.spotify_episode_id,
-                "status": entry.get("status"),
-                "downloaded_at": entry.get("downloaded_at"),
-                "language": normalized_payload.get("language"),
-                "available_translations": normalized_payload.get("available_translations") or [],
-                "segment_count": normalized_payload.get("segment_count"),
-                "transcript_text": _combined_transcript_text(segments),
-                "segments": segments,
+                "shard": shard_name,
+                "shard_digest": shard_digest,
+                "normalized_path": normalized_rel,
+                "normalized_sha256": record["sha256"],
+                "segment_count": segment_count,
             }
         )
 
-    export_payload = {
+    current_shards = {str(item["shard"]) for item in index_entries}
+    if shard_dir.exists():
+        for stale in shard_dir.glob("*.jsonl"):
+            if stale.name not in current_shards:
+                stale.unlink()
+
+    index_payload = {
         "version": 1,
+        "shard_version": EXPORT_SHARD_VERSION,
         "show_slug": sources.show_slug,
         "subject_slug": sources.subject_slug,
         "generated_at": utc_now_iso(),
@@ -94,16 +207,29 @@ def export_show_transcripts(
         "spotify_map_path": store._relpath(sources.spotify_map_path),
         "manifest_path": store._relpath(store.manifest_path),
         "episode_count_total": len(sources.episodes),
-        "episode_count_exported": len(exported_episodes),
+        "episode_count_exported": len(index_entries),
         "omitted_episode_count": len(omitted_episodes),
         "omitted_episodes": omitted_episodes,
-        "episodes": exported_episodes,
+        "episodes": index_entries,
     }
-    file_name = output_name or f"{sources.show_slug}.combined.json"
-    export_path = store.write_export_payload(file_name=file_name, payload=export_payload)
+    unchanged = (
+        not rebuilt
+        and export_path.exists()
+        and {key: value for key, value in previous_index.items() if key != "generated_at"}
+        == {key: value for key, value in index_payload.items() if key != "generated_at"}
+    )
+    if not unchanged:
+        _write_json_atomic(index_path, index_payload)
+        combined_header = {key: value for key, value in index_payload.items() if key != "shard_version"}
+        _write_combined_export(export_path, index_payload=combined_header, shard_dir=shard_dir)
+    ledger.save()
     return {
         "show_slug": sources.show_slug,
-        "export_path": export_path,
-        "episode_count_exported": len(exported_episodes),
+        "export_path": store._relpath(export_path),
+        "index_path": store._relpath(index_path),
+        "episode_count_exported": len(index_entries),
         "omitted_episode_count": len(omitted_episodes),
+        "episode_count_rebuilt": len(rebuilt),
+        "episode_count_reused": len(index_entries) - len(rebuilt),
+        "combined_rewritten": not unchanged,
     }
@@ -0,0 +1,150 @@
+"""Per-show digest ledger for incremental transcript export and verification."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from .constants import LEDGER_VERSION
+from .store import TranscriptStore, _write_json_atomic, utc_now_iso
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _directory_mtimes_match(root: Path, dirs: dict[str, Any]) -> bool:
+    for relpath, mtime_ns in dirs.items():
+        try:
+            if (root / relpath).stat().st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+class TranscriptLedger:
+    """Record size, mtime, and sha256 for every referenced transcript artifact.
+
+    A file is only re-hashed when its ``(size, mtime_ns)`` signature changes, so
+    callers can cheaply ask which episodes need re-reading.
+    """
+
+    def __init__(self, store: TranscriptStore, *, force_rehash: bool = False):
+        self.store = store
+        self.path = store.ledger_path
+        self.force_rehash = force_rehash
+        payload = self._load()
+        self.files: dict[str, dict[str, Any]] = dict(payload.get("files") or {})
+        self.verification: dict[str, dict[str, Any]] = dict(payload.get("verification") or {})
+        self.directories: dict[str, dict[str, Any]] = dict(payload.get("directories") or {})
+        self.hashed: list[str] = []
+
+    def _load(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            return {}
+        if not isinstance(payload, dict) or int(payload.get("version") or 0) != LEDGER_VERSION:
+            return {}
+        return payload
+
+    def file_record(self, relpath: str) -> dict[str, Any] | None:
+        """Return the ledger record for ``relpath``, re-hashing only when its stat signature moved."""
+
+        path = self.store.show_root / relpath
+        try:
+            stat = path.stat()
+        except OSError:
+            self.files.pop(relpath, None)
+            return None
+        previous = self.files.get(relpath)
+        if (
+            not self.force_rehash
+            and isinstance(previous, dict)
+            and previous.get("size") == stat.st_size
+            and previous.get("mtime_ns") == stat.st_mtime_ns
+            and previous.get("sha256")
+        ):
+            return previous
+        record = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": _file_sha256(path),
+        }
+        self.files[relpath] = record
+        self.hashed.append(relpath)
+        return record
+
+    def cached_verification(self, episode_key: str, signature: list[Any]) -> list[dict[str, Any]] | None:
+        cached = self.verification.get(episode_key)
+        if self.force_rehash or not isinstance(cached, dict) or cached.get("signature") != signature:
+            return None
+        issues = cached.get("issues")
+        return [dict(issue) for issue in issues] if isinstance(issues, list) else None
+
+    def store_verification(self, episode_key: str, signature: list[Any], issues: list[dict[str, Any]]) -> None:
+        self.verification[episode_key] = {"signature": signature, "issues": issues}
+
+    def list_directory(self, root: Path, suffix: str) -> set[str]:
+        """List artifact files under ``root``, walking only when a directory in the tree changed.
+
+        The mtime of every directory walked is recorded, so a file added to a
+        nested directory invalidates the listing even though ``root`` itself did
+        not change.
+        """
+
+        if not root.exists():
+            return set()
+        key = self.store._relpath(root)
+        cached = self.directories.get(key)
+        if (
+            not self.force_rehash
+            and isinstance(cached, dict)
+            and cached.get("suffix") == suffix
+            and isinstance(cached.get("dirs"), dict)
+            and _directory_mtimes_match(root, cached["dirs"])
+        ):
+            return set(cached.get("files") or [])
+        dirs: dict[str, int] = {}
+        files: set[str] = set()
+        for directory, _subdirs, names in os.walk(root):
+            directory_path = Path(directory)
+            try:
+                dirs[directory_path.relative_to(root).as_posix()] = directory_path.stat().st_mtime_ns
+            except OSError:
+                continue
+            files.update(
+                str((directory_path / name).relative_to(root.parent.parent))
+                for name in names
+                if name.endswith(suffix) and (directory_path / name).is_file()
+            )
+        self.directories[key] = {"suffix": suffix, "dirs": dict(sorted(dirs.items())), "files": sorted(files)}
+        return files
+
+    def prune(self, *, episode_keys: set[str], relpaths: set[str]) -> None:
+        for relpath in sorted(set(self.files) - relpaths):
+            self.files.pop(relpath, None)
+        for episode_key in sorted(set(self.verification) - episode_keys):
+            self.verification.pop(episode_key, None)
+
+    def save(self) -> None:
+        _write_json_atomic(
+            self.path,
+            {
+                "version": LEDGER_VERSION,
+                "updated_at": utc_now_iso(),
+                "files": dict(sorted(self.files.items())),
+                "verification": dict(sorted(self.verification.items())),
+                "directories": dict(sorted(self.directories.items())),
+            },
+        )
@@ -0,0 +1,208 @@
+"""SQLite FTS5 search index over normalized Spotify transcript segments."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from .constants import SEARCH_INDEX_VERSION, STATUS_DOWNLOADED
+from .models import ShowSources
+from .normalizer import _format_vtt_timestamp
+from .store import TranscriptStore, utc_now_iso
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    (
+        "CREATE TABLE IF NOT EXISTS episodes ("
+        "episode_key TEXT PRIMARY KEY, "
+        "title TEXT NOT NULL, "
+        "normalized_path TEXT NOT NULL, "
+        "digest TEXT NOT NULL, "
+        "segment_count INTEGER NOT NULL, "
+        "indexed_at TEXT NOT NULL)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5("
+        "text, "
+        "episode_key UNINDEXED, "
+        "start_ms UNINDEXED, "
+        "end_ms UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    ),
+)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    for statement in _SCHEMA:
+        connection.execute(statement)
+    row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if row is None or int(row[0]) != SEARCH_INDEX_VERSION:
+        connection.execute("DELETE FROM segments")
+        connection.execute("DELETE FROM episodes")
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+            (str(SEARCH_INDEX_VERSION),),
+        )
+        connection.commit()
+    return connection
+
+
+def _segment_rows(episode_key: str, payload: dict[str, Any]) -> list[tuple[str, str, int, int]]:
+    raw_segments = payload.get("segments")
+    rows: list[tuple[str, str, int, int]] = []
+    for segment in raw_segments if isinstance(raw_segments, list) else []:
+        if not isinstance(segment, dict):
+            continue
+        text = str(segment.get("text") or "").strip()
+        if not text:
+            continue
+        try:
+            start_ms = int(segment.get("start_ms") or 0)
+            end_ms = int(segment.get("end_ms") or start_ms)
+        except (TypeError, ValueError):
+            continue
+        rows.append((text, episode_key, start_ms, end_ms))
+    return rows
+
+
+def build_search_index(
+    *,
+    sources: ShowSources,
+    store: TranscriptStore,
+    rebuild: bool = False,
+) -> dict[str, Any]:
+    """Index downloaded transcripts, re-reading only episodes whose normalized file digest changed."""
+
+    entries_by_key = store.load_entries_by_episode_key()
+    indexed: list[str] = []
+    unchanged: list[str] = []
+    removed: list[str] = []
+    with closing(_connect(store.search_index_path)) as connection:
+        if rebuild:
+            connection.execute("DELETE FROM segments")
+            connection.execute("DELETE FROM episodes")
+        known = {
+            str(row[0]): str(row[1])
+            for row in connection.execute("SELECT episode_key, digest FROM episodes")
+        }
+        current_keys: set[str] = set()
+        for source in sources.episodes:
+            entry = entries_by_key.get(source.episode_key) or {}
+            if str(entry.get("status") or "").strip() != STATUS_DOWNLOADED:
+                continue
+            normalized_rel = str(entry.get("normalized_path") or "").strip()
+            if not normalized_rel:
+                continue
+            normalized_path = source.show_root / normalized_rel
+            if not normalized_path.exists():
+                continue
+            current_keys.add(source.episode_key)
+            digest = _file_sha256(normalized_path)
+            if known.get(source.episode_key) == digest:
+                unchanged.append(source.episode_key)
+                continue
+            try:
+                payload = json.loads(normalized_path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+                raise SystemExit(
+                    f"Unable to parse normalized transcript for {source.episode_key}: {normalized_path} ({exc})"
+                ) from exc
+            rows = _segment_rows(source.episode_key, payload if isinstance(payload, dict) else {})
+            with connection:
+                connection.execute("DELETE FROM segments WHERE episode_key = ?", (source.episode_key,))
+                connection.executemany(
+                    "INSERT INTO segments (text, episode_key, start_ms, end_ms) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO episodes "
+                    "(episode_key, title, normalized_path, digest, segment_count, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (source.episode_key, source.title, normalized_rel, digest, len(rows), utc_now_iso()),
+                )
+            indexed.append(source.episode_key)
+        for episode_key in sorted(set(known) - current_keys):
+            with connection:
+                connection.execute("DELETE FROM segments WHERE episode_key = ?", (episode_key,))
+                connection.execute("DELETE FROM episodes WHERE episode_key = ?", (episode_key,))
+            removed.append(episode_key)
+        segment_count = int(connection.execute("SELECT COUNT(*) FROM segments").fetchone()[0])
+    return {
+        "show_slug": sources.show_slug,
+        "index_path": store._relpath(store.search_index_path),
+        "episode_count_indexed": len(indexed),
+        "episode_count_unchanged": len(unchanged),
+        "episode_count_removed": len(removed),
+        "segment_count": segment_count,
+        "indexed_episodes": indexed,
+        "removed_episodes": removed,
+    }
+
+
+def _fts_query(query: str) -> str:
+    tokens = [token for token in str(query or "").split() if token.strip()]
+    return " ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+
+
+def search_show_transcripts(
+    *,
+    store: TranscriptStore,
+    query: str,
+    limit: int = 20,
+    episode_key: str | None = None,
+) -> dict[str, Any]:
+    """Return BM25-ranked segment hits with timestamps and highlighted snippets."""
+
+    match = _fts_query(query)
+    if not match:
+        raise SystemExit("Search query must contain at least one term.")
+    if not store.search_index_path.exists():
+        raise SystemExit(
+            f"Search index missing: {store.search_index_path}. Run `index-show` first."
+        )
+    sql = (
+        "SELECT segments.episode_key, episodes.title, segments.start_ms, segments.end_ms, "
+        "snippet(segments, 0, '[', ']', '...', 16), bm25(segments) "
+        "FROM segments JOIN episodes ON episodes.episode_key = segments.episode_key "
+        "WHERE segments MATCH ?"
+    )
+    params: list[Any] = [match]
+    if episode_key:
+        sql += " AND segments.episode_key = ?"
+        params.append(episode_key)
+    sql += " ORDER BY bm25(segments), segments.episode_key, CAST(segments.start_ms AS INTEGER) LIMIT ?"
+    params.append(max(int(limit), 1))
+    with closing(_connect(store.search_index_path)) as connection:
+        rows = connection.execute(sql, params).fetchall()
+    hits = [
+        {
+            "episode_key": str(row[0]),
+            "title": str(row[1]),
+            "start_ms": int(row[2]),
+            "end_ms": int(row[3]),
+            "start": _format_vtt_timestamp(int(row[2])),
+            "end": _format_vtt_timestamp(int(row[3])),
+            "snippet": str(row[4]),
+            "score": round(-float(row[5]), 6),
+        }
+        for row in rows
+    ]
+    return {
+        "query": query,
+        "hit_count": len(hits),
+        "hits": hits,
+    }
@@ -49,6 +49,8 @@ class TranscriptStore:
         self.export_dir = self.base_dir / "exports"
         self.manifest_path = self.base_dir / "manifest.json"
         self.queue_path = self.base_dir / "queue.json"
+        self.search_index_path = self.base_dir / "search.sqlite3"
+        self.ledger_path = self.base_dir / "ledger.json"
 
     def load_manifest(self) -> dict[str, Any]:
         return _load_manifest(self.manifest_path)
@@ -92,6 +94,10 @@ class TranscriptStore:
         _write_json_atomic(path, payload)
         return self._relpath(path)
 
+    def export_shard_dir(self, file_name: str) -> Path:
+        stem = file_name[: -len(".json")] if file_name.endswith(".json") else file_name
+        return self.export_dir / f"{stem}.shards"
+
     def save_manifest(
         self,
         *,
@@ -7,7 +7,8 @@ from pathlib import Path
 from typing import Any
 
 from .constants import STATUS_DOWNLOADED
-from .models import ShowSources
+from .ledger import TranscriptLedger
+from .models import EpisodeSource, ShowSources
 from .store import TranscriptStore, utc_now_iso
 
 
@@ -23,26 +24,133 @@ def _load_json(path: Path, label: str) -> dict[str, Any]:
     return payload
 
 
-def _collect_files(root: Path, suffix: str) -> set[str]:
-    if not root.exists():
-        return set()
-    return {
-        str(path.relative_to(root.parent.parent))
-        for path in root.rglob(f"*{suffix}")
-        if path.is_file()
-    }
+def _episode_issues(*, source: EpisodeSource, entry: dict[str, Any], ledger: TranscriptLedger) -> list[dict[str, Any]]:
+    issues: list[dict[str, Any]] = []
+    for field_name in ("raw_path", "normalized_path", "vtt_path"):
+        rel = str(entry.get(field_name) or "").strip()
+        if not rel:
+            issues.append(
+                {
+                    "episode_key": source.episode_key,
+                    "title": source.title,
+                    "severity": "error",
+                    "reason": f"missing_{field_name}",
+                }
+            )
+            continue
+        record = ledger.file_record(rel)
+        if record is None:
+            issues.append(
+                {
+                    "episode_key": source.episode_key,
+                    "title": source.title,
+                    "severity": "error",
+                    "reason": f"missing_file_{field_name}",
+                    "path": rel,
+                }
+            )
+            continue
+        if int(record.get("size") or 0) <= 0:
+            issues.append(
+                {
+                    "episode_key": source.episode_key,
+                    "title": source.title,
+                    "severity": "error",
+                    "reason": f"empty_file_{field_name}",
+                    "path": rel,
+                }
+            )
+
+    normalized_rel = str(entry.get("normalized_path") or "").strip()
+    if normalized_rel:
+        normalized_path = source.show_root / normalized_rel
+        if normalized_path.exists() and normalized_path.stat().st_size > 0:
+            payload = _load_json(normalized_path, f"normalized transcript for {source.episode_key}")
+            segments = payload.get("segments")
+            if not isinstance(segments, list) or not segments:
+                issues.append(
+                    {
+                        "episode_key": source.episode_key,
+                        "title": source.title,
+                        "severity": "error",
+                        "reason": "missing_segments",
+                    }
+                )
+            else:
+                if int(payload.get("segment_count") or 0) != len(segments):
+                    issues.append(
+                        {
+                            "episode_key": source.episode_key,
+                            "title": source.title,
+                            "severity": "error",
+                            "reason": "segment_count_mismatch",
+                            "segment_count": payload.get("segment_count"),
+                            "actual_segment_count": len(segments),
+                        }
+                    )
+                first_segment = segments[0] if isinstance(segments[0], dict) else None
+                if not first_segment or "text" not in first_segment or "start_ms" not in first_segment:
+                    issues.append(
+                        {
+                            "episode_key": source.episode_key,
+                            "title": source.title,
+                            "severity": "error",
+                            "reason": "bad_first_segment",
+                        }
+                    )
+
+    vtt_rel = str(entry.get("vtt_path") or "").strip()
+    if vtt_rel:
+        vtt_path = source.show_root / vtt_rel
+        if vtt_path.exists() and vtt_path.stat().st_size > 0:
+            text = vtt_path.read_text(encoding="utf-8")
+            if not text.startswith("WEBVTT"):
+                issues.append(
+                    {
+                        "episode_key": source.episode_key,
+                        "title": source.title,
+                        "severity": "error",
+                        "reason": "bad_vtt_header",
+                    }
+                )
+    return issues
+
+
+def _episode_signature(*, source: EpisodeSource, entry: dict[str, Any]) -> list[Any]:
+    signature: list[Any] = [source.title]
+    for field_name in ("raw_path", "normalized_path", "vtt_path"):
+        rel = str(entry.get(field_name) or "").strip()
+        if not rel:
+            signature.append([field_name, None])
+            continue
+        try:
+            stat = (source.show_root / rel).stat()
+        except OSError:
+            signature.append([field_name, rel, None, None])
+            continue
+        signature.append([field_name, rel, stat.st_size, stat.st_mtime_ns])
+    return signature
 
 
-def verify_show_transcripts(*, sources: ShowSources, store: TranscriptStore) -> dict[str, Any]:
+def verify_show_transcripts(*, sources: ShowSources, store: TranscriptStore, full: bool = False) -> dict[str, Any]:
+    """Verify transcript artifacts, re-checking only episodes whose ledger signature changed.
+
+    ``full=True`` ignores the ledger, re-hashes every referenced file, and walks
+    every artifact directory.
+    """
+
     manifest = store.load_manifest()
     entries = manifest.get("episodes") if isinstance(manifest.get("episodes"), list) else []
     entries_by_key = store.load_entries_by_episode_key()
+    ledger = TranscriptLedger(store, force_rehash=full)
     issues: list[dict[str, Any]] = []
     downloaded_count = 0
+    rechecked_count = 0
 
     referenced_raw: set[str] = set()
     referenced_normalized: set[str] = set()
     referenced_vtt: set[str] = set()
+    verified_keys: set[str] = set()
 
     for source in sources.episodes:
         entry = entries_by_key.get(source.episode_key)
@@ -62,6 +170,7 @@ def verify_show_transcripts(*, sources: ShowSources, store: TranscriptStore) ->
         if status != STATUS_DOWNLOADED:
             continue
         downloaded_count += 1
+        verified_keys.add(source.episode_key)
 
         for field_name, bucket in (
             ("raw_path", referenced_raw),
@@ -69,96 +178,20 @@ def verify_show_transcripts(*, sources: ShowSources, store: TranscriptStore) ->
             ("vtt_path", referenced_vtt),
         ):
             rel = str(entry.get(field_name) or "").strip()
-            if not rel:
-                issues.append(
-                    {
-                        "episode_key": source.episode_key,
-                        "title": source.title,
-                        "severity": "error",
-                        "reason": f"missing_{field_name}",
-                    }
-                )
-                continue
-            bucket.add(rel)
-            path = source.show_root / rel
-            if not path.exists():
-                issues.append(
-                    {
-                        "episode_key": source.episode_key,
-                        "title": source.title,
-                        "severity": "error",
-                        "reason": f"missing_file_{field_name}",
-                        "path": rel,
-                    }
-                )
-                continue
-            if path.stat().st_size <= 0:
-                issues.append(
-                    {
-                        "episode_key": source.episode_key,
-                        "title": source.title,
-                        "severity": "error",
-                        "reason": f"empty_file_{field_name}",
-                        "path": rel,
-                    }
-                )
+            if rel:
+                bucket.add(rel)
 
-        normalized_rel = str(entry.get("normalized_path") or "").strip()
-        if normalized_rel:
-            normalized_path = source.show_root / normalized_rel
-            if normalized_path.exists() and normalized_path.stat().st_size > 0:
-                payload = _load_json(normalized_path, f"normalized transcript for {source.episode_key}")
-                segments = payload.get("segments")
-                if not isinstance(segments, list) or not segments:
-                    issues.append(
-                        {
-                            "episode_key": source.episode_key,
-                            "title": source.title,
-                            "severity": "error",
-                            "reason": "missing_segments",
-                        }
-                    )
-                else:
-                    if int(payload.get("segment_count") or 0) != len(segments):
-                        issues.append(
-                            {
-                                "episode_key": source.episode_key,
-                                "title": source.title,
-                                "severity": "error",
-                                "reason": "segment_count_mismatch",
-                                "segment_count": payload.get("segment_count"),
-                                "actual_segment_count": len(segments),
-                            }
-                        )
-                    first_segment = segments[0] if isinstance(segments[0], dict) else None
-                    if not first_segment or "text" not in first_segment or "start_ms" not in first_segment:
-                        issues.append(
-                            {
-                                "episode_key": source.episode_key,
-                                "title": source.title,
-                                "severity": "error",
-                                "reason": "bad_first_segment",
-                            }
-                        )
-
-        vtt_rel = str(entry.get("vtt_path") or "").strip()
-        if vtt_rel:
-            vtt_path = source.show_root / vtt_rel
-            if vtt_path.exists() and vtt_path.stat().st_size > 0:
-                text = vtt_path.read_text(encoding="utf-8")
-                if not text.startswith("WEBVTT"):
-                    issues.append(
-                        {
-                            "episode_key": source.episode_key,
-                            "title": source.title,
-                            "severity": "error",
-                            "reason": "bad_vtt_header",
-                        }
-                    )
+        signature = _episode_signature(source=source, entry=entry)
+        episode_issues = ledger.cached_verification(source.episode_key, signature)
+        if episode_issues is None:
+            episode_issues = _episode_issues(source=source, entry=entry, ledger=ledger)
+            ledger.store_verification(source.episode_key, signature, episode_issues)
+            rechecked_count += 1
+        issues.extend(episode_issues)
 
-    orphaned_raw = sorted(_collect_files(store.raw_dir, ".json") - referenced_raw)
-    orphaned_normalized = sorted(_collect_files(store.normalized_dir, ".json") - referenced_normalized)
-    orphaned_vtt = sorted(_collect_files(store.vtt_dir, ".vtt") - referenced_vtt)
+    orphaned_raw = sorted(ledger.list_directory(store.raw_dir, ".json") - referenced_raw)
+    orphaned_normalized = sorted(ledger.list_directory(store.normalized_dir, ".json") - referenced_normalized)
+    orphaned_vtt = sorted(ledger.list_directory(store.vtt_dir, ".vtt") - referenced_vtt)
 
     for rel in orphaned_raw:
         issues.append({"severity": "warning", "reason": "orphaned_raw_file", "path": rel})
@@ -167,14 +200,21 @@ def verify_show_transcripts(*, sources: ShowSources, store: TranscriptStore) ->
     for rel in orphaned_vtt:
         issues.append({"severity": "warning", "reason": "orphaned_vtt_file", "path": rel})
 
+    ledger.prune(
+        episode_keys=verified_keys,
+        relpaths=referenced_raw | referenced_normalized | referenced_vtt,
+    )
+    ledger.save()
     return {
         "version": 1,
         "show_slug": sources.show_slug,
         "subject_slug": sources.subject_slug,
         "checked_at": utc_now_iso(),
+        "mode": "full" if full else "incremental",
         "inventory_episode_count": len(sources.episodes),
         "manifest_episode_count": len([entry for entry in entries if isinstance(entry, dict)]),
         "downloaded_episode_count": downloaded_count,
+        "rechecked_episode_count": rechecked_count,
         "issue_count": len(issues),
         "issues": issues,
     }
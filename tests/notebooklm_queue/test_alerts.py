@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from notebooklm_queue.alerts import drain_alert_spool, emit_failure_alert
+from notebooklm_queue.constants import STATE_BLOCKED_AUTH_STALE
+from notebooklm_queue.store import QueueStore
+
+
+class _WebhookSink:
+    def __init__(self, *, fail_first: int = 0, gate: threading.Event | None = None) -> None:
+        self.received: list[dict[str, object]] = []
+        self.fail_first = fail_first
+        self.gate = gate
+        self.entered = threading.Event()
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                sink.entered.set()
+                if sink.gate is not None:
+                    sink.gate.wait(timeout=10)
+                if sink.fail_first > 0:
+                    sink.fail_first -= 1
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                sink.received.append(json.loads(body))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args: object) -> None:
+                return None
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/alerts"
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def webhook(monkeypatch):  # noqa: ANN201
+    sinks: list[_WebhookSink] = []
+
+    def start(**kwargs: object) -> _WebhookSink:
+        sink = _WebhookSink(**kwargs)
+        sinks.append(sink)
+        monkeypatch.setenv("NOTEBOOKLM_QUEUE_ALERT_WEBHOOK_URL", sink.url)
+        return sink
+
+    monkeypatch.setenv("NOTEBOOKLM_QUEUE_ALERT_DELIVERY_BACKOFF_SECONDS", "0")
+    yield start
+    for sink in sinks:
+        sink.close()
+
+
+def _emit(store: QueueStore, lecture_key: str) -> dict[str, object] | None:
+    return emit_failure_alert(
+        store=store,
+        show_slug="bioneuro",
+        job={"show_slug": "bioneuro", "lecture_key": lecture_key, "job_id": f"job-{lecture_key}"},
+        manifest={"run_id": "run-1", "phases": []},
+        failed_state=STATE_BLOCKED_AUTH_STALE,
+        error_text="authentication expired",
+        note="auth stale",
+    )
+
+
+def test_repeated_alerts_are_held_then_delivered_as_one_digest(tmp_path: Path, webhook, monkeypatch) -> None:
+    sink = webhook()
+    monkeypatch.setenv("NOTEBOOKLM_QUEUE_ALERT_DEDUP_SECONDS", "3600")
+    store = QueueStore(tmp_path / "queue-root")
+
+    first = _emit(store, "W1L1")
+    assert first is not None and sink.received == []
+    report = drain_alert_spool(store=store)
+    assert [item["count"] for item in report["delivered"]] == [1]
+    assert json.loads(Path(str(first["alert_path"])).read_text(encoding="utf-8"))["delivery_status"] == "sent"
+
+    for lecture_key in ("W1L2", "W2L1", "W2L2"):
+        _emit(store, lecture_key)
+    held = drain_alert_spool(store=store)
+    assert held["held"] == 3 and held["delivered"] == []
+    assert len(sink.received) == 1
+
+    later = drain_alert_spool(store=store, now=datetime.now(tz=UTC) + timedelta(hours=2))
+    assert [item["count"] for item in later["delivered"]] == [3]
+    digest = sink.received[-1]
+    assert digest["digest"]["count"] == 3
+    assert digest["digest"]["lecture_keys"] == ["W1L2", "W2L1", "W2L2"]
+    assert "(3 occurrences)" in str(digest["summary"])
+    assert not list((tmp_path / "queue-root" / "alerts" / "spool").glob("*.json"))
+
+
+def test_drain_retries_failed_webhook_and_keeps_spool_when_all_channels_fail(
+    tmp_path: Path, webhook, monkeypatch
+) -> None:
+    sink = webhook(fail_first=2)
+    monkeypatch.setenv("NOTEBOOKLM_QUEUE_ALERT_DEDUP_SECONDS", "0")
+    monkeypatch.setenv("NOTEBOOKLM_QUEUE_ALERT_DELIVERY_RETRIES", "2")
+    store = QueueStore(tmp_path / "queue-root")
+
+    _emit(store, "W1L1")
+    report = drain_alert_spool(store=store)
+    assert report["delivered"][0]["deliveries"][0]["attempts"] == 3
+    assert len(sink.received) == 1
+
+    sink.fail_first = 10
+    monkeypatch.setenv("NOTEBOOKLM_QUEUE_ALERT_DELIVERY_RETRIES", "0")
+    _emit(store, "W1L2")
+    failed = drain_alert_spool(store=store)
+    assert failed["failed"] == 1
+    assert len(list((tmp_path / "queue-root" / "alerts" / "spool").glob("*.json"))) == 1
+
+
+def test_emit_does_not_wait_for_a_slow_drain(tmp_path: Path, webhook, monkeypatch) -> None:
+    gate = threading.Event()
+    sink = webhook(gate=gate)
+    monkeypatch.setenv("NOTEBOOKLM_QUEUE_ALERT_DEDUP_SECONDS", "0")
+    store = QueueStore(tmp_path / "queue-root")
+    _emit(store, "W1L1")
+
+    drain_reports: list[dict[str, object]] = []
+    drainer = threading.Thread(target=lambda: drain_reports.append(drain_alert_spool(store=store)))
+    drainer.start()
+    try:
+        assert sink.entered.wait(timeout=5)
+        emitter = threading.Thread(target=_emit, args=(store, "W1L2"))
+        emitter.start()
+        emitter.join(timeout=5)
+        assert not emitter.is_alive()
+        assert drain_alert_spool(store=store)["status"] == "lock_held"
+    finally:
+        gate.set()
+        drainer.join(timeout=10)
+
+    assert drain_reports[0]["status"] == "ok"
+    assert len(list((tmp_path / "queue-root" / "alerts" / "spool").glob("*.json"))) == 1
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
+import time
 from pathlib import Path
 
-from notebooklm_queue.discovery import discover_show_jobs, enqueue_discovered_jobs
+from notebooklm_queue import adapters as adapters_module
+from notebooklm_queue import store as store_module
+from notebooklm_queue.adapters import get_show_adapter
+from notebooklm_queue.discovery import discover_show_jobs, enqueue_discovered_jobs, plan_show_discovery
 from notebooklm_queue.models import JobIdentity
 from notebooklm_queue.runner import build_dry_run_plan
 from notebooklm_queue.store import QueueStore
@@ -352,3 +357,121 @@ def test_enqueue_discovered_jobs_dead_letters_superseded_non_terminal_records(tm
     ]
     assert len(current_records) == 1
     assert current_records[0]["lecture_key"] == "W01L1"
+
+
+def _write_da_show_fixture(tmp_path: Path, *, lecture_count: int) -> None:
+    for relative, content in (
+        (
+            "shows/personlighedspsykologi-da/config.github.json",
+            '{"output_inventory":"shows/personlighedspsykologi-da/episode_inventory.json"}',
+        ),
+        ("shows/personlighedspsykologi-en/episode_metadata.json", "{}"),
+        ("notebooklm-podcast-auto/personlighedspsykologi-da/prompt_config.json", "{}"),
+    ):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    rules = [
+        {"aliases": [f"W{index // 2 + 1:02d}L{index % 2 + 1}"], "topic": f"Topic {index}"}
+        for index in range(lecture_count)
+    ]
+    (tmp_path / "shows" / "personlighedspsykologi-en" / "auto_spec.json").write_text(
+        json.dumps({"rules": rules}),
+        encoding="utf-8",
+    )
+
+
+def test_plan_show_discovery_reports_diff_without_writing(tmp_path: Path) -> None:
+    _write_da_show_fixture(tmp_path, lecture_count=3)
+    store = QueueStore(tmp_path / "queue-root")
+    enqueue_discovered_jobs(repo_root=tmp_path, store=store, show_slug="personlighedspsykologi-da")
+
+    unchanged = plan_show_discovery(
+        repo_root=tmp_path,
+        store=store,
+        show_slug="personlighedspsykologi-da",
+    ).to_payload()
+
+    assert unchanged["create"] == []
+    assert sorted(item["lecture_key"] for item in unchanged["refresh"]) == ["W01L1", "W01L2", "W02L1"]
+    assert unchanged["supersede"] == []
+
+    auto_spec_path = tmp_path / "shows" / "personlighedspsykologi-en" / "auto_spec.json"
+    rules = json.loads(auto_spec_path.read_text(encoding="utf-8"))
+    rules["rules"].append({"aliases": ["W09L1"], "topic": "New"})
+    auto_spec_path.write_text(json.dumps(rules), encoding="utf-8")
+    jobs_before = sorted(path.name for path in (store.jobs_root / "personlighedspsykologi-da").glob("*.json"))
+
+    changed = plan_show_discovery(
+        repo_root=tmp_path,
+        store=store,
+        show_slug="personlighedspsykologi-da",
+    ).to_payload()
+
+    assert changed["discovered_count"] == 4
+    assert changed["config_hash"] != unchanged["config_hash"]
+    assert sorted(item["lecture_key"] for item in changed["create"]) == ["W01L1", "W01L2", "W02L1", "W09L1"]
+    assert changed["refresh"] == []
+    assert sorted(item["lecture_key"] for item in changed["supersede"]) == ["W01L1", "W01L2", "W02L1"]
+    assert {item["config_hash"] for item in changed["supersede"]} == {unchanged["config_hash"]}
+    jobs_after = sorted(path.name for path in (store.jobs_root / "personlighedspsykologi-da").glob("*.json"))
+    assert jobs_after == jobs_before
+
+
+def test_config_hash_is_memoised_by_file_stat_signature(tmp_path: Path, monkeypatch) -> None:
+    _write_da_show_fixture(tmp_path, lecture_count=1)
+    adapter = get_show_adapter("personlighedspsykologi-da")
+    old = time.time() - 60
+    for relative in adapter.config_paths:
+        os.utime(tmp_path / relative, (old, old))
+    monkeypatch.setattr(adapters_module, "_CONFIG_HASH_CACHE", {})
+    reads: list[Path] = []
+    original_read_bytes = Path.read_bytes
+
+    def counting_read_bytes(self: Path) -> bytes:
+        reads.append(self)
+        return original_read_bytes(self)
+
+    monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+
+    first = adapter.config_hash(tmp_path)
+    second = adapter.config_hash(tmp_path)
+    assert first == second
+    assert len(reads) == len(adapter.config_paths)
+
+    config_path = tmp_path / "shows" / "personlighedspsykologi-da" / "config.github.json"
+    config_path.write_text('{"output_inventory":"elsewhere.json"}', encoding="utf-8")
+    third = adapter.config_hash(tmp_path)
+    assert third != first
+    assert len(reads) == 2 * len(adapter.config_paths)
+
+
+def test_enqueue_discovered_jobs_benchmark_500_lectures_rewrites_indexes_once(tmp_path: Path, monkeypatch) -> None:
+    _write_da_show_fixture(tmp_path, lecture_count=500)
+    store = QueueStore(tmp_path / "queue-root")
+    index_writes: list[Path] = []
+    original_write = store_module._write_json_atomic
+
+    def counting_write(path: Path, payload: dict) -> None:
+        if path.parent in {store.indexes_root, store.show_indexes_root}:
+            index_writes.append(path)
+        original_write(path, payload)
+
+    monkeypatch.setattr(store_module, "_write_json_atomic", counting_write)
+
+    started = time.perf_counter()
+    result = enqueue_discovered_jobs(repo_root=tmp_path, store=store, show_slug="personlighedspsykologi-da")
+    cold_seconds = time.perf_counter() - started
+
+    assert len(result["enqueued"]) == 500
+    assert len(index_writes) == 2
+    assert len(store.list_jobs(show_slug="personlighedspsykologi-da")) == 500
+
+    index_writes.clear()
+    started = time.perf_counter()
+    result = enqueue_discovered_jobs(repo_root=tmp_path, store=store, show_slug="personlighedspsykologi-da")
+    warm_seconds = time.perf_counter() - started
+
+    assert len(result["enqueued"]) == 500
+    assert index_writes == []
+    assert warm_seconds < cold_seconds
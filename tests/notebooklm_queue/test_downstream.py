@@ -1,10 +1,23 @@
 from __future__ import annotations
 
 import json
+import sys
+import textwrap
+import time
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 from notebooklm_queue.constants import STATE_COMPLETED, STATE_FAILED_RETRYABLE, STATE_REPO_PUSHED, STATE_WAITING_FOR_ARTIFACT
-from notebooklm_queue.downstream import DownstreamOptions, DownstreamSyncError, sync_downstream_publication
+from notebooklm_queue import downstream as downstream_module
+from notebooklm_queue.downstream import (
+    DownstreamOptions,
+    DownstreamSyncError,
+    DownstreamTarget,
+    _wait_for_workflow_targets,
+    sync_downstream_publication,
+)
 from notebooklm_queue.models import JobIdentity
 from notebooklm_queue.store import QueueStore
 
@@ -102,18 +115,21 @@ def test_sync_downstream_waits_for_freudd_deploy_success(tmp_path: Path, monkeyp
         ],
     )
 
-    def fake_wait_for_workflow_target(**kwargs):
-        return {
-            "name": kwargs["target"].name,
-            "workflow_file": kwargs["target"].workflow_file,
-            "status": "completed",
-            "conclusion": "success",
-            "run_id": 12345,
-            "url": "https://github.com/example/run/12345",
-            "changed_paths": list(kwargs["target"].changed_paths),
-        }
+    def fake_wait_for_workflow_targets(**kwargs):
+        return [
+            {
+                "name": target.name,
+                "workflow_file": target.workflow_file,
+                "status": "completed",
+                "conclusion": "success",
+                "run_id": 12345,
+                "url": "https://github.com/example/run/12345",
+                "changed_paths": list(target.changed_paths),
+            }
+            for target in kwargs["targets"]
+        ]
 
-    monkeypatch.setattr("notebooklm_queue.downstream._wait_for_workflow_target", fake_wait_for_workflow_target)
+    monkeypatch.setattr("notebooklm_queue.downstream._wait_for_workflow_targets", fake_wait_for_workflow_targets)
 
     result = sync_downstream_publication(
         store=store,
@@ -156,10 +172,10 @@ def test_sync_downstream_marks_retryable_failure_on_failed_workflow(tmp_path: Pa
         changed_paths=["shows/bioneuro/content_manifest.json"],
     )
 
-    def fake_wait_for_workflow_target(**kwargs):
+    def fake_wait_for_workflow_targets(**kwargs):
         raise DownstreamSyncError("workflow failed")
 
-    monkeypatch.setattr("notebooklm_queue.downstream._wait_for_workflow_target", fake_wait_for_workflow_target)
+    monkeypatch.setattr("notebooklm_queue.downstream._wait_for_workflow_targets", fake_wait_for_workflow_targets)
 
     result = sync_downstream_publication(
         store=store,
@@ -190,3 +206,186 @@ def test_sync_downstream_skips_freudd_targets_for_danish_mirror(tmp_path: Path)
 
     assert result["final_state"] == STATE_COMPLETED
     assert result["targets"] == []
+
+
+def _write_fake_gh(tmp_path: Path, script: dict[str, list[dict[str, object] | None]], *, supports_commit: bool = True) -> tuple[Path, Path]:
+    """Write a fake `gh` that replays one scripted run state per call and workflow."""
+    # One state file per workflow: the waiter polls workflows concurrently, so a
+    # shared file would let two fake `gh` processes race on the same pop.
+    script_dir = tmp_path / "gh-script"
+    script_dir.mkdir()
+    for workflow, states in script.items():
+        (script_dir / f"{workflow}.json").write_text(json.dumps(states), encoding="utf-8")
+    calls_path = tmp_path / "gh-calls.jsonl"
+    gh_path = tmp_path / "fake-gh"
+    gh_path.write_text(
+        textwrap.dedent(
+            f"""\
+            #!{sys.executable}
+            import json
+            import os
+            import sys
+
+            args = sys.argv[1:]
+            with open({str(calls_path)!r}, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(args) + "\\n")
+            if "--commit" in args and not {supports_commit!r}:
+                sys.stderr.write("unknown flag: --commit\\n")
+                sys.exit(1)
+            workflow = args[args.index("--workflow") + 1]
+            state_path = os.path.join({str(script_dir)!r}, workflow + ".json")
+            states = [None]
+            if os.path.exists(state_path):
+                with open(state_path, encoding="utf-8") as handle:
+                    states = json.load(handle) or [None]
+            state = states.pop(0) if len(states) > 1 else states[0]
+            if os.path.exists(state_path):
+                with open(state_path, "w", encoding="utf-8") as handle:
+                    json.dump(states, handle)
+            runs = [] if state is None else [dict(state, headSha="abc123")]
+            runs.append({{"databaseId": 1, "headSha": "other", "status": "completed", "conclusion": "failure"}})
+            print(json.dumps(runs))
+            """
+        ),
+        encoding="utf-8",
+    )
+    gh_path.chmod(0o755)
+    return gh_path, calls_path
+
+
+def _gh_calls(calls_path: Path) -> list[list[str]]:
+    return [json.loads(line) for line in calls_path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record downstream poll waits without patching ``time.sleep`` for subprocess internals."""
+
+    recorded: list[float] = []
+    monkeypatch.setattr(downstream_module, "time", SimpleNamespace(monotonic=time.monotonic, sleep=recorded.append))
+    return recorded
+
+
+def test_wait_for_workflow_targets_polls_all_pending_workflows_per_round(tmp_path: Path, monkeypatch, sleeps) -> None:
+    monkeypatch.setattr(downstream_module, "_GH_WITHOUT_COMMIT_FILTER", set())
+    gh_path, calls_path = _write_fake_gh(
+        tmp_path,
+        {
+            "deploy-a.yml": [
+                None,
+                {"databaseId": 10, "status": "in_progress", "conclusion": ""},
+                {"databaseId": 10, "status": "completed", "conclusion": "success", "url": "https://run/10"},
+            ],
+            "deploy-b.yml": [
+                {"databaseId": 20, "status": "completed", "conclusion": "success", "url": "https://run/20"},
+            ],
+        },
+    )
+    targets = [
+        DownstreamTarget(name="a", workflow_file="deploy-a.yml", changed_paths=("shows/x/a.json",)),
+        DownstreamTarget(name="b", workflow_file="deploy-b.yml", changed_paths=("shows/x/b.json",)),
+    ]
+
+    results = _wait_for_workflow_targets(
+        repo_root=tmp_path,
+        commit_sha="abc123",
+        targets=targets,
+        options=DownstreamOptions(
+            repo_root=tmp_path,
+            gh_bin=str(gh_path),
+            timeout_seconds=30,
+            poll_interval_seconds=0,
+        ),
+    )
+
+    assert [(item["name"], item["run_id"], item["conclusion"]) for item in results] == [
+        ("a", 10, "success"),
+        ("b", 20, "success"),
+    ]
+    calls = _gh_calls(calls_path)
+    workflows = [call[call.index("--workflow") + 1] for call in calls]
+    assert workflows.count("deploy-b.yml") == 1
+    assert workflows.count("deploy-a.yml") == 3
+    assert all(call[call.index("--commit") + 1] == "abc123" for call in calls)
+    # poll_interval_seconds=0 still waits at least a second between gh polls.
+    assert len(sleeps) == 2 and min(sleeps) >= 1.0
+
+
+def test_wait_for_workflow_targets_falls_back_without_commit_filter(tmp_path: Path, monkeypatch, sleeps) -> None:
+    monkeypatch.setattr(downstream_module, "_GH_WITHOUT_COMMIT_FILTER", set())
+    gh_path, calls_path = _write_fake_gh(
+        tmp_path,
+        {"deploy.yml": [{"databaseId": 7, "status": "completed", "conclusion": "success"}]},
+        supports_commit=False,
+    )
+
+    results = _wait_for_workflow_targets(
+        repo_root=tmp_path,
+        commit_sha="abc123",
+        targets=[DownstreamTarget(name="freudd_deploy", workflow_file="deploy.yml", changed_paths=())],
+        options=DownstreamOptions(repo_root=tmp_path, gh_bin=str(gh_path), timeout_seconds=30, poll_interval_seconds=0),
+    )
+
+    assert results[0]["run_id"] == 7
+    calls = _gh_calls(calls_path)
+    assert "--commit" in calls[0]
+    assert "--commit" not in calls[1]
+    assert calls[1][calls[1].index("--limit") + 1] == "100"
+
+
+def test_wait_for_workflow_targets_fails_fast_on_failed_conclusion(tmp_path: Path, monkeypatch, sleeps) -> None:
+    monkeypatch.setattr(downstream_module, "_GH_WITHOUT_COMMIT_FILTER", set())
+    gh_path, _ = _write_fake_gh(
+        tmp_path,
+        {
+            "deploy-a.yml": [{"databaseId": 10, "status": "in_progress", "conclusion": ""}],
+            "deploy-b.yml": [{"databaseId": 20, "status": "completed", "conclusion": "failure", "url": "https://run/20"}],
+        },
+    )
+
+    with pytest.raises(DownstreamSyncError, match="Downstream workflow failed for b"):
+        _wait_for_workflow_targets(
+            repo_root=tmp_path,
+            commit_sha="abc123",
+            targets=[
+                DownstreamTarget(name="a", workflow_file="deploy-a.yml", changed_paths=()),
+                DownstreamTarget(name="b", workflow_file="deploy-b.yml", changed_paths=()),
+            ],
+            options=DownstreamOptions(repo_root=tmp_path, gh_bin=str(gh_path), timeout_seconds=30, poll_interval_seconds=0),
+        )
+
+
+def test_wait_for_workflow_targets_backs_off_until_overall_deadline(tmp_path: Path, monkeypatch) -> None:
+    polls: list[str] = []
+    monkeypatch.setattr(
+        downstream_module,
+        "_find_workflow_run",
+        lambda **kwargs: polls.append(kwargs["workflow_file"]),
+    )
+    clock = {"now": 0.0}
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(downstream_module.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(downstream_module.time, "sleep", fake_sleep)
+    monkeypatch.setattr(downstream_module.random, "uniform", lambda low, high: high)
+
+    with pytest.raises(DownstreamSyncError, match="last_status=not_found"):
+        _wait_for_workflow_targets(
+            repo_root=tmp_path,
+            commit_sha="abc123",
+            targets=[DownstreamTarget(name="freudd_deploy", workflow_file="deploy.yml", changed_paths=())],
+            options=DownstreamOptions(
+                repo_root=tmp_path,
+                timeout_seconds=100,
+                poll_interval_seconds=5,
+                max_poll_interval_seconds=30,
+            ),
+        )
+
+    assert sleeps[:4] == [5, 10, 20, 30]
+    assert sum(sleeps) == pytest.approx(100)
+    assert len(polls) == len(sleeps) + 1
@@ -8,6 +8,7 @@ from pathlib import Path
 
 import pytest
 
+from notebooklm_queue.alerts import drain_alert_spool
 from notebooklm_queue.constants import (
     STATE_APPROVED_FOR_PUBLISH,
     STATE_AWAITING_PUBLISH,
@@ -527,7 +528,9 @@ def test_execute_job_blocks_auth_stale_failures_and_emits_alert_via_command(tmp_
     alert_path = Path(execution["latest_alert_path"])
     alert_payload = json.loads(alert_path.read_text(encoding="utf-8"))
     assert alert_payload["kind"] == "auth_stale"
-    assert alert_capture.exists()
+    # Delivery is left to the out-of-band drain, not the failing job's path.
+    assert not alert_capture.exists()
+    assert drain_alert_spool(store=store)["status"] == "ok"
     delivered = json.loads(alert_capture.read_text(encoding="utf-8"))
     assert delivered["kind"] == "auth_stale"
 
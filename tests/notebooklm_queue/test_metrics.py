@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from notebooklm_queue.cli import main
+from notebooklm_queue.constants import STATE_BLOCKED_AUTH_STALE, STATE_COMPLETED, STATE_QUEUED
+from notebooklm_queue.metrics import OPENMETRICS_CONTENT_TYPE, serve_metrics, write_metrics_file
+from notebooklm_queue.models import JobIdentity
+from notebooklm_queue.store import QueueStore
+
+METRIC_NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+SAMPLE_PATTERN = re.compile(rf"^({METRIC_NAME})(?:\{{(.*)\}})? (\S+)$")
+LABEL_PATTERN = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(?:,|$)')
+SAMPLE_SUFFIXES = {"counter": ("_total",), "gauge": ("",), "histogram": ("_bucket", "_count", "_sum")}
+
+
+def parse_metrics_text(text: str, *, openmetrics: bool = True) -> dict[str, dict[str, object]]:
+    """Strict-enough OpenMetrics (or classic Prometheus) text parser: families keyed by name."""
+
+    lines = text.splitlines()
+    if openmetrics:
+        assert lines.pop() == "# EOF"
+    else:
+        assert "# EOF" not in lines
+    families: dict[str, dict[str, object]] = {}
+    current: dict[str, object] | None = None
+    for line in lines:
+        if line.startswith("# TYPE "):
+            _, _, name, metric_type = line.split(" ")
+            assert name not in families
+            # Classic text format types a counter under its full ``_total`` sample name.
+            assert openmetrics or metric_type != "counter" or name.endswith("_total"), line
+            current = families[name] = {"type": metric_type, "samples": []}
+            continue
+        if line.startswith("# HELP "):
+            assert current is not None and line.split(" ")[2] in families
+            continue
+        match = SAMPLE_PATTERN.match(line)
+        assert match, line
+        assert current is not None
+        name, raw_labels, raw_value = match.groups()
+        family_name = next(key for key, family in families.items() if family is current)
+        suffix = name[len(family_name):]
+        suffixes = SAMPLE_SUFFIXES[str(current["type"])] if openmetrics or current["type"] != "counter" else ("",)
+        assert name.startswith(family_name) and suffix in suffixes, line
+        labels = dict(LABEL_PATTERN.findall(raw_labels or ""))
+        current["samples"].append((suffix, labels, float(raw_value)))
+    return families
+
+
+def _samples(families: dict[str, dict[str, object]], name: str, suffix: str = "") -> dict[tuple, float]:
+    return {
+        tuple(sorted(labels.items())): value
+        for sample_suffix, labels, value in families[name]["samples"]
+        if sample_suffix == suffix
+    }
+
+
+def _fixture_store(tmp_path: Path) -> QueueStore:
+    store = QueueStore(tmp_path / "queue-root")
+    for lecture_key, state in (("W1L1", STATE_QUEUED), ("W1L2", STATE_QUEUED), ("W2L1", STATE_COMPLETED)):
+        store.upsert_job(
+            JobIdentity(
+                show_slug="bioneuro",
+                subject_slug="bioneuro",
+                lecture_key=lecture_key,
+                content_types=("audio",),
+                config_hash="cfg-1",
+            ),
+            initial_state=state,
+        )
+    store.upsert_job(
+        JobIdentity(
+            show_slug="personlighedspsykologi-en",
+            subject_slug="personlighedspsykologi",
+            lecture_key="W1L1",
+            content_types=("audio",),
+            config_hash="cfg-1",
+        ),
+        initial_state=STATE_BLOCKED_AUTH_STALE,
+    )
+    runs = [
+        ("run-1", "completed", None, [("generate", 12.0), ("download", 400.0)]),
+        ("run-2", "failed", "rate_limit", [("generate", 3.5)]),
+        ("run-3", "failed", "rate_limit", [("generate", 4.0)]),
+        ("run-4", "failed", None, [("generate", 2.0)]),
+    ]
+    for run_id, status, failure_mode, phases in runs:
+        manifest = {
+            "run_id": run_id,
+            "status": status,
+            "phases": [{"name": name, "duration_seconds": duration, "returncode": 0} for name, duration in phases],
+        }
+        if failure_mode:
+            manifest["failure_mode"] = failure_mode
+        store.save_run_manifest(show_slug="bioneuro", job_id="job-1", payload=manifest, run_id=run_id)
+    store.save_publish_manifest(
+        show_slug="bioneuro",
+        job_id="job-1",
+        bundle_id="bundle-1",
+        payload={
+            "status": "metadata_failed",
+            "metadata": {"phases": [{"name": "rebuild_rss", "duration_seconds": 70.0}]},
+        },
+    )
+    return store
+
+
+@pytest.fixture
+def profiles_env(tmp_path: Path, monkeypatch) -> None:  # noqa: ANN001
+    storage_file = tmp_path / "default-storage.json"
+    storage_file.write_text("{}", encoding="utf-8")
+    profiles_file = tmp_path / "profiles.host.json"
+    profiles_file.write_text(json.dumps({"profiles": {"default": str(storage_file)}}), encoding="utf-8")
+    state_file = tmp_path / "profile_state.json"
+    state_file.write_text(
+        json.dumps({"profiles": {"default": {"success_count": 7, "failure_count": 2}}}),
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("NOTEBOOKLM_PROFILES_FILE", str(profiles_file))
+    monkeypatch.setenv("NOTEBOOKLM_PROFILE_STATE_FILE", str(state_file))
+
+
+def test_metrics_file_reports_states_phase_histograms_and_failure_modes(tmp_path: Path, profiles_env) -> None:
+    store = _fixture_store(tmp_path)
+
+    path = write_metrics_file(store=store)
+
+    assert path == store.root / "metrics" / "queue.prom"
+    families = parse_metrics_text(path.read_text(encoding="utf-8"), openmetrics=False)
+    assert _samples(families, "notebooklm_queue_jobs") == {
+        (("show", "bioneuro"), ("state", "completed")): 1,
+        (("show", "bioneuro"), ("state", "queued")): 2,
+        (("show", "personlighedspsykologi-en"), ("state", "blocked_auth_stale")): 1,
+    }
+
+    histogram = "notebooklm_queue_phase_duration_seconds"
+    assert families[histogram]["type"] == "histogram"
+    generate = (("phase", "generate"), ("show", "bioneuro"))
+    assert _samples(families, histogram, "_count")[generate] == 4
+    assert _samples(families, histogram, "_sum")[generate] == pytest.approx(21.5)
+    buckets = _samples(families, histogram, "_bucket")
+    assert buckets[(("le", "5.0"), *generate)] == 3
+    assert buckets[(("le", "+Inf"), *generate)] == 4
+    assert _samples(families, histogram, "_count")[(("phase", "rebuild_rss"), ("show", "bioneuro"))] == 1
+
+    assert families["notebooklm_queue_run_failures_total"]["type"] == "counter"
+    assert _samples(families, "notebooklm_queue_run_failures_total") == {
+        (("failure_mode", "rate_limit"), ("show", "bioneuro")): 2,
+        (("failure_mode", "unclassified"), ("show", "bioneuro")): 1,
+    }
+    assert _samples(families, "notebooklm_profile_successes_total") == {(("profile", "default"),): 7}
+    assert _samples(families, "notebooklm_profile_failures_total") == {(("profile", "default"),): 2}
+
+    store.save_run_manifest(
+        show_slug="bioneuro",
+        job_id="job-2",
+        payload={"run_id": "run-5", "status": "failed", "failure_mode": "auth_stale", "phases": []},
+        run_id="run-5",
+    )
+    assert main(["--storage-root", str(store.root), "metrics", "--output", str(tmp_path / "cli.prom")]) == 0
+    refreshed = parse_metrics_text((tmp_path / "cli.prom").read_text(encoding="utf-8"), openmetrics=False)
+    assert _samples(refreshed, "notebooklm_queue_run_failures_total")[
+        (("failure_mode", "auth_stale"), ("show", "bioneuro"))
+    ] == 1
+
+
+def test_metrics_endpoint_serves_openmetrics(tmp_path: Path, profiles_env) -> None:
+    store = _fixture_store(tmp_path)
+    server = serve_metrics(store=store, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"] == OPENMETRICS_CONTENT_TYPE
+            families = parse_metrics_text(response.read().decode("utf-8"))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert _samples(families, "notebooklm_profile_status") == {(("profile", "default"), ("status", "usable")): 1}
+    assert "notebooklm_queue_phase_duration_seconds" in families
+    assert _samples(families, "notebooklm_profile_successes", "_total") == {(("profile", "default"),): 7}
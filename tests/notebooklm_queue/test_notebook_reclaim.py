@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
+import os
 from pathlib import Path
+import time
 from types import SimpleNamespace
 
+import pytest
+
+from notebooklm_queue import request_log_index
 from notebooklm_queue.notebook_reclaim import NotebookReclaimOptions, reclaim_notebooks
+from notebooklm_queue.notebook_reclaim_safety import find_undownloaded_request_logs
+from notebooklm_queue.profile_leases import ProfileAllocator, read_profile_state
+from notebooklm_queue.request_log_index import RequestLogIndex, record_request_log
 from notebooklm_queue.store import QueueStore
 
 
+@pytest.fixture(autouse=True)
+def _isolated_request_log_index(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(request_log_index.REQUEST_LOG_INDEX_PATH_ENV_VAR, str(tmp_path / "request-log-index.json"))
+
+
 class FakeClientContext:
     def __init__(self, client):
         self.client = client
@@ -189,3 +203,208 @@ def test_reclaim_notebooks_skips_when_headroom_exists(tmp_path: Path) -> None:
     profile = result["profiles"][0]
     assert profile["status"] == "skipped_has_headroom"
     assert fake_notebooks.deleted_ids == []
+
+
+def test_reclaim_keeps_profile_state_written_by_other_workers_during_the_pass(tmp_path: Path) -> None:
+    storage = tmp_path / "default.json"
+    storage.write_text("{}", encoding="utf-8")
+    profiles_file = _write_profiles_file(tmp_path, storage)
+    state_file = tmp_path / "profile_state.json"
+    allocator = ProfileAllocator(state_file)
+    allocator.record_result("default", success=True, error_type=None, cooldown_seconds=None)
+
+    class ConcurrentNotebooks(FakeNotebooks):
+        async def list(self):
+            # Another worker leases the profile and records a run while reclaim is listing.
+            self.lease = allocator.acquire(["default"])
+            allocator.record_result("default", success=True, error_type=None, cooldown_seconds=None)
+            return await super().list()
+
+    fake_notebooks = ConcurrentNotebooks([_notebook("nb-one", "One", "2026-01-01T00:00:00")], limit=5)
+    client = SimpleNamespace(notebooks=fake_notebooks, artifacts=FakeArtifacts())
+
+    reclaim_notebooks(
+        store=QueueStore(tmp_path / "queue"),
+        options=NotebookReclaimOptions(
+            profiles_file=profiles_file,
+            profile_state_file=state_file,
+            profiles=("default",),
+            repo_root=tmp_path,
+            target_free_slots=2,
+            dry_run=False,
+            use_lock=False,
+        ),
+        client_factory=_client_factory(client),
+    )
+
+    state, _warnings = read_profile_state(state_file)
+    entry = state["profiles"]["default"]
+    assert entry["success_count"] == 2
+    assert entry["last_reclaim_status"] == "skipped_has_headroom"
+    assert state["leases"]["default"]["token"] == fake_notebooks.lease.token
+    assert state["updated_by"] == "notebooklm_queue.reclaim_notebooks"
+
+
+def _count_parses(monkeypatch) -> list[Path]:
+    parsed: list[Path] = []
+    original = request_log_index._read_request_log
+    monkeypatch.setattr(
+        request_log_index,
+        "_read_request_log",
+        lambda path: parsed.append(path) or original(path),
+    )
+    return parsed
+
+
+def _age_dirs(root: Path, seconds: int = 60) -> None:
+    """Move directory mtimes out of the racy window so warm refreshes can reuse them."""
+
+    past = time.time() - seconds
+    for directory in [root, *(path for path in root.rglob("*") if path.is_dir())]:
+        os.utime(directory, (past, past))
+
+
+def test_request_log_index_tracks_rewrites_and_deletions(tmp_path: Path, monkeypatch) -> None:
+    root = tmp_path / "output" / "W01L1"
+    root.mkdir(parents=True)
+    log = root / "a.mp3.request.json"
+    log.write_text(json.dumps({"notebook_id": "nb-a", "output_path": str(root / "a.mp3")}), encoding="utf-8")
+    roots = (tmp_path / "output",)
+    index_path = tmp_path / "index.json"
+    _age_dirs(roots[0])
+
+    index = RequestLogIndex(index_path)
+    index.refresh(roots)
+    index.save()
+    assert find_undownloaded_request_logs(roots, "nb-a", index=index) == [log]
+
+    parsed = _count_parses(monkeypatch)
+    warm = RequestLogIndex(index_path)
+    warm.refresh(roots)
+    assert parsed == [] and warm.scanned_dirs == 0
+
+    # In-place rewrite keeps the directory mtime; the per-log stat still catches it.
+    directory_mtime = root.stat().st_mtime_ns
+    log.write_text(json.dumps({"notebook_id": "nb-b", "output_path": str(root / "a.mp3")}), encoding="utf-8")
+    os.utime(log, ns=(1, 1))
+    os.utime(root, ns=(directory_mtime, directory_mtime))
+    warm.refresh(roots)
+    assert parsed == [log]
+    assert warm.records_for("nb-a") == []
+    assert [record.log_path for record in warm.records_for("nb-b")] == [log]
+
+    log.unlink()
+    warm.refresh(roots)
+    assert warm.records_for("nb-b") == []
+
+
+def test_request_log_writer_hook_avoids_reparse(tmp_path: Path, monkeypatch) -> None:
+    root = tmp_path / "output"
+    root.mkdir()
+    index_path = tmp_path / "index.json"
+    RequestLogIndex(index_path).refresh((root,))
+    payload = {"notebook_id": "nb-new", "output_path": str(root / "new.mp3")}
+    log = root / "new.mp3.request.json"
+    log.write_text(json.dumps(payload), encoding="utf-8")
+    record_request_log(log, payload, path=index_path)
+
+    parsed = _count_parses(monkeypatch)
+    index = RequestLogIndex(index_path)
+    index.refresh((root,))
+    assert parsed == []
+    assert [record.log_path for record in index.records_for("nb-new")] == [log]
+
+
+def test_request_log_index_relists_directories_listed_inside_the_racy_window(tmp_path: Path) -> None:
+    root = tmp_path / "output"
+    root.mkdir()
+    index_path = tmp_path / "index.json"
+    index = RequestLogIndex(index_path)
+    index.refresh((root,))
+    index.save()
+
+    # Same-tick write: the directory mtime does not move past the cached value.
+    directory_mtime = root.stat().st_mtime_ns
+    log = root / "late.mp3.request.json"
+    log.write_text(json.dumps({"notebook_id": "nb-late", "output_path": str(root / "late.mp3")}), encoding="utf-8")
+    os.utime(root, ns=(directory_mtime, directory_mtime))
+
+    warm = RequestLogIndex(index_path)
+    warm.refresh((root,))
+    assert warm.scanned_dirs == 1
+    assert [record.log_path for record in warm.records_for("nb-late")] == [log]
+
+
+def test_request_log_writer_hooks_do_not_drop_concurrent_records(tmp_path: Path) -> None:
+    root = tmp_path / "output"
+    root.mkdir()
+    index_path = tmp_path / "index.json"
+    logs = []
+    for index in range(40):
+        payload = {"notebook_id": f"nb-{index}", "output_path": str(root / f"{index}.mp3")}
+        log = root / f"{index}.mp3.request.json"
+        log.write_text(json.dumps(payload), encoding="utf-8")
+        logs.append((log, payload))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda item: record_request_log(*item, path=index_path), logs))
+
+    recorded = RequestLogIndex(index_path)._dirs[str(root)]["logs"]
+    assert sorted(recorded) == sorted(log.name for log, _payload in logs)
+
+
+def test_benchmark_reclaim_scans_20k_request_logs_once_per_pass(tmp_path: Path, monkeypatch) -> None:
+    storage = tmp_path / "default.json"
+    storage.write_text("{}", encoding="utf-8")
+    profiles_file = _write_profiles_file(tmp_path, storage)
+    output_root = tmp_path / "notebooklm-podcast-auto" / "personlighedspsykologi" / "output"
+    notebook_count = 200
+    for index in range(20_000):
+        week_dir = output_root / f"W{index % 100:03d}"
+        week_dir.mkdir(parents=True, exist_ok=True)
+        output = week_dir / f"episode-{index:05d}.mp3"
+        if index >= 20:
+            output.write_bytes(b"audio")
+        (week_dir / f"{output.name}.request.json").write_text(
+            json.dumps({"notebook_id": f"nb-{index % notebook_count:03d}", "output_path": str(output)}),
+            encoding="utf-8",
+        )
+    _age_dirs(output_root)
+    notebooks = [
+        _notebook(f"nb-{index:03d}", f"Notebook {index}", f"2026-01-01T00:{index // 60:02d}:{index % 60:02d}")
+        for index in range(notebook_count)
+    ]
+    options = NotebookReclaimOptions(
+        profiles_file=profiles_file,
+        profile_state_file=tmp_path / "profile_state.json",
+        profiles=("default",),
+        repo_root=tmp_path,
+        target_free_slots=notebook_count,
+        max_deletions=notebook_count,
+        dry_run=True,
+        use_lock=False,
+    )
+    parsed = _count_parses(monkeypatch)
+
+    timings = []
+    for _ in range(2):
+        parsed.clear()
+        client = SimpleNamespace(notebooks=FakeNotebooks(notebooks, limit=notebook_count), artifacts=FakeArtifacts())
+        started = time.perf_counter()
+        result = reclaim_notebooks(
+            store=QueueStore(tmp_path / "queue"),
+            options=options,
+            client_factory=_client_factory(client),
+        )
+        timings.append(time.perf_counter() - started)
+        profile = result["profiles"][0]
+        assert profile["deleted_count"] == notebook_count - 20
+        assert all(item["reason"].startswith("local request logs") for item in profile["skipped_notebooks"])
+        if len(timings) == 1:
+            assert len(parsed) == 20_000
+            assert result["request_log_index"]["scanned_dirs"] == 101
+        else:
+            assert parsed == []
+            assert result["request_log_index"]["scanned_dirs"] == 0
+
+    assert timings[1] < timings[0]
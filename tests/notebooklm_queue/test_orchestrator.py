@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import UTC, datetime, timedelta
 import json
 from pathlib import Path
+import sys
 
+from notebooklm_queue.alerts import emit_failure_alert
 from notebooklm_queue.constants import (
     STATE_BLOCKED_AUTH_STALE,
     STATE_COMPLETED,
@@ -230,6 +232,50 @@ def test_drain_show_queue_stops_when_max_stage_runs_is_hit(tmp_path: Path, monke
     assert result["stopped_due_to_max_stage_runs"] is True
 
 
+def test_drain_show_queue_delivers_alerts_after_stages_release_their_locks(tmp_path: Path, monkeypatch) -> None:
+    repo_root = tmp_path / "repo"
+    repo_root.mkdir()
+    store = QueueStore(tmp_path / "queue-root")
+    alert_capture = tmp_path / "alert.json"
+    monkeypatch.setenv(
+        "NOTEBOOKLM_QUEUE_ALERT_COMMAND",
+        f"{sys.executable} -c \"import pathlib, sys; pathlib.Path(sys.argv[1]).write_text(sys.stdin.read())\" "
+        f"{alert_capture}",
+    )
+    monkeypatch.setenv("NOTEBOOKLM_QUEUE_ALERT_DEDUP_SECONDS", "0")
+    monkeypatch.setattr(
+        "notebooklm_queue.orchestrator.enqueue_discovered_jobs",
+        lambda **kwargs: {"discovered": [], "enqueued": []},
+    )
+    _patch_non_execution_stages_idle(monkeypatch)
+    monkeypatch.setattr("notebooklm_queue.orchestrator._has_ready_execution_work", lambda **kwargs: True)
+    runs: list[bool] = []
+
+    def _failing_run(**kwargs):
+        if runs:
+            raise FileNotFoundError("run")
+        with store.acquire_show_lock("bioneuro"):
+            emit_failure_alert(
+                store=store,
+                show_slug="bioneuro",
+                job={"show_slug": "bioneuro", "lecture_key": "W1L1", "job_id": "job-1"},
+                manifest={"run_id": "run-1", "phases": []},
+                failed_state=STATE_BLOCKED_AUTH_STALE,
+                error_text="authentication expired",
+                note="auth stale",
+            )
+        runs.append(alert_capture.exists())
+        return {"final_state": STATE_BLOCKED_AUTH_STALE}
+
+    monkeypatch.setattr("notebooklm_queue.orchestrator.execute_job", _failing_run)
+
+    result = drain_show_queue(store=store, show_slug="bioneuro", options=DrainShowOptions(repo_root=repo_root))
+
+    assert runs == [False]
+    assert result["alert_drain"]["delivered_count"] == 1
+    assert json.loads(alert_capture.read_text(encoding="utf-8"))["kind"] == "auth_stale"
+
+
 def test_drain_show_queue_waits_for_profile_capacity_without_claiming_job(
     tmp_path: Path, monkeypatch
 ) -> None:
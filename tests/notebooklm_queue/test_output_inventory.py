@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from notebooklm_queue.output_inventory import OutputInventory, load_output_inventory
+
+
+def _age_dirs(root: Path, seconds: int = 60) -> None:
+    """Move directory mtimes out of the racy window so warm refreshes can reuse them."""
+
+    past = time.time() - seconds
+    for directory in [root, *(path for path in root.rglob("*") if path.is_dir())]:
+        os.utime(directory, (past, past))
+
+
+def _touch(path: Path, content: bytes = b"") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+def test_inventory_lists_week_files_and_relists_only_changed_dirs(tmp_path: Path) -> None:
+    output_root = tmp_path / "output"
+    week_dir = output_root / "W01L1"
+    _touch(week_dir / "W01L1 - Reading {type=audio hash=ab12}.mp3", b"audio")
+    _touch(week_dir / "Queued.mp3.request.json", b"{}")
+    _touch(week_dir / "Failed.mp3.request.error.json", b"{}")
+    _touch(week_dir / "Both.mp3.request.json", b"{}")
+    _touch(week_dir / "Both.mp3.request.error.json", b"{}")
+    _touch(output_root / "W02L1" / "quiz.json", b"{}")
+    _age_dirs(output_root)
+    index_path = tmp_path / "inventory.json"
+
+    inventory = load_output_inventory(output_root, path=index_path)
+    assert inventory.scanned_dirs == 3
+    [audio] = [item for item in inventory.files(week_dir) if item.artifact_type == "audio"]
+    assert (audio.size, audio.cfg_tag) == (5, "type=audio hash=ab12")
+    assert inventory.output_status(week_dir) == {
+        "Both.mp3": "queued",
+        "Failed.mp3": "error",
+        "Queued.mp3": "queued",
+        "W01L1 - Reading {type=audio hash=ab12}.mp3": "mp3",
+    }
+    assert [path.name for path in inventory.subdirs(output_root)] == ["W01L1", "W02L1"]
+
+    assert OutputInventory(output_root, index_path).refresh().scanned_dirs == 0
+
+    _touch(week_dir / "Queued.mp3", b"audio")
+    inventory = load_output_inventory(output_root, path=index_path)
+    assert inventory.scanned_dirs == 1
+    assert inventory.output_status(week_dir)["Queued.mp3"] == "mp3"
+
+
+def test_benchmark_inventory_cold_and_warm_scans_of_40_weeks(tmp_path: Path) -> None:
+    output_root = tmp_path / "output"
+    for week in range(1, 41):
+        week_dir = output_root / f"W{week:02d}L1"
+        week_dir.mkdir(parents=True)
+        for index in range(200):
+            suffix = (".mp3", ".png", ".json", ".mp3.request.json")[index % 4]
+            (week_dir / f"W{week:02d}L1 - Item {index:03d} {{type=audio hash={index:04x}}}{suffix}").write_bytes(b"x")
+    _age_dirs(output_root)
+    index_path = tmp_path / "inventory.json"
+
+    started = time.perf_counter()
+    cold = OutputInventory(output_root, index_path).refresh()
+    assert cold.scanned_dirs == 41
+    cold.save()
+    cold_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    warm = OutputInventory(output_root, index_path).refresh()
+    warm_files = sum(len(warm.files(week_dir)) for week_dir in warm.subdirs(output_root))
+    warm_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cold.refresh()
+    in_process_seconds = time.perf_counter() - started
+
+    assert cold.scanned_dirs == 0
+    assert warm.scanned_dirs == 0
+    assert warm_files == 40 * 200
+    assert warm_seconds < cold_seconds
+    assert in_process_seconds < cold_seconds / 10
+
+
+def test_shared_inventory_refreshes_safely_from_concurrent_threads(tmp_path: Path) -> None:
+    output_root = tmp_path / "output"
+    output_root.mkdir()
+    index_path = tmp_path / "inventory.json"
+
+    def load(week: int) -> None:
+        _touch(output_root / f"W{week:02d}L1" / f"W{week:02d}L1 - Alle kilder {{type=audio}}.mp3", b"x")
+        load_output_inventory(output_root, path=index_path)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(load, range(1, 41)))
+
+    inventory = load_output_inventory(output_root, path=index_path)
+    assert len(inventory.subdirs(output_root)) == 40
+    assert json.loads(index_path.read_text(encoding="utf-8"))["dirs"] == inventory._dirs
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import time
+
+from notebooklm_queue.profile_capacity import inspect_profile_capacity
+from notebooklm_queue.profile_leases import ProfileAllocator, profile_entry_changes, read_profile_state
+
+
+def _lease_worker(state_path: str, marker_dir: str, rounds: int, result_path: str) -> None:
+    allocator = ProfileAllocator(Path(state_path))
+    acquired = 0
+    collisions = 0
+    for _ in range(rounds):
+        lease = allocator.acquire(["alpha", "beta"])
+        if lease is None:
+            time.sleep(0.001)
+            continue
+        acquired += 1
+        marker = Path(marker_dir) / f"{lease.profile}.held"
+        try:
+            fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            collisions += 1
+        else:
+            os.close(fd)
+            time.sleep(0.002)
+            marker.unlink()
+        allocator.release(lease)
+    Path(result_path).write_text(json.dumps({"acquired": acquired, "collisions": collisions}), encoding="utf-8")
+
+
+def _counter_worker(state_path: str, rounds: int) -> None:
+    allocator = ProfileAllocator(Path(state_path))
+    for _ in range(rounds):
+        allocator.record_result("alpha", success=True, error_type=None, cooldown_seconds=None)
+
+
+def _abandon_lease_worker(state_path: str) -> None:
+    lease = ProfileAllocator(Path(state_path)).acquire(["alpha"])
+    os._exit(0 if lease is not None else 1)
+
+
+def _run_processes(target, args_list: list[tuple]) -> None:
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+
+def test_concurrent_processes_never_share_a_profile_lease(tmp_path: Path) -> None:
+    state_path = tmp_path / "profile_state.json"
+    markers = tmp_path / "markers"
+    markers.mkdir()
+
+    _run_processes(
+        _lease_worker,
+        [(str(state_path), str(markers), 40, str(tmp_path / f"result-{index}.json")) for index in range(6)],
+    )
+
+    results = [json.loads((tmp_path / f"result-{index}.json").read_text(encoding="utf-8")) for index in range(6)]
+    assert sum(result["collisions"] for result in results) == 0
+    assert sum(result["acquired"] for result in results) > 0
+    state, _warnings = read_profile_state(state_path)
+    assert state["leases"] == {}
+    assert sum(int(entry["lease_count"]) for entry in state["profiles"].values()) == sum(
+        result["acquired"] for result in results
+    )
+
+
+def test_counter_updates_from_parallel_processes_are_not_lost(tmp_path: Path) -> None:
+    state_path = tmp_path / "profile_state.json"
+
+    _run_processes(_counter_worker, [(str(state_path), 25) for _ in range(4)])
+
+    state, _warnings = read_profile_state(state_path)
+    assert state["profiles"]["alpha"]["success_count"] == 100
+
+
+def test_update_profiles_applies_removed_fields(tmp_path: Path) -> None:
+    state_path = tmp_path / "profile_state.json"
+    allocator = ProfileAllocator(state_path)
+    allocator.update_profiles({"alpha": {"last_error": "auth", "cooldown_until": 5.0, "success_count": 3}})
+    before = dict(read_profile_state(state_path)[0]["profiles"]["alpha"])
+    after = {key: value for key, value in before.items() if key != "last_error"}
+    after["cooldown_until"] = 0.0
+
+    changed, removed = profile_entry_changes(before, after)
+    allocator.update_profiles({"alpha": changed}, removed_fields={"alpha": removed})
+
+    state, _warnings = read_profile_state(state_path)
+    assert state["profiles"]["alpha"] == {"cooldown_until": 0.0, "success_count": 3}
+
+
+def test_lease_of_dead_process_is_released_automatically(tmp_path: Path) -> None:
+    state_path = tmp_path / "profile_state.json"
+
+    _run_processes(_abandon_lease_worker, [(str(state_path),)])
+
+    state, _warnings = read_profile_state(state_path)
+    assert "alpha" in state["leases"]
+    lease = ProfileAllocator(state_path).acquire(["alpha"])
+    assert lease is not None
+    assert lease.pid == os.getpid()
+
+
+def test_acquire_skips_cooling_and_leased_profiles_and_expires_leases(tmp_path: Path) -> None:
+    state_path = tmp_path / "profile_state.json"
+    allocator = ProfileAllocator(state_path, lease_seconds=60)
+    allocator.record_result("alpha", success=False, error_type="rate_limit", cooldown_seconds=3600)
+
+    first = allocator.acquire(["alpha", "beta"])
+    assert first is not None and first.profile == "beta"
+    assert allocator.acquire(["alpha", "beta"]) is None
+
+    expired = allocator.acquire(["beta"], now_ts=time.time() + 120)
+    assert expired is not None and expired.token != first.token
+    assert allocator.release(first) is False
+    assert allocator.release(expired) is True
+
+
+def test_profile_capacity_reports_leased_profiles(tmp_path: Path) -> None:
+    storage = tmp_path / "alpha.json"
+    storage.write_text("{}", encoding="utf-8")
+    profiles_file = tmp_path / "profiles.json"
+    profiles_file.write_text(json.dumps({"profiles": {"alpha": str(storage)}}), encoding="utf-8")
+    state_path = tmp_path / "profile_state.json"
+    lease = ProfileAllocator(state_path).acquire(["alpha"])
+    assert lease is not None
+
+    capacity = inspect_profile_capacity(
+        profiles_file=profiles_file,
+        profile_state_file=state_path,
+        now=datetime.now(tz=UTC),
+    )
+
+    assert capacity["has_capacity"] is False
+    assert capacity["manual_intervention_required"] is False
+    assert capacity["status_counts"] == {"leased": 1}
+    assert capacity["profiles"][0]["lease_holder_pid"] == os.getpid()
+    assert capacity["wait_seconds"] == 60
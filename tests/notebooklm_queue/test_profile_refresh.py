@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 import json
 import os
 from pathlib import Path
+import time
 
 from notebooklm_queue.profile_capacity import inspect_profile_capacity
 from notebooklm_queue.profile_refresh import ProfileRefreshOptions, refresh_profiles
@@ -508,3 +510,88 @@ def test_refresh_profiles_respects_capacity_lock(tmp_path: Path) -> None:
 
     assert result["status"] == "lock_held"
     assert result["summary"] == {"lock_held": 1}
+
+
+class _FakeProfileClients:
+    """Per-profile delays and failures for refresh/probe, tracking peak concurrency."""
+
+    def __init__(self, delays: dict[str, float], refresh_errors=None, probe_errors=None) -> None:
+        self.delays = delays
+        self.refresh_errors = refresh_errors or {}
+        self.probe_errors = probe_errors or {}
+        self.active = 0
+        self.max_active = 0
+
+    async def _step(self, name: str, errors: dict[str, Exception]) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(name, 0.0))
+            if name in errors:
+                raise errors[name]
+        finally:
+            self.active -= 1
+
+    async def refresh(self, name: str, _storage_path: Path) -> None:
+        await self._step(name, self.refresh_errors)
+
+    async def probe(self, name: str, _storage_path: Path) -> None:
+        await self._step(name, self.probe_errors)
+
+
+def test_refresh_profiles_runs_concurrently_with_same_classification(tmp_path: Path) -> None:
+    now = datetime(2026, 5, 23, 12, tzinfo=UTC)
+    names = ["p1", "p2", "p3", "p4", "p5", "p6"]
+    storages = {}
+    for name in names:
+        storages[name] = tmp_path / f"{name}.json"
+        storages[name].write_text("{}", encoding="utf-8")
+    storages["p6"] = tmp_path / "missing.json"
+    profiles_file = _write_profiles_file(tmp_path, storages)
+    state_file = tmp_path / "profile_state.json"
+    clients = _FakeProfileClients(
+        {name: 0.2 for name in names} | {"p5": 5.0},
+        refresh_errors={
+            "p2": ValueError("Authentication expired or invalid. Run 'notebooklm login'."),
+            "p3": RuntimeError("HTTP 429 rate limit"),
+        },
+        probe_errors={"p4": RuntimeError("temporary network failure")},
+    )
+
+    started = time.monotonic()
+    result = refresh_profiles(
+        store=QueueStore(tmp_path / "queue"),
+        options=ProfileRefreshOptions(
+            profiles_file=profiles_file,
+            profile_state_file=state_file,
+            profile_priority=",".join(names),
+            force=True,
+            use_lock=False,
+            max_concurrency=3,
+            refresh_timeout_seconds=1,
+        ),
+        refresher=clients.refresh,
+        prober=clients.probe,
+        now=now,
+    )
+    elapsed = time.monotonic() - started
+
+    by_name = {item["name"]: item for item in result["profiles"]}
+    assert [item["name"] for item in result["profiles"]] == names
+    assert by_name["p1"]["status"] == "refreshed"
+    assert (by_name["p2"]["status"], by_name["p2"]["error_type"]) == ("failed", "auth")
+    assert (by_name["p3"]["status"], by_name["p3"]["error_type"]) == ("failed", "rate_limit")
+    assert (by_name["p4"]["phase"], by_name["p4"]["error_type"]) == ("probe", "transient")
+    assert (by_name["p5"]["status"], by_name["p5"]["error_type"]) == ("failed", "transient")
+    assert "timed out" in by_name["p5"]["error"]
+    assert (by_name["p6"]["status"], by_name["p6"]["error_type"]) == ("failed", "missing_storage")
+    assert result["status"] == "partial_failure"
+    assert clients.max_active == 3
+    assert elapsed < 2.0
+
+    state = json.loads(state_file.read_text(encoding="utf-8"))["profiles"]
+    assert state["p1"]["last_probe_status"] == "success"
+    assert state["p2"]["last_error"] == "auth"
+    assert state["p3"]["last_refresh_error_type"] == "rate_limit"
+    assert state["p4"]["last_probe_status"] == "failed"
+    assert state["p5"]["last_refresh_status"] == "failed"
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from notebooklm_queue import openai_preprocessing, source_text_cache
+from notebooklm_queue.source_chunking import (
+    OMISSION_MARKER,
+    SELECTION_STRATEGY_BM25,
+    SELECTION_STRATEGY_FULL,
+    SELECTION_STRATEGY_TRUNCATE,
+    TRUNCATION_MARKER,
+    bm25_scores,
+    lecture_relevance_terms,
+    select_source_text,
+    split_source_chunks,
+)
+
+FILLER = "The chapter recounts biographical context and historical anecdotes at length. " * 8
+
+
+def _reading() -> str:
+    pages = [
+        f"# Introduction\n{FILLER}",
+        f"{FILLER}",
+        f"# Drive theory\nFreud describes the id, ego and superego as structural agencies. "
+        f"Drive theory explains conflict between the id and the superego.\n{FILLER}",
+        f"{FILLER}",
+        f"# Object relations\nObject relations theory reworks drive theory around early attachment.\n{FILLER}",
+    ]
+    return "\n\n".join(f"### Page {index}\n{text}" for index, text in enumerate(pages, start=1))
+
+
+def test_chunks_start_at_page_and_heading_boundaries() -> None:
+    chunks = split_source_chunks("### Page 1\nIntro line\n# Theory\nBody text\n\n### Page 2\nMore body")
+
+    assert [(chunk.pages, chunk.heading, chunk.text) for chunk in chunks] == [
+        ((1,), "", "Intro line"),
+        ((1,), "Theory", "# Theory\nBody text"),
+        ((2,), "Theory", "More body"),
+    ]
+
+
+def test_ocr_form_feeds_are_treated_as_pages() -> None:
+    chunks = split_source_chunks("first page\fsecond page")
+
+    assert [chunk.pages for chunk in chunks] == [(1,), (2,)]
+
+
+def test_bm25_ranks_the_chunks_that_mention_the_terms() -> None:
+    chunks = split_source_chunks(_reading())
+    scores = bm25_scores(chunks, ["drive theory", "superego"])
+
+    ranked = sorted(range(len(chunks)), key=lambda index: (-scores[index], index))
+    assert chunks[ranked[0]].heading == "Drive theory"
+    assert chunks[ranked[1]].heading == "Object relations"
+    assert scores[0] == 0.0
+
+
+def test_selection_packs_relevant_later_pages_in_document_order() -> None:
+    text = _reading()
+    budget = len(text) // 2
+
+    selection = select_source_text(text, max_chars=budget, relevance_terms=["drive theory", "superego", "id"])
+
+    assert selection.strategy == SELECTION_STRATEGY_BM25
+    assert len(selection.text) <= budget
+    assert selection.included_pages == (3, 5)
+    assert selection.omitted_pages == (1, 2, 4)
+    assert selection.text.index("### Page 3") < selection.text.index("### Page 5")
+    assert selection.text.count(OMISSION_MARKER) == 2
+    assert select_source_text(text, max_chars=budget, relevance_terms=["superego", "drive theory", "id"]) == selection
+
+
+def test_selection_without_terms_keeps_leading_truncation() -> None:
+    text = _reading()
+
+    selection = select_source_text(text, max_chars=500)
+    assert selection.strategy == SELECTION_STRATEGY_TRUNCATE
+    assert selection.text == text[:500].rstrip() + "\n" + TRUNCATION_MARKER
+    assert selection.included_pages == (1,)
+
+    full = select_source_text(text, max_chars=len(text), relevance_terms=["id"])
+    assert full.strategy == SELECTION_STRATEGY_FULL
+    assert full.text == text
+    assert full.included_pages == (1, 2, 3, 4, 5)
+
+
+def test_lecture_relevance_terms_reads_glossary_and_theory_map(tmp_path: Path) -> None:
+    glossary = tmp_path / "course_glossary.json"
+    theory_map = tmp_path / "course_theory_map.json"
+    glossary.write_text(
+        json.dumps(
+            {
+                "terms": [
+                    {"term_id": "superego", "label": "superego", "aliases": ["overjeg"], "lecture_keys": ["W04L1"]},
+                    {"term_id": "trait", "label": "trait", "aliases": [], "lecture_keys": ["W02L1"]},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    theory_map.write_text(
+        json.dumps({"theories": [{"theory_id": "drive_theory", "label": "drive theory", "lecture_keys": ["W04L1"]}]}),
+        encoding="utf-8",
+    )
+
+    terms = lecture_relevance_terms("w04l1", glossary_path=glossary, theory_map_path=theory_map)
+
+    assert terms == ["superego", "overjeg", "drive theory"]
+    assert lecture_relevance_terms("W04L1", glossary_path=tmp_path / "missing.json", theory_map_path=theory_map) == [
+        "drive theory"
+    ]
+
+
+def test_openai_prompt_records_page_selection(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(source_text_cache.SOURCE_TEXT_CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    reading = tmp_path / "reading.md"
+    reading.write_text(_reading(), encoding="utf-8")
+    selection_log: list[dict] = []
+
+    prompt = openai_preprocessing._build_user_prompt_with_sources(
+        user_prompt="Summarise.",
+        source_paths=[reading],
+        max_inline_source_chars=len(_reading()) // 2,
+        relevance_terms=["drive theory", "superego"],
+        source_selection=selection_log,
+    )
+
+    assert "Freud describes the id" in prompt
+    assert selection_log[0]["source_name"] == "reading.md"
+    assert selection_log[0]["strategy"] == SELECTION_STRATEGY_BM25
+    assert 3 in selection_log[0]["included_pages"]
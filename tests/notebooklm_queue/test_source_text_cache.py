@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from notebooklm_queue import gemini_preprocessing, openai_preprocessing, source_text_cache
+from notebooklm_queue.source_text_cache import EXTRACTOR_VERSION, SourceTextCache, warm_source_text_cache
+
+
+def _write_pdf(path: Path, page_texts: list[str]) -> None:
+    writer = PdfWriter()
+    for text in page_texts:
+        page = writer.add_blank_page(width=200, height=200)
+        if not text:
+            continue
+        font = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)})}
+        )
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 20 100 Td ({text}) Tj ET".encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        writer.write(handle)
+
+
+def test_extraction_is_keyed_by_content_and_reused_across_paths(tmp_path: Path) -> None:
+    first = tmp_path / "readings" / "a.pdf"
+    _write_pdf(first, ["Freud", "", "Jung"])
+    copy = tmp_path / "elsewhere" / "renamed.pdf"
+    copy.parent.mkdir()
+    copy.write_bytes(first.read_bytes())
+    cache = SourceTextCache(tmp_path / "cache")
+
+    extraction = cache.extract_pdf(first)
+    assert extraction.cache_hit is False
+    assert extraction.page_texts == ("Freud", "", "Jung")
+    assert extraction.empty_pages == (2,)
+    assert extraction.text() == "### Page 1\nFreud\n\n### Page 3\nJung"
+
+    record = json.loads((cache.entry_dir(extraction.sha256) / "record.json").read_text(encoding="utf-8"))
+    assert record["extractor_version"] == EXTRACTOR_VERSION
+    assert record["ocr_status"] == "not_run"
+    assert record["empty_pages"] == [2]
+
+    reused = cache.extract_pdf(copy)
+    assert reused.cache_hit is True
+    assert reused.text() == extraction.text()
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.cached_page_count(copy) == 3
+
+
+def test_ocr_sidecar_is_cached_for_pdfs_without_a_text_layer(tmp_path: Path, monkeypatch) -> None:
+    scanned = tmp_path / "scan.pdf"
+    _write_pdf(scanned, ["", ""])
+    calls: list[Path] = []
+
+    def fake_ocr(path: Path, *, timeout_seconds: int, progress_logger) -> str:
+        calls.append(path)
+        return "scanned page one\fscanned page two"
+
+    monkeypatch.setattr(source_text_cache, "_ocrmypdf_sidecar", fake_ocr)
+    cache = SourceTextCache(tmp_path / "cache")
+
+    assert cache.read_source_text(scanned) == "scanned page one\fscanned page two"
+    assert cache.read_source_text(scanned) == "scanned page one\fscanned page two"
+    assert calls == [scanned]
+    extraction = cache.extract_pdf(scanned)
+    assert extraction.ocr_pages == (1, 2)
+    assert (cache.entry_dir(extraction.sha256) / "ocr.txt").exists()
+
+
+def test_text_layer_only_entry_is_upgraded_when_ocr_is_requested(tmp_path: Path, monkeypatch) -> None:
+    scanned = tmp_path / "scan.pdf"
+    _write_pdf(scanned, [""])
+    cache = SourceTextCache(tmp_path / "cache")
+    assert cache.extract_pdf(scanned, ocr=False).ocr_text is None
+
+    monkeypatch.setattr(
+        source_text_cache,
+        "_ocrmypdf_sidecar",
+        lambda path, *, timeout_seconds, progress_logger: "ocr text",
+    )
+    upgraded = cache.extract_pdf(scanned)
+    assert upgraded.cache_hit is False
+    assert upgraded.ocr_text == "ocr text"
+    assert cache.extract_pdf(scanned).cache_hit is True
+
+
+def test_preprocessing_inline_paths_read_through_the_shared_cache(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(source_text_cache.SOURCE_TEXT_CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    pdf = tmp_path / "reading.pdf"
+    _write_pdf(pdf, ["Adler"])
+    notes = tmp_path / "notes.md"
+    notes.write_text("  Lecture notes  \n", encoding="utf-8")
+
+    assert openai_preprocessing._read_source_text(pdf) == "### Page 1\nAdler"
+    assert source_text_cache.default_cache().hits == 0
+    assert openai_preprocessing._read_source_text(pdf) == "### Page 1\nAdler"
+    assert source_text_cache.default_cache().hits == 1
+    assert gemini_preprocessing._inline_source_payload(notes, max_chars=100) == (
+        "### Source file: notes.md\nLecture notes"
+    )
+    with pytest.raises(gemini_preprocessing.GeminiPreprocessingInputError, match="failed to read source file"):
+        gemini_preprocessing._inline_source_payload(tmp_path / "missing.md", max_chars=100)
+
+
+def test_warm_up_reports_hits_and_misses_with_a_process_pool(tmp_path: Path) -> None:
+    for index in range(3):
+        _write_pdf(tmp_path / "readings" / f"r{index}.pdf", [f"Reading {index}"])
+    (tmp_path / "readings" / "notes.txt").write_text("skip", encoding="utf-8")
+
+    cold = warm_source_text_cache([tmp_path / "readings"], cache_root=tmp_path / "cache", workers=2, ocr=False)
+    warm = warm_source_text_cache([tmp_path / "readings"], cache_root=tmp_path / "cache", workers=2, ocr=False)
+
+    assert (cold["file_count"], cold["miss_count"], cold["hit_count"]) == (3, 3, 0)
+    assert (warm["miss_count"], warm["hit_count"], warm["error_count"]) == (0, 3, 0)
+    assert [Path(item["path"]).name for item in warm["files"]] == ["r0.pdf", "r1.pdf", "r2.pdf"]
@@ -32,6 +32,30 @@ def test_upsert_job_is_idempotent_and_builds_indexes(tmp_path: Path) -> None:
     assert global_jobs[0]["show_slug"] == "demo-show"
 
 
+def test_upsert_jobs_batches_index_rewrites_and_merges_existing_metadata(tmp_path: Path) -> None:
+    store = QueueStore(tmp_path)
+    existing = store.upsert_job(_identity(lecture_key="W01L1"), metadata={"source_count": 4}, priority=5)
+
+    payloads = store.upsert_jobs(
+        [
+            (_identity(lecture_key="W01L1"), {"topic": "Intro"}),
+            (_identity(lecture_key="W01L2"), {"topic": "Second"}),
+            (_identity(lecture_key="W02L1"), None),
+        ],
+        priority=5,
+    )
+
+    assert [item["lecture_key"] for item in payloads] == ["W01L1", "W01L2", "W02L1"]
+    assert payloads[0]["job_id"] == existing["job_id"]
+    assert payloads[0]["metadata"] == {"source_count": 4, "topic": "Intro"}
+    assert [item["lecture_key"] for item in store.list_jobs(show_slug="demo-show")] == sorted(
+        ["W01L1", "W01L2", "W02L1"],
+        key=lambda key: _identity(lecture_key=key).stable_key(),
+    )
+    assert len(store.list_jobs()) == 3
+    assert store.load_job(show_slug="demo-show", job_id=payloads[1]["job_id"])["metadata"] == {"topic": "Second"}
+
+
 def test_transition_job_tracks_history_and_retry_window(tmp_path: Path) -> None:
     store = QueueStore(tmp_path)
     job = store.upsert_job(_identity(lecture_key="W01L1"))
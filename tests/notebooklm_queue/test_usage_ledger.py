@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from notebooklm_queue import gemini_preprocessing, openai_preprocessing
+from notebooklm_queue.cli import main
+from notebooklm_queue.usage_ledger import read_ledger, record_cache_hit, usage_scope
+
+
+@pytest.fixture
+def ledger_path(tmp_path: Path, monkeypatch) -> Path:  # noqa: ANN001
+    path = tmp_path / "usage-ledger.jsonl"
+    monkeypatch.setenv("NOTEBOOKLM_USAGE_LEDGER_PATH", str(path))
+    return path
+
+
+def _gemini_backend(client: object, model: str = "gemini-test") -> gemini_preprocessing.GeminiPreprocessingBackend:
+    support = mock.Mock()
+    support.GenerateContentConfig.side_effect = lambda **kwargs: kwargs
+    support.ThinkingConfig.side_effect = lambda **kwargs: kwargs
+    support.Part.from_text.side_effect = lambda *, text: {"text": text}
+    return gemini_preprocessing.GeminiPreprocessingBackend(
+        provider="gemini",
+        client=client,
+        support=support,
+        model=model,
+    )
+
+
+def test_gemini_generate_json_records_tokens_retries_and_scope(ledger_path: Path) -> None:
+    client = mock.Mock()
+    client.models.generate_content.side_effect = [
+        RuntimeError("429 Too Many Requests"),
+        SimpleNamespace(
+            text='{"ok": true}',
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=1200,
+                candidates_token_count=300,
+                thoughts_token_count=500,
+                cached_content_token_count=0,
+            ),
+        ),
+    ]
+
+    with usage_scope(stage="source_card", lecture_key="W01L1"):
+        payload = gemini_preprocessing.generate_json(
+            backend=_gemini_backend(client),
+            system_instruction="system",
+            user_prompt="user",
+            retry_sleep_seconds=0,
+        )
+
+    assert payload == {"ok": True}
+    [record] = list(read_ledger(ledger_path))
+    assert record["provider"] == "gemini"
+    assert record["model"] == "gemini-test"
+    assert (record["stage"], record["lecture_key"]) == ("source_card", "W01L1")
+    assert (record["status"], record["cache"], record["retries"]) == ("ok", "miss", 1)
+    assert (record["input_tokens"], record["output_tokens"], record["reasoning_tokens"]) == (1200, 800, 500)
+
+
+def test_openai_generate_json_records_failed_calls(ledger_path: Path) -> None:
+    client = mock.Mock()
+    client.responses.create.return_value = SimpleNamespace(
+        output_text="not json",
+        usage=SimpleNamespace(
+            input_tokens=900,
+            output_tokens=40,
+            output_tokens_details=SimpleNamespace(reasoning_tokens=25),
+            input_tokens_details=SimpleNamespace(cached_tokens=100),
+        ),
+    )
+    backend = openai_preprocessing.OpenAIPreprocessingBackend(provider="openai", client=client, model="gpt-test")
+
+    with usage_scope(stage="printout", lecture_key="W02L1"), pytest.raises(openai_preprocessing.OpenAIPreprocessingError):
+        openai_preprocessing.generate_json(backend=backend, system_instruction="system", user_prompt="user")
+
+    [record] = list(read_ledger(ledger_path))
+    assert (record["provider"], record["stage"], record["status"], record["retries"]) == ("openai", "printout", "error", 0)
+    assert (record["input_tokens"], record["output_tokens"]) == (900, 40)
+    assert (record["reasoning_tokens"], record["cached_input_tokens"]) == (25, 100)
+
+
+def test_usage_report_aggregates_by_stage_and_estimates_cost(tmp_path: Path, ledger_path: Path, capsys) -> None:
+    client = mock.Mock()
+    client.models.generate_content.return_value = SimpleNamespace(
+        text='{"ok": true}',
+        usage_metadata=SimpleNamespace(prompt_token_count=1_000_000, candidates_token_count=100_000),
+    )
+    for lecture_key in ("W01L1", "W01L2"):
+        with usage_scope(stage="lecture_substrate", lecture_key=lecture_key):
+            gemini_preprocessing.generate_json(
+                backend=_gemini_backend(client),
+                system_instruction="system",
+                user_prompt="user",
+            )
+    record_cache_hit(provider="gemini", model="gemini-test", stage="lecture_substrate", lecture_key="W01L3")
+    with usage_scope(stage="printout"):
+        gemini_preprocessing.generate_json(
+            backend=_gemini_backend(client, model="unpriced"),
+            system_instruction="system",
+            user_prompt="user",
+        )
+    prices_path = tmp_path / "prices.json"
+    prices_path.write_text(
+        json.dumps({"gemini-test": {"input_per_million": 2.0, "output_per_million": 10.0}}),
+        encoding="utf-8",
+    )
+
+    assert main(["usage-report", "--prices-file", str(prices_path), "--group-by", "stage", "--group-by", "lecture"]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    substrate = report["by_stage"]["lecture_substrate"]
+    assert (substrate["calls"], substrate["cache_hits"], substrate["input_tokens"]) == (3, 1, 2_000_000)
+    assert substrate["estimated_cost_usd"] == pytest.approx(6.0)
+    assert report["by_stage"]["printout"]["unpriced_calls"] == 1
+    assert report["by_lecture"]["W01L3"]["estimated_cost_usd"] == 0.0
+    assert "by_day" not in report
+    assert report["totals"]["calls"] == 4
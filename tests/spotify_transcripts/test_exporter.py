@@ -104,3 +104,40 @@ class ExporterTests(unittest.TestCase):
         self.assertEqual(payload["episodes"][0]["transcript_text"], "Hello\nWorld")
         self.assertEqual(payload["omitted_episodes"][0]["episode_key"], "ep-b")
         self.assertEqual(payload["omitted_episodes"][0]["reason"], "missing_mapping")
+
+    def test_export_show_transcripts_reuses_unchanged_episode_shards(self) -> None:
+        first = export_show_transcripts(sources=self.sources, store=self.store)
+        self.assertEqual(first["episode_count_rebuilt"], 1)
+        self.assertTrue(first["combined_rewritten"])
+        index = json.loads((self.show_root / first["index_path"]).read_text(encoding="utf-8"))
+        self.assertEqual(index["episodes"][0]["shard"], "ep-a.jsonl")
+        shard_lines = (
+            (self.show_root / first["index_path"]).parent / "ep-a.jsonl"
+        ).read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(shard_lines), 3)
+        self.assertEqual(json.loads(shard_lines[0])["transcript_text"], "Hello\nWorld")
+
+        second = export_show_transcripts(sources=self.sources, store=self.store)
+        self.assertEqual(second["episode_count_rebuilt"], 0)
+        self.assertEqual(second["episode_count_reused"], 1)
+        self.assertFalse(second["combined_rewritten"])
+
+        self.store.write_normalized_payload(
+            episode_key="ep-a",
+            payload={
+                "version": 1,
+                "language": "en-us",
+                "available_translations": [],
+                "segment_count": 1,
+                "segments": [{"start_ms": 0, "end_ms": 1500, "text": "Changed"}],
+            },
+        )
+        third = export_show_transcripts(sources=self.sources, store=self.store)
+        self.assertEqual(third["episode_count_rebuilt"], 1)
+        self.assertTrue(third["combined_rewritten"])
+        payload = json.loads((self.show_root / third["export_path"]).read_text(encoding="utf-8"))
+        self.assertEqual(payload["episodes"][0]["transcript_text"], "Changed")
+        self.assertEqual(payload["episodes"][0]["segments"], [{"start_ms": 0, "end_ms": 1500, "text": "Changed"}])
+
+        forced = export_show_transcripts(sources=self.sources, store=self.store, full=True)
+        self.assertEqual(forced["episode_count_rebuilt"], 1)
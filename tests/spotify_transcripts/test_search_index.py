@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from spotify_transcripts.discovery import load_show_sources
+from spotify_transcripts.search_index import build_search_index, search_show_transcripts
+from spotify_transcripts.store import TranscriptStore
+
+
+def _manifest_entry(episode_key: str, title: str) -> dict[str, object]:
+    return {
+        "episode_key": episode_key,
+        "title": title,
+        "status": "downloaded",
+        "normalized_path": f"spotify_transcripts/normalized/{episode_key}.json",
+    }
+
+
+def _normalized_payload(segments: list[tuple[int, int, str]]) -> dict[str, object]:
+    return {
+        "version": 1,
+        "language": "en-us",
+        "segment_count": len(segments),
+        "segments": [{"start_ms": start, "end_ms": end, "text": text} for start, end, text in segments],
+    }
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.repo_root = Path(self.temp_dir.name)
+        self.show_root = self.repo_root / "shows" / "demo-show"
+        self.show_root.mkdir(parents=True, exist_ok=True)
+        (self.show_root / "episode_inventory.json").write_text(
+            json.dumps(
+                {
+                    "version": 1,
+                    "subject_slug": "demo",
+                    "episodes": [
+                        {"episode_key": "ep-a", "title": "Episode A"},
+                        {"episode_key": "ep-b", "title": "Episode B"},
+                    ],
+                }
+            ),
+            encoding="utf-8",
+        )
+        (self.show_root / "spotify_map.json").write_text(
+            json.dumps(
+                {
+                    "version": 2,
+                    "subject_slug": "demo",
+                    "by_episode_key": {
+                        "ep-a": "https://open.spotify.com/episode/aaaaaaaaaaaaaaaa",
+                        "ep-b": "https://open.spotify.com/episode/bbbbbbbbbbbbbbbb",
+                    },
+                }
+            ),
+            encoding="utf-8",
+        )
+        self.sources = load_show_sources(repo_root=self.repo_root, show_slug="demo-show")
+        self.store = TranscriptStore(self.show_root)
+        self.store.write_normalized_payload(
+            episode_key="ep-a",
+            payload=_normalized_payload(
+                [
+                    (0, 4000, "Welcome to the episode about attachment theory."),
+                    (4000, 9000, "Bowlby described attachment as a lasting bond."),
+                    (9000, 12000, "Next week we cover personality traits."),
+                ]
+            ),
+        )
+        self.store.write_normalized_payload(
+            episode_key="ep-b",
+            payload=_normalized_payload(
+                [
+                    (61000, 65500, "The Big Five personality traits are openness and more."),
+                    (65500, 70000, "Trait theory differs from psychoanalytic theory."),
+                ]
+            ),
+        )
+        self._save_manifest(["ep-a", "ep-b"])
+
+    def _save_manifest(self, episode_keys: list[str]) -> None:
+        titles = {"ep-a": "Episode A", "ep-b": "Episode B"}
+        self.store.save_manifest(
+            show_slug="demo-show",
+            subject_slug="demo",
+            inventory_path=self.show_root / "episode_inventory.json",
+            spotify_map_path=self.show_root / "spotify_map.json",
+            entries={key: _manifest_entry(key, titles[key]) for key in episode_keys},
+        )
+
+    def test_search_returns_ranked_hits_with_timestamps_and_snippets(self) -> None:
+        summary = build_search_index(sources=self.sources, store=self.store)
+        self.assertEqual(summary["episode_count_indexed"], 2)
+        self.assertEqual(summary["segment_count"], 5)
+
+        result = search_show_transcripts(store=self.store, query="attachment")
+        self.assertEqual(result["hit_count"], 2)
+        self.assertEqual({hit["episode_key"] for hit in result["hits"]}, {"ep-a"})
+        self.assertIn("[attachment]", result["hits"][0]["snippet"])
+        self.assertGreaterEqual(result["hits"][0]["score"], result["hits"][1]["score"])
+
+        traits = search_show_transcripts(store=self.store, query="personality traits", limit=5)
+        by_episode = {hit["episode_key"]: hit for hit in traits["hits"]}
+        self.assertEqual(by_episode["ep-b"]["start_ms"], 61000)
+        self.assertEqual(by_episode["ep-b"]["end_ms"], 65500)
+        self.assertEqual(by_episode["ep-b"]["start"], "00:01:01.000")
+        self.assertEqual(by_episode["ep-b"]["title"], "Episode B")
+
+        scoped = search_show_transcripts(store=self.store, query="theory", episode_key="ep-b")
+        self.assertEqual([hit["episode_key"] for hit in scoped["hits"]], ["ep-b"])
+
+    def test_query_syntax_characters_are_treated_as_literal_terms(self) -> None:
+        build_search_index(sources=self.sources, store=self.store)
+        result = search_show_transcripts(store=self.store, query='"Big Five" OR -NEAR(')
+        self.assertEqual(result["hit_count"], 0)
+
+    def test_rebuild_is_incremental_by_normalized_digest(self) -> None:
+        build_search_index(sources=self.sources, store=self.store)
+
+        unchanged = build_search_index(sources=self.sources, store=self.store)
+        self.assertEqual(unchanged["episode_count_indexed"], 0)
+        self.assertEqual(unchanged["episode_count_unchanged"], 2)
+
+        self.store.write_normalized_payload(
+            episode_key="ep-b",
+            payload=_normalized_payload([(0, 1000, "Humanistic psychology replaces trait talk.")]),
+        )
+        changed = build_search_index(sources=self.sources, store=self.store)
+        self.assertEqual(changed["indexed_episodes"], ["ep-b"])
+        self.assertEqual(changed["segment_count"], 4)
+        self.assertEqual(search_show_transcripts(store=self.store, query="openness")["hit_count"], 0)
+        self.assertEqual(search_show_transcripts(store=self.store, query="humanistic")["hit_count"], 1)
+
+        self._save_manifest(["ep-a"])
+        pruned = build_search_index(sources=self.sources, store=self.store)
+        self.assertEqual(pruned["removed_episodes"], ["ep-b"])
+        self.assertEqual(pruned["segment_count"], 3)
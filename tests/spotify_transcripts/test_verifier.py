@@ -103,3 +103,67 @@ class VerifierTests(unittest.TestCase):
         reasons = {issue["reason"] for issue in payload["issues"]}
         self.assertIn("missing_manifest_entry", reasons)
         self.assertIn("orphaned_raw_file", reasons)
+
+    def test_verify_show_transcripts_notices_files_added_to_nested_directories(self) -> None:
+        nested = self.show_root / "spotify_transcripts" / "raw" / "archive"
+        nested.mkdir(parents=True)
+        first = verify_show_transcripts(sources=self.sources, store=self.store)
+        self.assertNotIn("orphaned_raw_file", {issue["reason"] for issue in first["issues"]})
+
+        # Only ``archive`` changes mtime; the top-level raw directory does not.
+        (nested / "stale.json").write_text("{}", encoding="utf-8")
+        second = verify_show_transcripts(sources=self.sources, store=self.store)
+        orphans = [issue["path"] for issue in second["issues"] if issue["reason"] == "orphaned_raw_file"]
+        self.assertEqual(orphans, ["spotify_transcripts/raw/archive/stale.json"])
+
+    def test_verify_show_transcripts_rechecks_only_changed_entries(self) -> None:
+        entries = {}
+        for key, title in (("ep-a", "Episode A"), ("ep-b", "Episode B")):
+            self.store.write_raw_payload(episode_key=key, payload={"ok": True})
+            self.store.write_normalized_payload(
+                episode_key=key,
+                payload={"segment_count": 1, "segments": [{"start_ms": 0, "end_ms": 1000, "text": "Hello"}]},
+            )
+            self.store.write_vtt(episode_key=key, content="WEBVTT\n\n1\n00:00:00.000 --> 00:00:01.000\nHello\n")
+            entries[key] = {
+                "episode_key": key,
+                "title": title,
+                "status": "downloaded",
+                "raw_path": f"spotify_transcripts/raw/{key}.json",
+                "normalized_path": f"spotify_transcripts/normalized/{key}.json",
+                "vtt_path": f"spotify_transcripts/vtt/{key}.vtt",
+            }
+        self.store.save_manifest(
+            show_slug="demo-show",
+            subject_slug="demo",
+            inventory_path=self.show_root / "episode_inventory.json",
+            spotify_map_path=self.show_root / "spotify_map.json",
+            entries=entries,
+        )
+
+        first = verify_show_transcripts(sources=self.sources, store=self.store)
+        self.assertEqual(first["rechecked_episode_count"], 2)
+        self.assertEqual(first["issue_count"], 0)
+        ledger = json.loads(self.store.ledger_path.read_text(encoding="utf-8"))
+        self.assertEqual(
+            set(ledger["files"]["spotify_transcripts/vtt/ep-a.vtt"].keys()),
+            {"size", "mtime_ns", "sha256"},
+        )
+
+        second = verify_show_transcripts(sources=self.sources, store=self.store)
+        self.assertEqual(second["rechecked_episode_count"], 0)
+        self.assertEqual(second["issue_count"], 0)
+
+        self.store.write_vtt(episode_key="ep-b", content="not a vtt header at all\n")
+        third = verify_show_transcripts(sources=self.sources, store=self.store)
+        self.assertEqual(third["rechecked_episode_count"], 1)
+        self.assertEqual([issue["reason"] for issue in third["issues"]], ["bad_vtt_header"])
+
+        fourth = verify_show_transcripts(sources=self.sources, store=self.store)
+        self.assertEqual(fourth["rechecked_episode_count"], 0)
+        self.assertEqual([issue["reason"] for issue in fourth["issues"]], ["bad_vtt_header"])
+
+        full = verify_show_transcripts(sources=self.sources, store=self.store, full=True)
+        self.assertEqual(full["mode"], "full")
+        self.assertEqual(full["rechecked_episode_count"], 2)
+        self.assertEqual(full["issue_count"], 1)
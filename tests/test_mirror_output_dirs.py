@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def _load_module():
+    script_path = Path(__file__).resolve().parents[1] / "scripts" / "mirror_output_dirs.py"
+    spec = importlib.util.spec_from_file_location("mirror_output_dirs", script_path)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run(mod, capsys, source: Path, dest: Path, manifest_dir: Path, **kwargs) -> tuple[int, str]:
+    capsys.readouterr()
+    code = mod.run_subject(
+        subject="bioneuro",
+        source_root=source,
+        dest_root=dest,
+        dry_run=kwargs.pop("dry_run", False),
+        delete=kwargs.pop("delete", False),
+        checksum=kwargs.pop("checksum", True),
+        manifest_dir=manifest_dir,
+        **kwargs,
+    )
+    return code, capsys.readouterr().out
+
+
+def _synthetic_tree(root: Path, count: int) -> None:
+    for index in range(count):
+        path = root / f"W{index % 14 + 1:02d}L{index % 3 + 1}" / f"episode-{index:05d}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"payload {index}\n", encoding="utf-8")
+
+
+def test_checksum_manifest_only_rehashes_changed_files(tmp_path: Path, monkeypatch, capsys) -> None:
+    mod = _load_module()
+    source = tmp_path / "source"
+    dest = tmp_path / "dest"
+    _synthetic_tree(source, 20)
+    (source / "W01L1" / "x.request.json").write_text("{}", encoding="utf-8")
+
+    code, output = _run(mod, capsys, source, dest, tmp_path / "manifests")
+    assert code == 0
+    assert "copied=20" in output
+    assert not (dest / "W01L1" / "x.request.json").exists()
+
+    hashed: list[Path] = []
+    original = mod.sha256_file
+    monkeypatch.setattr(mod, "sha256_file", lambda path: hashed.append(path) or original(path))
+    changed = source / "W01L1" / "episode-00000.txt"
+    changed.write_text("payload X\n", encoding="utf-8")
+    os.utime(changed, ns=(1, 1))
+
+    code, output = _run(mod, capsys, source, dest, tmp_path / "manifests")
+    assert code == 0
+    assert "updated=1" in output and "unchanged=19" in output
+    assert hashed == [changed]
+    assert (dest / "W01L1" / "episode-00000.txt").read_text(encoding="utf-8") == "payload X\n"
+
+
+def test_dry_run_output_is_unchanged_and_writes_nothing(tmp_path: Path, capsys) -> None:
+    mod = _load_module()
+    source = tmp_path / "source"
+    _synthetic_tree(source, 3)
+    dest = tmp_path / "dest"
+
+    code, output = _run(mod, capsys, source, dest, tmp_path / "manifests", dry_run=True)
+
+    assert code == 0
+    assert not dest.exists()
+    assert not (tmp_path / "manifests").exists()
+    lines = [line for line in output.splitlines() if line.startswith(("MKDIR", "COPY"))]
+    assert lines[0] == f"MKDIR   {dest}"
+    assert [line.split()[0] for line in lines[1:]] == ["MKDIR", "COPY"] * 3
+    assert "Checksum manifest" not in output
+
+
+def test_collision_is_still_refused(tmp_path: Path, capsys) -> None:
+    mod = _load_module()
+    source = tmp_path / "source"
+    (source / "W01L1").mkdir(parents=True)
+    (source / "W01L1" / "a.mp3").write_bytes(b"a")
+    (tmp_path / "dest" / "W01L1" / "a.mp3").mkdir(parents=True)
+
+    code, _ = _run(mod, capsys, source, tmp_path / "dest", tmp_path / "manifests")
+
+    assert code == 2
+
+
+def test_hardlink_mode_links_and_copy_mode_breaks_links(tmp_path: Path, capsys) -> None:
+    mod = _load_module()
+    source = tmp_path / "source"
+    _synthetic_tree(source, 2)
+    dest = tmp_path / "dest"
+    first = Path("W01L1") / "episode-00000.txt"
+
+    _run(mod, capsys, source, dest, tmp_path / "manifests", link_mode="hardlink")
+    assert os.path.samefile(source / first, dest / first)
+
+    mod.copy_file(source / first, dest / first)
+    assert not os.path.samefile(source / first, dest / first)
+    assert (dest / first).read_text(encoding="utf-8") == (source / first).read_text(encoding="utf-8")
+    assert (dest / first).stat().st_mtime_ns == (source / first).stat().st_mtime_ns
+
+
+def test_benchmark_5k_file_tree_warm_checksum_run_hashes_nothing(tmp_path: Path, monkeypatch, capsys) -> None:
+    mod = _load_module()
+    source = tmp_path / "source"
+    dest = tmp_path / "dest"
+    _synthetic_tree(source, 5000)
+
+    code, output = _run(mod, capsys, source, dest, tmp_path / "manifests", workers=8)
+    assert code == 0
+    assert "copied=5000" in output
+
+    hashed: list[Path] = []
+    original = mod.sha256_file
+    monkeypatch.setattr(mod, "sha256_file", lambda path: hashed.append(path) or original(path))
+    started = time.perf_counter()
+    code, output = _run(mod, capsys, source, dest, tmp_path / "manifests", workers=8)
+    warm_seconds = time.perf_counter() - started
+
+    assert code == 0
+    assert "unchanged=5000" in output
+    assert hashed == []
+    assert warm_seconds < 5.0